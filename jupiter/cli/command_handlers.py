@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 import time
@@ -12,14 +13,19 @@ from typing import Any
 from jupiter.config import load_config, load_merged_config, PluginsConfig, PerformanceConfig, JupiterConfig
 from jupiter.core import ProjectAnalyzer, ProjectScanner, ScanReport
 from jupiter.core.cache import CacheManager
+from jupiter.core.callgraph import CallGraphService
 from jupiter.core.history import HistoryManager
 from jupiter.core.plugin_manager import PluginManager
 from jupiter.core.state import save_last_root
 from jupiter.core.updater import apply_update
 from jupiter.server import JupiterAPIServer
 from jupiter.web import launch_web_ui
-from jupiter.core.runner import run_command
-from jupiter.core.simulator import ProjectSimulator
+from jupiter.core.runner import CommandResult, run_command
+from jupiter.core.runtime_profile import RuntimeProfile
+from jupiter.core.shards import run_sharded, split_pytest_command
+from jupiter.core.tracer import folded_lines
+from jupiter.core.tracer_bench import run_tracer_bench
+from jupiter.core.simulator import ProjectSimulator, SimulationTarget
 
 logger = logging.getLogger(__name__)
 
@@ -389,6 +395,18 @@ def handle_ci(
         sys.exit(1)
 
 
+def _build_simulator(root: Path, last_scan: dict[str, Any]) -> ProjectSimulator:
+    """Index the last scan, resolving imports with the project's source roots."""
+    try:
+        source_roots = load_config(root).performance.source_roots
+    except Exception as exc:
+        logger.debug("Could not read source roots: %s", exc)
+        source_roots = []
+    return ProjectSimulator(
+        last_scan["files"], root=last_scan.get("root") or str(root), source_roots=source_roots
+    )
+
+
 def handle_simulate_remove(root: Path, target: str, as_json: bool) -> None:
     # Load cache
     cache_manager = CacheManager(root)
@@ -397,7 +415,7 @@ def handle_simulate_remove(root: Path, target: str, as_json: bool) -> None:
         logger.error("No scan data found. Run 'jupiter scan' first.")
         sys.exit(1)
         
-    simulator = ProjectSimulator(last_scan["files"])
+    simulator = _build_simulator(root, last_scan)
     
     if "::" in target:
         path, func = target.split("::", 1)
@@ -420,6 +438,171 @@ def handle_simulate_remove(root: Path, target: str, as_json: bool) -> None:
             print(f" - [{imp.severity.upper()}] {imp.target}: {imp.details} ({imp.impact_type})")
 
 
+def handle_profile(root: Path, top: int, function: str | None, as_json: bool, static: bool = True) -> None:
+    """Print the runtime hot paths recorded by ``jupiter run --with-dynamic``."""
+    last_scan = CacheManager(root).load_last_scan()
+    if not last_scan:
+        logger.error("No scan data found. Run 'jupiter scan' first.")
+        sys.exit(1)
+    dynamic = last_scan.get("dynamic")
+    call_graph = None
+    if static and isinstance(dynamic, dict) and dynamic.get("calls"):
+        try:
+            source_roots = load_config(root).performance.source_roots
+        except Exception as exc:
+            logger.debug("Could not read source roots: %s", exc)
+            source_roots = []
+        call_graph = CallGraphService(root, source_roots, use_dynamic=False).analyze()
+    profile = RuntimeProfile.build(dynamic, call_graph)
+
+    data = profile.rankings(top)
+    if function:
+        detail = profile.function_detail(function, top)
+        if detail is None:
+            logger.error("No runtime data for '%s'.", function)
+            sys.exit(1)
+        data["function"] = detail
+    if as_json:
+        print(json.dumps(data, indent=2))
+        return
+
+    stats = data["statistics"]
+    if not stats["profiled_functions"]:
+        print("No runtime data. Run 'jupiter run --with-dynamic <command>' first.")
+        return
+    print(
+        f"Runtime profile: {stats['profiled_functions']} functions, {stats['total_calls']} calls, "
+        f"{stats['total_time']:.3f}s"
+    )
+    if stats["static_functions"]:
+        print(f" Joined to {stats['joined_functions']} of {stats['static_functions']} static functions")
+    sections = (
+        ("Top self time", data["top_self_time"]),
+        ("Top cumulative time", data["top_cumulative_time"]),
+    )
+    for title, items in sections:
+        print(f"\n{title}:")
+        for item in items:
+            location = f"{item['file_path']}:{item['line_number']}" if item.get("line_number") else item["file_path"]
+            print(
+                f" {item['self_time']:10.4f}s self {item['cumulative_time']:10.4f}s cum {item['calls']:8d} calls"
+                f"  {item.get('qualname') or item['name']} ({location})"
+            )
+    print("\nHottest edges:")
+    for edge in data["hot_edges"]:
+        print(f" {edge['time']:10.4f}s {edge['calls']:8d} calls  {edge['caller']} -> {edge['callee']}")
+    if function:
+        detail = data["function"]
+        print(f"\n{detail['key']}: {detail['calls']} calls, self {detail['self_time']:.4f}s, cumulative {detail['cumulative_time']:.4f}s")
+        for label, edges, side in (("Callers", detail["callers"], "caller"), ("Callees", detail["callees"], "callee")):
+            print(f" {label}:")
+            for edge in edges:
+                print(f"  {edge['time']:10.4f}s {edge['calls']:8d} calls  {edge[side]}")
+
+
+def handle_bench(
+    root: Path,
+    workloads: list[str] | None,
+    backends: list[str] | None,
+    repeat: int,
+    scale: float,
+    max_overhead: float | None,
+    tolerance: float,
+    save: bool,
+    fail_on_regression: bool,
+    as_json: bool,
+) -> None:
+    """Measure tracer overhead; exit 1 when over budget (or regressed with ``fail_on_regression``)."""
+    try:
+        report = run_tracer_bench(
+            root,
+            workloads=workloads,
+            backends=backends,
+            repeat=repeat,
+            scale=scale,
+            max_overhead=max_overhead,
+            tolerance=tolerance,
+            save=save,
+        )
+    except ValueError as exc:
+        logger.error("%s", exc)
+        sys.exit(2)
+
+    if as_json:
+        data = report.to_dict()
+        data["path"] = report.path
+        print(json.dumps(data, indent=2))
+    else:
+        print(report.describe())
+
+    if report.over_budget or (fail_on_regression and report.regressions):
+        sys.exit(1)
+
+
+def _parse_simulation_target(spec: str, new_path: str | None = None) -> SimulationTarget:
+    """Turn ``path`` / ``path::function`` (optionally ``... -> dest``) into a target."""
+    if new_path is None and "->" in spec:
+        spec, new_path = (part.strip() for part in spec.split("->", 1))
+    path, _, func = spec.partition("::")
+    return SimulationTarget(
+        action="move" if new_path else "remove",
+        path=path,
+        function_name=func or None,
+        new_path=new_path,
+    )
+
+
+def handle_simulate_batch(
+    root: Path,
+    targets: list[str],
+    moves: list[list[str]] | None,
+    from_file: Path | None,
+    as_json: bool,
+) -> None:
+    """Simulate many removals/moves against a single in-memory scan index."""
+    specs = [_parse_simulation_target(t) for t in targets]
+    for source, dest in moves or []:
+        specs.append(_parse_simulation_target(source, dest))
+    if from_file:
+        for line in from_file.read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                specs.append(_parse_simulation_target(line))
+    if not specs:
+        logger.error("No simulation targets given.")
+        sys.exit(1)
+
+    cache_manager = CacheManager(root)
+    last_scan = cache_manager.load_last_scan()
+    if not last_scan or "files" not in last_scan:
+        logger.error("No scan data found. Run 'jupiter scan' first.")
+        sys.exit(1)
+
+    simulator = _build_simulator(root, last_scan)
+    try:
+        batch = simulator.simulate_batch(specs)
+    except ValueError as exc:
+        logger.error("%s", exc)
+        sys.exit(1)
+
+    if as_json:
+        print(json.dumps(asdict(batch), indent=2))
+        return
+
+    print(f"Simulated {len(batch.results)} change(s)")
+    print(f"Risk Score: {batch.risk_score.upper()}")
+    for result in batch.results:
+        print(f" - {result.target}: {len(result.impacts)} impact(s), risk {result.risk_score}")
+    if not batch.impacts:
+        print("No combined impacts detected.")
+        return
+    print(f"Combined impacts ({len(batch.impacts)}):")
+    for imp in batch.impacts:
+        print(f" - [{imp.severity.upper()}] {imp.target}: {imp.details} ({imp.impact_type})")
+        for source in imp.sources:
+            print(f"     caused by: {source}")
+
+
 def handle_server(root: Path, host: str, port: int) -> None:
     """Start the Jupiter API server stub."""
     # Strip quotes if present (workaround for Windows cmd passing quotes)
@@ -488,28 +671,91 @@ def handle_watch(root: Path) -> None:
         logger.info("Stopping file watcher.")
 
 
-def handle_run(root: Path, command_str: str, with_dynamic: bool) -> None:
-    """Run a command with optional dynamic analysis."""
-    
-    # Split command string
+def _split_command(command_str: str) -> list[str]:
     # On Windows, shlex.split consumes backslashes. Use posix=False or manual split if needed.
     # Ideally, we should respect the shell quoting.
     if sys.platform == "win32":
-        cmd_args = shlex.split(command_str, posix=False)
+        return shlex.split(command_str, posix=False)
+    return shlex.split(command_str)
+
+
+def handle_run(
+    root: Path,
+    command_str: str,
+    with_dynamic: bool,
+    dynamic_mode: str = "trace",
+    sample_rate: float | None = None,
+    folded_path: Path | None = None,
+    shards: int | None = None,
+    extra_commands: list[str] | None = None,
+) -> None:
+    """Run a command with optional dynamic analysis (traced or sampled)."""
+    cmd_args = _split_command(command_str)
+
+    if (shards and shards > 1) or extra_commands:
+        result = _run_shards(root, cmd_args, shards, extra_commands, with_dynamic, dynamic_mode, sample_rate)
     else:
-        cmd_args = shlex.split(command_str)
-    
-    result = run_command(cmd_args, cwd=root, with_dynamic=with_dynamic)
-    
-    print(result.stdout)
-    if result.stderr:
-        print(result.stderr, file=sys.stderr)
+        result = run_command(
+            cmd_args,
+            cwd=root,
+            with_dynamic=with_dynamic,
+            dynamic_mode=dynamic_mode,
+            sample_rate=sample_rate,
+        )
+        print(result.stdout)
+        if result.stderr:
+            print(result.stderr, file=sys.stderr)
         
     if result.dynamic_data:
         logger.info("Dynamic analysis data captured.")
         cache_manager = CacheManager(root)
         cache_manager.merge_dynamic_data(result.dynamic_data)
         logger.info("Dynamic analysis results merged into cache.")
+        if folded_path is not None:
+            folded = result.dynamic_data.get("folded")
+            if folded:
+                folded_path.write_text("\n".join(folded_lines(folded)) + "\n", encoding="utf-8")
+                logger.info("Folded stacks written to %s", folded_path)
+            else:
+                logger.warning("No folded stacks to write (use --dynamic-mode sample).")
+
+
+def _run_shards(
+    root: Path,
+    cmd_args: list[str],
+    shards: int | None,
+    extra_commands: list[str] | None,
+    with_dynamic: bool,
+    dynamic_mode: str,
+    sample_rate: float | None,
+) -> CommandResult:
+    """Run the command as parallel shards; output is printed as each shard ends."""
+    if extra_commands:
+        commands = [cmd_args] + [_split_command(extra) for extra in extra_commands]
+    else:
+        try:
+            commands = split_pytest_command(cmd_args, root, shards or 1)
+        except ValueError as e:
+            logger.error("%s (use --extra-command to shard other commands)", e)
+            sys.exit(1)
+    workers = shards or len(commands)
+    logger.info("Running %d shard(s), %d at a time", len(commands), workers)
+
+    def print_shard(index: int, command: list[str], result: CommandResult) -> None:
+        print(f"==== shard {index + 1}/{len(commands)} (exit {result.returncode}) ====")
+        print(result.stdout)
+        if result.stderr:
+            print(result.stderr, file=sys.stderr)
+
+    return asyncio.run(run_sharded(
+        commands,
+        root,
+        workers,
+        with_dynamic=with_dynamic,
+        dynamic_mode=dynamic_mode,
+        sample_rate=sample_rate,
+        on_shard_done=print_shard,
+    ))
 
 
 def handle_app(root: Path) -> None:
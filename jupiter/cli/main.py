@@ -15,6 +15,7 @@ from jupiter import __version__
 from jupiter.config import load_config
 from jupiter.core.logging_utils import configure_logging
 from jupiter.core.state import save_last_root
+from jupiter.core.tracer_bench import WORKLOADS as TRACER_WORKLOADS
 from jupiter.cli.utils import resolve_root_argument
 from jupiter.cli.command_handlers import (
     handle_update,
@@ -30,6 +31,9 @@ from jupiter.cli.command_handlers import (
     handle_snapshot_show,
     handle_snapshot_diff,
     handle_simulate_remove,
+    handle_simulate_batch,
+    handle_profile,
+    handle_bench,
     handle_meeting_check_license,
     handle_autodiag,
 )
@@ -72,6 +76,9 @@ CLI_HANDLERS: Dict[str, Any] = {
     "snapshots_show": handle_snapshot_show,
     "snapshots_diff": handle_snapshot_diff,
     "simulate_remove": handle_simulate_remove,
+    "simulate_batch": handle_simulate_batch,
+    "profile": handle_profile,
+    "bench": handle_bench,
     "meeting_check_license": handle_meeting_check_license,
     "autodiag": handle_autodiag,
     "plugins_list": handle_plugins_list,
@@ -263,6 +270,28 @@ def build_parser() -> argparse.ArgumentParser:
     run_parser.add_argument("command_str", help="Command to run (e.g. python script.py)")
     run_parser.add_argument("root", type=Path, nargs="?", default=None, help="Project root")
     run_parser.add_argument("--with-dynamic", action="store_true", help="Enable dynamic analysis")
+    run_parser.add_argument(
+        "--dynamic-mode",
+        choices=["trace", "sample"],
+        default="trace",
+        help="Dynamic analysis mode: trace every call, or sample stacks (low overhead for long runs)",
+    )
+    run_parser.add_argument("--sample-rate", type=float, default=None, help="Samples per second in sample mode (default: 100)")
+    run_parser.add_argument("--folded", type=Path, default=None, help="Write folded stacks (flame graph input) to this file")
+    run_parser.add_argument(
+        "--shards",
+        type=int,
+        default=None,
+        help="Run in N parallel processes: a pytest command is split over its test files, "
+        "extra commands run N at a time; dynamic data of all shards is merged",
+    )
+    run_parser.add_argument(
+        "--extra-command",
+        action="append",
+        default=None,
+        metavar="CMD",
+        help="Additional command to run as its own shard (repeatable)",
+    )
 
     gui_parser = subcommands.add_parser("gui", help="Lancer l interface web locale")
     gui_parser.add_argument("root", type=Path, nargs="?", default=None, help="Projet à afficher dans la GUI")
@@ -299,6 +328,56 @@ def build_parser() -> argparse.ArgumentParser:
     sim_remove.add_argument("root", type=Path, nargs="?", default=None, help="Project root")
     sim_remove.add_argument("--json", action="store_true", help="Output as JSON")
 
+    sim_batch = simulate_sub.add_parser("batch", help="Simulate many removals/moves against one scan index")
+    sim_batch.add_argument("targets", nargs="*", default=[], help="Targets to remove: path (file) or path::function")
+    sim_batch.add_argument("--move", dest="moves", nargs=2, action="append", metavar=("SOURCE", "DEST"),
+                           help="Simulate moving SOURCE (path or path::function) to DEST file; repeatable")
+    sim_batch.add_argument("--from-file", type=Path, default=None,
+                           help="File with one target per line ('path[::function]' or 'path[::function] -> dest')")
+    sim_batch.add_argument("--json", action="store_true", help="Output as JSON")
+
+    # Profile subcommand (runtime hot paths)
+    profile_parser = subcommands.add_parser("profile", help="Show runtime hot paths from dynamic analysis")
+    profile_parser.add_argument("root", type=Path, nargs="?", default=None, help="Project root")
+    profile_parser.add_argument("--top", type=int, default=10, help="Number of entries per ranking")
+    profile_parser.add_argument(
+        "--function",
+        help="Also show callers and callees of a function (path.py::func or path.py::Class.method)",
+    )
+    profile_parser.add_argument("--no-static", action="store_true", help="Skip the join with the static call graph")
+    profile_parser.add_argument("--json", action="store_true", help="Emit JSON output")
+
+    bench_parser = subcommands.add_parser("bench", help="Measure dynamic-analysis tracer overhead")
+    bench_parser.add_argument("root", type=Path, nargs="?", default=None, help="Project root (reports go to .jupiter/bench/)")
+    bench_parser.add_argument(
+        "--workload",
+        action="append",
+        dest="workloads",
+        choices=list(TRACER_WORKLOADS),
+        default=None,
+        help="Workload to run (repeatable, default: all)",
+    )
+    bench_parser.add_argument(
+        "--backend",
+        action="append",
+        dest="backends",
+        choices=["monitoring", "profile", "sample"],
+        default=None,
+        help="Tracer configuration to measure (repeatable, default: all available)",
+    )
+    bench_parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is kept)")
+    bench_parser.add_argument("--scale", type=float, default=1.0, help="Workload size multiplier")
+    bench_parser.add_argument("--max-overhead", type=float, default=None, help="Fail when a ratio exceeds this budget")
+    bench_parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Relative ratio increase over the previous report counted as a regression",
+    )
+    bench_parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 when a regression is found")
+    bench_parser.add_argument("--no-save", action="store_true", help="Do not write the report to .jupiter/bench/")
+    bench_parser.add_argument("--json", action="store_true", help="Emit JSON output")
+
     # Meeting subcommand
     meeting_parser = subcommands.add_parser("meeting", help="Meeting service integration commands")
     meeting_sub = meeting_parser.add_subparsers(dest="meeting_command", required=True)
@@ -472,7 +551,16 @@ def main() -> None:
         port = args.port or config.server.port
         handle_server(root=root, host=host, port=port)
     elif args.command == "run":
-        handle_run(root=root, command_str=args.command_str, with_dynamic=args.with_dynamic)
+        handle_run(
+            root=root,
+            command_str=args.command_str,
+            with_dynamic=args.with_dynamic,
+            dynamic_mode=args.dynamic_mode,
+            sample_rate=args.sample_rate,
+            folded_path=args.folded,
+            shards=args.shards,
+            extra_commands=args.extra_command,
+        )
     elif args.command == "gui":
         host = args.host or config.gui.host
         port = args.port or config.gui.port
@@ -496,6 +584,23 @@ def main() -> None:
         save_last_root(sim_root)
         if args.simulate_command == "remove":
             handle_simulate_remove(sim_root, args.target, args.json)
+        elif args.simulate_command == "batch":
+            handle_simulate_batch(sim_root, args.targets, args.moves, args.from_file, args.json)
+    elif args.command == "profile":
+        handle_profile(root, args.top, args.function, args.json, static=not args.no_static)
+    elif args.command == "bench":
+        handle_bench(
+            root=root,
+            workloads=args.workloads,
+            backends=args.backends,
+            repeat=args.repeat,
+            scale=args.scale,
+            max_overhead=args.max_overhead,
+            tolerance=args.tolerance,
+            save=not args.no_save,
+            fail_on_regression=args.fail_on_regression,
+            as_json=args.json,
+        )
     elif args.command == "meeting":
         meeting_root = resolve_root_argument(getattr(args, "root", None))
         save_last_root(meeting_root)
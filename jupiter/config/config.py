@@ -1,7 +1,7 @@
 """
 Configuration loading and models for Jupiter.
 
-Version: 1.4.0
+Version: 1.7.0
 """
 
 from __future__ import annotations
@@ -135,6 +135,10 @@ class PerformanceConfig:
     max_graph_nodes: int = 1000
     large_file_threshold: int = 1024 * 1024  # 1MB
     excluded_dirs: list[str] = field(default_factory=lambda: ["node_modules", "venv", ".venv", "dist", "build"])
+    source_roots: list[str] = field(default_factory=list)  # Import roots (e.g. "src") for module resolution
+    scan_job_retention: int = 20  # Finished background scan jobs kept in .jupiter/jobs/
+    scan_job_max_age_days: float = 7.0  # Finished jobs older than this are removed (0 = no age limit)
+    scan_progress_hz: float = 10.0  # Scan progress frames sent per second over WebSocket
 
 
 @dataclass
@@ -459,6 +463,10 @@ def _serialize_performance(performance: PerformanceConfig) -> dict[str, Any]:
         "max_graph_nodes": performance.max_graph_nodes,
         "large_file_threshold": performance.large_file_threshold,
         "excluded_dirs": performance.excluded_dirs,
+        "source_roots": performance.source_roots,
+        "scan_job_retention": performance.scan_job_retention,
+        "scan_job_max_age_days": performance.scan_job_max_age_days,
+        "scan_progress_hz": performance.scan_progress_hz,
     }
 
 
@@ -0,0 +1,117 @@
+"""Cache of analyze summaries keyed by a project fingerprint.
+
+``/analyze`` (and ``LocalConnector.analyze``) used to scan and parse the
+whole project on every call; the dashboard calls it on each page load. The
+summary now depends on a fingerprint of its inputs:
+
+- the analyze options (``top``, ``show_hidden``, ``ignore_globs``);
+- the path, size and modification time (ns) of every scanned file, the
+  same change test as incremental scans;
+- the ``last_scan.json`` cache the analyzer reads dynamic call data from.
+
+Computing the fingerprint only walks and stats the tree, so an unchanged
+project answers without reading or parsing any file. Summaries are kept
+encoded (each hit returns a fresh dict) in a small LRU. ``invalidate()``
+drops entries when a scan or the file watcher reports changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from jupiter.core.cache import CacheManager
+from jupiter.core.jsonio import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+# Bump when the summary format changes: older entries stop matching
+ANALYZE_CACHE_VERSION = 1
+DEFAULT_MAX_ENTRIES = 8
+
+
+def project_fingerprint(root: Path, paths: Iterable[Path], options: Dict[str, Any]) -> str:
+    """Hash of the analyze inputs (see module docstring)."""
+    digest = hashlib.sha1()
+    digest.update(dumps({
+        "version": ANALYZE_CACHE_VERSION,
+        "top": options.get("top", 5),
+        "show_hidden": bool(options.get("show_hidden")),
+        "ignore_globs": sorted(options.get("ignore_globs") or ()),
+    }))
+    root_text = str(root)
+    for path in sorted(str(p) for p in paths):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue  # deleted while walking
+        relative = path[len(root_text):] if path.startswith(root_text) else path
+        digest.update(f"{relative}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8", "surrogateescape"))
+    try:
+        stat = CacheManager(root).last_scan_file.stat()
+        digest.update(f"last_scan\0{stat.st_size}\0{stat.st_mtime_ns}".encode("utf-8"))
+    except OSError:
+        pass
+    return digest.hexdigest()
+
+
+class AnalyzeCache:
+    """LRU of encoded summaries keyed by (root, fingerprint)."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, root: Path, fingerprint: str) -> Optional[Dict[str, Any]]:
+        key = (str(root), fingerprint)
+        with self._lock:
+            encoded = self._entries.get(key)
+            if encoded is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return loads(encoded)
+
+    def put(self, root: Path, fingerprint: str, summary: Dict[str, Any]) -> None:
+        try:
+            encoded = dumps(summary)
+        except (TypeError, ValueError) as exc:
+            logger.debug("Analyze summary not cacheable: %s", exc)
+            return
+        with self._lock:
+            self._entries[(str(root), fingerprint)] = encoded
+            self._entries.move_to_end((str(root), fingerprint))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, root: Optional[Path] = None) -> int:
+        """Drop the summaries of ``root`` (every root when None); return how many."""
+        with self._lock:
+            keys = [key for key in self._entries if root is None or key[0] == str(root)]
+            for key in keys:
+                del self._entries[key]
+            if keys:
+                self.invalidations += 1
+        return len(keys)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
+
+
+analyze_cache = AnalyzeCache()
@@ -17,6 +17,8 @@ from typing import Any, Dict, Iterable, List, Optional, cast
 
 from .scanner import FileMetadata
 from .cache import CacheManager
+from .callgraph import CallGraphResult
+from .runtime_profile import RuntimeProfile
 from .quality.complexity import estimate_complexity, estimate_js_complexity
 from .quality.duplication import find_duplications
 
@@ -167,6 +169,7 @@ class AnalysisSummary:
     hotspots: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
     quality: Dict[str, Any] = field(default_factory=dict)
     refactoring: List[Dict[str, Any]] = field(default_factory=list)
+    runtime: Dict[str, Any] = field(default_factory=dict)
 
     def describe(self) -> str:
         """Return a human readable multi-line summary."""
@@ -240,7 +243,22 @@ class AnalysisSummary:
             if len(self.refactoring) > 5:
                 refactoring_str += f"\n  ... and {len(self.refactoring) - 5} more."
 
-        return base_summary + python_summary_str + js_ts_summary_str + hotspots_str + quality_str + refactoring_str
+        runtime_str = ""
+        if self.runtime:
+            stats = self.runtime.get("statistics", {})
+            runtime_str = (
+                f"\n\nRuntime Hot Paths ({stats.get('profiled_functions', 0)} functions, "
+                f"{stats.get('total_calls', 0)} calls, {stats.get('total_time', 0.0):.3f}s):"
+            )
+            for item in self.runtime.get("top_self_time", []):
+                runtime_str += (
+                    f"\n  - {item['key']}: self {item['self_time']:.4f}s, "
+                    f"cumulative {item['cumulative_time']:.4f}s, {item['calls']} calls"
+                )
+            for edge in self.runtime.get("hot_edges", [])[:3]:
+                runtime_str += f"\n  - {edge['caller']} -> {edge['callee']}: {edge['time']:.4f}s ({edge['calls']} calls)"
+
+        return base_summary + python_summary_str + js_ts_summary_str + hotspots_str + quality_str + refactoring_str + runtime_str
 
     def to_dict(self) -> dict[str, object]:
         """Return a JSON-serializable representation of the summary."""
@@ -253,6 +271,8 @@ class AnalysisSummary:
             "quality": self.quality,
             "refactoring": self.refactoring,
         }
+        if self.runtime:
+            data["runtime"] = self.runtime
         if self.python_summary:
             # Manually convert dataclass to dict for nested serialization
             data["python_summary"] = asdict(self.python_summary)
@@ -283,12 +303,23 @@ class ProjectAnalyzer:
             self.analysis_cache = self.cache_manager.load_analysis_cache()
 
         self.dynamic_calls = {}
+        self.dynamic_data: Dict[str, Any] = {}
         if self.last_scan and "dynamic" in self.last_scan and self.last_scan["dynamic"]:
              dynamic_data = self.last_scan["dynamic"]
              if isinstance(dynamic_data, dict) and "calls" in dynamic_data:
                  self.dynamic_calls = dynamic_data["calls"]
+                 self.dynamic_data = dynamic_data
              elif isinstance(dynamic_data, dict):
                  self.dynamic_calls = dynamic_data
+                 self.dynamic_data = {"calls": dynamic_data}
+        # "file::name" -> calls, whatever the key form (qualname or bare name)
+        self._dynamic_by_name: Dict[str, int] = {}
+        for key, count in self.dynamic_calls.items():
+            file_path, _, qualname = str(key).partition("::")
+            simple = f"{file_path}::{qualname.rsplit('.', 1)[-1]}"
+            self._dynamic_by_name[simple] = self._dynamic_by_name.get(simple, 0) + count
+        # Static call graph of the last summarize() (joined to the runtime profile)
+        self._callgraph: Optional[CallGraphResult] = None
 
     def _build_callgraph_unused_set(self, python_files: List[FileMetadata]) -> set[str]:
         """
@@ -301,8 +332,9 @@ class ProjectAnalyzer:
         # Get file paths
         file_paths = [m.path for m in python_files]
         
-        # Build call graph
-        result = build_call_graph(self.root, file_paths)
+        # Build call graph (runtime calls and edges merged in)
+        result = build_call_graph(self.root, file_paths, dynamic=self.dynamic_data or None)
+        self._callgraph = result
         
         # Return the unused set using simple_key format (file::func without class)
         return {
@@ -384,7 +416,7 @@ class ProjectAnalyzer:
                     key = f"{rel_path_str}::{func}"
                     
                     # Check dynamic calls from runtime analysis
-                    dynamically_called = self.dynamic_calls.get(key, 0) > 0
+                    dynamically_called = self._dynamic_by_name.get(key, 0) > 0
                     
                     # Use call graph for unused detection
                     if self.use_callgraph:
@@ -440,6 +472,12 @@ class ProjectAnalyzer:
                 usage_summary=usage_counts,
             )
 
+        # Runtime hot paths (times and caller edges of the cached dynamic data)
+        runtime: Dict[str, Any] = {}
+        if self.dynamic_calls:
+            profile = RuntimeProfile.build(self.dynamic_data, self._callgraph)
+            runtime = profile.rankings(top_n)
+
         # JS/TS summary
         js_ts_files = [
             m for m in all_files if m.file_type in ("js", "ts", "jsx", "tsx") and m.language_analysis and not m.language_analysis.get("error")
@@ -616,4 +654,5 @@ class ProjectAnalyzer:
             hotspots=hotspots,
             quality=quality_metrics,
             refactoring=refactoring_recommendations,
+            runtime=runtime,
         )
@@ -5,6 +5,9 @@ import logging
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from jupiter.core.jsonio import dumps, loads
+from jupiter.core.tracefile import merge_dynamic
+
 logger = logging.getLogger(__name__)
 
 class CacheManager:
@@ -20,27 +23,68 @@ class CacheManager:
         if not self.cache_dir.exists():
             self.cache_dir.mkdir(parents=True, exist_ok=True)
 
+    def last_scan_stamp(self) -> Optional[tuple]:
+        """Identity of the cached last scan (path, mtime, size); None when there is none."""
+        try:
+            stat = self.last_scan_file.stat()
+        except OSError:
+            return None
+        return (str(self.last_scan_file), stat.st_mtime_ns, stat.st_size)
+
     def load_last_scan(self) -> Optional[Dict[str, Any]]:
         """Load the last scan report from cache."""
         if not self.last_scan_file.exists():
             return None
         try:
-            with open(self.last_scan_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = loads(self.last_scan_file.read_bytes())
             return self._normalize_report(data)
         except Exception as e:
             logger.warning("Failed to load last scan cache: %s", e)
             return None
 
+    def load_last_scan_encoded(self) -> Optional[bytes]:
+        """Return the cached report bytes when they are already in the API schema shape.
+
+        None when there is no cached report or when it is a legacy report
+        that ``load_last_scan`` still has to normalize.
+        """
+        try:
+            payload = self.last_scan_file.read_bytes()
+        except OSError:
+            return None
+        try:
+            data = loads(payload)
+        except Exception as e:
+            logger.warning("Failed to load last scan cache: %s", e)
+            return None
+        if not isinstance(data, dict) or self._needs_normalization(data):
+            return None
+        return payload
+
     def save_last_scan(self, report_data: Dict[str, Any]):
         """Save the scan report to cache."""
         self._ensure_cache_dir()
         normalized = self._normalize_report(report_data)
         try:
-            with open(self.last_scan_file, "w", encoding="utf-8") as f:
-                json.dump(normalized, f, indent=2)
+            self.save_last_scan_encoded(dumps(normalized))
+        except Exception as e:
+            logger.warning("Failed to save last scan cache: %s", e)
+
+    def save_last_scan_encoded(self, payload: bytes) -> bool:
+        """Save a scan report already encoded with ``jsonio.dumps`` (API schema shape).
+
+        Returns True once ``last_scan.json`` holds ``payload``.
+        """
+        self._ensure_cache_dir()
+        # Written next to the cache then renamed, so readers never see half a report
+        tmp_file = self.last_scan_file.with_suffix(".json.tmp")
+        try:
+            tmp_file.write_bytes(payload)
+            tmp_file.replace(self.last_scan_file)
         except Exception as e:
             logger.warning("Failed to save last scan cache: %s", e)
+            return False
+        return True
 
     def load_analysis_cache(self) -> Dict[str, Any]:
         """Load the analysis cache."""
@@ -77,38 +121,35 @@ class CacheManager:
         if not last_scan:
             return
 
-        dynamic_section: Dict[str, Any] = last_scan.get("dynamic") or {"calls": {}, "times": {}, "call_graph": {}}
+        dynamic_section = last_scan.get("dynamic")
         if not isinstance(dynamic_section, dict):
-            dynamic_section = {"calls": {}, "times": {}, "call_graph": {}}
-
-        calls = dynamic_section.get("calls") or {}
-        times = dynamic_section.get("times") or {}
-        call_graph = dynamic_section.get("call_graph") or {}
-
-        if not isinstance(calls, dict):
-            calls = {}
-        if not isinstance(times, dict):
-            times = {}
-        if not isinstance(call_graph, dict):
-            call_graph = {}
-
-        for func, count in dynamic_data.get("calls", {}).items():
-            calls[func] = calls.get(func, 0) + count
-
-        for func, time_val in dynamic_data.get("times", {}).items():
-            times[func] = times.get(func, 0.0) + time_val
-
-        for caller, callees in dynamic_data.get("call_graph", {}).items():
-            caller_entry = call_graph.setdefault(caller, {})
-            if not isinstance(caller_entry, dict):
-                caller_entry = {}
-                call_graph[caller] = caller_entry
-            for callee, count in callees.items():
-                caller_entry[callee] = caller_entry.get(callee, 0) + count
-
-        last_scan["dynamic"] = {"calls": calls, "times": times, "call_graph": call_graph}
+            dynamic_section = {}
+
+        # Only the aggregated counters are cached (not folded stacks or run metadata)
+        names = ["calls", "times", "call_graph"]
+        # Measured self/edge times are only kept while every merged run has
+        # them; otherwise RuntimeProfile falls back to its call-count estimate
+        timings = ("self_times", "call_graph_times")
+        if all(isinstance(dynamic_data.get(name), dict) for name in timings) and (
+            not dynamic_section.get("calls") or all(isinstance(dynamic_section.get(name), dict) for name in timings)
+        ):
+            names.extend(timings)
+        merged = {name: dynamic_section.get(name) for name in names}
+        merge_dynamic(merged, {name: dynamic_data.get(name) for name in names})
+        for name in names:
+            if not isinstance(merged.get(name), dict):
+                merged[name] = {}
+
+        last_scan["dynamic"] = merged
         self.save_last_scan(last_scan)
 
+    @staticmethod
+    def _needs_normalization(report_data: Dict[str, Any]) -> bool:
+        """True if ``_normalize_report`` would reshape ``report_data``."""
+        return not isinstance(report_data.get("plugins"), (list, type(None))) or isinstance(
+            report_data.get("files"), dict
+        )
+
     def _normalize_report(self, report_data: Dict[str, Any]) -> Dict[str, Any]:
         """Ensure cached reports match the API schema expectations."""
         normalized = dict(report_data)
@@ -1,5 +1,5 @@
 # jupiter/core/callgraph.py
-# Version: 1.0.0
+# Version: 1.2.0
 """
 Global call graph builder for Jupiter.
 
@@ -7,6 +7,9 @@ This module builds a complete call graph across the entire project by:
 1. Collecting ALL function definitions from ALL files
 2. Collecting ALL function calls/references from ALL files
 3. Resolving which functions are actually used (directly or indirectly)
+4. Merging the calls and caller -> callee edges observed at runtime (the
+   tracer's ``path.py::qualname`` keys) into the static graph, so functions
+   only reached through dynamic dispatch count as used
 
 Unlike per-file analysis, this approach can detect:
 - Cross-file calls
@@ -23,7 +26,10 @@ import ast
 import logging
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Set, List, Optional, Any, Tuple
+from typing import Dict, Set, List, Optional, Any, Tuple, Iterable
+
+from jupiter.core.cache import CacheManager
+from jupiter.core.modules import ModuleTable
 
 logger = logging.getLogger(__name__)
 
@@ -98,6 +104,7 @@ class FunctionInfo:
     is_visitor_method: bool = False  # visit_*, depart_*, etc.
     is_abstract: bool = False  # Has @abstractmethod
     is_interface_impl: bool = False  # Implements an abstract method
+    module: Optional[str] = None  # Dotted module name from the module table
     
     @property
     def full_name(self) -> str:
@@ -106,6 +113,14 @@ class FunctionInfo:
             return f"{self.file_path}::{self.class_name}.{self.name}"
         return f"{self.file_path}::{self.name}"
     
+    @property
+    def qualname(self) -> str:
+        """Return the dotted qualified name: module.Class.method or module.function"""
+        owner = self.module or self.file_path
+        if self.class_name:
+            return f"{owner}.{self.class_name}.{self.name}"
+        return f"{owner}.{self.name}"
+    
     @property
     def simple_key(self) -> str:
         """Return simple key: file::func (without class name)"""
@@ -170,6 +185,129 @@ class CallGraphResult:
     entry_points: Set[str] = field(default_factory=set)
     # Debug: why each function is considered used
     usage_reasons: Dict[str, List[str]] = field(default_factory=dict)
+    # Runtime data merged by reconcile_dynamic(): function -> observed calls,
+    # caller -> callee -> observed calls (weighted edges)
+    runtime_calls: Dict[str, int] = field(default_factory=dict)
+    runtime_edges: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    # Functions called at runtime that static analysis alone found unused
+    runtime_only: Set[str] = field(default_factory=set)
+    # Dynamic keys without a static definition (<module>, lambdas, unscanned files)
+    unresolved_runtime_keys: Set[str] = field(default_factory=set)
+
+
+def static_key_for_qualname(dynamic_key: str) -> Optional[str]:
+    """Map a tracer key (``path.py::qualname``) to the ``FunctionInfo.full_name`` form.
+
+    The visitor names a function after its innermost enclosing class only,
+    so ``Outer.Inner.run`` -> ``Inner.run``, ``Worker.run.<locals>.step`` ->
+    ``Worker.step`` and ``outer.<locals>.inner`` -> ``inner``. Returns None
+    for code that is not a ``def`` (``<module>``, ``<lambda>``, ...).
+    """
+    file_path, sep, qualname = dynamic_key.partition("::")
+    if not sep or not qualname:
+        return None
+    parts = qualname.split(".")
+    name = parts[-1]
+    if name.startswith("<"):
+        return None
+    owner = None
+    for index, part in enumerate(parts[:-1]):
+        # A segment followed by <locals> is a function scope, any other one a class
+        if part != "<locals>" and parts[index + 1] != "<locals>":
+            owner = part
+    return f"{file_path}::{owner}.{name}" if owner else f"{file_path}::{name}"
+
+
+class DynamicKeyResolver:
+    """Resolve tracer keys to static function keys with dictionary lookups.
+
+    Order: exact ``full_name``, normalized qualname (see
+    ``static_key_for_qualname``), then - for keys without a dot, as written
+    by tracers older than the qualname keys or Python < 3.11 - every
+    function of that file with that name (``simple_key``).
+    """
+
+    def __init__(self, functions: Dict[str, FunctionInfo]):
+        self.functions = functions
+        self._by_simple: Dict[str, List[str]] = {}
+        for key, func in functions.items():
+            self._by_simple.setdefault(func.simple_key, []).append(key)
+        self._resolved: Dict[str, List[str]] = {}
+
+    def resolve(self, dynamic_key: str) -> List[str]:
+        cached = self._resolved.get(dynamic_key)
+        if cached is not None:
+            return cached
+        if dynamic_key in self.functions:
+            keys = [dynamic_key]
+        else:
+            normalized = static_key_for_qualname(dynamic_key)
+            if normalized in self.functions:
+                keys = [normalized]  # type: ignore[list-item]
+            elif "." not in dynamic_key.partition("::")[2]:
+                keys = self._by_simple.get(dynamic_key, [])
+            else:
+                keys = []
+        self._resolved[dynamic_key] = keys
+        return keys
+
+
+def reconcile_dynamic(result: CallGraphResult, dynamic: Optional[Dict[str, Any]]) -> Dict[str, int]:
+    """Merge runtime ``calls``/``call_graph`` data into ``result``.
+
+    Observed calls land in ``runtime_calls``, observed caller -> callee
+    pairs in ``runtime_edges`` (weighted by call count) and every function
+    seen at runtime is marked used (reason ``called_at_runtime``). Keys are
+    joined through a ``DynamicKeyResolver`` index, so the merge is linear in
+    the size of the dynamic data.
+
+    Returns:
+        Counts: ``resolved_keys``, ``unresolved_keys``, ``runtime_edges``,
+        ``runtime_only``.
+    """
+    if not isinstance(dynamic, dict):
+        return {"resolved_keys": 0, "unresolved_keys": 0, "runtime_edges": 0, "runtime_only": 0}
+    calls = dynamic.get("calls") if isinstance(dynamic.get("calls"), dict) else {}
+    graph = dynamic.get("call_graph") if isinstance(dynamic.get("call_graph"), dict) else {}
+    resolver = DynamicKeyResolver(result.all_functions)
+
+    resolved = 0
+    for dynamic_key, count in calls.items():
+        keys = resolver.resolve(dynamic_key)
+        if not keys:
+            result.unresolved_runtime_keys.add(dynamic_key)
+            continue
+        resolved += 1
+        for key in keys:
+            result.runtime_calls[key] = result.runtime_calls.get(key, 0) + int(count)
+
+    edges = 0
+    for caller, callees in graph.items():
+        caller_keys = resolver.resolve(caller)
+        if not caller_keys or not isinstance(callees, dict):
+            continue
+        for callee, count in callees.items():
+            for caller_key in caller_keys:
+                targets = result.runtime_edges.setdefault(caller_key, {})
+                for callee_key in resolver.resolve(callee):
+                    if callee_key not in targets:
+                        edges += 1
+                    targets[callee_key] = targets.get(callee_key, 0) + int(count)
+
+    for key, count in result.runtime_calls.items():
+        if count <= 0:
+            continue
+        if key not in result.used_functions:
+            result.runtime_only.add(key)
+            result.used_functions.add(key)
+        result.usage_reasons.setdefault(key, []).append(f"called_at_runtime:{count}")
+
+    return {
+        "resolved_keys": resolved,
+        "unresolved_keys": len(result.unresolved_runtime_keys),
+        "runtime_edges": edges,
+        "runtime_only": len(result.runtime_only),
+    }
 
 
 class CallGraphVisitor(ast.NodeVisitor):
@@ -368,15 +506,18 @@ class CallGraphBuilder:
             print(f"Unused: {info.full_name} at line {info.line_number}")
     """
     
-    def __init__(self, root: Path):
+    def __init__(self, root: Path, source_roots: Iterable[str] = ()):
         self.root = Path(root).resolve()
+        self.source_roots = list(source_roots)
     
-    def build(self, python_files: List[Path]) -> CallGraphResult:
+    def build(self, python_files: List[Path], dynamic: Optional[Dict[str, Any]] = None) -> CallGraphResult:
         """
         Build call graph from Python files.
         
         Args:
             python_files: List of Python file paths to analyze
+            dynamic: Optional runtime data (``calls``/``call_graph`` of the
+                last scan's ``dynamic`` section) merged before unused detection
             
         Returns:
             CallGraphResult with all functions and usage information
@@ -390,6 +531,9 @@ class CallGraphBuilder:
             except Exception as e:
                 logger.warning(f"Failed to analyze {file_path}: {e}")
         
+        # Phase 1b: Module names (shared module table)
+        self._resolve_modules(python_files, result)
+        
         # Phase 2: Identify interface implementations
         self._identify_interface_implementations(result)
         
@@ -399,6 +543,10 @@ class CallGraphBuilder:
         # Phase 4: Propagate usage from entry points
         self._propagate_usage(result)
         
+        # Phase 4b: Merge what was observed at runtime
+        if dynamic:
+            reconcile_dynamic(result, dynamic)
+        
         # Phase 5: Identify unused functions
         self._identify_unused(result)
         
@@ -441,6 +589,19 @@ class CallGraphBuilder:
         # Add references
         result.all_references.extend(visitor.references)
     
+    def _resolve_modules(self, python_files: List[Path], result: CallGraphResult):
+        """Attach module names to functions."""
+        rel_paths = []
+        for file_path in python_files:
+            try:
+                rel_paths.append(Path(file_path).resolve().relative_to(self.root).as_posix())
+            except ValueError:
+                rel_paths.append(Path(file_path).as_posix())
+        table = ModuleTable(rel_paths, source_roots=self.source_roots)
+        
+        for func in result.all_functions.values():
+            func.module = table.module_name(func.file_path)
+    
     def _identify_entry_points(self, result: CallGraphResult):
         """
         Identify all entry points in the project.
@@ -526,19 +687,26 @@ class CallGraphBuilder:
                 result.unused_functions.add(key)
 
 
-def build_call_graph(root: Path, python_files: List[Path]) -> CallGraphResult:
+def build_call_graph(
+    root: Path,
+    python_files: List[Path],
+    source_roots: Iterable[str] = (),
+    dynamic: Optional[Dict[str, Any]] = None,
+) -> CallGraphResult:
     """
     Convenience function to build a call graph.
     
     Args:
         root: Project root path
         python_files: List of Python files to analyze
+        source_roots: Extra import roots used to name modules (e.g. ``src``)
+        dynamic: Optional runtime data merged with ``reconcile_dynamic``
         
     Returns:
         CallGraphResult with usage information
     """
-    builder = CallGraphBuilder(root)
-    return builder.build(python_files)
+    builder = CallGraphBuilder(root, source_roots=source_roots)
+    return builder.build(python_files, dynamic=dynamic)
 
 
 # =============================================================================
@@ -571,8 +739,10 @@ class CallGraphService:
         result = service.analyze()
     """
     
-    def __init__(self, root: Path):
+    def __init__(self, root: Path, source_roots: Iterable[str] = (), use_dynamic: bool = True):
         self.root = Path(root).resolve()
+        self.source_roots = list(source_roots)
+        self.use_dynamic = use_dynamic
         self._result: Optional[CallGraphResult] = None
         self._last_analysis_time: float = 0
     
@@ -601,9 +771,16 @@ class CallGraphService:
             and "venv" not in f.parts
         ]
         
+        # Runtime data of the cached scan (jupiter run --with-dynamic)
+        dynamic = None
+        if self.use_dynamic:
+            last_scan = CacheManager(self.root).load_last_scan() or {}
+            if isinstance(last_scan.get("dynamic"), dict):
+                dynamic = last_scan["dynamic"]
+        
         import time
         start = time.time()
-        self._result = build_call_graph(self.root, python_files)
+        self._result = build_call_graph(self.root, python_files, self.source_roots, dynamic=dynamic)
         self._last_analysis_time = time.time() - start
         
         logger.info(
@@ -724,6 +901,10 @@ class CallGraphService:
                 if result.all_functions else 0
             ),
             "analysis_time_seconds": self._last_analysis_time,
+            "runtime_functions": len(result.runtime_calls),
+            "runtime_only_functions": len(result.runtime_only),
+            "runtime_edges": sum(len(callees) for callees in result.runtime_edges.values()),
+            "unresolved_runtime_keys": len(result.unresolved_runtime_keys),
         }
     
     def invalidate_cache(self):
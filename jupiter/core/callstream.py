@@ -0,0 +1,242 @@
+"""Live function-call channel between traced processes and the Jupiter server.
+
+While the watch panel tracks calls, the server listens on a local socket
+(a Unix domain socket in ``.jupiter/ipc/`` or, where those are unavailable,
+a loopback TCP port) and writes an endpoint descriptor to
+``.jupiter/ipc/calls.json``. Every traced process of the project looks for
+that descriptor and pushes its aggregated call-count deltas every few
+hundred milliseconds, so the panel updates while long runs are still going.
+
+Wire format: newline-delimited JSON, ``{"type": "hello", "token": ..., "pid": ...}``
+first, then ``{"type": "calls", "calls": {"path.py::func": n}}`` deltas and
+a final ``{"type": "bye"}``.
+
+The client side (``CallPublisher``) only uses the standard library because
+it runs inside the traced process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import secrets
+import socket
+import threading
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DISABLE_ENV = "JUPITER_CALL_STREAM"
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+
+def ipc_dir(root: Path) -> Path:
+    return Path(root) / ".jupiter" / "ipc"
+
+
+def endpoint_file(root: Path) -> Path:
+    """Descriptor written by the server while the channel is open."""
+    return ipc_dir(root) / "calls.json"
+
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class CallStreamServer:
+    """Server end: receives call deltas and hands them to ``on_calls``."""
+
+    def __init__(self, root: Path, on_calls: Callable[[Dict[str, int]], Awaitable[None]]):
+        self.root = Path(root)
+        self.on_calls = on_calls
+        self.token = secrets.token_hex(16)
+        self.descriptor: Optional[Dict[str, Any]] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._socket_path: Optional[Path] = None
+        self.clients = 0
+
+    @property
+    def running(self) -> bool:
+        return self._server is not None
+
+    async def start(self) -> Dict[str, Any]:
+        directory = ipc_dir(self.root)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        descriptor: Dict[str, Any] = {"token": self.token, "pid": os.getpid()}
+        if hasattr(socket, "AF_UNIX") and os.name != "nt":
+            path = directory / "calls.sock"
+            if path.exists():
+                path.unlink()
+            try:
+                self._server = await asyncio.start_unix_server(self._handle, path=str(path), limit=MAX_MESSAGE_BYTES)
+                self._socket_path = path
+                descriptor.update({"transport": "unix", "path": str(path)})
+            except OSError as exc:  # e.g. path longer than sun_path
+                logger.debug("Unix socket unavailable (%s), using loopback TCP", exc)
+        if self._server is None:
+            self._server = await asyncio.start_server(self._handle, host="127.0.0.1", port=0, limit=MAX_MESSAGE_BYTES)
+            port = self._server.sockets[0].getsockname()[1]
+            descriptor.update({"transport": "tcp", "host": "127.0.0.1", "port": port})
+
+        target = endpoint_file(self.root)
+        tmp = target.with_suffix(".tmp")
+        tmp.write_text(json.dumps(descriptor), encoding="utf-8")
+        try:
+            os.chmod(tmp, 0o600)
+        except OSError:
+            pass
+        os.replace(tmp, target)
+        self.descriptor = descriptor
+        logger.info("Call stream listening (%s) for %s", descriptor["transport"], self.root)
+        return descriptor
+
+    async def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.close()
+        try:
+            await asyncio.wait_for(self._server.wait_closed(), timeout=2)
+        except asyncio.TimeoutError:
+            pass
+        self._server = None
+        for path in (endpoint_file(self.root), self._socket_path):
+            if path is not None:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+        self.descriptor = None
+        logger.info("Call stream closed for %s", self.root)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.clients += 1
+        try:
+            hello = await self._read(reader)
+            if not hello or hello.get("type") != "hello" or hello.get("token") != self.token:
+                logger.warning("Rejected call stream client (bad handshake)")
+                return
+            logger.debug("Call stream client connected (pid=%s)", hello.get("pid"))
+            while True:
+                message = await self._read(reader)
+                if message is None or message.get("type") == "bye":
+                    break
+                calls = message.get("calls")
+                if message.get("type") == "calls" and isinstance(calls, dict) and calls:
+                    try:
+                        await self.on_calls(calls)
+                    except Exception as exc:  # pragma: no cover - defensive logging
+                        logger.warning("Call stream handler failed: %s", exc)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError) as exc:
+            logger.debug("Call stream client dropped: %s", exc)
+        finally:
+            self.clients -= 1
+            writer.close()
+
+    @staticmethod
+    async def _read(reader: asyncio.StreamReader) -> Optional[Dict[str, Any]]:
+        line = await reader.readline()
+        if not line:
+            return None
+        message = json.loads(line)
+        return message if isinstance(message, dict) else None
+
+
+class CallPublisher:
+    """Client end, used by the tracer: coalesces call deltas and sends them.
+
+    ``push()`` only merges into a pending dictionary; a background thread
+    sends it every ``interval`` seconds. The descriptor is re-checked while
+    disconnected, so a watch started mid-run is picked up. Send errors drop
+    the connection silently: tracing never fails because of the channel.
+    """
+
+    def __init__(self, root: str, interval: float = 0.25):
+        self.root = Path(root)
+        self.interval = interval
+        self._pending: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._sock: Optional[socket.socket] = None
+        self._descriptor_mtime: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.sent = 0
+
+    def start(self) -> "CallPublisher":
+        self._thread = threading.Thread(target=self._run, name="jupiter-call-stream", daemon=True)
+        self._thread.start()
+        return self
+
+    def push(self, delta: Dict[str, Any]) -> None:
+        calls = delta.get("calls")
+        if not calls:
+            return
+        with self._lock:
+            pending = self._pending
+            for key, count in calls.items():
+                pending[key] = pending.get(key, 0) + count
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        self._send_pending()
+        if self._sock is not None:
+            self._send({"type": "bye"})
+            self._disconnect()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._send_pending()
+
+    def _send_pending(self) -> None:
+        connected = self._sock is not None or self._connect()
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        # Live channel: calls made while nobody listens are not replayed
+        if connected and pending and self._send({"type": "calls", "calls": pending}):
+            self.sent += 1
+
+    def _connect(self) -> bool:
+        path = endpoint_file(self.root)
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            return False
+        if mtime == self._descriptor_mtime:
+            return False  # Already failed with this descriptor
+        self._descriptor_mtime = mtime
+        try:
+            descriptor = json.loads(path.read_text(encoding="utf-8"))
+            if descriptor.get("transport") == "unix":
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.settimeout(1.0)
+                sock.connect(descriptor["path"])
+            else:
+                sock = socket.create_connection((descriptor["host"], descriptor["port"]), timeout=1.0)
+            self._sock = sock
+        except (OSError, ValueError, KeyError):
+            return False
+        return self._send({"type": "hello", "token": descriptor.get("token"), "pid": os.getpid()})
+
+    def _send(self, message: Dict[str, Any]) -> bool:
+        if self._sock is None:
+            return False
+        try:
+            self._sock.sendall(_encode(message))
+            return True
+        except OSError:
+            self._disconnect()
+            return False
+
+    def _disconnect(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
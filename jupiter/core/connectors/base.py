@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
 class BaseConnector(ABC):
     """Abstract base class for project backends."""
@@ -10,13 +10,32 @@ class BaseConnector(ABC):
         pass
 
     @abstractmethod
-    async def run_command(self, command: list[str], with_dynamic: bool = False, cwd: Optional[str] = None) -> Dict[str, Any]:
+    async def run_command(
+        self,
+        command: list[str],
+        with_dynamic: bool = False,
+        cwd: Optional[str] = None,
+        dynamic_mode: str = "trace",
+        sample_rate: Optional[float] = None,
+        on_dynamic: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        on_output: Optional[Callable[[str, str], Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
         """Run a command in the project context.
         
         Args:
             command: The command to execute as a list of strings.
             with_dynamic: Enable dynamic analysis (tracing) for this run.
             cwd: Optional working directory. If None, uses project root.
+            dynamic_mode: "trace" (every call) or "sample" (statistical sampling).
+            sample_rate: Samples per second in "sample" mode.
+            on_dynamic: Optional callback (sync or async) receiving partial
+                dynamic-data deltas while the command runs. Connectors that
+                cannot stream ignore it and only return the final data.
+            on_output: Optional callback (sync or async) receiving
+                ``(stream, line)`` for each stdout/stderr line as it is
+                produced. Same fallback as ``on_dynamic``.
+            timeout: Seconds before the command is stopped.
         """
         pass
 
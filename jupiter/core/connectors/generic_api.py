@@ -1,4 +1,4 @@
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 from jupiter.core.connectors.base import BaseConnector
 from jupiter.core.connectors.project_api import OpenApiConnector
 
@@ -52,7 +52,17 @@ class GenericApiConnector(BaseConnector):
             }
         }
 
-    async def run_command(self, command: list[str], with_dynamic: bool = False, cwd: Optional[str] = None) -> Dict[str, Any]:
+    async def run_command(
+        self,
+        command: list[str],
+        with_dynamic: bool = False,
+        cwd: Optional[str] = None,
+        dynamic_mode: str = "trace",
+        sample_rate: Optional[float] = None,
+        on_dynamic: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        on_output: Optional[Callable[[str, str], Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
         return {
             "stdout": "",
             "stderr": "Running commands is not supported on generic API projects.",
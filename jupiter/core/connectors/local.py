@@ -4,9 +4,10 @@ from typing import Any, Dict, Optional, Callable
 from pathlib import Path
 from jupiter.core.connectors.base import BaseConnector
 from jupiter.core.scanner import ProjectScanner
-from jupiter.core.runner import run_command
+from jupiter.core.runner import run_command_async
 from jupiter.core.cache import CacheManager
 from jupiter.core.analyzer import ProjectAnalyzer
+from jupiter.core.analyze_cache import analyze_cache, project_fingerprint
 from jupiter.config.config import ProjectApiConfig
 from jupiter.core.connectors.project_api import OpenApiConnector
 
@@ -130,27 +131,47 @@ class LocalConnector(BaseConnector):
             ignore_hidden=not options.get("show_hidden", False),
             ignore_globs=options.get("ignore_globs"),
         )
+        # Unchanged files and options: reuse the previous summary without parsing
+        paths = scanner.iter_paths()
+        fingerprint = project_fingerprint(self.root_path, paths, options)
+        cached = analyze_cache.get(self.root_path, fingerprint)
+        if cached is not None:
+            return cached
         analyzer = ProjectAnalyzer(root=self.root_path)
-        summary = analyzer.summarize(scanner.iter_files(), top_n=options.get("top", 5))
-        return summary.to_dict()
+        summary = analyzer.summarize(scanner.iter_files(paths), top_n=options.get("top", 5)).to_dict()
+        analyze_cache.put(self.root_path, fingerprint, summary)
+        return summary
 
-    async def run_command(self, command: list[str], with_dynamic: bool = False, cwd: Optional[str] = None) -> Dict[str, Any]:
+    async def run_command(
+        self,
+        command: list[str],
+        with_dynamic: bool = False,
+        cwd: Optional[str] = None,
+        dynamic_mode: str = "trace",
+        sample_rate: Optional[float] = None,
+        on_dynamic: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        on_output: Optional[Callable[[str, str], Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
         # Determine working directory
         working_dir = Path(cwd) if cwd else self.root_path
         if not working_dir.is_absolute():
             working_dir = self.root_path / working_dir
         
-        loop = asyncio.get_running_loop()
-        result = await loop.run_in_executor(
-            None, 
-            run_command, 
-            command, 
-            working_dir, 
-            with_dynamic
+        result = await run_command_async(
+            command,
+            working_dir,
+            with_dynamic,
+            dynamic_mode=dynamic_mode,
+            sample_rate=sample_rate,
+            on_dynamic=on_dynamic,
+            on_output=on_output,
+            timeout=timeout,
         )
         
         if result.dynamic_data:
             # Merge into cache
+            loop = asyncio.get_running_loop()
             await loop.run_in_executor(None, self._merge_dynamic_data, result.dynamic_data)
             
         return result.dict()
@@ -1,6 +1,6 @@
 import httpx
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 from jupiter.core.connectors.base import BaseConnector
 
 logger = logging.getLogger(__name__)
@@ -45,14 +45,31 @@ class RemoteConnector(BaseConnector):
 
         return await self._request_json("GET", "analyze", params=params, timeout=60.0)
 
-    async def run_command(self, command: list[str], with_dynamic: bool = False, cwd: Optional[str] = None) -> Dict[str, Any]:
+    async def run_command(
+        self,
+        command: list[str],
+        with_dynamic: bool = False,
+        cwd: Optional[str] = None,
+        dynamic_mode: str = "trace",
+        sample_rate: Optional[float] = None,
+        on_dynamic: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        on_output: Optional[Callable[[str, str], Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
         payload = {
             "command": command,
-            "with_dynamic": with_dynamic
+            "with_dynamic": with_dynamic,
+            "dynamic_mode": dynamic_mode,
         }
+        if sample_rate:
+            payload["sample_rate"] = sample_rate
         if cwd:
             payload["cwd"] = cwd
-        data = await self._request_json("POST", "run", json=payload, timeout=300.0)  # 5 minutes for run
+        if timeout:
+            payload["timeout"] = timeout
+        # The remote server enforces the command timeout; leave it room to answer
+        request_timeout = timeout + 30.0 if timeout else 300.0  # 5 minutes for run
+        data = await self._request_json("POST", "run", json=payload, timeout=request_timeout)
         # Map API response to what LocalConnector returns (which is basically the same structure)
         return {
             "stdout": data.get("stdout", ""),
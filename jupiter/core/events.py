@@ -20,6 +20,7 @@ SCAN_STARTED = "SCAN_STARTED"
 SCAN_FINISHED = "SCAN_FINISHED"
 RUN_STARTED = "RUN_STARTED"
 RUN_FINISHED = "RUN_FINISHED"
+RUN_OUTPUT = "RUN_OUTPUT"  # Batched stdout/stderr lines of a running command
 SNAPSHOT_CREATED = "SNAPSHOT_CREATED"
 CONFIG_UPDATED = "CONFIG_UPDATED"
 PLUGIN_TOGGLED = "PLUGIN_TOGGLED"
@@ -19,6 +19,8 @@ from typing import Any, Dict, List, Set, Optional
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
+from jupiter.core.modules import ModuleTable
+
 @dataclass
 class GraphNode:
     id: str
@@ -56,20 +58,12 @@ class GraphBuilder:
         self.nodes: Dict[str, GraphNode] = {}
         self.links: List[GraphEdge] = []
         
-        # Optimization: Build a lookup map for faster import resolution
-        # Map: "path/to/file.py" -> "full/path/to/file.py"
-        # We normalize to forward slashes and remove extensions for fuzzy matching if needed
+        # Import resolution goes through the shared module table (dictionary lookups)
         self.file_map: Dict[str, str] = {}
-        self.filename_index: Dict[str, List[str]] = {} # filename -> list of full paths
-        
         for f in self.files:
             path = f["path"].replace("\\", "/")
             self.file_map[path] = path
-            
-            filename = path.split("/")[-1]
-            if filename not in self.filename_index:
-                self.filename_index[filename] = []
-            self.filename_index[filename].append(path)
+        self.modules = ModuleTable(self.file_map)
 
     def build(self) -> DependencyGraph:
         # Auto-simplify if too many files
@@ -136,7 +130,7 @@ class GraphBuilder:
             imports = lang_analysis.get("imports", [])
             
             for imp in imports:
-                target_path = self._resolve_import_path(imp)
+                target_path = self._resolve_import_path(imp, source_path)
                 if target_path and target_path in file_to_dir:
                     target_dir = file_to_dir[target_path]
                     if source_dir != target_dir:
@@ -176,7 +170,7 @@ class GraphBuilder:
         imports = lang_analysis.get("imports", [])
         for imp in imports:
             # Heuristic: try to find if import matches another file in the project
-            target_path = self._resolve_import_path(imp)
+            target_path = self._resolve_import_path(imp, path)
             if target_path and target_path in self.file_map:
                 # In detailed mode, target is the file ID (path)
                 # We store the link with resolved target; validation happens in build()
@@ -203,23 +197,7 @@ class GraphBuilder:
                 type="contains"
             ))
 
-    def _resolve_import_path(self, import_name: str) -> Optional[str]:
-        # Optimized resolution using lookup map
-        # e.g. "jupiter.core.scanner" -> "jupiter/core/scanner.py"
-        
-        path_suffix = import_name.replace(".", "/") + ".py"
-        
-        # 1. Exact match (relative to root)
-        if path_suffix in self.file_map:
-            return self.file_map[path_suffix]
-
-        # 2. Suffix match using filename index
-        # Extract the filename from the import suffix
-        target_filename = path_suffix.split("/")[-1]
-        
-        candidates = self.filename_index.get(target_filename, [])
-        for path in candidates:
-            if path.endswith(path_suffix):
-                return path
-                
-        return None
+    def _resolve_import_path(self, import_name: str, importer: Optional[str] = None) -> Optional[str]:
+        # e.g. "jupiter.core.scanner" -> "jupiter/core/scanner.py"; relative
+        # imports ("..core") are resolved against the importing file.
+        return self.modules.resolve(import_name, importer)
@@ -152,6 +152,9 @@ class HistoryManager:
         snapshots.sort(key=lambda meta: meta.timestamp, reverse=True)
         return snapshots
 
+    def has_snapshot(self, snapshot_id: str) -> bool:
+        return (self.snapshots_dir / f"{snapshot_id}.json").is_file()
+
     def get_snapshot(self, snapshot_id: str) -> Optional[Dict[str, Any]]:
         filename = self.snapshots_dir / f"{snapshot_id}.json"
         if not filename.exists():
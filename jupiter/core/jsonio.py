@@ -0,0 +1,55 @@
+"""Fast JSON encoding for large reports.
+
+Scan reports for big projects hold tens of thousands of file entries, so
+they are encoded once to compact UTF-8 bytes and those bytes are reused
+for the cache file and the HTTP responses. ``orjson`` is used when it is
+installed (optional dependency); otherwise the standard ``json`` module
+produces the same bytes, only slower.
+"""
+
+from __future__ import annotations
+
+import json
+from enum import Enum
+from pathlib import PurePath
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
+# orjson: allow int/float dict keys (plugins produce some), like json.dumps does
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+
+def fast_json_available() -> bool:
+    """True if ``orjson`` is installed."""
+    return orjson is not None
+
+
+def _default(value: Any) -> Any:
+    """Encode the few non-JSON types found in plugin output."""
+    if isinstance(value, PurePath):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    if isinstance(value, Enum):
+        return value.value
+    if hasattr(value, "model_dump"):  # pydantic models
+        return value.model_dump()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(data: Any) -> bytes:
+    """Encode ``data`` as compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=_ORJSON_OPTIONS)
+    return json.dumps(data, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON bytes or text."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
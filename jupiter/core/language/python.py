@@ -1,5 +1,5 @@
 # jupiter/core/language/python.py
-# Version: 1.3.0
+# Version: 1.4.0
 """
 Python source code analyzer for Jupiter.
 
@@ -135,7 +135,7 @@ KNOWN_USED_PATTERNS = frozenset({
     "load_last_root", "save_last_root", "load_default_project_root",
     # Watch methods
     "broadcast_file_change", "broadcast_log_message", "record_function_calls",
-    "get_watch_state", "set_main_loop", "create_scan_progress_callback",
+    "get_watch_state", "create_scan_progress_callback",
     # Quality methods
     "estimate_complexity", "estimate_js_complexity", "find_duplications",
     # Updater
@@ -254,11 +254,19 @@ class PythonCodeAnalyzer(ast.NodeVisitor):
         self.generic_visit(node)
 
     def visit_ImportFrom(self, node: ast.ImportFrom):
-        # Store the MODULE path, not the full path with symbol
-        # E.g., "from jupiter.config import load_config" -> store "jupiter.config"
-        # This allows the graph builder to resolve module paths to file paths correctly
-        if node.module:
-            self.imports.add(node.module)
+        # Store "module.name" for every imported name, absolute or relative:
+        # "from jupiter.config import load_config" -> "jupiter.config.load_config",
+        # "from . import utils" -> ".utils". The name may be a submodule or a
+        # member; the module table resolves the longest prefix that is a file.
+        # Relative imports keep their leading dots so they resolve against the importer.
+        base = "." * (node.level or 0) + (node.module or "")
+        for alias in node.names:
+            if alias.name == "*":
+                self.imports.add(base)
+            elif base.endswith("."):
+                self.imports.add(base + alias.name)
+            else:
+                self.imports.add(f"{base}.{alias.name}")
         self.generic_visit(node)
 
     def visit_FunctionDef(self, node: ast.FunctionDef):
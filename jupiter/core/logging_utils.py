@@ -1,11 +1,12 @@
 """Utilities for configuring Jupiter logging consistently.
 
-Version: 1.1.0
+Version: 1.2.0
 """
 
 from __future__ import annotations
 
 import logging
+import re
 from datetime import datetime
 from pathlib import Path
 from typing import Iterable, Optional
@@ -31,6 +32,22 @@ LOG_RESTART_SEPARATOR = """
 """
 
 
+# ``token`` query parameter (SSE routes, see ``verify_stream_token``)
+_QUERY_TOKEN = re.compile(r"([?&]token=)[^&\s]*")
+
+
+class QueryTokenFilter(logging.Filter):
+    """Redact ``token=`` query parameters from uvicorn access log lines."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if isinstance(record.args, tuple):
+            record.args = tuple(
+                _QUERY_TOKEN.sub(r"\1***", arg) if isinstance(arg, str) and "token=" in arg else arg
+                for arg in record.args
+            )
+        return True
+
+
 def normalize_log_level(level_name: str | None) -> str:
     """Return a normalized logging level name (defaults to INFO)."""
     if not level_name:
@@ -105,6 +122,9 @@ def configure_logging(
     # Keep server logs aligned (uvicorn + FastAPI)
     for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
         logging.getLogger(name).setLevel(numeric_level)
+    access_logger = logging.getLogger("uvicorn.access")
+    if not any(isinstance(f, QueryTokenFilter) for f in access_logger.filters):
+        access_logger.addFilter(QueryTokenFilter())
 
     for name in extra_loggers or []:
         logging.getLogger(name).setLevel(numeric_level)
@@ -0,0 +1,253 @@
+"""Module-resolution table shared by the Live Map, the simulator and the call graph.
+
+The table is built once per scan from the scanned file paths and maps dotted
+module names to files, so resolving an import is a dictionary lookup instead
+of a suffix search over every file. Relative imports (``.utils``,
+``..core.x``) are resolved against the importing file; JS/TS specifiers
+(``./utils``) are resolved against the importer's directory.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PY_EXTENSIONS = (".py", ".pyi")
+JS_EXTENSIONS = (".js", ".ts", ".jsx", ".tsx", ".mjs", ".cjs")
+JS_INDEX_FILES = tuple(f"/index{ext}" for ext in (".js", ".ts", ".jsx", ".tsx"))
+
+_DRIVE_RE = re.compile(r"^[A-Za-z]:/")
+
+
+def normalize_path(path: str) -> str:
+    """Use forward slashes and drop a leading ``./``."""
+    path = path.replace("\\", "/")
+    while path.startswith("./"):
+        path = path[2:]
+    return path
+
+
+def _is_absolute(path: str) -> bool:
+    return path.startswith("/") or bool(_DRIVE_RE.match(path))
+
+
+def _relative_to(path: str, base: str) -> Optional[str]:
+    base = base.rstrip("/")
+    if not base or base == ".":
+        return path
+    if path.startswith(base + "/"):
+        return path[len(base) + 1:]
+    return None
+
+
+def _module_from_relative(rel_path: str) -> Optional[str]:
+    """``pkg/sub/mod.py`` -> ``pkg.sub.mod``; ``pkg/__init__.py`` -> ``pkg``."""
+    for ext in PY_EXTENSIONS:
+        if rel_path.endswith(ext):
+            stem = rel_path[: -len(ext)]
+            break
+    else:
+        return None
+    parts = [p for p in stem.split("/") if p]
+    if parts and parts[-1] == "__init__":
+        parts.pop()
+    if not parts or not all(p.isidentifier() for p in parts):
+        return None
+    return ".".join(parts)
+
+
+class ModuleTable:
+    """Dotted module name -> file path, built once per scan.
+
+    Every Python file gets a canonical module name, taken from the first
+    of: a configured source root containing it, its package chain (the
+    parent directories that contain an ``__init__.py``), or its path
+    relative to the project root. The other names are registered as
+    aliases so ``src/pkg/mod.py`` answers to both ``pkg.mod`` and
+    ``src.pkg.mod``; on conflicts the first registration wins.
+
+    File paths are returned exactly as given (after ``\\`` -> ``/``
+    normalization), so callers can keep using them as keys.
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[str],
+        root: Optional[str] = None,
+        source_roots: Iterable[str] = (),
+    ):
+        self.paths: List[str] = sorted({normalize_path(p) for p in paths})
+        self._path_set = set(self.paths)
+        self.root = normalize_path(root).rstrip("/") if root else self._infer_root()
+        self.source_roots = [normalize_path(r).rstrip("/") for r in source_roots]
+
+        self.modules: Dict[str, str] = {}  # dotted name -> path
+        self.names: Dict[str, str] = {}  # path -> canonical dotted name
+        self._packages = {
+            p.rsplit("/", 1)[0] for p in self.paths
+            if p.rsplit("/", 1)[-1] == "__init__.py" and "/" in p
+        }
+        self._cache: Dict[Tuple[str, Optional[str], bool], Optional[str]] = {}
+
+        for path in self.paths:
+            candidates = self._candidate_names(path)
+            if not candidates:
+                continue
+            self.names[path] = candidates[0]
+            for name in candidates:
+                self.modules.setdefault(name, path)
+
+        logger.debug(
+            "Module table built: %d files, %d module names (root=%s, source_roots=%s)",
+            len(self.paths), len(self.modules), self.root, self.source_roots,
+        )
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Names
+    # ─────────────────────────────────────────────────────────────────────
+
+    def module_name(self, path: str) -> Optional[str]:
+        """Canonical dotted name of ``path`` (also for files not in the table)."""
+        path = normalize_path(path)
+        if path in self.names:
+            return self.names[path]
+        candidates = self._candidate_names(path)
+        return candidates[0] if candidates else None
+
+    def _candidate_names(self, path: str) -> List[str]:
+        names: List[str] = []
+
+        def add(rel: Optional[str]) -> None:
+            name = _module_from_relative(rel) if rel is not None else None
+            if name and name not in names:
+                names.append(name)
+
+        rel_path = self._root_relative(path)
+        for source_root in self.source_roots:
+            if _is_absolute(source_root):
+                add(_relative_to(path, source_root))
+            elif rel_path is not None:
+                add(_relative_to(rel_path, source_root))
+        add(self._package_relative(path))
+        add(rel_path)
+        return names
+
+    def _root_relative(self, path: str) -> Optional[str]:
+        if not _is_absolute(path):
+            return path
+        return _relative_to(path, self.root) if self.root else None
+
+    def _package_relative(self, path: str) -> Optional[str]:
+        """Path relative to the top of its ``__init__.py`` package chain."""
+        directory = path.rpartition("/")[0]
+        if directory not in self._packages:
+            return None
+        top = directory
+        while top in self._packages:
+            top = top.rpartition("/")[0]
+        return path[len(top) + 1:] if top else path
+
+    def _infer_root(self) -> Optional[str]:
+        absolute = [p for p in self.paths if _is_absolute(p)]
+        if not absolute:
+            return None
+        prefix = absolute[0].rsplit("/", 1)[0]
+        for path in absolute[1:]:
+            while prefix and not path.startswith(prefix + "/"):
+                prefix = prefix.rpartition("/")[0]
+        return prefix or None
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Resolution
+    # ─────────────────────────────────────────────────────────────────────
+
+    def absolute_module(self, import_name: str, importer: Optional[str] = None) -> Optional[str]:
+        """Turn a (possibly relative) Python import into an absolute dotted name."""
+        if not import_name.startswith("."):
+            return import_name
+        if importer is None:
+            return None
+        importer_name = self.module_name(importer)
+        if importer_name is None:
+            return None
+
+        level = len(import_name) - len(import_name.lstrip("."))
+        rest = import_name[level:]
+        package = importer_name.split(".")
+        if normalize_path(importer).rpartition("/")[2] != "__init__.py":
+            package = package[:-1]
+        if level - 1 >= len(package):
+            return None
+        package = package[: len(package) - (level - 1)]
+        return ".".join(package + ([rest] if rest else [])) or None
+
+    def resolve(self, import_name: str, importer: Optional[str] = None) -> Optional[str]:
+        """Resolve an import to a file path of the table (or None if external).
+
+        Python imports resolve to the longest module prefix present in the
+        table (``pkg.mod.Class`` -> ``pkg/mod.py``), so ``from pkg import
+        name`` style entries land on the package's ``__init__.py``.
+        """
+        if not import_name:
+            return None
+        relative = import_name.startswith(".")
+        from_python = bool(importer) and importer.endswith(PY_EXTENSIONS)
+        key = (import_name, normalize_path(importer) if relative and importer else None, from_python)
+        if key in self._cache:
+            return self._cache[key]
+
+        specifier = import_name.replace("\\", "/")
+        if "/" in specifier:
+            result = self._resolve_js(specifier, importer)
+        elif relative and importer and not from_python:
+            result = self._resolve_js(import_name, importer)
+        else:
+            result = self._resolve_python(import_name, importer)
+            # A Python import never lands on a JS file (``import os`` vs ``os.js``)
+            if result is None and not relative and not from_python:
+                result = self._resolve_js(import_name, importer)
+
+        self._cache[key] = result
+        return result
+
+    def _resolve_python(self, import_name: str, importer: Optional[str]) -> Optional[str]:
+        module = self.absolute_module(import_name, importer)
+        while module:
+            path = self.modules.get(module)
+            if path is not None:
+                return path
+            module = module.rpartition(".")[0]
+        return None
+
+    def _resolve_js(self, specifier: str, importer: Optional[str]) -> Optional[str]:
+        if specifier.startswith("."):
+            if importer is None:
+                return None
+            base = normalize_path(importer).rpartition("/")[0]
+            parts = base.split("/") if base else []
+            for segment in specifier.split("/"):
+                if segment in ("", "."):
+                    continue
+                if segment == "..":
+                    if not parts:
+                        return None
+                    parts.pop()
+                else:
+                    parts.append(segment)
+            candidates = ["/".join(parts)]
+        else:
+            candidate = specifier.lstrip("/")
+            candidates = [candidate]
+            if self.root:
+                candidates.append(f"{self.root}/{candidate}")
+
+        for candidate in candidates:
+            if candidate in self._path_set:
+                return candidate
+            for suffix in JS_EXTENSIONS + JS_INDEX_FILES:
+                if candidate + suffix in self._path_set:
+                    return candidate + suffix
+        return None
@@ -0,0 +1,295 @@
+"""Indexed, paginated access to the files of a scan report.
+
+A ``ReportStore`` is built once per report (the server keeps one for the
+cached last scan until ``last_scan.json`` changes) and answers page
+queries without copying or re-serializing the whole report:
+
+- sort orders (``path``, ``size_bytes``, ``modified_timestamp``,
+  ``file_type``, ``extension``, ``function_count``) are computed on first
+  use and kept;
+- files are indexed by path (cursor lookup) and by extension (filter);
+- the positions matching a filter are cached (small LRU), so following
+  ``next_cursor`` page after page is a bisect and a slice;
+- ``fields`` projects each returned file to the requested keys.
+
+Cursors are file paths: a page starts right after the file named by the
+cursor in the requested order.
+"""
+
+from __future__ import annotations
+
+import bisect
+import posixpath
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+# Keys of a report file entry, plus values derived from it
+FILE_FIELDS = ("path", "size_bytes", "modified_timestamp", "file_type", "language_analysis")
+DERIVED_FIELDS = ("extension", "function_count", "has_errors")
+SORT_KEYS = ("path", "size_bytes", "modified_timestamp", "file_type", "extension", "function_count")
+
+_QUERY_CACHE_SIZE = 16
+
+
+def _extension(path: str) -> str:
+    name = posixpath.basename(path.replace("\\", "/"))
+    return name.rsplit(".", 1)[1].lower() if "." in name.lstrip(".") else ""
+
+
+def _has_errors(entry: Dict[str, Any]) -> bool:
+    analysis = entry.get("language_analysis")
+    return isinstance(analysis, dict) and bool(analysis.get("error") or analysis.get("errors"))
+
+
+def _function_count(entry: Dict[str, Any]) -> int:
+    analysis = entry.get("language_analysis")
+    if not isinstance(analysis, dict):
+        return 0
+    return len(analysis.get("defined_functions") or ())
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """``"path,size_bytes"`` -> ``["path", "size_bytes"]`` (None/empty: every stored field).
+
+    Raises:
+        ValueError: Unknown field name.
+    """
+    if not fields:
+        return None
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in FILE_FIELDS + DERIVED_FIELDS]
+    if unknown:
+        raise ValueError(
+            f"Unknown field(s): {', '.join(unknown)} (expected {', '.join(FILE_FIELDS + DERIVED_FIELDS)})"
+        )
+    return names or None
+
+
+def parse_sort(sort: Optional[str]) -> Tuple[str, bool]:
+    """``"-size_bytes"`` -> ``("size_bytes", True)`` (descending).
+
+    Raises:
+        ValueError: Unknown sort key.
+    """
+    sort = (sort or "path").strip()
+    descending = sort.startswith("-")
+    key = sort.lstrip("+-")
+    if key not in SORT_KEYS:
+        raise ValueError(f"Unknown sort key: {key} (expected {', '.join(SORT_KEYS)})")
+    return key, descending
+
+
+@dataclass
+class FilePage:
+    """One page of files."""
+
+    files: List[Dict[str, Any]]
+    total: int
+    total_size_bytes: int
+    next_cursor: Optional[str] = None
+    extensions: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "files": self.files,
+            "count": len(self.files),
+            "total": self.total,
+            "total_size_bytes": self.total_size_bytes,
+            "next_cursor": self.next_cursor,
+            "extensions": self.extensions,
+        }
+
+
+class ReportStore:
+    """In-memory index over the ``files`` of one scan report."""
+
+    def __init__(self, report: Dict[str, Any]):
+        self.root = str(report.get("root") or "")
+        self.header = {key: value for key, value in report.items() if key != "files"}
+        files = [f for f in report.get("files") or [] if isinstance(f, dict) and "path" in f]
+        files.sort(key=lambda f: str(f["path"]))
+        self.files = files
+        self._paths = [str(f["path"]) for f in files]
+        self._index_by_path = {path: index for index, path in enumerate(self._paths)}
+        root = self.root.replace("\\", "/").rstrip("/") + "/"
+        self._rel_paths = []
+        for path in self._paths:
+            posix = path.replace("\\", "/")
+            self._rel_paths.append(posix[len(root):] if root != "/" and posix.startswith(root) else posix)
+        self._extensions = [_extension(path) for path in self._paths]
+        self._errors = [_has_errors(f) for f in files]
+        self._sizes = [f.get("size_bytes") or 0 for f in files]
+        self._by_extension: Dict[str, List[int]] = {}
+        for index, ext in enumerate(self._extensions):
+            self._by_extension.setdefault(ext, []).append(index)
+        # (key, descending) -> file indexes in that order, and index -> position
+        self._orders: Dict[Tuple[str, bool], List[int]] = {}
+        self._positions: Dict[Tuple[str, bool], List[int]] = {}
+        self._matches: "OrderedDict[tuple, Tuple[List[int], int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    @property
+    def extension_counts(self) -> Dict[str, int]:
+        return {ext: len(indexes) for ext, indexes in sorted(self._by_extension.items())}
+
+    def _order(self, key: str, descending: bool) -> List[int]:
+        order = self._orders.get((key, descending))
+        if order is not None:
+            return order
+        count = len(self.files)
+        if key == "path":
+            order = list(range(count))
+        else:
+            value: Callable[[int], Any]
+            if key == "extension":
+                value = self._extensions.__getitem__
+            elif key == "function_count":
+                value = lambda i: _function_count(self.files[i])  # noqa: E731
+            elif key == "file_type":
+                value = lambda i: str(self.files[i].get("file_type") or "")  # noqa: E731
+            else:
+                value = lambda i: self.files[i].get(key) or 0  # noqa: E731
+            # Files are stored in path order, so a stable sort breaks ties by path
+            order = sorted(range(count), key=value)
+        if descending:
+            order.reverse()
+        positions = [0] * count
+        for position, index in enumerate(order):
+            positions[index] = position
+        self._orders[(key, descending)] = order
+        self._positions[(key, descending)] = positions
+        return order
+
+    def _matching(
+        self,
+        key: str,
+        descending: bool,
+        extensions: Tuple[str, ...],
+        prefix: Optional[str],
+        has_errors: Optional[bool],
+        search: Optional[str],
+    ) -> Tuple[List[int], int]:
+        """Positions (in the sort order) of the files matching the filters, and their total size."""
+        cache_key = (key, descending, extensions, prefix, has_errors, search)
+        cached = self._matches.get(cache_key)
+        if cached is not None:
+            self._matches.move_to_end(cache_key)
+            return cached
+
+        order = self._order(key, descending)
+        positions = self._positions[(key, descending)]
+        if extensions:
+            candidates: Iterable[int] = (i for ext in extensions for i in self._by_extension.get(ext, ()))
+        else:
+            candidates = range(len(self.files))
+        checks: List[Callable[[int], bool]] = []
+        if prefix is not None:
+            checks.append(self._prefix_check(prefix))
+        if has_errors is not None:
+            checks.append(lambda i: self._errors[i] == has_errors)
+        if search:
+            needle = search.lower()
+            checks.append(lambda i: needle in self._paths[i].lower())
+        matched = [positions[i] for i in candidates if all(check(i) for check in checks)]
+        matched.sort()
+        result = (matched, sum(self._sizes[order[p]] for p in matched))
+
+        self._matches[cache_key] = result
+        if len(self._matches) > _QUERY_CACHE_SIZE:
+            self._matches.popitem(last=False)
+        return result
+
+    def _prefix_check(self, prefix: str) -> Callable[[int], bool]:
+        """Directory prefix, relative to the report root (absolute paths compare with full paths)."""
+        prefix = prefix.replace("\\", "/").strip()
+        while prefix.startswith("./"):
+            prefix = prefix[2:]
+        prefix = prefix.rstrip("/")
+        if not prefix:
+            return lambda i: True
+        paths = [p.replace("\\", "/") for p in self._paths] if prefix.startswith("/") or ":" in prefix else self._rel_paths
+        directory = prefix + "/"
+        return lambda i: paths[i] == prefix or paths[i].startswith(directory)
+
+    def query(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_LIMIT,
+        fields: Optional[Sequence[str]] = None,
+        extensions: Optional[Sequence[str]] = None,
+        prefix: Optional[str] = None,
+        has_errors: Optional[bool] = None,
+        search: Optional[str] = None,
+        sort: str = "path",
+        descending: bool = False,
+    ) -> FilePage:
+        """Return the page of files following ``cursor``.
+
+        Args:
+            cursor: Path of the last file of the previous page (``next_cursor``).
+            limit: Page size (capped at ``MAX_LIMIT``).
+            fields: Keys to keep per file (``FILE_FIELDS``/``DERIVED_FIELDS``);
+                all stored keys by default.
+            extensions: Keep files with one of these extensions (``"py"``).
+            prefix: Keep files under this directory.
+            has_errors: Keep files whose analysis failed (True) or succeeded (False).
+            search: Case-insensitive substring of the path.
+            sort: One of ``SORT_KEYS``; ties are ordered by path.
+
+        Raises:
+            ValueError: Unknown sort key or cursor.
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {sort} (expected {', '.join(SORT_KEYS)})")
+        limit = max(1, min(int(limit), MAX_LIMIT))
+        exts = tuple(sorted({e.lower().lstrip(".") for e in extensions or () if e}))
+        matched, total_size = self._matching(sort, descending, exts, prefix, has_errors, search or None)
+        order = self._orders[(sort, descending)]
+
+        start = 0
+        if cursor:
+            index = self._index_by_path.get(cursor)
+            if index is not None:
+                start = bisect.bisect_right(matched, self._positions[(sort, descending)][index])
+            elif sort == "path":
+                # The cursor file is gone (report changed): resume at the next path
+                position = bisect.bisect_right(self._paths, cursor)
+                if descending:
+                    position = len(self._paths) - bisect.bisect_left(self._paths, cursor)
+                start = bisect.bisect_left(matched, position)
+            else:
+                raise ValueError(f"Unknown cursor: {cursor}")
+
+        window = matched[start:start + limit]
+        files = [self._project(self.files[order[p]], fields) for p in window]
+        next_cursor = None
+        if window and start + len(window) < len(matched):
+            next_cursor = self._paths[order[window[-1]]]
+        return FilePage(
+            files=files,
+            total=len(matched),
+            total_size_bytes=total_size,
+            next_cursor=next_cursor,
+            extensions=self.extension_counts,
+        )
+
+    def _project(self, entry: Dict[str, Any], fields: Optional[Sequence[str]]) -> Dict[str, Any]:
+        if not fields:
+            return entry
+        projected: Dict[str, Any] = {}
+        for name in fields:
+            if name == "extension":
+                projected[name] = _extension(str(entry["path"]))
+            elif name == "function_count":
+                projected[name] = _function_count(entry)
+            elif name == "has_errors":
+                projected[name] = _has_errors(entry)
+            else:
+                projected[name] = entry.get(name)
+        return projected
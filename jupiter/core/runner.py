@@ -2,19 +2,36 @@
 
 from __future__ import annotations
 
+import asyncio
+import codecs
+import contextlib
+import inspect
 import logging
 import subprocess
+from collections import deque
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import tempfile
-import json
-import sys
 import os
+import re
+import signal
 
 from pydantic import BaseModel
 
+from jupiter.core.callstream import DISABLE_ENV
+from jupiter.core.tracefile import TraceTail, read_trace
+from jupiter.core.tracer import DEFAULT_FLUSH_INTERVAL, MODES
+
 logger = logging.getLogger(__name__)
 
+# Characters of output kept per stream by run_command_async (the tail is kept)
+DEFAULT_MAX_OUTPUT_CHARS = 1024 * 1024
+# Seconds between SIGTERM and SIGKILL when a command is stopped
+TERMINATE_GRACE = 5.0
+_READ_SIZE = 64 * 1024
+# python, python3, python3.12, python.exe, ...
+_PYTHON_EXECUTABLE = re.compile(r"^python(\d+(\.\d+)?)?(\.exe)?$", re.IGNORECASE)
+
 
 class CommandResult(BaseModel):
     """Result of an executed command."""
@@ -23,22 +40,87 @@ class CommandResult(BaseModel):
     stderr: str
     returncode: int
     dynamic_data: Optional[Dict[str, Any]] = None
+    timed_out: bool = False
+    output_truncated: bool = False
+
 
+def run_command(
+    command: List[str],
+    cwd: Path,
+    with_dynamic: bool = False,
+    dynamic_mode: str = "trace",
+    sample_rate: Optional[float] = None,
+    on_dynamic: Optional[Callable[[Dict[str, Any]], None]] = None,
+    flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+) -> CommandResult:
+    """Executes a command and captures its output.
 
-def run_command(command: List[str], cwd: Path, with_dynamic: bool = False) -> CommandResult:
-    """Executes a command and captures its output."""
-    logger.info("Running command: %s in %s (dynamic=%s)", " ".join(command), cwd, with_dynamic)
+    Args:
+        command: Command and arguments.
+        cwd: Working directory (also the project root for dynamic analysis).
+        with_dynamic: Wrap Python scripts with ``jupiter.core.tracer``.
+        dynamic_mode: ``"trace"`` (deterministic, every call) or ``"sample"``
+            (statistical stack sampling, for long-running workloads).
+        sample_rate: Samples per second in ``"sample"`` mode.
+        on_dynamic: Called from this thread with each partial dynamic-data
+            delta while the command runs (and once more after it exits);
+            the deltas add up to the returned ``dynamic_data``.
+        flush_interval: Seconds between trace flushes / ``on_dynamic`` calls.
+    """
+    if dynamic_mode not in MODES:
+        raise ValueError(f"Unknown dynamic mode '{dynamic_mode}' (expected one of {', '.join(MODES)})")
+    logger.info(
+        "Running command: %s in %s (dynamic=%s, mode=%s)",
+        " ".join(command), cwd, with_dynamic, dynamic_mode,
+    )
     
     dynamic_data = None
+    final_command, temp_file = _prepare_command(command, cwd, with_dynamic, dynamic_mode, sample_rate, flush_interval)
+
+    try:
+        if temp_file and on_dynamic is not None:
+            stdout, stderr, returncode = _run_streaming(final_command, cwd, temp_file, on_dynamic, flush_interval)
+        else:
+            process = subprocess.run(
+                final_command,
+                capture_output=True,
+                text=True,
+                cwd=cwd,
+                check=False,  # Do not raise exception for non-zero exit codes
+            )
+            stdout, stderr, returncode = process.stdout, process.stderr, process.returncode
+
+        if temp_file:
+            dynamic_data = _collect_trace(temp_file)
+
+        return CommandResult(
+            stdout=stdout,
+            stderr=stderr,
+            returncode=returncode,
+            dynamic_data=dynamic_data
+        )
+    except Exception as e:
+        logger.error("Failed to run command '%s': %s", final_command, e)
+        return CommandResult(stdout="", stderr=str(e), returncode=-1)
+
+
+def _prepare_command(
+    command: List[str],
+    cwd: Path,
+    with_dynamic: bool,
+    dynamic_mode: str,
+    sample_rate: Optional[float],
+    flush_interval: float,
+) -> Tuple[List[str], Optional[str]]:
+    """Wrap Python commands with the tracer; returns (command, trace file or None)."""
     temp_file = None
-    
     final_command = command
-    
+
     if with_dynamic:
         # Only support python commands for now
-        if len(command) > 0 and (command[0].endswith("python") or command[0].endswith("python.exe") or command[0] == "python3"):
+        if len(command) > 0 and _PYTHON_EXECUTABLE.match(os.path.basename(command[0])):
              # Create temp file for output
-             fd, temp_path = tempfile.mkstemp(suffix=".json")
+             fd, temp_path = tempfile.mkstemp(suffix=".ndjson")
              os.close(fd)
              temp_file = temp_path
              
@@ -50,41 +132,300 @@ def run_command(command: List[str], cwd: Path, with_dynamic: bool = False) -> Co
                  args = command[2:]
                  
                  # We need to run the tracer module using the SAME python interpreter
+                 tracer_options = ["--mode", dynamic_mode, "--flush-interval", str(flush_interval)]
+                 if dynamic_mode == "sample" and sample_rate:
+                     tracer_options += ["--rate", str(sample_rate)]
                  final_command = [
                      command[0],
                      "-m",
                      "jupiter.core.tracer",
+                     *tracer_options,
                      temp_file,
                      str(cwd),
                      script
                  ] + args
         else:
             logger.warning("Dynamic analysis requested but command does not look like a Python script execution. Ignoring.")
+    return final_command, temp_file
+
 
+def _collect_trace(temp_file: str) -> Optional[Dict[str, Any]]:
+    """Read and delete the tracer's output file."""
+    if not os.path.exists(temp_file):
+        return None
+    dynamic_data = None
     try:
-        process = subprocess.run(
-            final_command,
-            capture_output=True,
-            text=True,
-            cwd=cwd,
-            check=False,  # Do not raise exception for non-zero exit codes
-        )
-        
-        if temp_file and os.path.exists(temp_file):
+        dynamic_data = read_trace(temp_file)
+        if dynamic_data is not None and not dynamic_data.get("complete", True):
+            logger.warning("Traced process exited without a final flush; dynamic data is partial.")
+    except Exception as e:
+        logger.error("Failed to read dynamic analysis data: %s", e)
+    finally:
+        os.remove(temp_file)
+    return dynamic_data
+
+
+def _run_streaming(
+    command: List[str],
+    cwd: Path,
+    trace_file: str,
+    on_dynamic: Callable[[Dict[str, Any]], None],
+    interval: float,
+) -> Tuple[str, str, int]:
+    """Run ``command`` and forward new trace chunks to ``on_dynamic`` while it runs."""
+    tail = TraceTail(trace_file)
+
+    def forward() -> None:
+        delta = tail.read_new()
+        if delta is not None:
             try:
-                with open(temp_file, "r") as f:
-                    dynamic_data = json.load(f)
-            except Exception as e:
-                logger.error("Failed to read dynamic analysis data: %s", e)
-            finally:
-                os.remove(temp_file)
+                on_dynamic(delta)
+            except Exception as e:  # pragma: no cover - defensive logging
+                logger.warning("Dynamic data callback failed: %s", e)
 
-        return CommandResult(
-            stdout=process.stdout,
-            stderr=process.stderr,
-            returncode=process.returncode,
-            dynamic_data=dynamic_data
+    # The deltas reach the caller through on_dynamic: keep the traced
+    # process off the live call channel so they are not counted twice
+    env = dict(os.environ)
+    env[DISABLE_ENV] = "0"
+    process = subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        cwd=cwd,
+        env=env,
+    )
+    while True:
+        try:
+            # communicate() keeps draining the pipes across timeouts
+            stdout, stderr = process.communicate(timeout=interval)
+            break
+        except subprocess.TimeoutExpired:
+            forward()
+    forward()
+    return stdout, stderr, process.returncode
+
+
+class _OutputBuffer:
+    """Keeps the last ``limit`` characters written to it."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.size = 0
+        self.dropped = 0
+        self._parts: deque = deque()
+
+    def append(self, text: str) -> None:
+        if not text:
+            return
+        self._parts.append(text)
+        self.size += len(text)
+        while self.size > self.limit and self._parts:
+            excess = self.size - self.limit
+            head = self._parts[0]
+            if len(head) <= excess:
+                self._parts.popleft()
+                cut = len(head)
+            else:
+                self._parts[0] = head[excess:]
+                cut = excess
+            self.size -= cut
+            self.dropped += cut
+
+    def value(self) -> str:
+        text = "".join(self._parts)
+        if self.dropped:
+            return f"[... {self.dropped} characters truncated ...]\n{text}"
+        return text
+
+
+async def _call(callback: Callable[..., Any], *args: Any) -> None:
+    try:
+        result = callback(*args)
+        if inspect.isawaitable(result):
+            await result
+    except Exception as e:  # pragma: no cover - defensive logging
+        logger.warning("Run callback failed: %s", e)
+
+
+async def _discard(future: "asyncio.Future[Any]") -> None:
+    future.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await future
+
+
+def _signal(process: asyncio.subprocess.Process, sig: int) -> None:
+    """Signal the command's process group (its children too) where possible."""
+    if os.name == "posix":
+        os.killpg(process.pid, sig)
+    elif sig == signal.SIGTERM:
+        process.terminate()
+    else:
+        process.kill()
+
+
+async def _terminate(process: asyncio.subprocess.Process) -> None:
+    """SIGTERM, then SIGKILL after ``TERMINATE_GRACE`` seconds."""
+    try:
+        if process.returncode is None:
+            _signal(process, signal.SIGTERM)
+            try:
+                await asyncio.wait_for(process.wait(), timeout=TERMINATE_GRACE)
+                return
+            except asyncio.TimeoutError:
+                pass
+        # Also reached when the command exited but a child still holds the pipes
+        _signal(process, signal.SIGKILL if os.name == "posix" else signal.SIGTERM)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+async def run_command_async(
+    command: List[str],
+    cwd: Path,
+    with_dynamic: bool = False,
+    dynamic_mode: str = "trace",
+    sample_rate: Optional[float] = None,
+    on_dynamic: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    on_output: Optional[Callable[[str, str], Any]] = None,
+    timeout: Optional[float] = None,
+    max_output_chars: int = DEFAULT_MAX_OUTPUT_CHARS,
+    flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    env: Optional[Dict[str, str]] = None,
+) -> CommandResult:
+    """Run a command on the event loop, streaming its output as it arrives.
+
+    Same arguments as ``run_command``, plus:
+
+    Args:
+        on_output: Called (sync or async) with ``(stream, line)`` for every
+            stdout/stderr line as it is read; ``stream`` is ``"stdout"`` or
+            ``"stderr"`` and ``line`` has no trailing newline.
+        timeout: Seconds before the command is terminated; the result then
+            has ``timed_out`` set.
+        max_output_chars: Characters of each stream kept for the result
+            (the most recent ones; ``output_truncated`` tells when some
+            were dropped). Every line still goes to ``on_output``.
+        env: Extra environment variables for the command.
+
+    Cancelling the calling task terminates the command (SIGTERM, then
+    SIGKILL after ``TERMINATE_GRACE`` seconds) before re-raising.
+    """
+    if dynamic_mode not in MODES:
+        raise ValueError(f"Unknown dynamic mode '{dynamic_mode}' (expected one of {', '.join(MODES)})")
+    logger.info(
+        "Running command (async): %s in %s (dynamic=%s, mode=%s, timeout=%s)",
+        " ".join(command), cwd, with_dynamic, dynamic_mode, timeout,
+    )
+    final_command, temp_file = _prepare_command(command, cwd, with_dynamic, dynamic_mode, sample_rate, flush_interval)
+
+    child_env = None
+    if env or (temp_file and on_dynamic is not None):
+        child_env = dict(os.environ)
+        child_env.update(env or {})
+        if temp_file and on_dynamic is not None:
+            # Deltas reach the caller through on_dynamic (see _run_streaming)
+            child_env[DISABLE_ENV] = "0"
+
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *final_command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=cwd,
+            env=child_env,
+            # Own process group, so that stopping it also stops its children
+            start_new_session=os.name == "posix",
         )
     except Exception as e:
         logger.error("Failed to run command '%s': %s", final_command, e)
+        if temp_file:
+            _collect_trace(temp_file)
         return CommandResult(stdout="", stderr=str(e), returncode=-1)
+
+    buffers = {"stdout": _OutputBuffer(max_output_chars), "stderr": _OutputBuffer(max_output_chars)}
+
+    async def pump(stream: asyncio.StreamReader, name: str) -> None:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        partial = ""
+        while True:
+            data = await stream.read(_READ_SIZE)
+            text = decoder.decode(data, final=not data)
+            buffers[name].append(text)
+            if on_output is not None and text:
+                *lines, partial = (partial + text).split("\n")
+                for line in lines:
+                    await _call(on_output, name, line.rstrip("\r"))
+                if len(partial) > max_output_chars:
+                    await _call(on_output, name, partial)
+                    partial = ""
+            if not data:
+                break
+        if on_output is not None and partial:
+            await _call(on_output, name, partial.rstrip("\r"))
+
+    tail = TraceTail(temp_file) if temp_file and on_dynamic is not None else None
+
+    async def forward_dynamic() -> None:
+        delta = tail.read_new()
+        if delta is not None:
+            await _call(on_dynamic, delta)
+
+    async def follow_trace() -> None:
+        while True:
+            await asyncio.sleep(flush_interval)
+            await forward_dynamic()
+
+    pumps = asyncio.gather(pump(process.stdout, "stdout"), pump(process.stderr, "stderr"))
+
+    async def finish() -> int:
+        await pumps
+        return await process.wait()
+
+    # One deadline for the output and the exit: a command may close its
+    # pipes and keep running
+    finished = asyncio.ensure_future(finish())
+    follower = asyncio.ensure_future(follow_trace()) if tail is not None else None
+    timed_out = False
+    try:
+        try:
+            returncode = await asyncio.wait_for(asyncio.shield(finished), timeout=timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+            logger.warning("Command timed out after %ss: %s", timeout, " ".join(command))
+            await _terminate(process)
+            try:
+                await asyncio.wait_for(asyncio.shield(finished), timeout=TERMINATE_GRACE)
+            except asyncio.TimeoutError:
+                await _discard(finished)
+                await _discard(pumps)
+            returncode = await process.wait()
+    except asyncio.CancelledError:
+        logger.info("Command cancelled: %s", " ".join(command))
+        await _discard(finished)
+        await _discard(pumps)
+        await _terminate(process)
+        if temp_file:
+            _collect_trace(temp_file)
+        raise
+    finally:
+        if follower is not None:
+            follower.cancel()
+
+    dynamic_data = None
+    if tail is not None:
+        await forward_dynamic()
+    if temp_file:
+        dynamic_data = _collect_trace(temp_file)
+
+    stderr = buffers["stderr"].value()
+    if timed_out:
+        stderr += f"\n[Command timed out after {timeout}s]"
+    return CommandResult(
+        stdout=buffers["stdout"].value(),
+        stderr=stderr,
+        returncode=returncode,
+        dynamic_data=dynamic_data,
+        timed_out=timed_out,
+        output_truncated=bool(buffers["stdout"].dropped or buffers["stderr"].dropped),
+    )
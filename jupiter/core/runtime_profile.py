@@ -0,0 +1,242 @@
+"""Runtime profile: dynamic call data joined to the static call graph.
+
+The tracer records, per ``rel/path.py::qualname`` key, a call count, the time
+spent in the function including its callees (``times``), the time spent in
+its own body (``self_times``), caller -> callee counts (``call_graph``) and
+the time spent under each edge (``call_graph_times``). ``RuntimeProfile``
+indexes these per function and attaches the matching ``FunctionInfo``
+definitions.
+
+Traces without ``self_times``/``call_graph_times`` (older trace files) get
+an estimate instead: each caller is attributed the share of the callee's
+time matching its share of the calls (``edge calls / callee calls * callee
+time``), and self time is the cumulative time minus those edge times. It is
+only exact when a callee has a single caller and evenly priced calls.
+
+Rankings (``top_self``, ``top_cumulative``, ``hot_edges``) show where the
+runtime goes; ``rankings()`` is the JSON form used by the API and CLI.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .callgraph import CallGraphResult, DynamicKeyResolver, FunctionInfo
+
+
+@dataclass
+class FunctionProfile:
+    """Runtime figures of one function (one dynamic key)."""
+
+    key: str
+    calls: int = 0
+    cumulative_time: float = 0.0
+    self_time: float = 0.0
+    callers: Dict[str, int] = field(default_factory=dict)
+    callees: Dict[str, int] = field(default_factory=dict)
+    # Static definitions sharing this key (same name in several classes)
+    definitions: List[FunctionInfo] = field(default_factory=list)
+
+    @property
+    def file_path(self) -> str:
+        return self.key.split("::", 1)[0]
+
+    @property
+    def name(self) -> str:
+        return self.key.split("::", 1)[-1]
+
+    @property
+    def per_call(self) -> float:
+        return self.cumulative_time / self.calls if self.calls else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "key": self.key,
+            "file_path": self.file_path,
+            "name": self.name,
+            "calls": self.calls,
+            "cumulative_time": self.cumulative_time,
+            "self_time": self.self_time,
+            "per_call": self.per_call,
+            "callers": len(self.callers),
+            "callees": len(self.callees),
+            "line_number": None,
+            "qualname": None,
+        }
+        if len(self.definitions) == 1:
+            func = self.definitions[0]
+            data["line_number"] = func.line_number
+            data["qualname"] = func.qualname
+        elif self.definitions:
+            data["candidates"] = sorted(func.qualname for func in self.definitions)
+        return data
+
+
+@dataclass
+class EdgeProfile:
+    """A caller -> callee pair seen at runtime."""
+
+    caller: str
+    callee: str
+    calls: int
+    time: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"caller": self.caller, "callee": self.callee, "calls": self.calls, "time": self.time}
+
+
+class RuntimeProfile:
+    """Index of dynamic call data, optionally joined to static ``FunctionInfo``.
+
+    Usage::
+
+        profile = RuntimeProfile.build(last_scan["dynamic"], call_graph)
+        profile.top_self(10)          # where the time is spent
+        profile.hot_edges(10)         # which calls carry it
+        profile.for_function(info)    # FunctionInfo -> FunctionProfile
+    """
+
+    def __init__(self) -> None:
+        self.functions: Dict[str, FunctionProfile] = {}
+        self.edges: Dict[Tuple[str, str], EdgeProfile] = {}
+        # FunctionInfo.full_name -> dynamic key
+        self.static_index: Dict[str, str] = {}
+        self.static_functions = 0
+
+    @classmethod
+    def build(
+        cls,
+        dynamic: Optional[Mapping[str, Any]],
+        call_graph: Optional[CallGraphResult] = None,
+    ) -> "RuntimeProfile":
+        """Index ``dynamic`` (``calls``/``times``/``call_graph``) and join ``call_graph`` functions."""
+        profile = cls()
+        dynamic = dynamic if isinstance(dynamic, Mapping) else {}
+        calls = dynamic.get("calls") if isinstance(dynamic.get("calls"), Mapping) else {}
+        times = dynamic.get("times") if isinstance(dynamic.get("times"), Mapping) else {}
+        graph = dynamic.get("call_graph") if isinstance(dynamic.get("call_graph"), Mapping) else {}
+        self_times = dynamic.get("self_times") if isinstance(dynamic.get("self_times"), Mapping) else None
+        edge_times = dynamic.get("call_graph_times")
+        edge_times = edge_times if isinstance(edge_times, Mapping) else None
+
+        def entry(key: str) -> FunctionProfile:
+            func = profile.functions.get(key)
+            if func is None:
+                func = profile.functions[key] = FunctionProfile(key)
+            return func
+
+        for key, count in calls.items():
+            entry(key).calls = int(count)
+        for key, seconds in times.items():
+            func = entry(key)
+            func.cumulative_time = float(seconds)
+        for caller, callees in graph.items():
+            if not isinstance(callees, Mapping):
+                continue
+            for callee, count in callees.items():
+                entry(caller).callees[callee] = int(count)
+                entry(callee).callers[caller] = int(count)
+
+        for func in profile.functions.values():
+            func.self_time = func.cumulative_time
+        for func in profile.functions.values():
+            for caller, count in func.callers.items():
+                if edge_times is not None:
+                    callees = edge_times.get(caller)
+                    seconds = float(callees.get(func.key, 0.0)) if isinstance(callees, Mapping) else 0.0
+                else:
+                    share = min(1.0, count / func.calls) if func.calls else 0.0
+                    seconds = func.cumulative_time * share
+                profile.edges[(caller, func.key)] = EdgeProfile(caller, func.key, count, seconds)
+                if caller != func.key:
+                    profile.functions[caller].self_time -= seconds
+        if self_times is not None:
+            for func in profile.functions.values():
+                func.self_time = float(self_times.get(func.key, 0.0))
+        for func in profile.functions.values():
+            func.self_time = max(0.0, func.self_time)
+
+        if call_graph is not None:
+            profile.join(call_graph.all_functions)
+        return profile
+
+    def join(self, functions: Dict[str, FunctionInfo]) -> None:
+        """Attach static definitions (``full_name`` -> ``FunctionInfo``) to the profiled keys.
+
+        Keys are resolved with ``DynamicKeyResolver``: ``file::Class.method``
+        qualname keys match one definition, bare ``file::name`` keys (older
+        traces) every definition of that name in the file.
+        """
+        self.static_functions += len(functions)
+        resolver = DynamicKeyResolver(functions)
+        for func in self.functions.values():
+            for full_name in resolver.resolve(func.key):
+                func.definitions.append(functions[full_name])
+                self.static_index.setdefault(full_name, func.key)
+
+    def get(self, key: str) -> Optional[FunctionProfile]:
+        """Profile by dynamic key (``file::Class.method``) or static full name."""
+        return self.functions.get(key) or self.functions.get(self.static_index.get(key, ""))
+
+    def for_function(self, info: FunctionInfo) -> Optional[FunctionProfile]:
+        return self.functions.get(self.static_index.get(info.full_name, ""))
+
+    def _ranked(self, attr: str, limit: int) -> List[FunctionProfile]:
+        items = [f for f in self.functions.values() if getattr(f, attr) > 0]
+        items.sort(key=lambda f: (-getattr(f, attr), f.key))
+        return items[:limit]
+
+    def top_self(self, limit: int = 10) -> List[FunctionProfile]:
+        return self._ranked("self_time", limit)
+
+    def top_cumulative(self, limit: int = 10) -> List[FunctionProfile]:
+        return self._ranked("cumulative_time", limit)
+
+    def top_calls(self, limit: int = 10) -> List[FunctionProfile]:
+        return self._ranked("calls", limit)
+
+    def hot_edges(self, limit: int = 10) -> List[EdgeProfile]:
+        edges = sorted(self.edges.values(), key=lambda e: (-e.time, -e.calls, e.caller, e.callee))
+        return edges[:limit]
+
+    @property
+    def total_time(self) -> float:
+        """Time of the outermost calls (functions with no profiled caller)."""
+        return sum(f.cumulative_time for f in self.functions.values() if not f.callers)
+
+    def statistics(self) -> Dict[str, Any]:
+        joined = sum(1 for f in self.functions.values() if f.definitions)
+        return {
+            "profiled_functions": len(self.functions),
+            "static_functions": self.static_functions,
+            "joined_functions": joined,
+            "unmatched_keys": len(self.functions) - joined if self.static_functions else 0,
+            "total_calls": sum(f.calls for f in self.functions.values()),
+            "total_time": self.total_time,
+            "edges": len(self.edges),
+        }
+
+    def rankings(self, top: int = 10) -> Dict[str, Any]:
+        """JSON-ready hot-path rankings."""
+        return {
+            "statistics": self.statistics(),
+            "top_self_time": [f.to_dict() for f in self.top_self(top)],
+            "top_cumulative_time": [f.to_dict() for f in self.top_cumulative(top)],
+            "top_calls": [f.to_dict() for f in self.top_calls(top)],
+            "hot_edges": [e.to_dict() for e in self.hot_edges(top)],
+        }
+
+    def function_detail(self, key: str, top: int = 10) -> Optional[Dict[str, Any]]:
+        """One function with its heaviest callers and callees."""
+        func = self.get(key)
+        if func is None:
+            return None
+        data = func.to_dict()
+        callers = [self.edges[(caller, func.key)] for caller in func.callers]
+        callees = [self.edges[(func.key, callee)] for callee in func.callees]
+        callers.sort(key=lambda e: (-e.time, -e.calls, e.caller))
+        callees.sort(key=lambda e: (-e.time, -e.calls, e.callee))
+        data["callers"] = [e.to_dict() for e in callers[:top]]
+        data["callees"] = [e.to_dict() for e in callees[:top]]
+        return data
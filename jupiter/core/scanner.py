@@ -5,7 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 import fnmatch
 from pathlib import Path
-from typing import Iterable, Iterator, Optional, Dict, Any, Callable
+from typing import Iterable, Iterator, List, Optional, Dict, Any, Callable
 import logging
 import time
 import concurrent.futures
@@ -98,12 +98,20 @@ class ProjectScanner:
         "*.egg-info",
     ]
 
-    def iter_files(self) -> Iterator[FileMetadata]:
-        """Yield :class:`FileMetadata` objects for files under ``root``."""
+    def iter_paths(self) -> List[Path]:
+        """Paths of the files a scan would process (ignore rules applied, nothing read)."""
+        return list(self._walk_files(self.root))
+
+    def iter_files(self, paths: Optional[List[Path]] = None) -> Iterator[FileMetadata]:
+        """Yield :class:`FileMetadata` objects for files under ``root``.
+
+        Args:
+            paths: Files to process, as returned by ``iter_paths()`` (walked when None).
+        """
         start_time = time.time()
         
         # Collect all paths first to allow parallel processing
-        paths = list(self._walk_files(self.root))
+        paths = list(self._walk_files(self.root)) if paths is None else paths
         total_files = len(paths)
         
         walk_time = time.time() - start_time
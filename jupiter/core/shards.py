@@ -0,0 +1,252 @@
+"""Sharded (parallel) command runs with merged dynamic analysis.
+
+A pytest invocation is split into ``N`` commands, each running a share of
+the test files (largest files spread first so shards take similar time),
+or an explicit list of commands is run ``N`` at a time. Every shard is a
+separate traced process with its own trace file; the dynamic data of all
+shards is summed in one pass with ``tracefile.merge_dynamic``, so callers
+update the cache once instead of once per shard.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import configparser
+import logging
+import os
+import shlex
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from jupiter.core.runner import CommandResult, run_command_async
+from jupiter.core.tracefile import empty_dynamic, merge_dynamic
+
+logger = logging.getLogger(__name__)
+
+# pytest options whose value is a separate argument (never a test path)
+_PYTEST_VALUE_OPTIONS = {
+    "-k", "-m", "-p", "-c", "-o", "-W", "-n", "--deselect", "--ignore", "--ignore-glob",
+    "--rootdir", "--basetemp", "--confcutdir", "--junitxml", "--junit-xml", "--log-file",
+    "--cov", "--cov-report", "--maxfail", "--durations", "--tb", "--import-mode", "--override-ini",
+}
+_SKIP_DIRS = {".git", ".hg", ".svn", ".tox", ".nox", ".venv", "venv", "env", "node_modules",
+              "__pycache__", "build", "dist", ".jupiter", ".pytest_cache", "site-packages"}
+
+
+def is_pytest_command(command: Sequence[str]) -> bool:
+    """``pytest ...``, ``py.test ...`` or ``python -m pytest ...``."""
+    if not command:
+        return False
+    name = os.path.basename(command[0]).lower()
+    if name in ("pytest", "pytest.exe", "py.test"):
+        return True
+    return len(command) > 2 and name.startswith("python") and command[1:3] == ["-m", "pytest"]
+
+
+def _ini_testpaths(path: Path, section: str) -> Optional[List[str]]:
+    parser = configparser.ConfigParser()
+    try:
+        parser.read(path, encoding="utf-8")
+    except configparser.Error:
+        return None
+    if parser.has_option(section, "testpaths"):
+        return parser.get(section, "testpaths").split()
+    return None
+
+
+def _pyproject_testpaths(path: Path) -> Optional[List[str]]:
+    try:
+        import tomllib  # Python 3.11+
+    except ImportError:
+        return None
+    try:
+        data = tomllib.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    testpaths = data.get("tool", {}).get("pytest", {}).get("ini_options", {}).get("testpaths")
+    if isinstance(testpaths, str):
+        return testpaths.split()
+    if isinstance(testpaths, list):
+        return [str(p) for p in testpaths]
+    return None
+
+
+def _configured_testpaths(cwd: Path) -> List[str]:
+    """``testpaths`` from the first of pytest.ini, pyproject.toml, tox.ini, setup.cfg that sets it."""
+    for name in ("pytest.ini", "pyproject.toml", "tox.ini", "setup.cfg"):
+        path = cwd / name
+        if not path.is_file():
+            continue
+        if name == "pyproject.toml":
+            testpaths = _pyproject_testpaths(path)
+        else:
+            testpaths = _ini_testpaths(path, "tool:pytest" if name == "setup.cfg" else "pytest")
+        if testpaths:
+            return testpaths
+    return []
+
+
+def _test_files(directory: Path) -> List[Path]:
+    found = []
+    for current, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if d not in _SKIP_DIRS and not d.startswith("."))
+        for name in sorted(files):
+            if name.endswith(".py") and (name.startswith("test_") or name.endswith("_test.py")):
+                found.append(Path(current) / name)
+    return found
+
+
+def _balance(items: List[str], weights: Dict[str, int], shards: int) -> List[List[str]]:
+    """Largest-first greedy assignment to the least loaded shard."""
+    bins: List[List[str]] = [[] for _ in range(shards)]
+    loads = [0] * shards
+    for item in sorted(items, key=lambda i: (-weights.get(i, 0), i)):
+        index = loads.index(min(loads))
+        bins[index].append(item)
+        loads[index] += max(weights.get(item, 0), 1)
+    return [b for b in bins if b]
+
+
+def split_pytest_command(command: Sequence[str], cwd: Path, shards: int) -> List[List[str]]:
+    """Split a pytest invocation into at most ``shards`` commands over its test files.
+
+    Test paths given on the command line are kept (directories are expanded
+    to their ``test_*.py``/``*_test.py`` files, node IDs such as
+    ``tests/test_x.py::test_y`` stay whole); without paths, pytest's
+    ``testpaths`` setting or the working directory is searched. Options are
+    repeated on every shard, plus ``-p no:cacheprovider`` so concurrent
+    shards do not overwrite each other's cache.
+
+    Raises:
+        ValueError: Not a pytest command, or no test files found.
+    """
+    if not is_pytest_command(command):
+        raise ValueError("Only pytest commands can be split into shards")
+    if shards < 1:
+        raise ValueError("shards must be >= 1")
+    command = list(command)
+    if os.path.basename(command[0]).lower().startswith("python"):
+        base, args = command[:3], command[3:]
+    else:
+        base, args = [sys.executable, "-m", "pytest"], command[1:]
+
+    options: List[str] = []
+    targets: List[str] = []
+    expect_value = False
+    for arg in args:
+        if expect_value:
+            options.append(arg)
+            expect_value = False
+        elif arg.startswith("-"):
+            options.append(arg)
+            expect_value = arg in _PYTEST_VALUE_OPTIONS
+        elif (cwd / arg.split("::", 1)[0]).exists():
+            targets.append(arg)
+        else:
+            options.append(arg)
+
+    if not targets:
+        targets = [p for p in _configured_testpaths(cwd) if (cwd / p).exists()] or ["."]
+
+    units: List[str] = []
+    weights: Dict[str, int] = {}
+    for target in targets:
+        path = cwd / target.split("::", 1)[0]
+        if "::" not in target and path.is_dir():
+            for file in _test_files(path):
+                rel = Path(os.path.relpath(file, cwd)).as_posix()
+                units.append(rel)
+                weights[rel] = file.stat().st_size
+        else:
+            units.append(target)
+            weights[target] = path.stat().st_size if path.is_file() else 0
+    units = list(dict.fromkeys(units))
+    if not units:
+        raise ValueError(f"No test files found for: {' '.join(command)}")
+
+    if "no:cacheprovider" not in options:
+        options += ["-p", "no:cacheprovider"]
+    return [base + options + group for group in _balance(units, weights, shards)]
+
+
+def merge_shard_results(results: Sequence[CommandResult]) -> Optional[Dict[str, Any]]:
+    """Sum the dynamic data of all shards (None when no shard produced any)."""
+    merged: Optional[Dict[str, Any]] = None
+    complete = True
+    for result in results:
+        data = result.dynamic_data
+        if not data:
+            continue
+        if merged is None:
+            merged = empty_dynamic()
+            for key in ("mode", "backend", "rate"):
+                if key in data:
+                    merged[key] = data[key]
+        merge_dynamic(merged, data)
+        complete = complete and data.get("complete", True)
+    if merged is not None:
+        merged["complete"] = complete
+        merged["shards"] = len(results)
+    return merged
+
+
+async def run_sharded(
+    commands: Sequence[Sequence[str]],
+    cwd: Path,
+    shards: int,
+    with_dynamic: bool = False,
+    dynamic_mode: str = "trace",
+    sample_rate: Optional[float] = None,
+    timeout: Optional[float] = None,
+    on_shard_done: Optional[Any] = None,
+) -> CommandResult:
+    """Run ``commands`` at most ``shards`` at a time and combine the results.
+
+    Args:
+        commands: One command per shard (see ``split_pytest_command``).
+        on_shard_done: Optional ``callback(index, command, result)`` called as
+            each shard finishes (e.g. to print its output right away).
+
+    Returns:
+        A ``CommandResult`` whose output concatenates the shards' (each
+        under a ``==== shard i/n ====`` header), whose return code is the
+        first non-zero one, and whose ``dynamic_data`` is the merged data
+        of every shard.
+    """
+    semaphore = asyncio.Semaphore(max(1, shards))
+    total = len(commands)
+
+    async def run_one(index: int, command: Sequence[str]) -> CommandResult:
+        async with semaphore:
+            logger.info("Shard %d/%d: %s", index + 1, total, shlex.join(command))
+            result = await run_command_async(
+                list(command),
+                cwd,
+                with_dynamic,
+                dynamic_mode=dynamic_mode,
+                sample_rate=sample_rate,
+                timeout=timeout,
+                env={"JUPITER_SHARD": str(index), "JUPITER_SHARDS": str(total)},
+            )
+        if on_shard_done is not None:
+            on_shard_done(index, command, result)
+        return result
+
+    results = await asyncio.gather(*(run_one(i, c) for i, c in enumerate(commands)))
+
+    stdout, stderr = [], []
+    for index, (command, result) in enumerate(zip(commands, results)):
+        header = f"==== shard {index + 1}/{total}: {shlex.join(command)} (exit {result.returncode}) ===="
+        stdout.append(f"{header}\n{result.stdout}")
+        if result.stderr:
+            stderr.append(f"{header}\n{result.stderr}")
+    returncode = next((r.returncode for r in results if r.returncode != 0), 0)
+    return CommandResult(
+        stdout="\n".join(stdout),
+        stderr="\n".join(stderr),
+        returncode=returncode,
+        dynamic_data=merge_shard_results(results),
+        timed_out=any(r.timed_out for r in results),
+        output_truncated=any(r.output_truncated for r in results),
+    )
@@ -4,8 +4,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Set, Optional, Any
+from typing import Dict, Iterable, List, Set, Optional, Any
 
+from jupiter.core.modules import ModuleTable, normalize_path
 from jupiter.core.scanner import FileMetadata
 
 
@@ -24,135 +25,293 @@ class SimulationResult:
     risk_score: str  # "high", "medium", "low"
 
 
+@dataclass
+class SimulationTarget:
+    """A single change evaluated as part of a batch simulation."""
+
+    action: str  # "remove" or "move"
+    path: str
+    function_name: Optional[str] = None
+    new_path: Optional[str] = None  # Destination file for "move"
+
+    @property
+    def label(self) -> str:
+        target = f"{self.path}::{self.function_name}" if self.function_name else self.path
+        if self.action == "move":
+            return f"Move {target} -> {self.new_path}"
+        return f"Remove {'function' if self.function_name else 'file'} {target}"
+
+
+@dataclass
+class BatchImpact:
+    """An impact of a batch simulation, attributed to the targets causing it."""
+
+    target: str
+    impact_type: str
+    details: str
+    severity: str
+    sources: List[str] = field(default_factory=list)  # Labels of the targets causing it
+
+
+@dataclass
+class BatchSimulationResult:
+    results: List[SimulationResult]
+    impacts: List[BatchImpact]  # Combined, de-duplicated impact set
+    risk_score: str
+
+
 class ProjectSimulator:
     """Simulates changes in the project to predict impact."""
 
-    def __init__(self, files: List[Dict[str, Any]]):
+    def __init__(
+        self,
+        files: List[Dict[str, Any]],
+        root: Optional[str] = None,
+        source_roots: Iterable[str] = (),
+    ):
         """
         Initialize with a list of file dictionaries (from scan report).
         We use dicts because that's what the API/CLI usually passes around after scanning.
+        ``root``/``source_roots`` feed the shared module-resolution table.
         """
         self.files = files
-        self.file_map = {f["path"]: f for f in files}
+        self.file_map = {normalize_path(f["path"]): f for f in files}
+        self.modules = ModuleTable(self.file_map, root=root, source_roots=source_roots)
         
         # Build indices
         self.defined_functions: Dict[str, str] = {}  # func_name -> file_path
         self.imports_by_file: Dict[str, Set[str]] = {}  # file_path -> set of imported names
         self.calls_by_file: Dict[str, Set[str]] = {}  # file_path -> set of called function names
+        # Reverse indices so each query only touches the files it concerns
+        self.importers_by_file: Dict[str, Dict[str, List[str]]] = {}  # imported file -> file_path -> imports
+        self.callers_by_function: Dict[str, List[str]] = {}  # func_name -> files calling it
         
         self._build_indices()
 
     def _build_indices(self):
         for f in self.files:
-            path = f["path"]
+            path = normalize_path(f["path"])
             lang_analysis = f.get("language_analysis") or {}
-            
-            # Index defined functions (heuristic: last writer wins for duplicates, or we could store list)
-            # For better accuracy, we'd need fully qualified names, but we'll stick to simple names for now
-            # as per the current analyzer capabilities.
-            for func in lang_analysis.get("defined_functions", []):
-                # We store a mapping of function name to defining file. 
-                # Issue: multiple files can define the same function name.
-                # We'll store a list of files defining it? Or just rely on imports?
-                # Let's try to be slightly smarter: we only care about global uniqueness if we don't check imports.
-                # But we should check imports.
-                pass
 
             self.imports_by_file[path] = set(lang_analysis.get("imports", []))
             self.calls_by_file[path] = set(lang_analysis.get("function_calls", []))
 
+            for imp in self.imports_by_file[path]:
+                # Resolve once through the module table (relative imports and
+                # "module.member" forms included) so "who imports file X" is a single lookup.
+                target = self.modules.resolve(imp, path)
+                if target is not None:
+                    self.importers_by_file.setdefault(target, {}).setdefault(path, []).append(imp)
+            for call in self.calls_by_file[path]:
+                self.callers_by_function.setdefault(call, []).append(path)
+
     def simulate_remove_file(self, file_path: str) -> SimulationResult:
         """Simulate removing a file."""
         impacts = []
         
-        # 1. Check for broken imports
-        # Heuristic: if file B imports something that looks like file_path's module name
-        # We need to convert file path to module notation (e.g. jupiter/core/scanner.py -> jupiter.core.scanner)
-        module_name = self._path_to_module(file_path)
+        # 1. Check for broken imports (imports resolved to this file by the module table)
+        file_path = self._key(file_path)
         
-        for other_path, imports in self.imports_by_file.items():
+        for other_path, imports in self.importers_by_file.get(file_path, {}).items():
             if other_path == file_path:
                 continue
-                
-            # Check if other_path imports this module
-            # Exact match or sub-module match
             for imp in imports:
-                if imp == module_name or imp.startswith(f"{module_name}."):
+                impacts.append(Impact(
+                    target=other_path,
+                    impact_type="broken_import",
+                    details=f"Imports removed module '{imp}'",
+                    severity="high"
+                ))
+
+        # 2. Check for broken calls (functions defined in this file)
+        # We assume if B calls 'func' AND B imports the removed module, it's a hit.
+        for func in self._defined_functions(file_path):
+            for other_path in self.callers_by_function.get(func, []):
+                if other_path == file_path:
+                    continue
+                if self._imports_file(other_path, file_path):
                     impacts.append(Impact(
-                        target=other_path,
-                        impact_type="broken_import",
-                        details=f"Imports removed module '{imp}'",
+                        target=f"{other_path}::{func}", # Approximate location
+                        impact_type="broken_call",
+                        details=f"Calls function '{func}' from removed file",
                         severity="high"
                     ))
 
-        # 2. Check for broken calls (functions defined in this file)
-        target_file = self.file_map.get(file_path)
-        if target_file:
-            defined_funcs = target_file.get("language_analysis", {}).get("defined_functions", [])
-            for func in defined_funcs:
-                # For each function defined in the removed file, see who calls it
-                # This is tricky without full resolution. 
-                # We'll assume if B calls 'func' AND B imports 'module_name', it's a hit.
-                for other_path, calls in self.calls_by_file.items():
-                    if other_path == file_path:
-                        continue
-                    
-                    if func in calls:
-                        # Check if it likely imports it
-                        other_imports = self.imports_by_file.get(other_path, set())
-                        if any(imp == module_name or imp.startswith(f"{module_name}") for imp in other_imports):
-                             impacts.append(Impact(
-                                target=f"{other_path}::{func}", # Approximate location
-                                impact_type="broken_call",
-                                details=f"Calls function '{func}' from removed file",
-                                severity="high"
-                            ))
-
         return self._finalize_result(f"Remove file {file_path}", impacts)
 
     def simulate_remove_function(self, file_path: str, function_name: str) -> SimulationResult:
         """Simulate removing a function from a file."""
         impacts = []
-        module_name = self._path_to_module(file_path)
+        file_path = self._key(file_path)
 
         # Check who calls this function
-        for other_path, calls in self.calls_by_file.items():
-            if function_name in calls:
-                # If it's the same file, it's a broken internal call
-                if other_path == file_path:
-                     impacts.append(Impact(
-                        target=other_path,
-                        impact_type="broken_internal_call",
-                        details=f"Internal call to removed function '{function_name}'",
-                        severity="high"
-                    ))
-                     continue
+        for other_path in self.callers_by_function.get(function_name, []):
+            # If it's the same file, it's a broken internal call
+            if other_path == file_path:
+                impacts.append(Impact(
+                    target=other_path,
+                    impact_type="broken_internal_call",
+                    details=f"Internal call to removed function '{function_name}'",
+                    severity="high"
+                ))
+                continue
 
-                # If it's another file, check if it imports the module
-                other_imports = self.imports_by_file.get(other_path, set())
-                if any(imp == module_name or imp.startswith(f"{module_name}") for imp in other_imports):
-                    impacts.append(Impact(
-                        target=other_path,
-                        impact_type="broken_call",
-                        details=f"Calls removed function '{function_name}'",
-                        severity="high"
-                    ))
+            # If it's another file, check if it imports the module
+            if self._imports_file(other_path, file_path):
+                impacts.append(Impact(
+                    target=other_path,
+                    impact_type="broken_call",
+                    details=f"Calls removed function '{function_name}'",
+                    severity="high"
+                ))
 
         return self._finalize_result(f"Remove function {file_path}::{function_name}", impacts)
 
+    def simulate_move_file(self, file_path: str, new_path: str) -> SimulationResult:
+        """Simulate moving (renaming) a file: importers must follow the new module path."""
+        impacts = []
+        file_path = self._key(file_path)
+        new_path = self._key(new_path)
+        module_name = self._path_to_module(file_path)
+        new_module = self._path_to_module(new_path)
+
+        for other_path, imports in self.importers_by_file.get(file_path, {}).items():
+            if other_path == file_path:
+                continue
+            for imp in imports:
+                # Keep the imported member ("mod.Class" -> "new_mod.Class")
+                absolute = self.modules.absolute_module(imp, other_path) or imp
+                member = absolute[len(module_name):] if absolute.startswith(module_name + ".") else ""
+                impacts.append(Impact(
+                    target=other_path,
+                    impact_type="stale_import",
+                    details=f"Imports moved module '{imp}' (now '{new_module}{member}')",
+                    severity="medium"
+                ))
+
+        return self._finalize_result(f"Move file {file_path} -> {new_path}", impacts)
+
+    def simulate_move_function(self, file_path: str, function_name: str, new_path: str) -> SimulationResult:
+        """Simulate moving a function to another file."""
+        impacts = []
+        file_path = self._key(file_path)
+        new_path = self._key(new_path)
+        module_name = self._path_to_module(file_path)
+        new_module = self._path_to_module(new_path)
+
+        for other_path in self.callers_by_function.get(function_name, []):
+            if other_path == new_path:
+                continue
+            if other_path == file_path:
+                # Remaining code in the source file now needs to import the function
+                impacts.append(Impact(
+                    target=other_path,
+                    impact_type="missing_import",
+                    details=f"Calls '{function_name}', which must now be imported from '{new_module}'",
+                    severity="medium"
+                ))
+                continue
+            if self._imports_file(other_path, file_path):
+                impacts.append(Impact(
+                    target=other_path,
+                    impact_type="stale_import",
+                    details=f"Calls '{function_name}' via '{module_name}', now defined in '{new_module}'",
+                    severity="medium"
+                ))
+
+        return self._finalize_result(f"Move function {file_path}::{function_name} -> {new_path}", impacts)
+
+    def simulate(self, target: SimulationTarget) -> SimulationResult:
+        """Evaluate a single batch target against the shared indices."""
+        if target.action == "remove":
+            if target.function_name:
+                return self.simulate_remove_function(target.path, target.function_name)
+            return self.simulate_remove_file(target.path)
+        if target.action == "move":
+            if not target.new_path:
+                raise ValueError(f"Move target '{target.path}' requires a destination path")
+            if target.function_name:
+                return self.simulate_move_function(target.path, target.function_name, target.new_path)
+            return self.simulate_move_file(target.path, target.new_path)
+        raise ValueError(f"Unknown simulation action '{target.action}'")
+
+    def simulate_batch(self, targets: Iterable[SimulationTarget]) -> BatchSimulationResult:
+        """Evaluate many changes at once and combine their impacts.
+
+        Impacts landing in files that the batch itself removes are dropped, and
+        identical impacts raised by several targets are reported once with every
+        causing target listed in ``sources``.
+        """
+        targets = list(targets)
+        removed_files = {self._key(t.path) for t in targets if t.action == "remove" and not t.function_name}
+
+        results: List[SimulationResult] = []
+        combined: Dict[tuple, BatchImpact] = {}
+        for target in targets:
+            result = self.simulate(target)
+            results.append(result)
+            for impact in result.impacts:
+                if impact.target.partition("::")[0] in removed_files:
+                    continue
+                key = (impact.target, impact.impact_type, impact.details)
+                entry = combined.get(key)
+                if entry is None:
+                    entry = BatchImpact(
+                        target=impact.target,
+                        impact_type=impact.impact_type,
+                        details=impact.details,
+                        severity=impact.severity,
+                    )
+                    combined[key] = entry
+                if target.label not in entry.sources:
+                    entry.sources.append(target.label)
+
+        impacts = list(combined.values())
+        return BatchSimulationResult(
+            results=results,
+            impacts=impacts,
+            risk_score=self._risk_score(impacts),
+        )
+
+    def _defined_functions(self, file_path: str) -> List[str]:
+        target_file = self.file_map.get(file_path)
+        if not target_file:
+            return []
+        return (target_file.get("language_analysis") or {}).get("defined_functions", [])
+
+    def _imports_file(self, file_path: str, imported_path: str) -> bool:
+        """Return True if ``file_path`` imports the module of ``imported_path`` (or a member)."""
+        return file_path in self.importers_by_file.get(imported_path, {})
+
+    def _key(self, path: str) -> str:
+        """Normalize a user-supplied path to the key used by the indices.
+
+        Scan reports may store absolute paths; a path relative to the
+        project root is matched against them.
+        """
+        path = normalize_path(path)
+        if path not in self.file_map and self.modules.root:
+            rooted = f"{self.modules.root}/{path}"
+            if rooted in self.file_map:
+                return rooted
+        return path
+
     def _path_to_module(self, path: str) -> str:
         """Convert file path to python module notation."""
-        p = Path(path)
-        # Remove extension
-        name = p.with_suffix("").as_posix()
-        # Replace slashes with dots
-        return name.replace("/", ".")
+        name = self.modules.module_name(path)
+        if name:
+            return name
+        # Not a Python module path: fall back to a plain dotted path
+        return Path(normalize_path(path)).with_suffix("").as_posix().replace("/", ".")
 
     def _finalize_result(self, target: str, impacts: List[Impact]) -> SimulationResult:
-        risk = "low"
-        if any(i.severity == "high" for i in impacts):
-            risk = "high"
-        elif any(i.severity == "medium" for i in impacts):
-            risk = "medium"
-            
-        return SimulationResult(target=target, impacts=impacts, risk_score=risk)
+        return SimulationResult(target=target, impacts=impacts, risk_score=self._risk_score(impacts))
+
+    @staticmethod
+    def _risk_score(impacts: Iterable[Any]) -> str:
+        severities = {i.severity for i in impacts}
+        if "high" in severities:
+            return "high"
+        if "medium" in severities:
+            return "medium"
+        return "low"
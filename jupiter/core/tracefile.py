@@ -0,0 +1,195 @@
+"""Append-only NDJSON trace files written by ``jupiter.core.tracer``.
+
+The tracer flushes its aggregated counters every few hundred milliseconds
+instead of dumping one JSON document at exit, so a killed process keeps
+everything up to its last flush and memory only holds the current window.
+
+One JSON object per line::
+
+    {"type": "header", "format": "jupiter-trace", "version": 1, "root": ..., "pid": ..., "mode": ...}
+    {"type": "chunk", "seq": 0, "calls": {...}, "times": {...}, "call_graph": {...}}
+    ...
+    {"type": "end", "backend": "monitoring", ...}
+
+Chunks are deltas; ``read_trace`` sums them back into the usual
+``calls``/``times``/``call_graph`` dictionary and ``TraceTail`` reads the
+chunks appended since its last call (for live consumers). A truncated last
+line (process killed mid-write) is ignored.
+
+This module only depends on the standard library: it is imported by the
+tracer inside the traced process.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from typing import Any, Dict, Iterator, Optional
+
+TRACE_FORMAT = "jupiter-trace"
+TRACE_VERSION = 1
+
+# Additive fields of a chunk besides the per-function and per-edge counters
+_COUNTERS = ("samples",)
+
+
+def empty_dynamic() -> Dict[str, Any]:
+    return {"calls": {}, "times": {}, "call_graph": {}}
+
+
+def merge_dynamic(base: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """Add the counters of ``delta`` into ``base`` (in place) and return it.
+
+    Handles ``calls``, ``times``, ``self_times``, ``call_graph``,
+    ``call_graph_times`` and, when present, the sampling ``folded`` stacks
+    and ``samples`` count. Malformed sections in
+    ``base`` are replaced.
+    """
+    for name, zero in (("calls", 0), ("times", 0.0), ("self_times", 0.0), ("folded", 0)):
+        values = delta.get(name)
+        if not values:
+            continue
+        target = base.get(name)
+        if not isinstance(target, dict):
+            target = base[name] = {}
+        for key, value in values.items():
+            target[key] = target.get(key, zero) + value
+
+    for name, zero in (("call_graph", 0), ("call_graph_times", 0.0)):
+        graph = delta.get(name)
+        if not graph:
+            continue
+        target_graph = base.get(name)
+        if not isinstance(target_graph, dict):
+            target_graph = base[name] = {}
+        for caller, callees in graph.items():
+            entry = target_graph.get(caller)
+            if not isinstance(entry, dict):
+                entry = target_graph[caller] = {}
+            for callee, value in callees.items():
+                entry[callee] = entry.get(callee, zero) + value
+
+    for name in _COUNTERS:
+        if name in delta:
+            base[name] = base.get(name, 0) + delta[name]
+    return base
+
+
+class TraceWriter:
+    """Thread-safe NDJSON trace writer (one ``flush()`` per record)."""
+
+    def __init__(self, path: str, **header: Any):
+        self.path = path
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._file = open(path, "w", encoding="utf-8")
+        self._write({
+            "type": "header",
+            "format": TRACE_FORMAT,
+            "version": TRACE_VERSION,
+            "pid": os.getpid(),
+            **header,
+        })
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    def write_chunk(self, delta: Dict[str, Any]) -> None:
+        with self._lock:
+            if self._file.closed:
+                return
+            self._write({"type": "chunk", "seq": self._seq, **delta})
+            self._seq += 1
+
+    def close(self, **summary: Any) -> None:
+        with self._lock:
+            if self._file.closed:
+                return
+            self._write({"type": "end", "chunks": self._seq, **summary})
+            self._file.close()
+
+
+def _iter_records(text: str) -> Iterator[Dict[str, Any]]:
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue  # Truncated write
+        if isinstance(record, dict):
+            yield record
+
+
+def read_trace(path: str) -> Optional[Dict[str, Any]]:
+    """Merge a trace file into one dynamic-analysis dictionary.
+
+    Also accepts the single-document JSON written by older tracers. Header
+    and end-record metadata (``mode``, ``backend``, ``rate``, ...) are
+    copied into the result; ``complete`` is False when the traced process
+    died before writing its end record.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+    except OSError:
+        return None
+    if not text.strip():
+        return None
+
+    try:
+        document = json.loads(text)
+    except json.JSONDecodeError:
+        document = None
+    if isinstance(document, dict) and "type" not in document:
+        return document  # Legacy single JSON document
+
+    result = empty_dynamic()
+    complete = False
+    for record in _iter_records(text):
+        kind = record.get("type")
+        if kind == "chunk":
+            merge_dynamic(result, record)
+        elif kind in ("header", "end"):
+            complete = complete or kind == "end"
+            for key, value in record.items():
+                if key not in ("type", "format", "version", "chunks", "pid") and key not in _COUNTERS:
+                    result[key] = value
+    result["complete"] = complete
+    return result
+
+
+class TraceTail:
+    """Incrementally read the chunks appended to a trace file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._offset = 0
+        self._pending = b""
+        self.finished = False
+
+    def read_new(self) -> Optional[Dict[str, Any]]:
+        """Merged delta of the chunks written since the last call (None if none)."""
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                data = f.read()
+        except OSError:
+            return None
+        if not data:
+            return None
+        self._offset += len(data)
+        data = self._pending + data
+        complete, _, self._pending = data.rpartition(b"\n")
+
+        delta: Optional[Dict[str, Any]] = None
+        for record in _iter_records(complete.decode("utf-8", errors="replace")):
+            kind = record.get("type")
+            if kind == "chunk":
+                delta = merge_dynamic(delta if delta is not None else empty_dynamic(), record)
+            elif kind == "end":
+                self.finished = True
+        return delta
@@ -1,101 +1,740 @@
-"""Dynamic analysis tracer."""
+"""Dynamic analysis tracer.
+
+Records, for every function defined under the project root, how often it
+was called, the time spent in it and who called it. Two backends:
+
+- ``monitoring`` (Python 3.12+): ``sys.monitoring`` (PEP 669) call/return
+  events. Code objects outside the project are disabled after their first
+  event, so library code runs at full speed.
+- ``profile``: ``sys.setprofile`` fallback. Unlike ``sys.settrace`` it
+  receives no line events. Every profiled thread pays for the
+  ``c_call``/``c_return`` events of all its calls, so below Python 3.12
+  only the thread that installs the tracer is profiled unless ``threads``
+  (``JUPITER_TRACER_THREADS=1``) asks for all of them; 3.12+ profiles
+  every thread, as the monitoring backend does.
+
+``SamplingProfiler`` is the statistical alternative for long-running
+workloads: a background thread samples ``sys._current_frames()`` at a fixed
+rate and aggregates the stacks into the same ``calls``/``times``/
+``call_graph`` structure (sample counts and estimated seconds) plus
+flame-graph-ready folded stacks.
+
+Besides the cumulative ``times`` (counted once per outermost frame, so
+recursion is not summed several times), the tracer records ``self_times``
+(time minus the time of project callees) and ``call_graph_times`` (time
+spent under each caller -> callee edge, once per outermost call on that
+edge).
+
+Functions are keyed ``rel/path.py::qualname`` (``co_qualname``, so methods
+keep their class: ``app.py::Worker.run``); before Python 3.11 the key is
+``rel/path.py::name``. Code object -> function key lookups are memoized in
+both backends, so the path filtering and key formatting happen once per
+function instead of on every call.
+
+With a ``sink``, each thread hands its counters to the sink every
+``flush_interval`` seconds and starts a new window, so memory only holds
+the counters of the current window; ``main()`` streams them to an NDJSON
+trace file (see ``jupiter.core.tracefile``).
+"""
 import sys
-import json
+import dis
 import atexit
+import inspect
 import os
+import runpy
+import signal
+import threading
 import time
 from collections import defaultdict
+from types import CodeType
+from typing import Any, Callable, Dict, Optional
 
-class Tracer:
-    def __init__(self, root: str):
-        self.root = os.path.abspath(root)
+from jupiter.core import callstream, tracefile
+from jupiter.core.callstream import DISABLE_ENV, CallPublisher
+from jupiter.core.tracefile import TraceWriter
+
+BACKENDS = ("auto", "monitoring", "profile")
+MODES = ("trace", "sample")
+DEFAULT_SAMPLE_RATE = 100.0  # samples per second
+DEFAULT_FLUSH_INTERVAL = 0.5  # seconds between trace file chunks
+
+_TOOL_NAME = "jupiter-tracer"
+
+_UNSEEN = object()
+
+_GENERATOR_FLAGS = (
+    inspect.CO_GENERATOR | inspect.CO_COROUTINE | inspect.CO_ASYNC_GENERATOR | inspect.CO_ITERABLE_COROUTINE
+)
+
+
+def monitoring_available() -> bool:
+    """True if the ``sys.monitoring`` backend can be used."""
+    return hasattr(sys, "monitoring")
+
+
+class _ThreadState:
+    """Counters and timing stack of one thread (only touched by that thread)."""
+
+    __slots__ = (
+        "thread_id", "calls", "times", "self_times", "call_graph", "call_graph_times",
+        "stack", "active_frames", "depth", "edge_depth", "next_flush",
+    )
+
+    def __init__(self, thread_id: int, next_flush: float = float("inf")):
+        self.thread_id = thread_id
+        self.next_flush = next_flush
         self.calls = defaultdict(int)
         self.times = defaultdict(float)
+        self.self_times = defaultdict(float)
         self.call_graph = defaultdict(lambda: defaultdict(int))
-        self.active_frames = {}
+        self.call_graph_times = defaultdict(lambda: defaultdict(float))
+        # [key, start, callee time, caller key] per running project frame
+        self.stack: list = []
+        # frame -> stack entry for the setprofile backend
+        self.active_frames: dict = {}
+        # Running frames per key and per (caller, callee) edge: time is only
+        # added to times/call_graph_times when the outermost one returns
+        self.depth = defaultdict(int)
+        self.edge_depth = defaultdict(int)
+
+
+class Tracer:
+    """Deterministic call tracer.
+
+    Every thread records into its own ``_ThreadState`` (no locks, no shared
+    counters); ``calls``, ``times``, ``call_graph`` and ``results()`` merge
+    them, and the merged view is kept once recording stops. Generators and
+    coroutines are timed only while running: a suspension
+    (``yield``/``await``) closes the current slice and a resume opens a new
+    one without counting another call.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        backend: str = "auto",
+        sink: Optional[Callable[[Dict[str, Any]], None]] = None,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        threads: Optional[bool] = None,
+    ):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown tracer backend '{backend}' (expected one of {', '.join(BACKENDS)})")
+        self.root = os.path.abspath(root)
+        self._prefix = os.path.join(self.root, "")
+        self.requested_backend = backend
+        self.backend: Optional[str] = None
+        # code object -> "rel/path.py::func" (or None for code outside the root)
+        self._keys: Dict[Any, Optional[str]] = {}
+        # generator/coroutine code object -> f_lasti of its first RESUME
+        self._first_resume: Dict[Any, int] = {}
+        self._local = threading.local()
+        self._states: list = []
+        self._states_lock = threading.Lock()
+        self._tool_id: Optional[int] = None
+        # The tracer's own modules (they run inside the traced process)
+        self._excluded = {
+            os.path.abspath(module.__file__) for module in (sys.modules[__name__], tracefile, callstream)
+        }
+        self._sink = sink
+        self.flush_interval = flush_interval
+        # Profile every thread with the setprofile backend (None: only where
+        # threading.setprofile_all_threads exists, i.e. 3.12+)
+        self.threads = threads
+        # Merged counters, cached after uninstall() until new ones arrive
+        self._stopped = False
+        self._view: Optional[Dict[str, Any]] = None
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Per-thread state
+    # ─────────────────────────────────────────────────────────────────────
+
+    def _state(self) -> _ThreadState:
+        try:
+            return self._local.state
+        except AttributeError:
+            state = _ThreadState(threading.get_ident())
+            if self._sink is not None:
+                state.next_flush = time.perf_counter() + self.flush_interval
+            self._local.state = state
+            with self._states_lock:
+                self._states.append(state)
+            return state
+
+    def _take_delta(self, state: _ThreadState) -> Dict[str, Any]:
+        """Detach the counters of ``state`` (a new window starts empty)."""
+        delta = {
+            "calls": dict(state.calls),
+            "times": dict(state.times),
+            "self_times": dict(state.self_times),
+            "call_graph": {k: dict(v) for k, v in state.call_graph.items()},
+            "call_graph_times": {k: dict(v) for k, v in state.call_graph_times.items()},
+        }
+        state.calls = defaultdict(int)
+        state.times = defaultdict(float)
+        state.self_times = defaultdict(float)
+        state.call_graph = defaultdict(lambda: defaultdict(int))
+        state.call_graph_times = defaultdict(lambda: defaultdict(float))
+        self._view = None
+        return delta
+
+    def _flush_state(self, state: _ThreadState, now: Optional[float] = None) -> None:
+        if self._sink is None:
+            return
+        delta = self._take_delta(state)
+        if delta["calls"] or delta["times"] or delta["call_graph"]:
+            self._sink(delta)
+        state.next_flush = (time.perf_counter() if now is None else now) + self.flush_interval
+
+    def flush(self) -> None:
+        """Hand every thread's pending counters to the sink (e.g. at exit)."""
+        for state in list(self._states):
+            self._flush_state(state)
+
+    def _merged(self) -> Dict[str, Any]:
+        """Counters of every thread merged; recomputed on each access while recording."""
+        view = self._view
+        if view is not None:
+            return view
+        view = {
+            "calls": defaultdict(int),
+            "times": defaultdict(float),
+            "self_times": defaultdict(float),
+            "call_graph": defaultdict(lambda: defaultdict(int)),
+            "call_graph_times": defaultdict(lambda: defaultdict(float)),
+        }
+        for state in list(self._states):
+            for name in ("calls", "times", "self_times"):
+                target = view[name]
+                for key, value in list(getattr(state, name).items()):
+                    target[key] += value
+            for name in ("call_graph", "call_graph_times"):
+                graph = view[name]
+                for caller, callees in list(getattr(state, name).items()):
+                    target = graph[caller]
+                    for callee, value in list(callees.items()):
+                        target[callee] += value
+        if self._stopped:
+            self._view = view
+        return view
+
+    @property
+    def calls(self):
+        return self._merged()["calls"]
+
+    @property
+    def times(self):
+        return self._merged()["times"]
+
+    @property
+    def self_times(self):
+        return self._merged()["self_times"]
+
+    @property
+    def call_graph(self):
+        return self._merged()["call_graph"]
+
+    @property
+    def call_graph_times(self):
+        return self._merged()["call_graph_times"]
+
+    @property
+    def active_frames(self):
+        frames = {}
+        for state in list(self._states):
+            frames.update(state.active_frames)
+        return frames
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Keys
+    # ─────────────────────────────────────────────────────────────────────
+
+    def _key_for_code(self, code) -> Optional[str]:
+        try:
+            return self._keys[code]
+        except KeyError:
+            pass
+        key = None
+        filename = code.co_filename
+        if filename.startswith(self._prefix) and filename not in self._excluded:
+            rel_path = filename[len(self._prefix):].replace(os.sep, "/")
+            # Virtualenvs inside the project (pytest, plugins, ...) are not project code
+            if "/site-packages/" not in rel_path and "/dist-packages/" not in rel_path:
+                # co_qualname (3.11+) keeps the class: "Worker.run", "outer.<locals>.inner"
+                key = f"{rel_path}::{getattr(code, 'co_qualname', code.co_name)}"
+        self._keys[code] = key
+        return key
 
     def _get_func_key(self, frame):
+        return self._key_for_code(frame.f_code)
+
+    def _is_resume(self, frame) -> bool:
+        """True if a ``call`` event re-enters a suspended generator/coroutine."""
         code = frame.f_code
-        filename = code.co_filename
-        
-        # Check if file is within root
-        if not filename.startswith(self.root):
-            return None
+        if not isinstance(code, CodeType) or not code.co_flags & _GENERATOR_FLAGS:
+            return False
+        first = self._first_resume.get(code)
+        if first is None:
+            first = -1
+            for instruction in dis.get_instructions(code):
+                if instruction.opname == "RESUME":
+                    first = instruction.offset
+                    break
+            self._first_resume[code] = first
+        return frame.f_lasti > first
 
-        # Get relative path
-        try:
-            rel_path = os.path.relpath(filename, self.root)
-        except ValueError:
-            return None
-            
-        if rel_path.startswith(".."):
-             return None
+    # ─────────────────────────────────────────────────────────────────────
+    # Timing stack (both backends)
+    # ─────────────────────────────────────────────────────────────────────
 
-        func_name = code.co_name
-        return f"{rel_path}::{func_name}"
+    def _push(self, state: _ThreadState, key: str, caller: Optional[str], now: float) -> list:
+        """Open a timed slice of ``key`` (``caller``: edge to time, None for resumes)."""
+        entry = [key, now, 0.0, caller]
+        state.depth[key] += 1
+        if caller is not None:
+            state.edge_depth[(caller, key)] += 1
+        state.stack.append(entry)
+        return entry
+
+    def _unwind(self, state: _ThreadState, entry: list, now: float) -> None:
+        """Close the slices down to ``entry``; entries above it missed their return."""
+        stack = state.stack
+        while stack:
+            top = stack.pop()
+            key, start, callee_time, caller = top
+            elapsed = now - start
+            state.self_times[key] += elapsed - callee_time
+            if stack:
+                stack[-1][2] += elapsed
+            depth = state.depth[key] - 1
+            if depth:
+                state.depth[key] = depth
+            else:
+                del state.depth[key]
+                state.times[key] += elapsed
+            if caller is not None:
+                edge = (caller, key)
+                depth = state.edge_depth[edge] - 1
+                if depth:
+                    state.edge_depth[edge] = depth
+                else:
+                    del state.edge_depth[edge]
+                    state.call_graph_times[caller][key] += elapsed
+            if top is entry:
+                return
+
+    # ─────────────────────────────────────────────────────────────────────
+    # setprofile backend
+    # ─────────────────────────────────────────────────────────────────────
 
     def trace_func(self, frame, event, arg):
+        if self._stopped:
+            # Below 3.12, threads started before uninstall() keep calling us
+            return None
+        # Hot path: c_call/c_return and non-project frames exit after one lookup
         if event == 'call':
-            key = self._get_func_key(frame)
+            code = frame.f_code
+            key = self._keys.get(code, _UNSEEN)
+            if key is _UNSEEN:
+                key = self._key_for_code(code)
             if key:
-                self.calls[key] += 1
-                self.active_frames[frame] = time.perf_counter()
-                
-                # Track caller -> callee
-                if frame.f_back:
-                    caller_key = self._get_func_key(frame.f_back)
-                    if caller_key:
-                        self.call_graph[caller_key][key] += 1
-            return self.trace_func
+                state = self._state()
+                now = time.perf_counter()
+                if now >= state.next_flush:
+                    self._flush_state(state, now)
+                caller_key = None
+                if not self._is_resume(frame):
+                    state.calls[key] += 1
+
+                    # Track caller -> callee
+                    caller = frame.f_back
+                    if caller is not None:
+                        caller_key = self._key_for_code(caller.f_code)
+                        if caller_key:
+                            state.call_graph[caller_key][key] += 1
+                state.active_frames[frame] = self._push(state, key, caller_key, now)
 
         elif event == 'return':
-            key = self._get_func_key(frame)
-            if key and frame in self.active_frames:
-                start_time = self.active_frames.pop(frame)
-                duration = time.perf_counter() - start_time
-                self.times[key] += duration
-            return self.trace_func
-            
+            # Also a generator/coroutine suspension: close the running slice
+            code = frame.f_code
+            key = self._keys.get(code, _UNSEEN)
+            if key is _UNSEEN:
+                key = self._key_for_code(code)
+            if key:
+                state = self._state()
+                entry = state.active_frames.pop(frame, None)
+                if entry is not None:
+                    self._unwind(state, entry, time.perf_counter())
+
+        # Keeps working when installed with sys.settrace (local trace function)
         return self.trace_func
 
+    # ─────────────────────────────────────────────────────────────────────
+    # sys.monitoring backend
+    # ─────────────────────────────────────────────────────────────────────
+
+    def _on_start(self, code, offset):
+        key = self._key_for_code(code)
+        if key is None:
+            return sys.monitoring.DISABLE
+        state = self._state()
+        now = time.perf_counter()
+        if now >= state.next_flush:
+            self._flush_state(state, now)
+        state.calls[key] += 1
+        caller = None
+        if state.stack:
+            caller = state.stack[-1][0]
+            state.call_graph[caller][key] += 1
+        self._push(state, key, caller, now)
+
+    def _on_resume(self, code, offset):
+        # Generator/coroutine resumed: time it again without counting a call
+        key = self._key_for_code(code)
+        if key is None:
+            return sys.monitoring.DISABLE
+        self._push(self._state(), key, None, time.perf_counter())
+
+    def _on_throw(self, code, offset, exception):
+        # PY_THROW (exception thrown into a suspended generator) is global
+        key = self._key_for_code(code)
+        if key is not None:
+            self._push(self._state(), key, None, time.perf_counter())
+
+    def _on_return(self, code, offset, retval):
+        # Also used for PY_YIELD: a suspended generator is off the stack
+        key = self._key_for_code(code)
+        if key is None:
+            return sys.monitoring.DISABLE
+        self._pop(key)
+
+    def _on_unwind(self, code, offset, exception):
+        # PY_UNWIND is a global event and cannot be disabled per code object
+        key = self._key_for_code(code)
+        if key is not None:
+            self._pop(key)
+
+    def _pop(self, key):
+        now = time.perf_counter()
+        state = self._state()
+        # Missed events (e.g. frames entered before install): close the
+        # entries above the matching one, or ignore an unknown return
+        for entry in reversed(state.stack):
+            if entry[0] == key:
+                self._unwind(state, entry, now)
+                return
+
+    def _monitoring_callbacks(self):
+        events = sys.monitoring.events
+        return (
+            (events.PY_START, self._on_start),
+            (events.PY_RESUME, self._on_resume),
+            (events.PY_THROW, self._on_throw),
+            (events.PY_RETURN, self._on_return),
+            (events.PY_YIELD, self._on_return),
+            (events.PY_UNWIND, self._on_unwind),
+        )
+
+    def _install_monitoring(self) -> bool:
+        mon = sys.monitoring
+        tool_id = mon.PROFILER_ID
+        if mon.get_tool(tool_id) is not None:
+            return False
+        mon.use_tool_id(tool_id, _TOOL_NAME)
+        event_set = 0
+        for event, callback in self._monitoring_callbacks():
+            mon.register_callback(tool_id, event, callback)
+            event_set |= event
+        # Monitoring events fire in every thread, including ones started later
+        mon.set_events(tool_id, event_set)
+        self._tool_id = tool_id
+        return True
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Lifecycle
+    # ─────────────────────────────────────────────────────────────────────
+
+    def install(self) -> str:
+        """Start recording in every thread and return the backend in use."""
+        backend = self.requested_backend
+        self._stopped = False
+        self._view = None
+        if backend in ("auto", "monitoring") and monitoring_available() and self._install_monitoring():
+            self.backend = "monitoring"
+        elif backend == "monitoring":
+            raise RuntimeError("sys.monitoring is unavailable or its profiler slot is already in use")
+        else:
+            all_threads = hasattr(threading, "setprofile_all_threads") if self.threads is None else self.threads
+            if all_threads and hasattr(threading, "setprofile_all_threads"):
+                # 3.12+: also reaches threads that are already running
+                threading.setprofile_all_threads(self.trace_func)
+            else:
+                sys.setprofile(self.trace_func)
+            if all_threads:
+                threading.setprofile(self.trace_func)
+            self.backend = "profile"
+        return self.backend
+
+    def uninstall(self) -> None:
+        """Stop recording."""
+        if self.backend == "monitoring" and self._tool_id is not None:
+            mon = sys.monitoring
+            mon.set_events(self._tool_id, mon.events.NO_EVENTS)
+            for event, _ in self._monitoring_callbacks():
+                mon.register_callback(self._tool_id, event, None)
+            mon.free_tool_id(self._tool_id)
+            self._tool_id = None
+        elif self.backend == "profile":
+            threading.setprofile(None)
+            if hasattr(threading, "setprofile_all_threads"):
+                threading.setprofile_all_threads(None)
+            else:
+                sys.setprofile(None)
+        self.backend = None
+        self._stopped = True
+
+    def summary(self) -> Dict[str, Any]:
+        """Run metadata (written in the trace file's end record)."""
+        return {"mode": "trace", "threads": len(self._states)}
+
+    def results(self) -> Dict[str, Any]:
+        """Plain-dict snapshot (``calls``, ``times``, ``call_graph`` + summary).
+
+        With a sink, only the counters not flushed yet are included.
+        """
+        view = self._merged()
+        results = {
+            "calls": dict(view["calls"]),
+            "times": dict(view["times"]),
+            "self_times": dict(view["self_times"]),
+            "call_graph": {k: dict(v) for k, v in view["call_graph"].items()},
+            "call_graph_times": {k: dict(v) for k, v in view["call_graph_times"].items()},
+        }
+        results.update(self.summary())
+        return results
+
+
+class SamplingProfiler(Tracer):
+    """Statistical profiler sampling every thread's stack from a background thread.
+
+    In the results, ``calls[key]`` is the number of samples in which the
+    function was on the stack, ``times[key]`` the wall-clock time those
+    samples represent (inclusive), ``self_times[key]`` the time of the
+    samples in which it was the innermost project frame, ``call_graph``
+    counts caller -> callee pairs seen in samples and ``call_graph_times``
+    the time of the samples containing each pair. Only project frames are kept, so a stack
+    ``main -> json.dumps -> hook`` is recorded as ``main;hook``.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        rate: float = DEFAULT_SAMPLE_RATE,
+        sink: Optional[Callable[[Dict[str, Any]], None]] = None,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    ):
+        super().__init__(root, sink=sink, flush_interval=flush_interval)
+        if rate <= 0:
+            raise ValueError("Sampling rate must be positive")
+        self.rate = rate
+        self.interval = 1.0 / rate
+        self.samples = 0
+        self._flushed_samples = 0
+        self._sampler_id: Optional[int] = None
+        self.folded = defaultdict(int)
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def install(self) -> str:
+        self._stopped = False
+        self._view = None
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="jupiter-sampler", daemon=True)
+        self._thread.start()
+        self.backend = "sampling"
+        return self.backend
+
+    def uninstall(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.backend = None
+        self._stopped = True
+
+    def _run(self) -> None:
+        own_thread = threading.get_ident()
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            self.sample(now - last, skip_thread=own_thread)
+            last = now
+
+    def sample(self, elapsed: Optional[float] = None, skip_thread: Optional[int] = None) -> None:
+        """Record one sample of every thread (``elapsed`` defaults to the interval)."""
+        weight = self.interval if elapsed is None else elapsed
+        self._sampler_id = threading.get_ident()
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id != skip_thread:
+                self._record_stack(frame, weight)
+        self.samples += 1
+        self._view = None
+        state = self._state()
+        now = time.perf_counter()
+        if now >= state.next_flush:
+            self._flush_state(state, now)
+
+    def _record_stack(self, frame, weight: float) -> None:
+        keys = []
+        while frame is not None:
+            key = self._key_for_code(frame.f_code)
+            if key:
+                keys.append(key)
+            frame = frame.f_back
+        if not keys:
+            return
+        keys.reverse()
+        self.folded[";".join(keys)] += 1
+        state = self._state()
+        for key in set(keys):
+            state.calls[key] += 1
+            state.times[key] += weight
+        state.self_times[keys[-1]] += weight
+        for caller, callee in zip(keys, keys[1:]):
+            state.call_graph[caller][callee] += 1
+        for caller, callee in set(zip(keys, keys[1:])):
+            state.call_graph_times[caller][callee] += weight
+
+    def _take_delta(self, state: _ThreadState) -> Dict[str, Any]:
+        delta = super()._take_delta(state)
+        # Folded stacks and the sample count belong to the sampler thread
+        if state.thread_id == self._sampler_id:
+            folded, self.folded = self.folded, defaultdict(int)
+            delta["folded"] = dict(folded)
+            delta["samples"] = self.samples - self._flushed_samples
+            self._flushed_samples = self.samples
+        return delta
+
+    def summary(self) -> Dict[str, Any]:
+        summary = super().summary()
+        summary.update({"mode": "sample", "rate": self.rate})
+        return summary
+
+    def results(self) -> Dict[str, Any]:
+        results = super().results()
+        results.update({
+            "samples": self.samples - self._flushed_samples,
+            "folded": dict(self.folded),
+        })
+        return results
+
+
+def folded_lines(folded: Dict[str, int]) -> list:
+    """``{"a;b": 3}`` -> ``["a;b 3"]`` (input format of flamegraph.pl / speedscope)."""
+    return [f"{stack} {count}" for stack, count in sorted(folded.items())]
+
+
+def _parse_options(argv: list) -> tuple:
+    """Leading ``--mode``, ``--rate``, ``--flush-interval`` and ``--backend`` options, then positionals."""
+    options = {
+        "mode": "trace",
+        "rate": DEFAULT_SAMPLE_RATE,
+        "flush_interval": DEFAULT_FLUSH_INTERVAL,
+        "backend": os.environ.get("JUPITER_TRACER_BACKEND", "auto"),
+    }
+    args = list(argv)
+    while args and args[0] in ("--mode", "--rate", "--flush-interval", "--backend") and len(args) > 1:
+        name, value = args[0][2:].replace("-", "_"), args[1]
+        options[name] = float(value) if name in ("rate", "flush_interval") else value
+        args = args[2:]
+    return options, args
+
+
 def main():
-    # Usage: python -m jupiter.core.tracer <output_file> <root_dir> <script> [args...]
-    if len(sys.argv) < 4:
-        print("Usage: python -m jupiter.core.tracer <output_file> <root_dir> <script> [args...]", file=sys.stderr)
+    # Usage: python -m jupiter.core.tracer [--mode trace|sample] [--rate HZ] [--flush-interval S]
+    #        [--backend auto|monitoring|profile] <output_file> <root_dir> (<script> | -m <module>) [args...]
+    # <output_file> receives NDJSON chunks every --flush-interval seconds.
+    # The backend can also be forced with JUPITER_TRACER_BACKEND=monitoring|profile;
+    # JUPITER_TRACER_THREADS=1|0 turns profiling of every thread on or off (setprofile backend).
+    options, argv = _parse_options(sys.argv[1:])
+    if len(argv) < 3 or options["mode"] not in MODES:
+        print(
+            "Usage: python -m jupiter.core.tracer [--mode trace|sample] [--rate HZ] "
+            "<output_file> <root_dir> (<script> | -m <module>) [args...]",
+            file=sys.stderr,
+        )
         sys.exit(1)
 
-    output_file = sys.argv[1]
-    root_dir = sys.argv[2]
-    script_path = sys.argv[3]
-    script_args = sys.argv[3:]
+    output_file = argv[0]
+    root_dir = argv[1]
+    module = None
+    if argv[2] == "-m":
+        if len(argv) < 4:
+            print("tracer: -m requires a module name", file=sys.stderr)
+            sys.exit(1)
+        module = argv[3]
+        script_args = argv[3:]
+    else:
+        # Absolute so the script's own functions pass the project-root filter
+        script_path = os.path.abspath(argv[2])
+        script_args = argv[2:]
+
+    writer = TraceWriter(output_file, root=os.path.abspath(root_dir), mode=options["mode"])
+    publisher = None
+    if os.environ.get(DISABLE_ENV, "1") != "0":
+        # Live call counts for the watch panel, if a Jupiter server is listening
+        publisher = CallPublisher(root_dir, interval=options["flush_interval"]).start()
+
+    def sink(delta):
+        writer.write_chunk(delta)
+        if publisher is not None:
+            publisher.push(delta)
+
+    stream = {"sink": sink, "flush_interval": options["flush_interval"]}
+    if options["mode"] == "sample":
+        tracer = SamplingProfiler(root_dir, rate=options["rate"], **stream)
+    else:
+        threads = os.environ.get("JUPITER_TRACER_THREADS")
+        tracer = Tracer(
+            root_dir, backend=options["backend"], threads=None if threads is None else threads == "1", **stream
+        )
+    backend = None
 
-    tracer = Tracer(root_dir)
-    sys.settrace(tracer.trace_func)
-    
     def save_results():
         try:
-            # Convert defaultdicts to dicts for JSON serialization
-            results = {
-                "calls": dict(tracer.calls),
-                "times": dict(tracer.times),
-                "call_graph": {k: dict(v) for k, v in tracer.call_graph.items()}
-            }
-            with open(output_file, 'w') as f:
-                json.dump(results, f, indent=2)
+            tracer.uninstall()
+            tracer.flush()
+            writer.close(backend=backend, **tracer.summary())
+            if publisher is not None:
+                publisher.close()
         except Exception as e:
             print(f"Error saving trace results: {e}", file=sys.stderr)
-    
+
     atexit.register(save_results)
 
+    # SIGTERM normally skips atexit: turn it into a clean exit unless the
+    # traced program installs its own handler
+    if threading.current_thread() is threading.main_thread():
+        try:
+            if signal.getsignal(signal.SIGTERM) == signal.SIG_DFL:
+                signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+        except (ValueError, OSError, AttributeError):
+            pass
+
     # Prepare environment for the script
     sys.argv = script_args
-    sys.path.insert(0, os.path.dirname(os.path.abspath(script_path)))
-    
+    sys.path.insert(0, os.getcwd() if module else os.path.dirname(script_path))
+
     try:
+        if module:
+            # Like ``python -m``: run_module fills sys.argv[0] with the module path
+            backend = tracer.install()
+            runpy.run_module(module, run_name="__main__", alter_sys=True)
+            return
+
         # We use runpy or exec. Exec is simpler for a script file.
         with open(script_path, 'rb') as f:
             code = compile(f.read(), script_path, 'exec')
-            
+
         # Execute in a new namespace
         globs = {
             '__name__': '__main__',
@@ -103,9 +742,11 @@ def main():
             '__doc__': None,
             '__package__': None,
         }
+        backend = tracer.install()
         exec(code, globs)
     except SystemExit:
-        pass
+        # Keep the script's exit status (atexit still writes the trace)
+        raise
     except Exception:
         import traceback
         traceback.print_exc()
@@ -0,0 +1,360 @@
+"""Tracer overhead calibration.
+
+Runs synthetic workloads untraced and under every tracer configuration
+available in this interpreter, and reports how much slower each one runs
+(``ratio`` = traced time / untraced time):
+
+- ``calls``: a tight loop of small function and method calls;
+- ``recursion``: deep recursive calls (naive Fibonacci, tree walk);
+- ``async``: coroutines suspended and resumed through an asyncio loop.
+
+Configurations are the ``monitoring`` (Python 3.12+) and ``profile``
+backends of ``Tracer`` and the ``sample`` mode (``SamplingProfiler``), each
+streaming NDJSON chunks to a trace file exactly like ``jupiter run
+--with-dynamic`` does. Every measurement is the best of ``repeat`` runs.
+
+Reports are saved as ``.jupiter/bench/tracer-<timestamp>.json``; each run
+is compared with the previous report from the same Python version so a
+ratio that grows beyond ``tolerance`` is reported as a regression.
+"""
+
+from __future__ import annotations
+
+import gc
+import importlib.util
+import json
+import logging
+import platform
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from jupiter.core.tracefile import TraceWriter
+from jupiter.core.tracer import DEFAULT_SAMPLE_RATE, SamplingProfiler, Tracer, monitoring_available
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPEAT = 5
+DEFAULT_TOLERANCE = 0.25  # a ratio 25% above the previous report is a regression
+
+WORKLOADS = {
+    "calls": "tight loop of small function and method calls",
+    "recursion": "recursive calls (naive Fibonacci, tree walk)",
+    "async": "coroutines suspended and resumed through asyncio",
+}
+
+# Written into a temporary project root so the tracer records it as project code
+_WORKLOAD_SOURCE = '''
+import asyncio
+
+
+def add(a, b):
+    return a + b
+
+
+class Counter:
+    def __init__(self):
+        self.total = 0
+
+    def bump(self, value):
+        self.total = add(self.total, value)
+
+
+def calls(scale):
+    counter = Counter()
+    for i in range(int(100_000 * scale)):
+        counter.bump(i & 7)
+    return counter.total
+
+
+def fib(n):
+    return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+
+def depth(node):
+    return 1 + max((depth(child) for child in node), default=0)
+
+
+def recursion(scale):
+    tree = []
+    for _ in range(min(300, int(200 * scale))):
+        tree = [tree, []]
+    return sum(fib(18) for _ in range(max(1, int(20 * scale)))) + depth(tree)
+
+
+async def step(value):
+    await asyncio.sleep(0)
+    return value + 1
+
+
+async def worker(count):
+    total = 0
+    for i in range(count):
+        total += await step(i)
+    return total
+
+
+def run_async(scale):
+    async def main():
+        return sum(await asyncio.gather(*(worker(int(200 * scale)) for _ in range(50))))
+
+    return asyncio.run(main())
+'''
+
+_ENTRY_POINTS = {"calls": "calls", "recursion": "recursion", "async": "run_async"}
+
+
+def bench_dir(root: Path) -> Path:
+    return Path(root) / ".jupiter" / "bench"
+
+
+def available_backends() -> List[str]:
+    """Tracer configurations measurable in this interpreter."""
+    backends = ["profile", "sample"]
+    if monitoring_available():
+        backends.insert(0, "monitoring")
+    return backends
+
+
+@dataclass
+class BenchMeasurement:
+    """One workload under one tracer configuration."""
+
+    workload: str
+    backend: str
+    seconds: float
+    ratio: float
+    calls: int = 0
+    previous_ratio: Optional[float] = None
+    regression: bool = False
+    over_budget: bool = False
+
+
+@dataclass
+class TracerBenchReport:
+    """Result of one calibration run."""
+
+    created_at: str
+    python: str
+    implementation: str
+    platform: str
+    jupiter_version: str
+    repeat: int
+    scale: float
+    baseline: Dict[str, float] = field(default_factory=dict)
+    measurements: List[BenchMeasurement] = field(default_factory=list)
+    max_overhead: Optional[float] = None
+    tolerance: float = DEFAULT_TOLERANCE
+    previous: Optional[str] = None
+    path: Optional[str] = None
+
+    @property
+    def regressions(self) -> List[BenchMeasurement]:
+        return [m for m in self.measurements if m.regression]
+
+    @property
+    def over_budget(self) -> List[BenchMeasurement]:
+        return [m for m in self.measurements if m.over_budget]
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.pop("path")
+        return data
+
+    def describe(self) -> str:
+        lines = [
+            f"Tracer overhead (Python {self.python}, best of {self.repeat}, scale {self.scale:g})",
+            f"{'workload':<10} {'backend':<11} {'untraced':>10} {'traced':>10} {'ratio':>8} {'previous':>9}",
+        ]
+        for m in self.measurements:
+            previous = f"{m.previous_ratio:.2f}x" if m.previous_ratio is not None else "-"
+            flags = (" REGRESSION" if m.regression else "") + (" OVER BUDGET" if m.over_budget else "")
+            lines.append(
+                f"{m.workload:<10} {m.backend:<11} {self.baseline[m.workload]:>9.4f}s {m.seconds:>9.4f}s "
+                f"{m.ratio:>7.2f}x {previous:>9}{flags}"
+            )
+        if self.max_overhead is not None:
+            lines.append(f"Budget: {self.max_overhead:.2f}x ({len(self.over_budget)} over)")
+        if self.previous:
+            lines.append(f"Compared with {self.previous} (tolerance {self.tolerance:.0%})")
+        if self.path:
+            lines.append(f"Saved to {self.path}")
+        return "\n".join(lines)
+
+
+def _load_workloads(directory: Path) -> Any:
+    path = directory / "jupiter_bench_workloads.py"
+    path.write_text(_WORKLOAD_SOURCE, encoding="utf-8")
+    spec = importlib.util.spec_from_file_location("jupiter_bench_workloads", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)  # type: ignore[union-attr]
+    return module
+
+
+def _timed(func: Callable[[], Any]) -> float:
+    gc.collect()
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def _traced_run(func: Callable[[], Any], root: Path, backend: str, trace_path: Path) -> tuple:
+    """Time ``func`` under ``backend`` with a streaming trace file; return (seconds, calls)."""
+    writer = TraceWriter(str(trace_path), root=str(root), mode="sample" if backend == "sample" else "trace")
+    recorded = [0]
+
+    def sink(delta: Dict[str, Any]) -> None:
+        writer.write_chunk(delta)
+        recorded[0] += sum(delta.get("calls", {}).values())
+
+    if backend == "sample":
+        tracer = SamplingProfiler(str(root), rate=DEFAULT_SAMPLE_RATE, sink=sink)
+    else:
+        tracer = Tracer(str(root), backend=backend, sink=sink)
+    gc.collect()
+    start = time.perf_counter()
+    tracer.install()
+    try:
+        func()
+    finally:
+        tracer.uninstall()
+        tracer.flush()
+        elapsed = time.perf_counter() - start
+        writer.close(**tracer.summary())
+    return elapsed, recorded[0]
+
+
+def load_bench_reports(root: Path) -> List[Dict[str, Any]]:
+    """Saved reports, oldest first."""
+    reports = []
+    for path in sorted(bench_dir(root).glob("tracer-*.json")):
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        data["file"] = path.name
+        reports.append(data)
+    return reports
+
+
+def _previous_report(root: Path, python: str) -> Optional[Dict[str, Any]]:
+    minor = ".".join(python.split(".")[:2])
+    for data in reversed(load_bench_reports(root)):
+        if ".".join(str(data.get("python", "")).split(".")[:2]) == minor:
+            return data
+    return None
+
+
+def run_tracer_bench(
+    root: Path,
+    workloads: Optional[Sequence[str]] = None,
+    backends: Optional[Sequence[str]] = None,
+    repeat: int = DEFAULT_REPEAT,
+    scale: float = 1.0,
+    max_overhead: Optional[float] = None,
+    tolerance: float = DEFAULT_TOLERANCE,
+    save: bool = True,
+) -> TracerBenchReport:
+    """Measure tracer overhead on the synthetic workloads.
+
+    Args:
+        root: Project root; the report goes to ``<root>/.jupiter/bench/``.
+        workloads: Subset of ``WORKLOADS`` (all by default).
+        backends: Subset of ``available_backends()`` (all by default).
+        repeat: Runs per measurement (the fastest is kept).
+        scale: Workload size multiplier.
+        max_overhead: Budget: measurements with a higher ratio are flagged.
+        tolerance: Relative ratio increase over the previous report that
+            counts as a regression.
+        save: Write the report to ``.jupiter/bench/``.
+
+    Raises:
+        ValueError: Unknown workload or a backend unavailable here.
+    """
+    workloads = list(workloads or WORKLOADS)
+    unknown = [w for w in workloads if w not in WORKLOADS]
+    if unknown:
+        raise ValueError(f"Unknown workload(s): {', '.join(unknown)} (expected {', '.join(WORKLOADS)})")
+    available = available_backends()
+    backends = list(backends or available)
+    unavailable = [b for b in backends if b not in available]
+    if unavailable:
+        raise ValueError(f"Backend(s) not available here: {', '.join(unavailable)} (available: {', '.join(available)})")
+    repeat = max(1, int(repeat))
+
+    from jupiter import __version__
+
+    python = platform.python_version()
+    report = TracerBenchReport(
+        created_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        python=python,
+        implementation=platform.python_implementation(),
+        platform=platform.platform(terse=True),
+        jupiter_version=__version__,
+        repeat=repeat,
+        scale=scale,
+        max_overhead=max_overhead,
+        tolerance=tolerance,
+    )
+
+    with tempfile.TemporaryDirectory(prefix="jupiter-bench-") as tmp:
+        work_root = Path(tmp)
+        module = _load_workloads(work_root)
+        try:
+            for name in workloads:
+                entry = getattr(module, _ENTRY_POINTS[name])
+
+                def func(entry=entry) -> Any:
+                    return entry(scale)
+
+                func()  # warm-up (imports, caches)
+                untraced: List[float] = []
+                traced: Dict[str, List[float]] = {b: [] for b in backends}
+                calls: Dict[str, int] = {}
+                # Interleaved so drift (CPU frequency, other load) hits every configuration alike
+                for _ in range(repeat):
+                    untraced.append(_timed(func))
+                    for backend in backends:
+                        seconds, recorded = _traced_run(func, work_root, backend, work_root / f"{name}-{backend}.ndjson")
+                        traced[backend].append(seconds)
+                        calls[backend] = recorded
+                baseline = min(untraced)
+                report.baseline[name] = baseline
+                for backend in backends:
+                    seconds = min(traced[backend])
+                    report.measurements.append(BenchMeasurement(
+                        workload=name,
+                        backend=backend,
+                        seconds=seconds,
+                        ratio=seconds / baseline if baseline > 0 else 0.0,
+                        calls=calls[backend],
+                    ))
+        finally:
+            sys.modules.pop("jupiter_bench_workloads", None)
+
+    previous = _previous_report(root, python)
+    if previous:
+        report.previous = previous["file"]
+        ratios = {(m.get("workload"), m.get("backend")): m.get("ratio") for m in previous.get("measurements", [])}
+        for m in report.measurements:
+            before = ratios.get((m.workload, m.backend))
+            if isinstance(before, (int, float)) and before > 0:
+                m.previous_ratio = before
+                m.regression = m.ratio > before * (1 + tolerance)
+    if max_overhead is not None:
+        for m in report.measurements:
+            m.over_budget = m.ratio > max_overhead
+
+    if save:
+        directory = bench_dir(root)
+        directory.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S-%f")
+        path = directory / f"tracer-{stamp}.json"
+        path.write_text(json.dumps(report.to_dict(), indent=2), encoding="utf-8")
+        report.path = str(path)
+        logger.info("Tracer benchmark saved to %s", path)
+    return report
@@ -5,14 +5,19 @@ Live Map Plugin - Bridge v2 Structure
 Interactive dependency graph visualization using D3.js.
 Features file-level and directory-level dependency graphs.
 
-Version: 0.3.2 - Added API router contribution for /plugins/livemap/graph endpoint
+Version: 0.7.0 - Compact graph transport format
 """
 
 from __future__ import annotations
 
+import asyncio
+from pathlib import Path
 from typing import Any, Optional
 
-__version__ = "0.3.2"
+__version__ = "0.7.0"
+
+# Topic used to push graph deltas to WebUI clients (forwarded by the WS bridge)
+GRAPH_DELTA_TOPIC = "livemap.graph.delta"
 
 # Module-level logger (set during init)
 _logger: Any = None
@@ -20,6 +25,8 @@ _logger: Any = None
 # Plugin state
 _last_graph: Optional[dict[str, Any]] = None
 _config: dict[str, Any] = {}
+_model: Any = None  # LiveGraphModel, created lazily
+_model_root: Optional[str] = None
 
 
 def init(bridge) -> bool:
@@ -35,6 +42,14 @@ def init(bridge) -> bool:
     global _logger
     _logger = bridge.services.get_logger("livemap")
     
+    # Keep the live graph in sync with every completed scan
+    try:
+        from jupiter.core.bridge.events import get_event_bus, EventTopic
+        get_event_bus().subscribe(EventTopic.SCAN_FINISHED.value, _on_scan_finished, plugin_id="livemap")
+    except Exception as e:
+        if _logger:
+            _logger.debug("Event bus not available: %s", e)
+    
     if _logger:
         _logger.info("Live Map plugin initialized (v%s)", __version__)
     
@@ -43,11 +58,18 @@ def init(bridge) -> bool:
 
 def shutdown() -> None:
     """Clean up plugin resources."""
-    global _last_graph, _config
+    global _last_graph, _config, _model, _model_root
     if _logger:
         _logger.info("Live Map plugin shutting down")
+    try:
+        from jupiter.core.bridge.events import get_event_bus
+        get_event_bus().unsubscribe_plugin("livemap")
+    except Exception:
+        pass
     _last_graph = None
     _config = {}
+    _model = None
+    _model_root = None
 
 
 def configure(config: dict[str, Any]) -> None:
@@ -88,8 +110,6 @@ def on_scan(scan_result: dict[str, Any], config: dict[str, Any]) -> None:
         scan_result: The scan result dictionary
         config: Plugin configuration
     """
-    global _last_graph
-    
     if not config.get("enabled", True):
         return
     
@@ -98,22 +118,60 @@ def on_scan(scan_result: dict[str, Any], config: dict[str, Any]) -> None:
         return
     
     try:
-        from jupiter.plugins.livemap.core.graph import GraphBuilder
-        
-        simplify = config.get("simplify", False)
-        max_nodes = config.get("max_nodes", 1000)
-        
-        builder = GraphBuilder(files, simplify=simplify, max_nodes=max_nodes)
-        graph = builder.build()
-        _last_graph = graph.to_dict()
-        
+        update_graph(files, project_root=scan_result.get("project_path"))
+    except Exception as e:
         if _logger:
-            _logger.info("Live Map: Built graph with %d nodes, %d links",
-                         len(_last_graph.get("nodes", [])),
-                         len(_last_graph.get("links", [])))
+            _logger.error("Live Map failed to update graph: %s", e)
+
+
+def _on_scan_finished(topic: str, payload: dict[str, Any]) -> None:
+    """Apply the freshly cached scan to the live graph (scan.finished subscriber).
+    
+    The event is emitted on the server's event loop: reading the report and
+    diffing it against the model run in a worker thread, and the delta is
+    published back on the loop (WebSocket forwarding schedules tasks there).
+    """
+    if not get_config().get("enabled", True):
+        return
+    project_root = payload.get("project_root")
+    if not project_root:
+        return
+    
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # No loop to keep responsive (CLI, tests)
+        _publish_delta(_apply_cached_scan(project_root))
+        return
+    future = loop.run_in_executor(None, _apply_cached_scan, project_root)
+    # Done callbacks run on the loop
+    future.add_done_callback(_on_cached_scan_applied)
+
+
+def _apply_cached_scan(project_root: str) -> Any:
+    """Apply the cached scan of ``project_root`` to the model; return the delta (None without a scan)."""
+    from jupiter.core.cache import CacheManager
+    
+    cache = CacheManager(Path(project_root))
+    # Taken before reading: a report replaced meanwhile is applied again later
+    stamp = cache.last_scan_stamp()
+    last_scan = cache.load_last_scan()
+    if not last_scan or "files" not in last_scan:
+        return None
+    model = get_graph_model(project_root)
+    delta = model.apply_scan(last_scan["files"])
+    model.scan_stamp = stamp
+    return delta
+
+
+def _on_cached_scan_applied(future: "asyncio.Future[Any]") -> None:
+    try:
+        delta = future.result()
     except Exception as e:
         if _logger:
-            _logger.error("Live Map failed to build graph: %s", e)
+            _logger.error("Live Map failed to update graph: %s", e)
+        return
+    _publish_delta(delta)
 
 
 def on_analyze(analysis_result: dict[str, Any], config: dict[str, Any]) -> None:
@@ -131,19 +189,96 @@ def on_analyze(analysis_result: dict[str, Any], config: dict[str, Any]) -> None:
 # Public API
 # ─────────────────────────────────────────────────────────────────────────────
 
+def get_graph_model(project_root: Optional[str] = None) -> Any:
+    """
+    Return the live graph model, resetting it when the project root changes.
+    
+    Args:
+        project_root: Root the caller works on (None keeps the current model)
+        
+    Returns:
+        The LiveGraphModel instance
+    """
+    global _model, _model_root
+    
+    from jupiter.plugins.livemap.core.model import LiveGraphModel
+    
+    root = str(project_root) if project_root is not None else _model_root
+    if _model is None or root != _model_root:
+        _model = LiveGraphModel(root=root, source_roots=_source_roots(root))
+        _model_root = root
+    return _model
+
+
+def _source_roots(project_root: Optional[str]) -> list[str]:
+    """Read ``performance.source_roots`` from the project configuration."""
+    if not project_root:
+        return []
+    try:
+        from jupiter.config import load_config
+        return list(load_config(Path(project_root)).performance.source_roots)
+    except Exception as e:
+        if _logger:
+            _logger.debug("Could not read source roots for %s: %s", project_root, e)
+        return []
+
+
+def update_graph(files: list[dict[str, Any]], project_root: Optional[str] = None) -> dict[str, Any]:
+    """
+    Apply a scan file list to the live graph and push the resulting delta.
+    
+    Only changed nodes and edges are published (topic ``livemap.graph.delta``),
+    so connected WebUI clients patch their graph instead of reloading it.
+    
+    Args:
+        files: List of file dictionaries from scan
+        project_root: Project the files belong to
+        
+    Returns:
+        The delta dictionary (empty lists when nothing changed)
+    """
+    return _publish_delta(get_graph_model(project_root).apply_scan(files))
+
+
+def _publish_delta(delta: Any) -> dict[str, Any]:
+    """Publish a non-empty model delta on the event bus; return its dictionary."""
+    if delta is None:
+        return {}
+    payload = delta.to_dict()
+    
+    if not delta.is_empty():
+        if _logger:
+            _logger.info("Live Map: graph v%d (%d nodes changed, %d links changed)",
+                         delta.version,
+                         len(delta.nodes_added) + len(delta.nodes_updated) + len(delta.nodes_removed),
+                         len(delta.links_added) + len(delta.links_updated) + len(delta.links_removed))
+        try:
+            from jupiter.core.bridge.events import get_event_bus
+            get_event_bus().emit(GRAPH_DELTA_TOPIC, payload, source_plugin="livemap")
+        except Exception as e:
+            if _logger:
+                _logger.debug("Could not publish graph delta: %s", e)
+    
+    return payload
+
+
 def get_last_graph() -> Optional[dict[str, Any]]:
     """
-    Return the last built graph.
+    Return the current graph.
     
     Returns:
-        The graph dictionary or None
+        The live model's graph once a scan was applied, otherwise the last
+        ``build_graph()`` result (or None)
     """
+    if _model is not None and _model.file_count:
+        return _model.to_dict()
     return _last_graph
 
 
 def build_graph(files: list[dict[str, Any]], 
                 simplify: bool = False, 
-                max_nodes: int = 1000) -> dict[str, Any]:
+                max_nodes: int = 1000,
+                project_root: Optional[str] = None) -> dict[str, Any]:
     """
     Build a new dependency graph from files.
     
@@ -151,6 +286,7 @@ def build_graph(files: list[dict[str, Any]],
         files: List of file dictionaries from scan
         simplify: Whether to use simplified mode
         max_nodes: Maximum nodes before auto-simplify
+        project_root: Project the files belong to (for module resolution)
         
     Returns:
         Graph dictionary with nodes and links
@@ -163,7 +299,10 @@ def build_graph(files: list[dict[str, Any]],
         _logger.info("Building graph: %d files, simplify=%s, max_nodes=%d",
                      len(files), simplify, max_nodes)
     
-    builder = GraphBuilder(files, simplify=simplify, max_nodes=max_nodes)
+    builder = GraphBuilder(
+        files, simplify=simplify, max_nodes=max_nodes,
+        root=project_root, source_roots=_source_roots(project_root)
+    )
     graph = builder.build()
     _last_graph = graph.to_dict()
     
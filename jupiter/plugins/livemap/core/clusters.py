@@ -0,0 +1,203 @@
+"""
+Live Map Plugin - Level-of-Detail Clustering
+============================================
+
+Hierarchical package tree over the live graph. Sizes, file counts and import
+edge weights are aggregated once per graph version; views then only contain
+the clusters visible at a zoom level plus the clusters the client expanded.
+
+Version: 0.5.0
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional
+
+from jupiter.plugins.livemap.core.graph import GraphEdge, GraphNode
+
+logger = logging.getLogger(__name__)
+
+ROOT_ID = ""
+
+
+@dataclass
+class Cluster:
+    """A directory (or a single file) in the package tree."""
+    id: str
+    label: str
+    depth: int
+    parent: Optional[str]
+    is_file: bool = False
+    size: int = 0
+    file_count: int = 0
+    group: Optional[str] = None
+    children: list[str] = field(default_factory=list)
+
+    def to_node(self) -> dict[str, Any]:
+        """Serialize as a graph node understood by the Live Map UI."""
+        return {
+            "id": self.id,
+            "type": "file" if self.is_file else "cluster",
+            "label": self.label,
+            "size": self.size,
+            "complexity": 0,
+            "group": self.group if self.is_file else "directory",
+            "depth": self.depth,
+            "file_count": self.file_count,
+            "expandable": bool(self.children),
+        }
+
+
+class ClusterTree:
+    """Package tree with aggregated sizes and per-depth edge weights."""
+
+    def __init__(self, file_nodes: Iterable[GraphNode], import_links: Iterable[GraphEdge]):
+        self.clusters: dict[str, Cluster] = {
+            ROOT_ID: Cluster(id=ROOT_ID, label="/", depth=0, parent=None)
+        }
+        self.max_depth = 0
+
+        for node in file_nodes:
+            self._add_file(node)
+
+        # Aggregated edge weights between clusters of the same depth:
+        # edges_by_depth[d][(a, b)] where a and b are the depth-d ancestors
+        # (or the files themselves when shallower) of each link's endpoints.
+        self.edges_by_depth: list[dict[tuple[str, str], int]] = [
+            {} for _ in range(self.max_depth + 1)
+        ]
+        for link in import_links:
+            if link.source not in self.clusters or link.target not in self.clusters:
+                continue
+            for depth in range(1, self.max_depth + 1):
+                source = self.ancestor_at(link.source, depth)
+                target = self.ancestor_at(link.target, depth)
+                if source != target:
+                    edges = self.edges_by_depth[depth]
+                    edges[(source, target)] = edges.get((source, target), 0) + link.weight
+
+        logger.debug(
+            "Cluster tree built: %d clusters, max depth %d",
+            len(self.clusters), self.max_depth
+        )
+
+    def _add_file(self, node: GraphNode) -> None:
+        parts = node.id.split("/")
+        parent_id = ROOT_ID
+        for depth, part in enumerate(parts[:-1], start=1):
+            cluster_id = "/".join(parts[:depth])
+            cluster = self.clusters.get(cluster_id)
+            if cluster is None:
+                cluster = Cluster(id=cluster_id, label=part, depth=depth, parent=parent_id)
+                self.clusters[cluster_id] = cluster
+                self.clusters[parent_id].children.append(cluster_id)
+            parent_id = cluster_id
+
+        depth = len(parts)
+        self.clusters[node.id] = Cluster(
+            id=node.id,
+            label=node.label,
+            depth=depth,
+            parent=parent_id,
+            is_file=True,
+            size=node.size,
+            file_count=1,
+            group=node.group,
+        )
+        self.clusters[parent_id].children.append(node.id)
+        self.max_depth = max(self.max_depth, depth)
+
+        # Aggregate size and file count up the chain
+        ancestor: Optional[str] = parent_id
+        while ancestor is not None:
+            cluster = self.clusters[ancestor]
+            cluster.size += node.size
+            cluster.file_count += 1
+            ancestor = cluster.parent
+
+    def ancestor_at(self, cluster_id: str, depth: int) -> str:
+        """Return the ancestor of ``cluster_id`` at ``depth`` (itself if shallower)."""
+        cluster = self.clusters[cluster_id]
+        if cluster.depth <= depth:
+            return cluster_id
+        return "/".join(cluster_id.split("/")[:depth])
+
+    def level_size(self, level: int) -> int:
+        """Number of nodes visible at ``level`` without expansions."""
+        return sum(
+            1 for c in self.clusters.values()
+            if c.id != ROOT_ID and (c.depth == level or (c.is_file and c.depth < level))
+        )
+
+    def auto_level(self, max_nodes: int) -> int:
+        """Deepest level whose view stays within ``max_nodes`` (at least 1)."""
+        level = 1
+        for candidate in range(1, self.max_depth + 1):
+            if self.level_size(candidate) > max_nodes:
+                break
+            level = candidate
+        return level
+
+    def view(
+        self,
+        level: int = 1,
+        expanded: Iterable[str] = (),
+        focus: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """Build the visible graph for a zoom level.
+
+        Args:
+            level: Depth of the clusters shown by default.
+            expanded: Cluster IDs replaced by their children.
+            focus: Optional cluster the viewport is restricted to.
+
+        Returns:
+            ``nodes``/``links`` for the visible clusters, with link weights
+            summed over the underlying import edges.
+        """
+        focus_id = focus.strip("/") if focus else ROOT_ID
+        if focus_id not in self.clusters:
+            raise KeyError(focus_id)
+        expanded_set = {e.strip("/") for e in expanded if e.strip("/") in self.clusters}
+        focus_depth = self.clusters[focus_id].depth
+        level = max(level, focus_depth + 1)
+
+        visible: list[str] = []
+        stack = list(reversed(self.clusters[focus_id].children))
+        while stack:
+            cluster = self.clusters[stack.pop()]
+            if cluster.children and (cluster.depth < level or cluster.id in expanded_set):
+                stack.extend(reversed(cluster.children))
+            else:
+                visible.append(cluster.id)
+
+        visible_set = set(visible)
+        deepest = max((self.clusters[c].depth for c in visible), default=0)
+        links: dict[tuple[str, str], int] = {}
+        for (source, target), weight in self.edges_by_depth[deepest].items() if deepest else ():
+            source_rep = self._representative(source, visible_set)
+            target_rep = self._representative(target, visible_set)
+            if source_rep is None or target_rep is None or source_rep == target_rep:
+                continue
+            links[(source_rep, target_rep)] = links.get((source_rep, target_rep), 0) + weight
+
+        return {
+            "nodes": [self.clusters[c].to_node() for c in visible],
+            "links": [
+                {"source": s, "target": t, "type": "dependency", "weight": w}
+                for (s, t), w in links.items()
+            ],
+            "level": level,
+            "focus": focus_id,
+            "expanded": sorted(expanded_set),
+            "total_files": self.clusters[ROOT_ID].file_count,
+        }
+
+    def _representative(self, cluster_id: str, visible: set[str]) -> Optional[str]:
+        """Walk up from ``cluster_id`` to the visible cluster containing it."""
+        current: Optional[str] = cluster_id
+        while current is not None and current not in visible:
+            current = self.clusters[current].parent
+        return current
@@ -4,7 +4,7 @@ Live Map Plugin - Graph Builder
 
 Builds dependency graphs from scan results.
 
-Version: 0.3.0
+Version: 0.6.0
 """
 
 from __future__ import annotations
@@ -12,7 +12,9 @@ from __future__ import annotations
 import logging
 from dataclasses import dataclass, asdict, field
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
+
+from jupiter.core.modules import ModuleTable
 
 logger = logging.getLogger(__name__)
 
@@ -51,12 +53,45 @@ class DependencyGraph:
         }
 
 
+def make_file_node(path: str, file: dict[str, Any]) -> GraphNode:
+    """Create the node representing a scanned file (``path`` already normalized)."""
+    file_type = file.get("file_type", "")
+    group = "file"
+    if file_type in ("js", "ts", "jsx", "tsx"):
+        group = "js_file"
+    elif file_type == "py":
+        group = "py_file"
+
+    return GraphNode(
+        id=path,
+        type="file",
+        label=path.split("/")[-1],
+        size=file.get("size_bytes", 0),
+        group=group
+    )
+
+
+def make_function_nodes(file_id: str, functions: list[str]) -> list[GraphNode]:
+    """Create the function nodes contained in a file."""
+    return [
+        GraphNode(
+            id=f"{file_id}::{func}",
+            type="function",
+            label=func,
+            group="function"
+        )
+        for func in functions
+    ]
+
+
 class GraphBuilder:
     """Builds a dependency graph from scan results."""
 
     def __init__(self, files: list[dict[str, Any]], 
                  simplify: bool = False, 
-                 max_nodes: int = 1000):
+                 max_nodes: int = 1000,
+                 root: Optional[str] = None,
+                 source_roots: Iterable[str] = ()):
         """
         Initialize the graph builder.
         
@@ -64,6 +99,8 @@ class GraphBuilder:
             files: List of file dictionaries from scan
             simplify: Whether to use simplified (directory-level) mode
             max_nodes: Maximum nodes before auto-enabling simplify
+            root: Project root the scanned paths are relative to (inferred if omitted)
+            source_roots: Extra import roots (e.g. ``src``) for module resolution
         """
         self.files = files
         self.simplify = simplify
@@ -76,23 +113,12 @@ class GraphBuilder:
             len(files), simplify, max_nodes
         )
         
-        # Build lookup maps for faster import resolution
+        # Module-resolution table: imports resolve with dictionary lookups
         self.file_map: dict[str, str] = {}
-        self.filename_index: dict[str, list[str]] = {}
-        
         for f in self.files:
             path = f["path"].replace("\\", "/")
             self.file_map[path] = path
-            
-            filename = path.split("/")[-1]
-            if filename not in self.filename_index:
-                self.filename_index[filename] = []
-            self.filename_index[filename].append(path)
-        
-        logger.debug(
-            "File index built: %d unique paths, %d unique filenames",
-            len(self.file_map), len(self.filename_index)
-        )
+        self.modules = ModuleTable(self.file_map, root=root, source_roots=source_roots)
 
     def build(self) -> DependencyGraph:
         """Build and return the dependency graph."""
@@ -203,7 +229,7 @@ class GraphBuilder:
             imports_found += len(imports)
             
             for imp in imports:
-                target_path = self._resolve_import_path(imp)
+                target_path = self._resolve_import_path(imp, source_path)
                 if target_path and target_path in file_to_dir:
                     imports_resolved += 1
                     target_dir = file_to_dir[target_path]
@@ -226,22 +252,9 @@ class GraphBuilder:
         """Process a single file and add nodes/edges."""
         path = file["path"].replace("\\", "/")
         file_id = path
-        
-        file_type = file.get("file_type", "")
-        group = "file"
-        if file_type in ("js", "ts", "jsx", "tsx"):
-            group = "js_file"
-        elif file_type == "py":
-            group = "py_file"
 
         # Add file node
-        self.nodes[file_id] = GraphNode(
-            id=file_id,
-            type="file",
-            label=path.split("/")[-1],
-            size=file.get("size_bytes", 0),
-            group=group
-        )
+        self.nodes[file_id] = make_file_node(path, file)
 
         lang_analysis = file.get("language_analysis") or {}
         
@@ -251,7 +264,7 @@ class GraphBuilder:
         imports_resolved = 0
         
         for imp in imports:
-            target_path = self._resolve_import_path(imp)
+            target_path = self._resolve_import_path(imp, path)
             if target_path and target_path in self.file_map:
                 imports_resolved += 1
                 self.links.append(GraphEdge(
@@ -261,96 +274,23 @@ class GraphBuilder:
                 ))
 
         # Process functions (nodes)
-        functions = lang_analysis.get("defined_functions", [])
-        for func in functions:
-            func_id = f"{file_id}::{func}"
-            self.nodes[func_id] = GraphNode(
-                id=func_id,
-                type="function",
-                label=func,
-                group="function"
-            )
+        for func_node in make_function_nodes(file_id, lang_analysis.get("defined_functions", [])):
+            self.nodes[func_node.id] = func_node
             # Link function to file
             self.links.append(GraphEdge(
                 source=file_id,
-                target=func_id,
+                target=func_node.id,
                 type="contains"
             ))
         
         return {"imports_found": imports_found, "imports_resolved": imports_resolved}
 
-    def _resolve_import_path(self, import_name: str) -> Optional[str]:
+    def _resolve_import_path(self, import_name: str, importer: Optional[str] = None) -> Optional[str]:
         """
         Resolve import name to file path.
         
-        Handles Python imports (jupiter.core.scanner -> jupiter/core/scanner.py)
-        and JS/TS relative imports.
+        Handles Python imports (jupiter.core.scanner -> jupiter/core/scanner.py),
+        relative Python imports (..core -> resolved against ``importer``) and
+        JS/TS relative specifiers, through the shared module table.
         """
-        if not import_name:
-            return None
-            
-        # Skip external/stdlib packages
-        if "." not in import_name and "/" not in import_name and "\\" not in import_name:
-            for ext in (".py", ".js", ".ts", ".jsx", ".tsx"):
-                if import_name + ext in self.file_map:
-                    return self.file_map[import_name + ext]
-            return None
-        
-        # Normalize path separators
-        normalized = import_name.replace("\\", "/").replace(".", "/")
-        
-        if normalized.startswith("/"):
-            normalized = normalized[1:]
-        
-        # Try multiple resolution strategies
-        py_extensions = [".py", "/__init__.py"]
-        js_extensions = [".js", ".ts", ".jsx", ".tsx", "/index.js", "/index.ts"]
-        
-        for ext in py_extensions + js_extensions:
-            path_candidate = normalized + ext
-            
-            # Direct match
-            if path_candidate in self.file_map:
-                return self.file_map[path_candidate]
-            
-            # Suffix match
-            for full_path in self.file_map:
-                if full_path.endswith(path_candidate) or full_path.endswith("/" + path_candidate):
-                    return full_path
-        
-        # Try progressively shorter paths
-        parts = normalized.split("/")
-        while len(parts) > 1:
-            partial_path = "/".join(parts)
-            for ext in py_extensions + js_extensions:
-                path_candidate = partial_path + ext
-                
-                if path_candidate in self.file_map:
-                    return self.file_map[path_candidate]
-                
-                for full_path in self.file_map:
-                    if full_path.endswith(path_candidate) or full_path.endswith("/" + path_candidate):
-                        return full_path
-            
-            parts = parts[:-1]
-        
-        # Fuzzy match on filename
-        target_name = normalized.split("/")[-1] if "/" in normalized else normalized
-        for ext in [".py", ".js", ".ts", ".jsx", ".tsx"]:
-            candidates = self.filename_index.get(target_name + ext, [])
-            
-            parts = normalized.split("/")
-            best_match = None
-            best_score = 0
-            
-            for path in candidates:
-                path_lower = path.lower()
-                score = sum(1 for part in parts if part and part.lower() in path_lower and part != "..")
-                if score > best_score:
-                    best_score = score
-                    best_match = path
-            
-            if best_match and best_score >= len(parts) * 0.5:
-                return best_match
-        
-        return None
+        return self.modules.resolve(import_name, importer)
@@ -0,0 +1,383 @@
+"""
+Live Map Plugin - Incremental Graph Model
+=========================================
+
+Keeps the file-level dependency graph in memory between scans and applies
+per-file add/remove/update deltas instead of rebuilding every node and edge.
+
+Version: 0.7.0
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, Iterable, Optional
+
+from jupiter.core.modules import ModuleTable, normalize_path
+from jupiter.plugins.livemap.core.clusters import ClusterTree
+from jupiter.plugins.livemap.core.transport import encode_compact
+from jupiter.plugins.livemap.core.graph import (
+    GraphEdge,
+    GraphNode,
+    make_file_node,
+    make_function_nodes,
+)
+
+logger = logging.getLogger(__name__)
+
+LinkKey = tuple[str, str, str]  # (source, target, type)
+
+
+@dataclass
+class GraphDelta:
+    """Changes between two versions of the live graph."""
+    base_version: int
+    version: int
+    nodes_added: list[GraphNode] = field(default_factory=list)
+    nodes_updated: list[GraphNode] = field(default_factory=list)
+    nodes_removed: list[str] = field(default_factory=list)
+    links_added: list[GraphEdge] = field(default_factory=list)
+    links_updated: list[GraphEdge] = field(default_factory=list)
+    links_removed: list[GraphEdge] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return not (
+            self.nodes_added or self.nodes_updated or self.nodes_removed
+            or self.links_added or self.links_updated or self.links_removed
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to serializable dictionary."""
+        return {
+            "base_version": self.base_version,
+            "version": self.version,
+            "nodes_added": [asdict(n) for n in self.nodes_added],
+            "nodes_updated": [asdict(n) for n in self.nodes_updated],
+            "nodes_removed": list(self.nodes_removed),
+            "links_added": [asdict(e) for e in self.links_added],
+            "links_updated": [asdict(e) for e in self.links_updated],
+            "links_removed": [asdict(e) for e in self.links_removed],
+        }
+
+
+def _normalize(path: str) -> str:
+    return path.replace("\\", "/")
+
+
+def _signature(file: dict[str, Any]) -> tuple:
+    """Everything about a file that can change its nodes or outgoing edges."""
+    lang_analysis = file.get("language_analysis") or {}
+    return (
+        file.get("size_bytes", 0),
+        file.get("file_type", ""),
+        tuple(lang_analysis.get("imports", [])),
+        tuple(lang_analysis.get("defined_functions", [])),
+    )
+
+
+class LiveGraphModel:
+    """Persistent file-level dependency graph updated from scan results.
+
+    Each file owns its file node, its function nodes, its ``contains`` edges
+    and its outgoing ``import`` edges. A scan only touches the files whose
+    signature changed; import edges of unchanged files are re-resolved only
+    when the set of files changes and they may point somewhere else (imports
+    that were unresolved, or that targeted a removed file).
+    """
+
+    def __init__(
+        self,
+        history_size: int = 20,
+        root: Optional[str] = None,
+        source_roots: Iterable[str] = (),
+    ):
+        self.nodes: dict[str, GraphNode] = {}
+        self.links: dict[LinkKey, GraphEdge] = {}
+        self.version = 0
+        # Identity of the cached scan report last applied (see CacheManager.last_scan_stamp)
+        self.scan_stamp: Optional[tuple] = None
+        self._signatures: dict[str, tuple] = {}
+        self._imports: dict[str, list[str]] = {}
+        self._owned_nodes: dict[str, list[str]] = {}
+        self._links_by_source: dict[str, set[LinkKey]] = {}
+        self._links_by_target: dict[str, set[LinkKey]] = {}
+        self._unresolved: set[str] = set()  # Files with at least one unresolved import
+        self._root = root
+        self._source_roots = list(source_roots)
+        self._resolver: Optional[ModuleTable] = None
+        self._history: deque[GraphDelta] = deque(maxlen=history_size)
+        self._clusters: Optional[tuple[int, ClusterTree]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def file_count(self) -> int:
+        return len(self._signatures)
+
+    def apply_scan(self, files: Iterable[dict[str, Any]]) -> GraphDelta:
+        """Bring the model in line with a full scan file list."""
+        incoming = {_normalize(f["path"]): f for f in files}
+        with self._lock:
+            removed = [p for p in self._signatures if p not in incoming]
+            updated = [
+                f for p, f in incoming.items()
+                if self._signatures.get(p) != _signature(f)
+            ]
+            return self._apply(updated, removed)
+
+    def apply_changes(
+        self,
+        updated: Iterable[dict[str, Any]] = (),
+        removed: Iterable[str] = (),
+    ) -> GraphDelta:
+        """Apply explicit per-file changes (e.g. from a watcher)."""
+        with self._lock:
+            return self._apply(list(updated), [_normalize(p) for p in removed if _normalize(p) in self._signatures])
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the full graph (same shape as ``DependencyGraph.to_dict``)."""
+        with self._lock:
+            return {
+                "nodes": [asdict(n) for n in self.nodes.values()],
+                "links": [asdict(e) for e in self.links.values()],
+                "version": self.version,
+            }
+
+    def to_compact(self, binary: bool = False) -> dict[str, Any]:
+        """Serialize the full graph in the compact transport format (no ``asdict``)."""
+        with self._lock:
+            return encode_compact(
+                self.nodes.values(), self.links.values(), binary=binary, version=self.version
+            )
+
+    def cluster_tree(self) -> ClusterTree:
+        """Return the package cluster tree for the current version (cached)."""
+        with self._lock:
+            if self._clusters is None or self._clusters[0] != self.version:
+                tree = ClusterTree(
+                    (n for n in self.nodes.values() if n.type == "file"),
+                    (e for e in self.links.values() if e.type == "import"),
+                )
+                self._clusters = (self.version, tree)
+            return self._clusters[1]
+
+    def changes_since(self, version: int) -> Optional[GraphDelta]:
+        """Merge the retained deltas after ``version``.
+
+        Returns None when the history no longer reaches back that far, in
+        which case the client must reload the full graph.
+        """
+        with self._lock:
+            if version == self.version:
+                return GraphDelta(base_version=version, version=version)
+            deltas = [d for d in self._history if d.base_version >= version]
+            if not deltas or deltas[0].base_version != version:
+                return None
+            return self._merge(deltas)
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Internals (called with the lock held)
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def _apply(self, updated: list[dict[str, Any]], removed: list[str]) -> GraphDelta:
+        nodes_before: dict[str, Optional[GraphNode]] = {}
+        links_before: dict[LinkKey, Optional[GraphEdge]] = {}
+
+        updated_paths = [_normalize(f["path"]) for f in updated]
+        added = [p for p in updated_paths if p not in self._signatures]
+        membership_changed = bool(removed) or bool(added)
+
+        # Files whose import edges must be re-resolved
+        relink: set[str] = set(updated_paths)
+
+        for path in removed:
+            relink.update(self._drop_file(path, nodes_before, links_before, drop_incoming=True))
+            self._signatures.pop(path, None)
+            self._imports.pop(path, None)
+            self._unresolved.discard(path)
+            relink.discard(path)
+
+        for file, path in zip(updated, updated_paths):
+            self._drop_file(path, nodes_before, links_before, drop_incoming=False)
+            self._signatures[path] = _signature(file)
+            self._imports[path] = list((file.get("language_analysis") or {}).get("imports", []))
+            self._add_file(path, file, nodes_before, links_before)
+
+        if membership_changed or self._resolver is None:
+            previous = self._resolver
+            self._resolver = ModuleTable(self._signatures, root=self._root, source_roots=self._source_roots)
+            relink.update(self._unresolved)
+            # Imports resolved to a shorter prefix (``pkg.mod`` -> ``pkg/__init__.py``)
+            # may now match an added module, or matched a removed one's package
+            relink.update(self._prefix_importers(added, self._resolver))
+            if previous is not None:
+                relink.update(self._prefix_importers(removed, previous))
+            relink.difference_update(removed)
+
+        for path in relink:
+            self._relink(path, links_before)
+
+        delta = self._diff(nodes_before, links_before)
+        if not delta.is_empty():
+            self.version += 1
+            delta.version = self.version
+            self._history.append(delta)
+            logger.debug(
+                "Live graph v%d: +%d/~%d/-%d nodes, +%d/~%d/-%d links",
+                self.version,
+                len(delta.nodes_added), len(delta.nodes_updated), len(delta.nodes_removed),
+                len(delta.links_added), len(delta.links_updated), len(delta.links_removed),
+            )
+        return delta
+
+    def _drop_file(
+        self,
+        path: str,
+        nodes_before: dict[str, Optional[GraphNode]],
+        links_before: dict[LinkKey, Optional[GraphEdge]],
+        drop_incoming: bool,
+    ) -> set[str]:
+        """Remove the nodes/edges owned by ``path``; return importers to re-resolve."""
+        for node_id in self._owned_nodes.pop(path, []):
+            nodes_before.setdefault(node_id, self.nodes.get(node_id))
+            self.nodes.pop(node_id, None)
+
+        for key in self._links_by_source.pop(path, set()):
+            self._remove_link(key, links_before)
+
+        importers: set[str] = set()
+        if drop_incoming:
+            for key in list(self._links_by_target.get(path, ())):
+                importers.add(key[0])
+                self._remove_link(key, links_before)
+        return importers
+
+    def _add_file(
+        self,
+        path: str,
+        file: dict[str, Any],
+        nodes_before: dict[str, Optional[GraphNode]],
+        links_before: dict[LinkKey, Optional[GraphEdge]],
+    ) -> None:
+        lang_analysis = file.get("language_analysis") or {}
+        owned = [make_file_node(path, file)]
+        owned.extend(make_function_nodes(path, lang_analysis.get("defined_functions", [])))
+        for node in owned:
+            nodes_before.setdefault(node.id, self.nodes.get(node.id))
+            self.nodes[node.id] = node
+        self._owned_nodes[path] = [node.id for node in owned]
+
+        for node in owned[1:]:
+            self._add_link(GraphEdge(source=path, target=node.id, type="contains"), links_before)
+
+    def _prefix_importers(self, paths: list[str], table: ModuleTable) -> set[str]:
+        """Files importing a module whose name prefixes a module name of ``paths`` in ``table``."""
+        wanted = {normalize_path(p) for p in paths}
+        if not wanted:
+            return set()
+        prefixes: set[str] = set()
+        for name, path in table.modules.items():
+            if path in wanted:
+                parts = name.split(".")
+                prefixes.update(".".join(parts[:i]) for i in range(1, len(parts)))
+
+        importers: set[str] = set()
+        for prefix in prefixes:
+            target = table.modules.get(prefix)
+            for key in self._links_by_target.get(target, ()) if target else ():
+                if key[2] == "import":
+                    importers.add(key[0])
+        return importers
+
+    def _relink(self, path: str, links_before: dict[LinkKey, Optional[GraphEdge]]) -> None:
+        """Re-resolve the outgoing import edges of ``path``."""
+        for key in [k for k in self._links_by_source.get(path, ()) if k[2] == "import"]:
+            self._remove_link(key, links_before)
+
+        assert self._resolver is not None
+        weights: dict[str, int] = {}
+        unresolved = False
+        for imp in self._imports.get(path, []):
+            target = self._resolver.resolve(imp, path)
+            if target and target in self._signatures:
+                weights[target] = weights.get(target, 0) + 1
+            else:
+                unresolved = True
+
+        if unresolved:
+            self._unresolved.add(path)
+        else:
+            self._unresolved.discard(path)
+
+        for target, weight in weights.items():
+            self._add_link(GraphEdge(source=path, target=target, type="import", weight=weight), links_before)
+
+    def _add_link(self, edge: GraphEdge, links_before: dict[LinkKey, Optional[GraphEdge]]) -> None:
+        key = (edge.source, edge.target, edge.type)
+        links_before.setdefault(key, self.links.get(key))
+        self.links[key] = edge
+        self._links_by_source.setdefault(edge.source, set()).add(key)
+        self._links_by_target.setdefault(edge.target, set()).add(key)
+
+    def _remove_link(self, key: LinkKey, links_before: dict[LinkKey, Optional[GraphEdge]]) -> None:
+        links_before.setdefault(key, self.links.get(key))
+        self.links.pop(key, None)
+        source_keys = self._links_by_source.get(key[0])
+        if source_keys is not None:
+            source_keys.discard(key)
+        target_keys = self._links_by_target.get(key[1])
+        if target_keys is not None:
+            target_keys.discard(key)
+            if not target_keys:
+                del self._links_by_target[key[1]]
+
+    def _diff(
+        self,
+        nodes_before: dict[str, Optional[GraphNode]],
+        links_before: dict[LinkKey, Optional[GraphEdge]],
+    ) -> GraphDelta:
+        delta = GraphDelta(base_version=self.version, version=self.version)
+        for node_id, before in nodes_before.items():
+            after = self.nodes.get(node_id)
+            if before is None and after is not None:
+                delta.nodes_added.append(after)
+            elif before is not None and after is None:
+                delta.nodes_removed.append(node_id)
+            elif before != after and after is not None:
+                delta.nodes_updated.append(after)
+        for key, before_link in links_before.items():
+            after_link = self.links.get(key)
+            if before_link is None and after_link is not None:
+                delta.links_added.append(after_link)
+            elif before_link is not None and after_link is None:
+                delta.links_removed.append(before_link)
+            elif before_link != after_link and after_link is not None:
+                delta.links_updated.append(after_link)
+        return delta
+
+    def _merge(self, deltas: list[GraphDelta]) -> GraphDelta:
+        """Collapse consecutive deltas into one, diffing first and last states."""
+        nodes_before: dict[str, Optional[GraphNode]] = {}
+        links_before: dict[LinkKey, Optional[GraphEdge]] = {}
+        # Walk backwards so the earliest "before" state wins
+        for delta in reversed(deltas):
+            for node in delta.nodes_added:
+                nodes_before[node.id] = None
+            for node_id in delta.nodes_removed:
+                nodes_before[node_id] = GraphNode(id=node_id, type="", label="")
+            for node in delta.nodes_updated:
+                nodes_before[node.id] = GraphNode(id=node.id, type="", label="")
+            for edge in delta.links_added:
+                links_before[(edge.source, edge.target, edge.type)] = None
+            for edge in delta.links_removed:
+                links_before[(edge.source, edge.target, edge.type)] = edge
+            for edge in delta.links_updated:
+                links_before[(edge.source, edge.target, edge.type)] = GraphEdge(
+                    source=edge.source, target=edge.target, type=edge.type, weight=-1
+                )
+        merged = self._diff(nodes_before, links_before)
+        merged.base_version = deltas[0].base_version
+        merged.version = deltas[-1].version
+        return merged
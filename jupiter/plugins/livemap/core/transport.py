@@ -0,0 +1,253 @@
+"""
+Live Map Plugin - Compact Graph Transport
+=========================================
+
+Column-oriented encoding of a graph for large projects. Strings (IDs,
+labels, groups, types) are stored once in a string table; nodes and links
+reference them by index, and numeric columns are little-endian typed
+arrays (base64 in JSON, raw bytes with msgpack). Function node IDs
+(``file::func``) are rebuilt from their parent node instead of repeating
+the file path.
+
+Layout::
+
+    {
+      "format": "compact", "strings": [...],
+      "nodes": {"count": N, "id": Int32, "parent": Int32, "type": Uint32,
+                "label": Uint32, "group": Int32, "size": Uint32,
+                "complexity": Uint32, "extra": {name: Uint32, ...}},
+      "links": {"count": M, "source": Uint32, "target": Uint32,
+                "type": Uint32, "weight": Uint32},
+      ...extra top-level fields (version, level, ...)
+    }
+
+``id`` is -1 when the node has a ``parent`` (ID = parent ID + ``::`` +
+label, the parent always comes first); ``group`` is -1 for nodes
+without a group.
+
+Version: 0.7.0
+"""
+
+from __future__ import annotations
+
+import base64
+import gzip
+import json
+import sys
+from array import array
+from typing import Any, Iterable, Optional
+
+COMPACT_FORMAT = "compact"
+
+# Extra integer node attributes carried as columns (cluster views)
+_EXTRA_NODE_FIELDS = ("depth", "file_count", "expandable")
+
+
+def _field(obj: Any, name: str, default: Any = None) -> Any:
+    if isinstance(obj, dict):
+        return obj.get(name, default)
+    return getattr(obj, name, default)
+
+
+def _typed(typecode: str, values: Iterable[int]) -> array:
+    data = array(typecode, values)
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data
+
+
+def _pack(data: array, binary: bool) -> Any:
+    raw = data.tobytes()
+    return raw if binary else base64.b64encode(raw).decode("ascii")
+
+
+def _unpack(typecode: str, value: Any) -> array:
+    raw = value if isinstance(value, (bytes, bytearray)) else base64.b64decode(value)
+    data = array(typecode)
+    data.frombytes(raw)
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data
+
+
+def encode_compact(
+    nodes: Iterable[Any],
+    links: Iterable[Any],
+    binary: bool = False,
+    **extra: Any,
+) -> dict[str, Any]:
+    """Encode nodes/links (``GraphNode``/``GraphEdge`` or dicts) compactly.
+
+    Args:
+        nodes: Graph nodes.
+        links: Graph links whose endpoints are node IDs.
+        binary: Keep typed arrays as raw bytes (for msgpack) instead of base64.
+        **extra: Top-level fields copied as-is (``version``, ``level``, ...).
+    """
+    strings: list[str] = []
+    string_index: dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        index = string_index.get(value)
+        if index is None:
+            index = len(strings)
+            string_index[value] = index
+            strings.append(value)
+        return index
+
+    nodes = list(nodes)
+    node_index: dict[str, int] = {}
+    for i, node in enumerate(nodes):
+        node_index[_field(node, "id")] = i
+
+    ids, parents, types, labels, groups, sizes, complexities = [], [], [], [], [], [], []
+    extras: dict[str, list[int]] = {}
+    for i, node in enumerate(nodes):
+        node_id = _field(node, "id")
+        label = _field(node, "label", "") or ""
+        owner, sep, name = node_id.rpartition("::")
+        # Only reference earlier nodes so decoders can rebuild IDs in one pass
+        parent = node_index.get(owner, -1) if sep and name == label else -1
+        if parent >= i:
+            parent = -1
+        ids.append(-1 if parent >= 0 else intern(node_id))
+        parents.append(parent)
+        types.append(intern(_field(node, "type", "") or ""))
+        labels.append(intern(label))
+        group = _field(node, "group")
+        groups.append(intern(group) if group is not None else -1)
+        sizes.append(int(_field(node, "size", 0) or 0))
+        complexities.append(int(_field(node, "complexity", 0) or 0))
+        if isinstance(node, dict):
+            for key in _EXTRA_NODE_FIELDS:
+                if key in node:
+                    extras.setdefault(key, [0] * (len(ids) - 1)).append(int(node[key]))
+            for key, column in extras.items():
+                if len(column) < len(ids):
+                    column.append(0)
+
+    sources, targets, link_types, weights = [], [], [], []
+    for link in links:
+        source = node_index.get(_field(link, "source"))
+        target = node_index.get(_field(link, "target"))
+        if source is None or target is None:
+            continue
+        sources.append(source)
+        targets.append(target)
+        link_types.append(intern(_field(link, "type", "") or ""))
+        weights.append(int(_field(link, "weight", 1) or 0))
+
+    payload: dict[str, Any] = {
+        "format": COMPACT_FORMAT,
+        "strings": strings,
+        "nodes": {
+            "count": len(nodes),
+            "id": _pack(_typed("i", ids), binary),
+            "parent": _pack(_typed("i", parents), binary),
+            "type": _pack(_typed("I", types), binary),
+            "label": _pack(_typed("I", labels), binary),
+            "group": _pack(_typed("i", groups), binary),
+            "size": _pack(_typed("I", sizes), binary),
+            "complexity": _pack(_typed("I", complexities), binary),
+            "extra": {key: _pack(_typed("I", column), binary) for key, column in extras.items()},
+        },
+        "links": {
+            "count": len(sources),
+            "source": _pack(_typed("I", sources), binary),
+            "target": _pack(_typed("I", targets), binary),
+            "type": _pack(_typed("I", link_types), binary),
+            "weight": _pack(_typed("I", weights), binary),
+        },
+    }
+    payload.update(extra)
+    return payload
+
+
+def decode_compact(payload: dict[str, Any]) -> dict[str, Any]:
+    """Rebuild the plain ``{"nodes": [...], "links": [...]}`` graph."""
+    strings = payload["strings"]
+    n = payload["nodes"]
+    columns = {
+        name: _unpack(code, n[name])
+        for name, code in (("id", "i"), ("parent", "i"), ("type", "I"), ("label", "I"),
+                           ("group", "i"), ("size", "I"), ("complexity", "I"))
+    }
+    extras = {key: _unpack("I", value) for key, value in n.get("extra", {}).items()}
+
+    ids: list[str] = []
+    nodes: list[dict[str, Any]] = []
+    for i in range(n["count"]):
+        label = strings[columns["label"][i]]
+        parent = columns["parent"][i]
+        node_id = f"{ids[parent]}::{label}" if parent >= 0 else strings[columns["id"][i]]
+        ids.append(node_id)
+        group = columns["group"][i]
+        node = {
+            "id": node_id,
+            "type": strings[columns["type"][i]],
+            "label": label,
+            "size": columns["size"][i],
+            "complexity": columns["complexity"][i],
+            "group": strings[group] if group >= 0 else None,
+        }
+        for key, column in extras.items():
+            node[key] = bool(column[i]) if key == "expandable" else column[i]
+        nodes.append(node)
+
+    l = payload["links"]
+    sources, targets = _unpack("I", l["source"]), _unpack("I", l["target"])
+    types, weights = _unpack("I", l["type"]), _unpack("I", l["weight"])
+    links = [
+        {"source": ids[sources[i]], "target": ids[targets[i]], "type": strings[types[i]], "weight": weights[i]}
+        for i in range(l["count"])
+    ]
+
+    graph = {k: v for k, v in payload.items() if k not in ("format", "strings", "nodes", "links")}
+    graph.update({"nodes": nodes, "links": links})
+    return graph
+
+
+def serialize(
+    payload: dict[str, Any], encoding: Optional[str] = None, accept_encoding: Optional[str] = None
+) -> tuple[bytes, str, dict[str, str]]:
+    """Serialize a (compact or plain) payload for an HTTP response.
+
+    Args:
+        payload: Graph payload.
+        encoding: ``None``/``"identity"``, ``"gzip"`` (compressed JSON body)
+            or ``"msgpack"`` (requires the optional ``msgpack`` package).
+        accept_encoding: The request's ``Accept-Encoding`` header. When
+            given, ``"gzip"`` compresses with what the client accepts
+            (``negotiate_encoding()``: br, gzip, or identity if neither).
+
+    Returns:
+        (body, media type, extra headers)
+
+    Raises:
+        ValueError: Unknown encoding.
+        RuntimeError: msgpack requested but not installed.
+    """
+    if encoding == "msgpack":
+        try:
+            import msgpack  # type: ignore[import-not-found]
+        except ImportError as exc:
+            raise RuntimeError("msgpack encoding requires the 'msgpack' package") from exc
+        return msgpack.packb(payload, use_bin_type=True), "application/x-msgpack", {}
+
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    if encoding in (None, "", "identity"):
+        return body, "application/json", {}
+    if encoding == "gzip":
+        if accept_encoding is None:
+            return gzip.compress(body, compresslevel=5), "application/json", {
+                "Content-Encoding": "gzip", "Vary": "Accept-Encoding"
+            }
+        from jupiter.server.responses import compress, negotiate_encoding
+
+        negotiated = negotiate_encoding(accept_encoding)
+        if negotiated == "identity":
+            return body, "application/json", {"Vary": "Accept-Encoding"}
+        return compress(body, negotiated), "application/json", {
+            "Content-Encoding": negotiated, "Vary": "Accept-Encoding"
+        }
+    raise ValueError(f"Unknown encoding '{encoding}'")
@@ -2,17 +2,18 @@
 
 Provides REST endpoints for the Live Map dependency graph visualization.
 
-Version: 0.3.2
+Version: 0.8.0 - ETag revalidation (304) and negotiated compression for graph views
 
 Note: This router is mounted by the Bridge at /plugins/livemap, so no prefix here.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request, Response
 
 logger = logging.getLogger(__name__)
 
@@ -20,32 +21,21 @@ logger = logging.getLogger(__name__)
 router = APIRouter(tags=["livemap"])
 
 
-@router.get("/graph")
-async def get_graph(
-    request: Request,
-    simplify: bool = False,
-    max_nodes: int = 1000
-) -> Dict[str, Any]:
-    """Generate a dependency graph for the Live Map visualization.
-    
-    Args:
-        simplify: If True, group by directory instead of showing individual files.
-        max_nodes: Maximum number of nodes before auto-simplification.
-        
-    Returns:
-        Graph data with nodes and links for D3.js visualization.
-    """
+def _cached_scan(request: Request) -> tuple[Any, Optional[Dict[str, Any]]]:
+    """Return (root, cached scan report or None)."""
     from jupiter.core.cache import CacheManager
-    from jupiter.plugins.livemap import build_graph
     
     # Get root path from app state
     root = getattr(request.app.state, "root_path", None)
     if not root:
         raise HTTPException(status_code=500, detail="No root path configured")
-    
-    # Try cached scan first
-    cache_manager = CacheManager(root)
-    last_scan = cache_manager.load_last_scan()
+    return root, CacheManager(root).load_last_scan()
+
+
+async def _load_scan(request: Request) -> tuple[Any, Dict[str, Any]]:
+    """Return (root, scan report), falling back to a connector scan."""
+    # Try cached scan first (parsing a large report would block the loop)
+    root, last_scan = await asyncio.to_thread(_cached_scan, request)
     
     if not last_scan or "files" not in last_scan:
         # Try scanning via connector if available
@@ -62,12 +52,261 @@ async def get_graph(
         if not last_scan or "files" not in last_scan:
             raise HTTPException(status_code=404, detail="No scan data available. Run a scan first.")
     
+    return root, last_scan
+
+
+async def _graph_model(request: Request) -> tuple[Any, Any]:
+    """Return (root, live graph model).
+    
+    Views are built from the model. The cached scan is applied again when
+    the model is empty (first view after a server start) or when the report
+    differs from the one the model was built from: the ``scan.finished``
+    subscriber only sees scans run by this server, not ``jupiter scan``
+    from the CLI.
+    """
+    from jupiter.plugins.livemap import _publish_delta, get_graph_model
+    from jupiter.server.system_services import SystemState
+    
+    root = getattr(request.app.state, "root_path", None)
+    if not root:
+        raise HTTPException(status_code=500, detail="No root path configured")
+    model = get_graph_model(str(root))
+    stamp = await asyncio.to_thread(SystemState(request.app).last_scan_stamp)
+    if model.file_count == 0 or (stamp is not None and stamp != model.scan_stamp):
+        root, last_scan = await _load_scan(request)
+        delta = await asyncio.to_thread(model.apply_scan, last_scan["files"])
+        model.scan_stamp = stamp
+        _publish_delta(delta)
+    return root, model
+
+
+def _scan_or_404(request: Request) -> tuple[Any, Dict[str, Any]]:
+    root, last_scan = _cached_scan(request)
+    if not last_scan or "files" not in last_scan:
+        raise HTTPException(status_code=404, detail="No scan data available. Run a scan first.")
+    return root, last_scan
+
+
+def _graph_etag(request: Request, *params: Any) -> Optional[str]:
+    """Version of a graph view: cached scan, model version, plugin config and view parameters.
+    
+    None when there is no cached scan (the graph then comes from a
+    connector scan and is versioned by its content).
+    """
+    from jupiter.plugins.livemap import get_config, get_graph_model
+    from jupiter.server.responses import make_etag
+    from jupiter.server.system_services import SystemState
+    
+    root = getattr(request.app.state, "root_path", None)
+    if not root:
+        return None
+    stamp = SystemState(request.app).last_scan_stamp()
+    if stamp is None:
+        return None
+    # The model version is part of the payload (``/graph/changes`` resumes from it)
+    version = get_graph_model(str(root)).version
+    config = sorted((str(k), repr(v)) for k, v in get_config().items())
+    return make_etag("livemap", *stamp, version, config, *params)
+
+
+async def _graph_response(
+    request: Request,
+    etag: Optional[str],
+    build: Callable[[], Dict[str, Any]],
+    format: str,
+    encoding: Optional[str],
+) -> Response:
+    """Serve the graph produced by ``build`` (only called when the client's copy is stale).
+    
+    Plain JSON goes through ``conditional_response`` (304, negotiated
+    gzip/br, compressed variants cached per ETag); an explicit ``encoding``
+    keeps the transport serialization and only adds revalidation. Either
+    way the graph is built and encoded in a worker thread.
+    """
+    from jupiter.plugins.livemap.core.transport import encode_compact
+    from jupiter.core.jsonio import dumps
+    from jupiter.server.responses import REVALIDATE_CACHE_CONTROL, conditional_response, etag_matches
+    
+    if format not in ("json", "compact"):
+        raise HTTPException(status_code=400, detail=f"Unknown format '{format}'")
+    if format == "json" and not encoding:
+        return await conditional_response(request, etag, lambda: dumps(build()))
+    
+    headers = {"Cache-Control": REVALIDATE_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    if etag:
+        headers["ETag"] = etag
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+    accept_encoding = request.headers.get("accept-encoding", "")
+    
+    def encode() -> Response:
+        graph = build()
+        if format == "compact" and graph.get("format") != "compact":
+            extra = {k: v for k, v in graph.items() if k not in ("nodes", "links")}
+            graph = encode_compact(graph["nodes"], graph["links"], binary=encoding == "msgpack", **extra)
+        return _encoded(graph, encoding, headers, accept_encoding)
+    
+    # Building, encoding and compressing a large graph would block the loop
+    return await asyncio.to_thread(encode)
+
+
+def _encoded(
+    payload: Dict[str, Any],
+    encoding: Optional[str],
+    extra_headers: Optional[Dict[str, str]] = None,
+    accept_encoding: Optional[str] = None,
+) -> Response:
+    from jupiter.plugins.livemap.core.transport import serialize
+    
     try:
-        graph = build_graph(last_scan["files"], simplify=simplify, max_nodes=max_nodes)
-        return graph
-    except Exception as e:
-        logger.error("LiveMap graph generation failed: %s", e)
-        raise HTTPException(status_code=500, detail=f"Graph generation failed: {str(e)}")
+        body, media_type, headers = serialize(payload, encoding, accept_encoding)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=406, detail=str(e))
+    return Response(content=body, media_type=media_type, headers={**(extra_headers or {}), **headers})
+
+
+@router.get("/graph")
+async def get_graph(
+    request: Request,
+    simplify: bool = False,
+    max_nodes: int = 1000,
+    format: str = "json",
+    encoding: Optional[str] = None
+) -> Any:
+    """Generate a dependency graph for the Live Map visualization.
+    
+    The detailed graph is served from the live model, which only re-processes
+    files that changed since the previous scan.
+    
+    Args:
+        simplify: If True, group by directory instead of showing individual files.
+        max_nodes: Maximum number of nodes before switching to a clustered
+            view (see ``/graph/clusters``).
+        format: ``json`` (default) or ``compact`` (string table + typed
+            arrays, see ``core/transport.py``).
+        encoding: Optional ``gzip`` or ``msgpack`` body encoding.
+        
+    Returns:
+        Graph data with nodes and links for D3.js visualization. Detailed
+        graphs also carry the model ``version`` used by ``/graph/changes``;
+        clustered views carry ``clustered``, ``level`` and ``expanded``.
+    """
+    from jupiter.plugins.livemap import build_graph
+    
+    if simplify:
+        etag = _graph_etag(request, "graph", simplify, max_nodes, format, encoding)
+        # Versioned by the cached scan: it is only read if the client's copy is stale
+        scan = None if etag else await _load_scan(request)
+        
+        def build_simplified() -> Dict[str, Any]:
+            root, last_scan = scan or _scan_or_404(request)
+            try:
+                return build_graph(last_scan["files"], simplify=True, max_nodes=max_nodes, project_root=str(root))
+            except Exception as e:
+                logger.error("LiveMap graph generation failed: %s", e)
+                raise HTTPException(status_code=500, detail=f"Graph generation failed: {str(e)}")
+        
+        return await _graph_response(request, etag, build_simplified, format, encoding)
+    
+    _, model = await _graph_model(request)
+    etag = _graph_etag(request, "graph", simplify, max_nodes, format, encoding)
+    
+    def build() -> Dict[str, Any]:
+        try:
+            if model.file_count > max_nodes:
+                tree = model.cluster_tree()
+                return _cluster_view(tree, tree.auto_level(max_nodes), [], None, model.version)
+            if format == "compact":
+                # Encode straight from the model's node/edge objects
+                return model.to_compact(binary=encoding == "msgpack")
+            return model.to_dict()
+        except Exception as e:
+            logger.error("LiveMap graph generation failed: %s", e)
+            raise HTTPException(status_code=500, detail=f"Graph generation failed: {str(e)}")
+    
+    return await _graph_response(request, etag, build, format, encoding)
+
+
+@router.get("/graph/clusters")
+async def get_graph_clusters(
+    request: Request,
+    level: Optional[int] = None,
+    expand: str = "",
+    focus: Optional[str] = None,
+    max_nodes: int = 1000,
+    format: str = "json",
+    encoding: Optional[str] = None
+) -> Any:
+    """Return a level-of-detail view of the package cluster tree.
+    
+    Cluster sizes and edge weights are aggregated once per graph version;
+    each request only materializes the clusters visible in the view.
+    
+    Args:
+        level: Package depth to display (default: deepest level that fits
+            in ``max_nodes``).
+        expand: Comma-separated cluster IDs to replace by their children.
+        focus: Optional cluster ID restricting the view to its subtree.
+        max_nodes: Node budget used when ``level`` is omitted.
+        format: ``json`` (default) or ``compact``.
+        encoding: Optional ``gzip`` or ``msgpack`` body encoding.
+        
+    Returns:
+        Graph data with cluster/file nodes (``size``, ``file_count``,
+        ``expandable``) and weighted dependency links.
+    """
+    expanded = [e for e in expand.split(",") if e.strip()]
+    _, model = await _graph_model(request)
+    etag = _graph_etag(request, "clusters", level, expanded, focus, max_nodes, format, encoding)
+    
+    def build() -> Dict[str, Any]:
+        # Cached per model version: an expand only materializes the new view
+        tree = model.cluster_tree()
+        try:
+            return _cluster_view(
+                tree, level if level is not None else tree.auto_level(max_nodes), expanded, focus, model.version
+            )
+        except KeyError:
+            raise HTTPException(status_code=404, detail=f"Unknown cluster: {focus}")
+    
+    return await _graph_response(request, etag, build, format, encoding)
+
+
+def _cluster_view(
+    tree: Any,
+    level: int,
+    expanded: list[str],
+    focus: Optional[str],
+    version: int,
+) -> Dict[str, Any]:
+    view = tree.view(level=level, expanded=expanded, focus=focus)
+    view["clustered"] = True
+    view["version"] = version
+    return view
+
+
+@router.get("/graph/changes")
+async def get_graph_changes(request: Request, since: int = 0) -> Dict[str, Any]:
+    """Return the graph changes since a model version.
+    
+    Args:
+        since: Version the client currently holds (from ``/graph`` or a delta).
+        
+    Returns:
+        A delta (``base_version``/``version`` plus added/updated/removed
+        nodes and links), or ``{"reset": true, "version": N}`` when the
+        client is too far behind and must reload ``/graph``.
+    """
+    from jupiter.plugins.livemap import get_graph_model
+    
+    root = getattr(request.app.state, "root_path", None)
+    model = get_graph_model(str(root) if root else None)
+    delta = model.changes_since(since)
+    if delta is None:
+        return {"reset": True, "version": model.version}
+    return delta.to_dict()
 
 
 @router.get("/config")
@@ -0,0 +1,6 @@
+"""
+Live Map Plugin - Tests Module
+
+@version 0.4.0
+@module jupiter.plugins.livemap.tests
+"""
@@ -0,0 +1,194 @@
+"""
+Live Map Plugin - Level-of-Detail Clustering Tests
+
+@version 0.5.0
+@module jupiter.plugins.livemap.tests
+"""
+
+import pytest
+
+from jupiter.plugins.livemap.core.model import LiveGraphModel
+
+
+def _file(path, imports=(), size=10):
+    return {
+        "path": path,
+        "size_bytes": size,
+        "file_type": "py",
+        "language_analysis": {"imports": list(imports), "defined_functions": []},
+    }
+
+
+def _model():
+    model = LiveGraphModel()
+    model.apply_scan([
+        _file("app/core/engine.py", size=100),
+        _file("app/core/state.py", imports=["app.core.engine"], size=50),
+        _file("app/api/routes.py", imports=["app.core.engine", "app.core.state"], size=30),
+        _file("lib/helpers.py", imports=["app.core.state"], size=20),
+        _file("main.py", imports=["app.api.routes", "lib.helpers"], size=5),
+    ])
+    return model
+
+
+def _links(view):
+    return {(l["source"], l["target"]): l["weight"] for l in view["links"]}
+
+
+class TestClusterTree:
+    """Tests for ClusterTree."""
+
+    def test_top_level_aggregates_sizes_and_edges(self):
+        view = _model().cluster_tree().view(level=1)
+
+        nodes = {n["id"]: n for n in view["nodes"]}
+        assert set(nodes) == {"app", "lib", "main.py"}
+        assert nodes["app"]["size"] == 180
+        assert nodes["app"]["file_count"] == 3
+        assert nodes["app"]["expandable"] is True
+        assert nodes["main.py"]["type"] == "file"
+        assert _links(view) == {("lib", "app"): 1, ("main.py", "app"): 1, ("main.py", "lib"): 1}
+
+    def test_expand_replaces_cluster_with_children(self):
+        view = _model().cluster_tree().view(level=1, expanded=["app"])
+
+        assert {n["id"] for n in view["nodes"]} == {"app/core", "app/api", "lib", "main.py"}
+        assert _links(view) == {
+            ("app/api", "app/core"): 2,
+            ("lib", "app/core"): 1,
+            ("main.py", "app/api"): 1,
+            ("main.py", "lib"): 1,
+        }
+        assert view["expanded"] == ["app"]
+
+    def test_focus_restricts_view_to_subtree(self):
+        tree = _model().cluster_tree()
+        view = tree.view(level=1, focus="app/core")
+
+        assert {n["id"] for n in view["nodes"]} == {"app/core/engine.py", "app/core/state.py"}
+        assert _links(view) == {("app/core/state.py", "app/core/engine.py"): 1}
+        with pytest.raises(KeyError):
+            tree.view(focus="missing")
+
+    def test_auto_level_respects_node_budget(self):
+        tree = _model().cluster_tree()
+        assert tree.auto_level(3) == 1
+        assert tree.auto_level(4) == 2
+        assert tree.auto_level(100) == tree.max_depth
+
+    def test_tree_is_cached_per_version(self):
+        model = _model()
+        tree = model.cluster_tree()
+        assert model.cluster_tree() is tree
+
+        model.apply_changes(removed=["lib/helpers.py"])
+        rebuilt = model.cluster_tree()
+        assert rebuilt is not tree
+        assert "lib" not in rebuilt.clusters
+
+
+class TestClusterRoutes:
+    """Tests for the /graph and /graph/clusters routes."""
+
+    def test_views_come_from_the_model_without_rereading_the_scan(self, tmp_path, monkeypatch):
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from jupiter.core.cache import CacheManager
+        from jupiter.plugins import livemap
+        from jupiter.plugins.livemap.server.api import router
+
+        CacheManager(tmp_path).save_last_scan({"files": [
+            _file("app/core/engine.py"),
+            _file("app/api/routes.py", imports=["app.core.engine"]),
+            _file("main.py", imports=["app.api.routes"]),
+        ]})
+        loads = []
+        load_last_scan = CacheManager.load_last_scan
+        monkeypatch.setattr(CacheManager, "load_last_scan", lambda self: loads.append(1) or load_last_scan(self))
+
+        app = FastAPI()
+        app.include_router(router)
+        app.state.root_path = tmp_path
+        client = TestClient(app)
+        try:
+            top = client.get("/graph/clusters", params={"level": 1})
+            expanded = client.get("/graph/clusters", params={"level": 1, "expand": "app"})
+            detailed = client.get("/graph")
+        finally:
+            livemap.shutdown()
+
+        assert {n["id"] for n in top.json()["nodes"]} == {"app", "main.py"}
+        assert {n["id"] for n in expanded.json()["nodes"]} == {"app/core", "app/api", "main.py"}
+        assert len(detailed.json()["nodes"]) == 3
+        # Only the first view filled the empty model
+        assert len(loads) == 1
+
+    def test_graph_follows_scans_cached_outside_the_server(self, tmp_path):
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from jupiter.core.cache import CacheManager
+        from jupiter.plugins import livemap
+        from jupiter.plugins.livemap.server.api import router
+
+        cache = CacheManager(tmp_path)
+        cache.save_last_scan({"files": [_file("a.py"), _file("b.py", imports=["a"])]})
+        app = FastAPI()
+        app.include_router(router)
+        app.state.root_path = tmp_path
+        client = TestClient(app)
+        try:
+            first = client.get("/graph")
+            # e.g. `jupiter scan` from the CLI: no scan.finished event reaches the server
+            cache.save_last_scan({"files": [_file("a.py"), _file("c.py", imports=["a"]), _file("d.py")]})
+            second = client.get("/graph", headers={"If-None-Match": first.headers["etag"]})
+            third = client.get("/graph", headers={"If-None-Match": second.headers["etag"]})
+        finally:
+            livemap.shutdown()
+
+        assert {n["id"] for n in first.json()["nodes"]} == {"a.py", "b.py"}
+        assert second.status_code == 200
+        assert second.headers["etag"] != first.headers["etag"]
+        assert {n["id"] for n in second.json()["nodes"]} == {"a.py", "c.py", "d.py"}
+        assert third.status_code == 304
+
+    def test_transport_encodings_are_built_off_the_event_loop(self, tmp_path, monkeypatch):
+        import asyncio
+
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from jupiter.core.cache import CacheManager
+        from jupiter.plugins import livemap
+        from jupiter.plugins.livemap.core import transport
+        from jupiter.plugins.livemap.core.model import LiveGraphModel
+        from jupiter.plugins.livemap.server.api import router
+
+        CacheManager(tmp_path).save_last_scan({"files": [_file("a.py"), _file("b.py", imports=["a"])]})
+        on_loop = []
+
+        def spy(func):
+            def wrapper(*args, **kwargs):
+                try:
+                    asyncio.get_running_loop()
+                    on_loop.append(True)
+                except RuntimeError:
+                    on_loop.append(False)
+                return func(*args, **kwargs)
+            return wrapper
+
+        monkeypatch.setattr(LiveGraphModel, "to_compact", spy(LiveGraphModel.to_compact))
+        monkeypatch.setattr(transport, "serialize", spy(transport.serialize))
+
+        app = FastAPI()
+        app.include_router(router)
+        app.state.root_path = tmp_path
+        client = TestClient(app)
+        try:
+            response = client.get("/graph", params={"format": "compact", "encoding": "gzip"})
+        finally:
+            livemap.shutdown()
+
+        assert response.status_code == 200
+        assert on_loop == [False, False]
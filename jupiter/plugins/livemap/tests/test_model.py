@@ -0,0 +1,216 @@
+"""
+Live Map Plugin - Incremental Graph Model Tests
+
+@version 0.6.0
+@module jupiter.plugins.livemap.tests
+"""
+
+from jupiter.plugins.livemap.core.graph import GraphBuilder
+from jupiter.plugins.livemap.core.model import LiveGraphModel
+
+
+def _file(path, imports=(), functions=(), size=10):
+    return {
+        "path": path,
+        "size_bytes": size,
+        "file_type": "py",
+        "language_analysis": {"imports": list(imports), "defined_functions": list(functions)},
+    }
+
+
+def _files():
+    return [
+        _file("pkg/core.py", functions=["run"]),
+        _file("pkg/util.py", imports=["pkg.core"], functions=["helper"]),
+        _file("main.py", imports=["pkg.util", "pkg.core"]),
+    ]
+
+
+def _link_keys(graph):
+    return {(l["source"], l["target"], l["type"]) for l in graph["links"]}
+
+
+class TestLiveGraphModel:
+    """Tests for LiveGraphModel."""
+
+    def test_initial_scan_matches_full_build(self):
+        model = LiveGraphModel()
+        delta = model.apply_scan(_files())
+
+        full = GraphBuilder(_files()).build().to_dict()
+        graph = model.to_dict()
+        assert {n["id"] for n in graph["nodes"]} == {n["id"] for n in full["nodes"]}
+        assert _link_keys(graph) == _link_keys(full)
+        assert delta.version == 1 and delta.base_version == 0
+        assert len(delta.nodes_added) == len(graph["nodes"])
+
+    def test_unchanged_scan_is_empty_delta(self):
+        model = LiveGraphModel()
+        model.apply_scan(_files())
+        delta = model.apply_scan(_files())
+        assert delta.is_empty()
+        assert model.version == 1
+
+    def test_update_only_touches_changed_file(self):
+        model = LiveGraphModel()
+        model.apply_scan(_files())
+        files = _files()
+        files[1] = _file("pkg/util.py", imports=["pkg.core"], functions=["helper", "extra"], size=20)
+
+        delta = model.apply_scan(files)
+
+        assert [n.id for n in delta.nodes_added] == ["pkg/util.py::extra"]
+        assert [n.id for n in delta.nodes_updated] == ["pkg/util.py"]
+        assert delta.nodes_removed == []
+        assert [(e.source, e.target) for e in delta.links_added] == [("pkg/util.py", "pkg/util.py::extra")]
+        assert delta.links_removed == []
+
+    def test_added_module_takes_over_imports_of_its_package(self):
+        base = [_file("pkg/__init__.py"), _file("main.py", imports=["pkg.mod"])]
+        grown = base + [_file("pkg/mod.py")]
+        model = LiveGraphModel()
+        model.apply_scan(base)
+        assert ("main.py", "pkg/__init__.py", "import") in _link_keys(model.to_dict())
+
+        delta = model.apply_scan(grown)
+
+        assert _link_keys(model.to_dict()) == _link_keys(GraphBuilder(grown).build().to_dict())
+        assert ("main.py", "pkg/mod.py", "import") in {(e.source, e.target, e.type) for e in delta.links_added}
+
+        model.apply_scan(base)
+        assert _link_keys(model.to_dict()) == _link_keys(GraphBuilder(base).build().to_dict())
+
+    def test_removed_file_drops_incoming_edges_and_relinks_on_return(self):
+        model = LiveGraphModel()
+        model.apply_scan(_files())
+
+        delta = model.apply_scan([f for f in _files() if f["path"] != "pkg/core.py"])
+        assert set(delta.nodes_removed) == {"pkg/core.py", "pkg/core.py::run"}
+        removed_links = {(e.source, e.target, e.type) for e in delta.links_removed}
+        assert ("main.py", "pkg/core.py", "import") in removed_links
+        assert ("pkg/util.py", "pkg/core.py", "import") in removed_links
+
+        # Importers with now-unresolved imports are re-linked when the file comes back
+        delta = model.apply_scan(_files())
+        added_links = {(e.source, e.target, e.type) for e in delta.links_added}
+        assert ("main.py", "pkg/core.py", "import") in added_links
+        assert ("pkg/util.py", "pkg/core.py", "import") in added_links
+
+    def test_changes_since_merges_history(self):
+        model = LiveGraphModel(history_size=2)
+        model.apply_scan(_files())
+        files = _files()
+        files[2] = _file("main.py", imports=["pkg.util"])
+        model.apply_scan(files)
+        files.append(_file("extra.py"))
+        model.apply_scan(files)
+
+        merged = model.changes_since(1)
+        assert merged is not None
+        assert (merged.base_version, merged.version) == (1, 3)
+        assert [n.id for n in merged.nodes_added] == ["extra.py"]
+        assert [(e.source, e.target) for e in merged.links_removed] == [("main.py", "pkg/core.py")]
+
+        assert model.changes_since(3).is_empty()
+        # Version 0 fell out of the bounded history: client must reload
+        assert model.changes_since(0) is None
+
+
+    def test_relative_imports_resolve_through_module_table(self):
+        model = LiveGraphModel(root="/proj")
+        model.apply_scan([
+            _file("/proj/pkg/__init__.py"),
+            _file("/proj/pkg/core.py"),
+            _file("/proj/pkg/sub/__init__.py"),
+            _file("/proj/pkg/sub/util.py", imports=["..core"]),
+            _file("/proj/other/util.py", imports=["pkg.sub.util"]),
+        ])
+        links = _link_keys(model.to_dict())
+        assert ("/proj/pkg/sub/util.py", "/proj/pkg/core.py", "import") in links
+        assert ("/proj/other/util.py", "/proj/pkg/sub/util.py", "import") in links
+
+
+class TestLivemapPluginDeltas:
+    """Tests for delta publication from the plugin module."""
+
+    def test_update_graph_publishes_only_non_empty_deltas(self):
+        from jupiter.plugins import livemap
+        from jupiter.core.bridge.events import get_event_bus
+
+        received = []
+
+        def on_delta(topic, payload):
+            received.append(payload)
+
+        bus = get_event_bus()
+        bus.subscribe(livemap.GRAPH_DELTA_TOPIC, on_delta)
+        try:
+            livemap.get_graph_model("/tmp/livemap-test-root")
+            livemap.update_graph(_files(), project_root="/tmp/livemap-test-root")
+            livemap.update_graph(_files(), project_root="/tmp/livemap-test-root")
+        finally:
+            bus.unsubscribe(livemap.GRAPH_DELTA_TOPIC, on_delta)
+            livemap.shutdown()
+
+        assert len(received) == 1
+        assert received[0]["version"] == 1
+        assert len(received[0]["nodes_added"]) == 5
+
+    def test_last_graph_follows_scans(self):
+        from jupiter.plugins import livemap
+
+        try:
+            assert livemap.get_last_graph() is None
+            livemap.on_scan({"files": _files(), "project_path": "/tmp/livemap-test-root"}, {})
+            first = livemap.get_last_graph()
+            files = _files()[:2]
+            livemap.on_scan({"files": files, "project_path": "/tmp/livemap-test-root"}, {})
+            second = livemap.get_last_graph()
+        finally:
+            livemap.shutdown()
+
+        assert first["version"] == 1 and len(first["nodes"]) == 5
+        assert second["version"] == 2
+        assert {n["id"] for n in second["nodes"]} < {n["id"] for n in first["nodes"]}
+
+    def test_scan_finished_applies_cached_scan_off_the_event_loop(self, tmp_path, monkeypatch):
+        import asyncio
+        import threading
+
+        from jupiter.plugins import livemap
+        from jupiter.core.bridge.events import get_event_bus
+        from jupiter.core.cache import CacheManager
+
+        CacheManager(tmp_path).save_last_scan({"files": _files()})
+        threads = []
+        apply_scan = LiveGraphModel.apply_scan
+
+        def spy(model, files):
+            threads.append(threading.current_thread())
+            return apply_scan(model, files)
+
+        monkeypatch.setattr(LiveGraphModel, "apply_scan", spy)
+
+        async def scan_finished():
+            done = asyncio.get_running_loop().create_future()
+
+            def on_delta(topic, payload):
+                # Published back on the loop
+                asyncio.get_running_loop()
+                done.set_result(payload)
+
+            bus = get_event_bus()
+            bus.subscribe(livemap.GRAPH_DELTA_TOPIC, on_delta)
+            try:
+                livemap._on_scan_finished("scan.finished", {"project_root": str(tmp_path)})
+                return await asyncio.wait_for(done, 5)
+            finally:
+                bus.unsubscribe(livemap.GRAPH_DELTA_TOPIC, on_delta)
+
+        try:
+            delta = asyncio.run(scan_finished())
+        finally:
+            livemap.shutdown()
+
+        assert threads and threads[0] is not threading.main_thread()
+        assert len(delta["nodes_added"]) == 5
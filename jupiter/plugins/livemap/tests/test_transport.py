@@ -0,0 +1,102 @@
+"""
+Live Map Plugin - Compact Transport Tests
+
+@version 0.7.0
+@module jupiter.plugins.livemap.tests
+"""
+
+import gzip
+import json
+
+import pytest
+
+from jupiter.plugins.livemap.core.model import LiveGraphModel
+from jupiter.plugins.livemap.core.transport import decode_compact, encode_compact, serialize
+
+
+def _file(path, imports=(), functions=(), size=10):
+    return {
+        "path": path,
+        "size_bytes": size,
+        "file_type": "py",
+        "language_analysis": {"imports": list(imports), "defined_functions": list(functions)},
+    }
+
+
+def _model():
+    model = LiveGraphModel()
+    model.apply_scan([
+        _file("project/package/core/engine.py", functions=["start", "stop"], size=1200),
+        _file("project/package/core/state.py", imports=["project.package.core.engine"], functions=["load"]),
+        _file("project/package/api.py", imports=["project.package.core.state"], size=300),
+    ])
+    return model
+
+
+def _normalized(graph):
+    nodes = sorted((n["id"], n["type"], n["label"], n["size"], n["group"]) for n in graph["nodes"])
+    links = sorted((l["source"], l["target"], l["type"], l["weight"]) for l in graph["links"])
+    return nodes, links
+
+
+class TestCompactTransport:
+    """Tests for the compact graph encoding."""
+
+    def test_model_round_trip(self):
+        model = _model()
+        payload = model.to_compact()
+
+        assert payload["format"] == "compact"
+        assert payload["version"] == model.version
+        decoded = decode_compact(json.loads(json.dumps(payload)))
+        assert _normalized(decoded) == _normalized(model.to_dict())
+        assert decoded["version"] == model.version
+
+    def test_function_ids_do_not_repeat_paths(self):
+        payload = _model().to_compact()
+        assert not any("::" in s for s in payload["strings"])
+
+    def test_cluster_view_keeps_extra_columns(self):
+        view = _model().cluster_tree().view(level=3)
+        payload = encode_compact(view["nodes"], view["links"], level=view["level"])
+
+        decoded = decode_compact(payload)
+        assert decoded["level"] == 3
+        by_id = {n["id"]: n for n in decoded["nodes"]}
+        assert by_id["project/package/core"]["file_count"] == 2
+        assert by_id["project/package/core"]["expandable"] is True
+        assert by_id["project/package/api.py"]["expandable"] is False
+
+    def test_gzip_serialization(self):
+        payload = _model().to_compact()
+        body, media_type, headers = serialize(payload, "gzip")
+
+        assert media_type == "application/json"
+        assert headers["Content-Encoding"] == "gzip"
+        assert json.loads(gzip.decompress(body)) == payload
+        with pytest.raises(ValueError):
+            serialize(payload, "zstd")
+
+    def test_gzip_follows_accept_encoding(self):
+        payload = _model().to_compact()
+
+        body, _, headers = serialize(payload, "gzip", accept_encoding="gzip;q=1.0, br;q=0")
+        assert headers["Content-Encoding"] == "gzip"
+        assert json.loads(gzip.decompress(body)) == payload
+        for accept in ("", "identity", "gzip;q=0"):
+            body, media_type, headers = serialize(payload, "gzip", accept_encoding=accept)
+            assert "Content-Encoding" not in headers and headers["Vary"] == "Accept-Encoding"
+            assert media_type == "application/json" and json.loads(body) == payload
+
+    def test_msgpack_is_optional(self):
+        payload = _model().to_compact(binary=True)
+        try:
+            import msgpack
+        except ImportError:
+            with pytest.raises(RuntimeError):
+                serialize(payload, "msgpack")
+            return
+        body, media_type, _ = serialize(payload, "msgpack")
+        assert media_type == "application/x-msgpack"
+        decoded = decode_compact(msgpack.unpackb(body, raw=False))
+        assert _normalized(decoded) == _normalized(_model().to_dict())
@@ -4,7 +4,7 @@ Live Map Plugin - Web UI
 
 HTML and JavaScript templates for the Live Map visualization.
 
-Version: 0.3.0
+Version: 0.7.0 - Load graphs in the compact transport format (gzip)
 """
 
 from __future__ import annotations
@@ -100,7 +100,7 @@ def get_ui_html() -> str:
                     <h4 data-i18n="livemap_help_tips_title">💡 Tips</h4>
                     <ul class="help-list">
                         <li data-i18n="livemap_help_tip_scan">Run a scan first to populate the graph</li>
-                        <li data-i18n="livemap_help_tip_large">For projects with 1000+ files, Simplify mode is auto-enabled</li>
+                        <li data-i18n="livemap_help_tip_large">For projects with 1000+ files, the map shows package clusters: double-click a cluster to expand it, a file to collapse its folder</li>
                         <li data-i18n="livemap_help_tip_settings">Configure defaults in Settings > Plugins > Live Map</li>
                     </ul>
                 </section>
@@ -300,6 +300,10 @@ def get_ui_js() -> str:
         svg: null,
         g: null,
         zoom: null,
+        graphData: null,
+        version: null,
+        cluster: null,
+        deltaSubscribed: false,
         
         getApiBaseUrl() {
             if (window.state?.apiBaseUrl) return state.apiBaseUrl;
@@ -346,10 +350,18 @@ def get_ui_js() -> str:
             const simplify = document.getElementById('livemap-simplify')?.checked || false;
             
             try {
-                const response = await this.request(`/plugins/livemap/graph?simplify=${simplify}`);
+                const response = await this.request(
+                    `/plugins/livemap/graph?simplify=${simplify}&format=compact&encoding=gzip`
+                );
                 if (!response.ok) throw new Error(`HTTP ${response.status}`);
                 
-                const graphData = await response.json();
+                const graphData = this.decodeCompact(await response.json());
+                // Only the detailed graph is versioned and can be patched incrementally;
+                // clustered views are re-requested for their current expansion state
+                this.cluster = graphData.clustered
+                    ? { level: graphData.level, expanded: new Set(graphData.expanded || []) }
+                    : null;
+                this.version = !this.cluster && Number.isInteger(graphData.version) ? graphData.version : null;
                 this.render(graphData);
             } catch (err) {
                 console.error('[LiveMap] Failed to load graph:', err);
@@ -358,6 +370,179 @@ def get_ui_js() -> str:
             }
         },
         
+        decodeTyped(b64, Type) {
+            if (!b64) return new Type(0);
+            const bin = atob(b64);
+            const bytes = new Uint8Array(bin.length);
+            for (let i = 0; i < bin.length; i++) bytes[i] = bin.charCodeAt(i);
+            return new Type(bytes.buffer);
+        },
+        
+        // Rebuild {nodes, links} from the compact transport format (string table + typed arrays)
+        decodeCompact(payload) {
+            if (!payload || payload.format !== 'compact') return payload;
+            const strings = payload.strings;
+            const n = payload.nodes;
+            const ids = this.decodeTyped(n.id, Int32Array);
+            const parents = this.decodeTyped(n.parent, Int32Array);
+            const types = this.decodeTyped(n.type, Uint32Array);
+            const labels = this.decodeTyped(n.label, Uint32Array);
+            const groups = this.decodeTyped(n.group, Int32Array);
+            const sizes = this.decodeTyped(n.size, Uint32Array);
+            const complexities = this.decodeTyped(n.complexity, Uint32Array);
+            const extras = Object.entries(n.extra || {}).map(([key, value]) => [key, this.decodeTyped(value, Uint32Array)]);
+            
+            const nodes = new Array(n.count);
+            for (let i = 0; i < n.count; i++) {
+                const label = strings[labels[i]];
+                const node = {
+                    id: parents[i] >= 0 ? `${nodes[parents[i]].id}::${label}` : strings[ids[i]],
+                    type: strings[types[i]],
+                    label,
+                    size: sizes[i],
+                    complexity: complexities[i],
+                    group: groups[i] >= 0 ? strings[groups[i]] : null
+                };
+                extras.forEach(([key, column]) => { node[key] = key === 'expandable' ? column[i] === 1 : column[i]; });
+                nodes[i] = node;
+            }
+            
+            const l = payload.links;
+            const sources = this.decodeTyped(l.source, Uint32Array);
+            const targets = this.decodeTyped(l.target, Uint32Array);
+            const linkTypes = this.decodeTyped(l.type, Uint32Array);
+            const weights = this.decodeTyped(l.weight, Uint32Array);
+            const links = new Array(l.count);
+            for (let i = 0; i < l.count; i++) {
+                links[i] = {
+                    source: nodes[sources[i]].id,
+                    target: nodes[targets[i]].id,
+                    type: strings[linkTypes[i]],
+                    weight: weights[i]
+                };
+            }
+            
+            const graph = { ...payload, nodes, links };
+            delete graph.format;
+            delete graph.strings;
+            return graph;
+        },
+        
+        linkKey(l) {
+            const source = typeof l.source === 'object' ? l.source.id : l.source;
+            const target = typeof l.target === 'object' ? l.target.id : l.target;
+            return `${source}|${target}|${l.type}`;
+        },
+        
+        async loadClusters() {
+            if (!this.cluster) return;
+            const expand = encodeURIComponent([...this.cluster.expanded].join(','));
+            try {
+                const response = await this.request(
+                    `/plugins/livemap/graph/clusters?level=${this.cluster.level}&expand=${expand}&format=compact&encoding=gzip`
+                );
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                const view = this.decodeCompact(await response.json());
+                
+                // Keep positions of clusters that stay visible; children start at their parent
+                const previous = new Map(this.graphData.nodes.map(n => [n.id, n]));
+                view.nodes.forEach(n => {
+                    let anchor = previous.get(n.id);
+                    for (let id = n.id; !anchor && id.includes('/');) {
+                        id = id.slice(0, id.lastIndexOf('/'));
+                        anchor = previous.get(id);
+                    }
+                    if (anchor) { n.x = anchor.x; n.y = anchor.y; }
+                });
+                this.graphData.nodes = view.nodes;
+                this.graphData.links = view.links;
+                this.cluster.expanded = new Set(view.expanded || []);
+                this.updateElements(0.5);
+            } catch (err) {
+                console.error('[LiveMap] Failed to load clusters:', err);
+                this.notify('Failed to load clusters: ' + err.message, 'error');
+            }
+        },
+        
+        toggleCluster(node) {
+            if (!this.cluster) return;
+            if (node.expandable) {
+                this.cluster.expanded.add(node.id);
+            } else {
+                // Collapse the folder this node was expanded from (and anything below it)
+                const parent = node.id.includes('/') ? node.id.slice(0, node.id.lastIndexOf('/')) : '';
+                if (!this.cluster.expanded.has(parent)) return;
+                [...this.cluster.expanded]
+                    .filter(id => id === parent || id.startsWith(parent + '/'))
+                    .forEach(id => this.cluster.expanded.delete(id));
+            }
+            this.loadClusters();
+        },
+        
+        async onDelta(delta) {
+            if (this.cluster) return this.loadClusters();
+            if (!delta || this.version === null || !this.graphData) return;
+            if (delta.base_version !== this.version) {
+                // Missed an update: ask the server for everything since our version
+                try {
+                    const response = await this.request(`/plugins/livemap/graph/changes?since=${this.version}`);
+                    if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                    const changes = await response.json();
+                    if (changes.reset) return this.refresh();
+                    delta = changes;
+                } catch (err) {
+                    console.warn('[LiveMap] Catch-up failed, reloading graph:', err);
+                    return this.refresh();
+                }
+            }
+            this.applyDelta(delta);
+        },
+        
+        applyDelta(delta) {
+            const data = this.graphData;
+            const removedNodes = new Set(delta.nodes_removed || []);
+            const nodesById = new Map();
+            data.nodes = data.nodes.filter(n => !removedNodes.has(n.id));
+            data.nodes.forEach(n => nodesById.set(n.id, n));
+            
+            (delta.nodes_updated || []).forEach(n => {
+                const existing = nodesById.get(n.id);
+                if (existing) Object.assign(existing, n);  // keeps x/y so the layout stays put
+                else { data.nodes.push(n); nodesById.set(n.id, n); }
+            });
+            (delta.nodes_added || []).forEach(n => {
+                if (!nodesById.has(n.id)) { data.nodes.push(n); nodesById.set(n.id, n); }
+            });
+            
+            const removedLinks = new Set((delta.links_removed || []).map(l => this.linkKey(l)));
+            const updatedLinks = new Map((delta.links_updated || []).map(l => [this.linkKey(l), l]));
+            data.links = data.links.filter(l => {
+                const key = this.linkKey(l);
+                const [source, target] = key.split('|');
+                return !removedLinks.has(key) && nodesById.has(source) && nodesById.has(target);
+            });
+            data.links.forEach(l => {
+                const update = updatedLinks.get(this.linkKey(l));
+                if (update) l.weight = update.weight;
+            });
+            (delta.links_added || []).forEach(l => {
+                if (nodesById.has(l.source) && nodesById.has(l.target)) data.links.push({ ...l });
+            });
+            
+            this.version = delta.version;
+            this.updateElements(0.3);
+        },
+        
+        subscribeDeltas() {
+            const bridge = window.jupiterBridge;
+            if (!bridge?.events || this.deltaSubscribed) return;
+            bridge.events.subscribe('livemap.graph.delta', (delta) => this.onDelta(delta));
+            this.deltaSubscribed = true;
+            if (bridge.ws && !bridge.ws.isConnected()) {
+                bridge.ws.connect().catch(() => {});
+            }
+        },
+        
         resetZoom() {
             if (this.svg && this.zoom) {
                 this.svg.transition().duration(500).call(this.zoom.transform, d3.zoomIdentity);
@@ -369,6 +554,7 @@ def get_ui_js() -> str:
             if (!container) return;
             
             container.innerHTML = '';
+            this.graphData = graphData;
             
             if (!graphData.nodes || graphData.nodes.length === 0) {
                 container.innerHTML = '<div class="livemap-loading">No graph data. Run a scan first.</div>';
@@ -376,8 +562,6 @@ def get_ui_js() -> str:
                 return;
             }
             
-            this.updateStats(graphData.nodes.length, graphData.links.length);
-            
             if (typeof d3 === 'undefined') {
                 container.innerHTML = '<div class="livemap-loading" style="color: var(--error);">D3.js not loaded</div>';
                 return;
@@ -399,49 +583,70 @@ def get_ui_js() -> str:
                 .scaleExtent([0.1, 8])
                 .on('zoom', ({transform}) => this.g.attr('transform', transform));
             
-            this.svg.call(this.zoom);
+            this.svg.call(this.zoom).on('dblclick.zoom', null);
             
             // Simulation
-            this.simulation = d3.forceSimulation(graphData.nodes)
-                .force('link', d3.forceLink(graphData.links).id(d => d.id).distance(60))
+            this.simulation = d3.forceSimulation()
+                .force('link', d3.forceLink().id(d => d.id).distance(60))
                 .force('charge', d3.forceManyBody().strength(-100))
-                .force('collide', d3.forceCollide().radius(15))
+                .force('collide', d3.forceCollide().radius(d => Math.max(15, this.getNodeRadius(d) + 4)))
                 .force('center', d3.forceCenter(width / 2, height / 2));
             
-            // Links
-            const link = this.g.append('g')
-                .attr('class', 'links')
-                .selectAll('line')
-                .data(graphData.links)
-                .join('line')
-                .attr('class', 'livemap-link')
-                .attr('stroke-width', d => Math.sqrt(d.weight || 1));
-            
-            // Nodes
-            const node = this.g.append('g')
-                .attr('class', 'nodes')
-                .selectAll('circle')
-                .data(graphData.nodes)
-                .join('circle')
-                .attr('r', d => d.type === 'directory' ? 8 : 5)
-                .attr('fill', d => this.getNodeColor(d))
-                .attr('stroke', '#fff')
-                .attr('stroke-width', 1.5)
-                .call(this.drag(this.simulation));
-            
-            node.append('title').text(d => d.label);
+            this.linkGroup = this.g.append('g').attr('class', 'links');
+            this.nodeGroup = this.g.append('g').attr('class', 'nodes');
             
             this.simulation.on('tick', () => {
-                link
-                    .attr('x1', d => d.source.x)
+                this.linkSelection
+                    ?.attr('x1', d => d.source.x)
                     .attr('y1', d => d.source.y)
                     .attr('x2', d => d.target.x)
                     .attr('y2', d => d.target.y);
                 
-                node
-                    .attr('cx', d => d.x)
+                this.nodeSelection
+                    ?.attr('cx', d => d.x)
                     .attr('cy', d => d.y);
             });
+            
+            this.updateElements(1);
+        },
+        
+        updateElements(alpha) {
+            const data = this.graphData;
+            if (!this.simulation || !data) return;
+            
+            this.updateStats(data.nodes.length, data.links.length);
+            
+            // Keyed joins: only entering/exiting elements touch the DOM
+            this.linkSelection = this.linkGroup
+                .selectAll('line')
+                .data(data.links, d => this.linkKey(d))
+                .join('line')
+                .attr('class', 'livemap-link')
+                .attr('stroke-width', d => Math.sqrt(d.weight || 1));
+            
+            this.nodeSelection = this.nodeGroup
+                .selectAll('circle')
+                .data(data.nodes, d => d.id)
+                .join(enter => {
+                    const circle = enter.append('circle')
+                        .attr('stroke', '#fff')
+                        .attr('stroke-width', 1.5)
+                        .call(this.drag(this.simulation))
+                        .on('dblclick', (event, d) => {
+                            event.stopPropagation();
+                            this.toggleCluster(d);
+                        });
+                    circle.append('title');
+                    return circle;
+                })
+                .attr('r', d => this.getNodeRadius(d))
+                .attr('fill', d => this.getNodeColor(d));
+            
+            this.nodeSelection.select('title').text(d => d.file_count > 1 ? `${d.label} (${d.file_count} files)` : d.label);
+            
+            this.simulation.nodes(data.nodes);
+            this.simulation.force('link').links(data.links);
+            this.simulation.alpha(alpha).restart();
         },
         
         updateStats(nodes, links) {
@@ -451,6 +656,11 @@ def get_ui_js() -> str:
             if (linkEl) linkEl.textContent = links;
         },
         
+        getNodeRadius(d) {
+            if (d.type === 'cluster') return Math.min(24, 6 + Math.sqrt(d.file_count || 1) * 1.5);
+            return d.type === 'directory' ? 8 : 5;
+        },
+        
         getNodeColor(d) {
             switch (d.group) {
                 case 'py_file': return '#3572A5';
@@ -492,6 +702,7 @@ def get_ui_js() -> str:
         
         init() {
             this.bind();
+            this.subscribeDeltas();
             this.refresh();
         }
     };
@@ -27,9 +27,9 @@ from jupiter.core.plugin_manager import PluginManager
 from jupiter.core.state import save_last_root
 from jupiter.config import JupiterConfig, PluginsConfig
 from jupiter.server.manager import ProjectManager
-from jupiter.server.ws import websocket_endpoint
+from jupiter.server.ws import manager as ws_manager, websocket_endpoint
 from jupiter.server.meeting_adapter import MeetingAdapter
-from jupiter.server.routers import auth, scan, system, analyze, watch, autodiag
+from jupiter.server.routers import auth, scan, system, analyze, watch, autodiag, events
 from jupiter.server.routers import plugins as plugins_v2_router
 from jupiter.core.logging_utils import configure_logging
 
@@ -114,11 +114,6 @@ async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown events."""
     global _heartbeat_task
     
-    # Startup: capture the running event loop for cross-thread callbacks
-    loop = asyncio.get_running_loop()
-    watch.set_main_loop(loop)
-    logger.info("Main event loop captured for watch callbacks")
-    
     # Initialize Bridge v2 plugin system
     try:
         from jupiter.core.bridge import init_plugin_system, is_initialized
@@ -167,6 +162,18 @@ async def lifespan(app: FastAPI):
     
     yield
     
+    # Shutdown: close the live call channel
+    try:
+        await watch.shutdown_call_stream()
+    except Exception as e:
+        logger.warning("Error closing call stream: %s", e)
+
+    # Shutdown: close WebSocket clients and stop their writer tasks
+    try:
+        await ws_manager.shutdown()
+    except Exception as e:
+        logger.warning("Error closing WebSocket clients: %s", e)
+
     # Shutdown: cleanup Bridge v2
     try:
         # First shutdown WS bridge
@@ -190,7 +197,6 @@ async def lifespan(app: FastAPI):
         except asyncio.CancelledError:
             pass
         logger.info("Meeting heartbeat task stopped")
-    watch.set_main_loop(None)
 
 
 app = FastAPI(
@@ -227,6 +233,7 @@ app.include_router(scan.router)
 app.include_router(system.router)
 app.include_router(analyze.router)
 app.include_router(watch.router)
+app.include_router(events.router)
 app.include_router(plugins_v2_router.router)  # Bridge v2 plugin routes
 
 @app.exception_handler(JupiterError)
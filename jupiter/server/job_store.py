@@ -0,0 +1,247 @@
+"""Durable store for background scan jobs.
+
+Version: 1.0.0 - Job metadata in memory, reports on disk, bounded retention
+
+Jobs live under ``<root>/.jupiter/jobs/``:
+
+- ``<job_id>.json``: job metadata (status, timings, options, error), small
+  enough to keep every retained job in memory;
+- ``<job_id>.report.json``: the encoded report of a completed job, read
+  from disk only when ``/scan/result`` asks for it (a hard link to the
+  ``last_scan.json`` written by the same scan when the filesystem allows it).
+
+Finished jobs are pruned beyond ``max_jobs`` or ``max_age_days``
+(``performance.scan_job_retention`` / ``performance.scan_job_max_age_days``).
+Jobs found queued or running when the store is reopened were interrupted
+by a restart and are marked failed.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from jupiter.core.jsonio import dumps, loads
+from jupiter.core.report_store import ReportStore
+from jupiter.server.models import ScanRequest
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_JOBS = 20
+DEFAULT_MAX_AGE_DAYS = 7.0
+
+
+class ScanStatus(str, Enum):
+    """Status of a background scan job."""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+FINISHED_STATUSES = (ScanStatus.COMPLETED, ScanStatus.FAILED)
+
+
+class BackgroundScanJob:
+    """Represents a background scan job."""
+
+    def __init__(self, job_id: str, options: ScanRequest):
+        self.job_id = job_id
+        self.options = options
+        self.status = ScanStatus.PENDING
+        self.created_at: float = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.progress: int = 0
+        self.files_processed: int = 0
+        self.files_total: int = 0
+        self.current_file: Optional[str] = None
+        self.file_count: Optional[int] = None
+        # Size of the encoded report stored on disk (see ScanJobStore.result)
+        self.result_bytes: Optional[int] = None
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for API response."""
+        return {
+            "job_id": self.job_id,
+            "status": self.status.value,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "progress": self.progress,
+            "files_processed": self.files_processed,
+            "files_total": self.files_total,
+            "current_file": self.current_file,
+            "file_count": self.file_count,
+            "result_bytes": self.result_bytes,
+            "error": self.error,
+            "duration_ms": int((self.finished_at - self.started_at) * 1000) if self.started_at and self.finished_at else None,
+        }
+
+    def to_record(self) -> Dict[str, Any]:
+        """Metadata persisted in ``<job_id>.json``."""
+        record = self.to_dict()
+        record.pop("duration_ms")
+        record["created_at"] = self.created_at
+        record["options"] = self.options.model_dump()
+        return record
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "BackgroundScanJob":
+        job = cls(str(record["job_id"]), ScanRequest(**(record.get("options") or {})))
+        job.status = ScanStatus(record.get("status", ScanStatus.FAILED.value))
+        for name in (
+            "created_at", "started_at", "finished_at", "progress", "files_processed",
+            "files_total", "current_file", "file_count", "result_bytes", "error",
+        ):
+            if record.get(name) is not None:
+                setattr(job, name, record[name])
+        return job
+
+
+class ScanJobStore:
+    """Background scan jobs of one project root (see module docstring)."""
+
+    def __init__(self, root: Path, max_jobs: int = DEFAULT_MAX_JOBS, max_age_days: float = DEFAULT_MAX_AGE_DAYS):
+        self.root = Path(root)
+        self.jobs_dir = self.root / ".jupiter" / "jobs"
+        self.max_jobs = max(1, int(max_jobs))
+        self.max_age_days = max_age_days
+        self._jobs: Dict[str, BackgroundScanJob] = {}
+        self._lock = threading.Lock()
+        # File index of the last job paged through /scan/result/{job_id}/files
+        self._report_store: Optional[Tuple[str, ReportStore]] = None
+        self._load()
+
+    def _meta_path(self, job_id: str) -> Path:
+        return self.jobs_dir / f"{job_id}.json"
+
+    def _result_path(self, job_id: str) -> Path:
+        return self.jobs_dir / f"{job_id}.report.json"
+
+    def _load(self) -> None:
+        if not self.jobs_dir.is_dir():
+            return
+        for path in self.jobs_dir.glob("*.json"):
+            if path.name.endswith(".report.json"):
+                continue
+            try:
+                job = BackgroundScanJob.from_record(loads(path.read_bytes()))
+            except Exception as exc:
+                logger.warning("Ignoring unreadable scan job %s: %s", path.name, exc)
+                continue
+            if job.status not in FINISHED_STATUSES:
+                job.status = ScanStatus.FAILED
+                job.finished_at = job.finished_at or path.stat().st_mtime
+                job.error = "Interrupted by a server restart"
+                self._write_meta(job)
+            self._jobs[job.job_id] = job
+        self.prune()
+
+    def _write_meta(self, job: BackgroundScanJob) -> None:
+        try:
+            self.jobs_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self._meta_path(job.job_id).with_suffix(".json.tmp")
+            tmp.write_bytes(dumps(job.to_record()))
+            tmp.replace(self._meta_path(job.job_id))
+        except OSError as exc:
+            logger.warning("Failed to persist scan job %s: %s", job.job_id, exc)
+
+    def add(self, job: BackgroundScanJob) -> BackgroundScanJob:
+        with self._lock:
+            self._jobs[job.job_id] = job
+        self._write_meta(job)
+        return job
+
+    def save(self, job: BackgroundScanJob) -> None:
+        """Persist a status change (progress updates stay in memory)."""
+        self._write_meta(job)
+        if job.status in FINISHED_STATUSES:
+            self.prune()
+
+    def complete(self, job: BackgroundScanJob, encoded: bytes, source: Optional[Path] = None) -> None:
+        """Store the report of a completed job and persist it.
+
+        Args:
+            source: File already holding ``encoded`` (the ``last_scan.json``
+                written by the scan); hard-linked instead of written again.
+        """
+        path = self._result_path(job.job_id)
+        try:
+            self.jobs_dir.mkdir(parents=True, exist_ok=True)
+            path.unlink(missing_ok=True)
+            linked = False
+            if source is not None:
+                try:
+                    os.link(source, path)
+                    linked = True
+                except OSError:
+                    linked = False  # other filesystem, no hard links: write a copy
+            if not linked:
+                tmp = path.with_suffix(".json.tmp")
+                tmp.write_bytes(encoded)
+                tmp.replace(path)
+            job.result_bytes = len(encoded)
+        except OSError as exc:
+            logger.warning("Failed to store the report of scan job %s: %s", job.job_id, exc)
+            job.result_bytes = None
+        job.status = ScanStatus.COMPLETED
+        self.save(job)
+
+    def get(self, job_id: str) -> Optional[BackgroundScanJob]:
+        return self._jobs.get(job_id)
+
+    def jobs(self) -> List[BackgroundScanJob]:
+        """Retained jobs, newest first."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return sorted(jobs, key=lambda j: j.created_at, reverse=True)
+
+    def result(self, job_id: str) -> Optional[bytes]:
+        """Encoded report of a completed job (None once pruned or lost)."""
+        try:
+            return self._result_path(job_id).read_bytes()
+        except OSError:
+            return None
+
+    def report_store(self, job_id: str) -> Optional[ReportStore]:
+        """File index of a job's report (the last one built is kept)."""
+        cached = self._report_store
+        if cached and cached[0] == job_id:
+            return cached[1]
+        encoded = self.result(job_id)
+        if encoded is None:
+            return None
+        store = ReportStore(loads(encoded))
+        self._report_store = (job_id, store)
+        return store
+
+    def prune(self, now: Optional[float] = None) -> List[str]:
+        """Drop finished jobs beyond ``max_jobs`` or older than ``max_age_days``; return their IDs."""
+        now = time.time() if now is None else now
+        with self._lock:
+            finished = sorted(
+                (j for j in self._jobs.values() if j.status in FINISHED_STATUSES),
+                key=lambda j: j.finished_at or j.created_at,
+                reverse=True,
+            )
+            expired = finished[self.max_jobs:]
+            if self.max_age_days and self.max_age_days > 0:
+                cutoff = now - self.max_age_days * 86400
+                expired += [j for j in finished[:self.max_jobs] if (j.finished_at or j.created_at) < cutoff]
+            for job in expired:
+                del self._jobs[job.job_id]
+        for job in expired:
+            for path in (self._meta_path(job.job_id), self._result_path(job.job_id)):
+                try:
+                    path.unlink(missing_ok=True)
+                except OSError as exc:
+                    logger.warning("Failed to remove %s: %s", path, exc)
+        if self._report_store and self._report_store[0] in {j.job_id for j in expired}:
+            self._report_store = None
+        return [job.job_id for job in expired]
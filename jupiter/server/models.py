@@ -5,7 +5,7 @@ Version: 1.1.0
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -74,6 +74,23 @@ class ScanReport(BaseModel):
     )
 
 
+class FilePageResponse(BaseModel):
+    """Response model for GET /reports/last/files and GET /scan/result/{job_id}/files."""
+
+    files: List[Dict[str, Any]] = Field(
+        default_factory=list, description="File entries, projected to the requested fields."
+    )
+    count: int = Field(default=0, description="Files in this page.")
+    total: int = Field(default=0, description="Files matching the filters.")
+    total_size_bytes: int = Field(default=0, description="Size of all matching files.")
+    next_cursor: Optional[str] = Field(
+        default=None, description="Pass as `cursor` to get the next page (null on the last page)."
+    )
+    extensions: Dict[str, int] = Field(
+        default_factory=dict, description="File count per extension in the whole report."
+    )
+
+
 class RunRequest(BaseModel):
     """Request model for POST /run endpoint."""
 
@@ -83,12 +100,27 @@ class RunRequest(BaseModel):
     with_dynamic: bool = Field(
         default=False, description="Enable dynamic analysis (tracing) for this run."
     )
+    dynamic_mode: Literal["trace", "sample"] = Field(
+        default="trace",
+        description="Dynamic analysis mode: 'trace' records every call, 'sample' samples stacks (low overhead).",
+    )
+    sample_rate: Optional[float] = Field(
+        default=None, gt=0, description="Samples per second in 'sample' mode (default 100)."
+    )
     backend_name: Optional[str] = Field(
         default=None, description="Name of the backend to use (optional)."
     )
     cwd: Optional[str] = Field(
         default=None, description="Working directory for command execution (optional, defaults to project root)."
     )
+    timeout: Optional[float] = Field(
+        default=None, gt=0, description="Seconds before the command is stopped (optional)."
+    )
+    run_id: Optional[str] = Field(
+        default=None,
+        max_length=64,
+        description="Client-chosen ID echoed in RUN_OUTPUT events (generated when omitted).",
+    )
 
 
 class RunResponse(BaseModel):
@@ -98,6 +130,16 @@ class RunResponse(BaseModel):
     stderr: str
     returncode: int
     dynamic_analysis: Optional[Dict[str, Any]] = None
+    run_id: Optional[str] = None
+    timed_out: bool = False
+    output_truncated: bool = False
+
+
+class RunJobResponse(BaseModel):
+    """Response model for POST /run/jobs (background command execution)."""
+
+    job_id: str
+    run_id: str
 
 
 class PythonProjectSummary(BaseModel):
@@ -143,6 +185,55 @@ class RefactoringRecommendation(BaseModel):
     code_excerpt: Optional[str] = None
 
 
+class RuntimeFunctionModel(BaseModel):
+    """A function of the runtime profile (times in seconds)."""
+
+    key: str
+    file_path: str
+    name: str
+    calls: int
+    cumulative_time: float
+    self_time: float
+    per_call: float
+    callers: int
+    callees: int
+    line_number: Optional[int] = None
+    qualname: Optional[str] = None
+    candidates: Optional[List[str]] = None
+
+
+class RuntimeEdgeModel(BaseModel):
+    """A caller -> callee edge with the callee time attributed to it."""
+
+    caller: str
+    callee: str
+    calls: int
+    time: float
+
+
+class RuntimeProfileSummary(BaseModel):
+    """Hot-path rankings of the cached dynamic data."""
+
+    statistics: Dict[str, Any] = Field(default_factory=dict)
+    top_self_time: List[RuntimeFunctionModel] = Field(default_factory=list)
+    top_cumulative_time: List[RuntimeFunctionModel] = Field(default_factory=list)
+    top_calls: List[RuntimeFunctionModel] = Field(default_factory=list)
+    hot_edges: List[RuntimeEdgeModel] = Field(default_factory=list)
+
+
+class RuntimeFunctionDetail(RuntimeFunctionModel):
+    """One profiled function with its heaviest callers and callees."""
+
+    callers: List[RuntimeEdgeModel] = Field(default_factory=list)  # type: ignore[assignment]
+    callees: List[RuntimeEdgeModel] = Field(default_factory=list)  # type: ignore[assignment]
+
+
+class RuntimeProfileResponse(RuntimeProfileSummary):
+    """Response model for GET /profile."""
+
+    function: Optional[RuntimeFunctionDetail] = None
+
+
 class AnalyzeResponse(BaseModel):
     """Response model for GET /analyze endpoint."""
 
@@ -156,6 +247,7 @@ class AnalyzeResponse(BaseModel):
     plugins: Optional[List[Dict[str, Any]]] = None
     refactoring: List[RefactoringRecommendation] = Field(default_factory=list)
     api: Optional[Dict[str, Any]] = None
+    runtime: Optional[RuntimeProfileSummary] = None
     # Plugin data fields
     code_quality: Optional[Dict[str, Any]] = None
     pylance: Optional[Dict[str, Any]] = None
@@ -397,6 +489,31 @@ class SimulateResponse(BaseModel):
     impacts: List[ImpactModel]
     risk_score: str
 
+
+class SimulateTargetModel(BaseModel):
+    """A single removal or move evaluated by POST /simulate/batch."""
+    action: str = Field("remove", description="Change to simulate: 'remove' or 'move'")
+    path: str = Field(..., description="Path to the file")
+    function_name: Optional[str] = Field(None, description="Name of the function (omit to target the whole file)")
+    new_path: Optional[str] = Field(None, description="Destination file (required when action is 'move')")
+
+
+class SimulateBatchRequest(BaseModel):
+    """Request model for POST /simulate/batch endpoint."""
+    targets: List[SimulateTargetModel] = Field(..., description="Changes evaluated together against one scan index")
+
+
+class BatchImpactModel(ImpactModel):
+    """An impact of the combined batch, with the targets that cause it."""
+    sources: List[str] = Field(default_factory=list)
+
+
+class SimulateBatchResponse(BaseModel):
+    """Response model for batch simulation results."""
+    results: List[SimulateResponse]
+    impacts: List[BatchImpactModel]
+    risk_score: str
+
 class LoginRequest(BaseModel):
     username: str
     password: str
@@ -0,0 +1,218 @@
+"""Response helpers for pre-encoded, versioned and compressed JSON payloads.
+
+Version: 1.2.0 - Off-loop body building and compression, cached identity bodies
+
+Heavy read endpoints (last report, snapshots, Live Map graph, metrics)
+return ``conditional_response()``: the body carries an ETag derived from
+the content version (cache stamp, snapshot ID, graph parameters, or a hash
+of the body), a matching ``If-None-Match`` gets an empty 304, and the body
+is compressed with the best encoding the client accepts. The encoded body
+and its compressed variants are kept in a byte-bounded LRU keyed by ETag,
+so an unchanged report or an immutable snapshot is built and compressed
+once; building and compressing run in a worker thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple, Union
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from jupiter.core.jsonio import dumps
+
+try:
+    import brotli  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+# Smaller bodies are sent as-is (compression would not pay for its headers)
+MIN_COMPRESS_BYTES = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+class EncodedJSONResponse(Response):
+    """JSON response whose body is already encoded (see ``jupiter.core.jsonio``).
+
+    Returning it from a route skips FastAPI's ``response_model`` validation
+    and re-serialization; the route's ``response_model`` still documents the
+    schema in OpenAPI.
+    """
+
+    media_type = "application/json"
+
+    def __init__(self, body: bytes, status_code: int = 200, headers: Optional[Mapping[str, str]] = None):
+        super().__init__(content=body, status_code=status_code, headers=headers)
+
+    @classmethod
+    def of(cls, data: Any, status_code: int = 200, headers: Optional[Mapping[str, str]] = None) -> "EncodedJSONResponse":
+        """Encode ``data`` and wrap it."""
+        return cls(dumps(data), status_code=status_code, headers=headers)
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag (quoted) identifying a content version made of ``parts``."""
+    digest = hashlib.sha1("\x1f".join(map(str, parts)).encode("utf-8")).hexdigest()
+    return f'"{digest[:24]}"'
+
+
+def content_etag(body: bytes) -> str:
+    """ETag of a body whose version is only known from its content."""
+    return f'"{hashlib.sha1(body).hexdigest()[:24]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """``If-None-Match`` check (weak comparison, ``*`` and lists accepted)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    def strong(tag: str) -> str:
+        tag = tag.strip()
+        return tag[2:] if tag.startswith("W/") else tag
+
+    return strong(etag) in {strong(tag) for tag in if_none_match.split(",")}
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> str:
+    """Best of ``br`` (when ``brotli`` is installed), ``gzip`` and ``identity``."""
+    if not accept_encoding:
+        return "identity"
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name.strip().lower()] = quality
+    supported = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best, best_quality = "identity", 0.0
+    for name in supported:
+        quality = weights.get(name, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == "gzip":
+        # mtime=0: identical input gives identical bytes
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    return body
+
+
+class VariantCache:
+    """Byte-bounded LRU of encoded bodies keyed by (ETag, encoding)."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, str]) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key: Tuple[str, str], body: bytes) -> None:
+        if len(body) > self.max_bytes // 4:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = body
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._size, "hits": self.hits, "misses": self.misses}
+
+
+variant_cache = VariantCache()
+
+
+async def conditional_response(
+    request: Request,
+    etag: Optional[str],
+    body: Union[bytes, Callable[[], bytes]],
+    media_type: str = "application/json",
+    immutable: bool = False,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """Serve ``body`` with ETag revalidation and negotiated compression.
+
+    Args:
+        etag: Content version (``make_etag``); None hashes the body, which
+            still saves the transfer but not the work of producing it.
+        body: Encoded body, or a callable producing it (only called when
+            neither a 304 nor a cached variant can be served). The callable
+            and the compression run in a worker thread.
+        immutable: The resource never changes for this ETag (snapshots):
+            clients may reuse it without revalidating.
+    """
+    response_headers = dict(headers or {})
+    response_headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL
+    response_headers["Vary"] = "Accept-Encoding"
+
+    versioned = etag is not None
+    if etag is None:
+        raw = await asyncio.to_thread(body) if callable(body) else body
+        etag = content_etag(raw)
+    else:
+        raw = None
+    response_headers["ETag"] = etag
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=response_headers)
+
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    encoded = variant_cache.get((etag, encoding))
+    if encoded is None:
+        if raw is None:
+            raw = variant_cache.get((etag, "identity"))
+        if raw is None:
+            raw = await asyncio.to_thread(body) if callable(body) else body
+            if versioned:
+                # Clients without gzip/br, and later compressions, reuse it
+                variant_cache.put((etag, "identity"), raw)
+        if encoding != "identity" and len(raw) < MIN_COMPRESS_BYTES:
+            encoding = "identity"
+        if encoding == "identity":
+            encoded = raw
+        else:
+            encoded = await asyncio.to_thread(compress, raw, encoding)
+            variant_cache.put((etag, encoding), encoded)
+    if encoding != "identity":
+        response_headers["Content-Encoding"] = encoding
+    return Response(content=encoded, status_code=200, media_type=media_type, headers=response_headers)
@@ -1,12 +1,13 @@
 """Analysis and CI router for Jupiter API.
 
-Version: 1.0.1
+Version: 1.2.0 - Immutable, compressed snapshot responses (ETag)
 """
 
+import asyncio
 import logging
 from typing import Optional, List, Dict, Any, cast
 from dataclasses import asdict
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from jupiter.server.models import (
     AnalyzeResponse, 
     Hotspot, 
@@ -18,15 +19,21 @@ from jupiter.server.models import (
     SnapshotMetadataModel,
     SimulateRequest,
     SimulateResponse,
+    SimulateBatchRequest,
+    SimulateBatchResponse,
+    BatchImpactModel,
     ImpactModel,
     CIRequest,
     CIResponse,
     CIMetrics,
     CIThresholds,
+    RuntimeProfileResponse,
 )
+from jupiter.server.responses import conditional_response, make_etag
 from jupiter.server.routers.auth import verify_token
 from jupiter.core.cache import CacheManager
-from jupiter.core.simulator import ProjectSimulator
+from jupiter.core.jsonio import dumps
+from jupiter.core.simulator import SimulationResult, SimulationTarget
 from jupiter.core.graph import GraphBuilder
 from jupiter.server.system_services import SystemState
 
@@ -108,6 +115,7 @@ async def get_analyze(
         plugins=app.state.plugin_manager.get_plugins_info(),
         refactoring=refactoring_list,
         api=summary_dict.get("api"),
+        runtime=summary_dict.get("runtime") or None,
     )
     
     # Run plugin hooks
@@ -237,26 +245,69 @@ async def diff_snapshots(request: Request, id_a: str, id_b: str) -> SnapshotDiff
 
 
 @router.get("/snapshots/{snapshot_id}", response_model=SnapshotResponse, dependencies=[Depends(verify_token)])
-async def get_snapshot(request: Request, snapshot_id: str) -> SnapshotResponse:
-    snapshot = SystemState(request.app).history_manager().get_snapshot(snapshot_id)
-    if not snapshot:
+async def get_snapshot(request: Request, snapshot_id: str) -> Response:
+    """Snapshots never change once written: served as immutable, compressed once."""
+    history = SystemState(request.app).history_manager()
+    if not history.has_snapshot(snapshot_id):
         raise HTTPException(status_code=404, detail="Snapshot not found")
-    metadata = SnapshotMetadataModel(**snapshot["metadata"])
-    return SnapshotResponse(metadata=metadata, report=snapshot["report"])
+
+    def body() -> bytes:
+        snapshot = history.get_snapshot(snapshot_id)
+        if not snapshot:
+            raise HTTPException(status_code=404, detail="Snapshot not found")
+        metadata = SnapshotMetadataModel(**snapshot["metadata"])
+        return dumps(SnapshotResponse(metadata=metadata, report=snapshot["report"]).model_dump())
+
+    return await conditional_response(
+        request, make_etag("snapshot", history.project_root, snapshot_id), body, immutable=True
+    )
+
+
+@router.get("/profile", response_model=RuntimeProfileResponse, dependencies=[Depends(verify_token)])
+async def get_runtime_profile(
+    request: Request,
+    top: int = 10,
+    function: Optional[str] = None,
+) -> RuntimeProfileResponse:
+    """Hot-path rankings of the cached dynamic data, joined to the static call graph.
+
+    ``function`` (``path.py::func`` or ``path.py::Class.method``) adds that
+    function's heaviest callers and callees.
+    """
+    profile = await asyncio.to_thread(SystemState(request.app).runtime_profile)
+    if profile is None:
+        raise HTTPException(status_code=400, detail="No scan data available. Please run a scan first.")
+    top = max(1, min(top, 500))
+    detail = None
+    if function:
+        detail = profile.function_detail(function, top)
+        if detail is None:
+            raise HTTPException(status_code=404, detail=f"No runtime data for '{function}'")
+    return RuntimeProfileResponse(**profile.rankings(top), function=detail)
+
+
+def _simulation_response(result: SimulationResult) -> SimulateResponse:
+    return SimulateResponse(
+        target=result.target,
+        impacts=[
+            ImpactModel(
+                target=i.target,
+                impact_type=i.impact_type,
+                details=i.details,
+                severity=i.severity
+            ) for i in result.impacts
+        ],
+        risk_score=result.risk_score
+    )
 
 
 @router.post("/simulate/remove", response_model=SimulateResponse)
 async def simulate_remove(request: Request, sim_req: SimulateRequest) -> SimulateResponse:
     """Simulate the removal of a file or function."""
-    # We need the current scan state. We can load it from cache.
-    root = request.app.state.root_path
-    cache_manager = CacheManager(root)
-    last_scan = cache_manager.load_last_scan()
-    
-    if not last_scan or "files" not in last_scan:
+    # The simulator is indexed once per cached scan and shared across requests.
+    simulator = SystemState(request.app).simulator()
+    if simulator is None:
         raise HTTPException(status_code=400, detail="No scan data available. Please run a scan first.")
-        
-    simulator = ProjectSimulator(last_scan["files"])
     
     if sim_req.target_type == "file":
         result = simulator.simulate_remove_file(sim_req.path)
@@ -267,17 +318,38 @@ async def simulate_remove(request: Request, sim_req: SimulateRequest) -> Simulat
     else:
         raise HTTPException(status_code=400, detail="Invalid target_type")
         
-    return SimulateResponse(
-        target=result.target,
-        impacts=[
-            ImpactModel(
-                target=i.target,
-                impact_type=i.impact_type,
-                details=i.details,
-                severity=i.severity
-            ) for i in result.impacts
-        ],
-        risk_score=result.risk_score
+    return _simulation_response(result)
+
+
+@router.post("/simulate/batch", response_model=SimulateBatchResponse)
+async def simulate_batch(request: Request, batch_req: SimulateBatchRequest) -> SimulateBatchResponse:
+    """Simulate many removals/moves at once against the cached scan.
+
+    Returns one result per target plus the combined impact set, where each
+    impact lists the targets (``sources``) that cause it.
+    """
+    simulator = SystemState(request.app).simulator()
+    if simulator is None:
+        raise HTTPException(status_code=400, detail="No scan data available. Please run a scan first.")
+
+    targets = [
+        SimulationTarget(
+            action=t.action,
+            path=t.path,
+            function_name=t.function_name,
+            new_path=t.new_path,
+        )
+        for t in batch_req.targets
+    ]
+    try:
+        batch = simulator.simulate_batch(targets)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    return SimulateBatchResponse(
+        results=[_simulation_response(r) for r in batch.results],
+        impacts=[BatchImpactModel(**asdict(i)) for i in batch.impacts],
+        risk_score=batch.risk_score,
     )
 
 
@@ -1,6 +1,6 @@
 from typing import Optional, Dict, Any, List
 import logging
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jupiter.server.models import LoginRequest, UserModel
 
@@ -70,6 +70,21 @@ async def verify_token(request: Request, credentials: Optional[HTTPAuthorization
     
     raise HTTPException(status_code=401, detail="Invalid authentication token")
 
+async def verify_stream_token(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security_scheme),
+    token: Optional[str] = Query(None, description="Token for clients that cannot send headers (EventSource)."),
+) -> str:
+    """Like verify_token, also accepting the token as a ``token`` query parameter.
+
+    Only for the Server-Sent Events routes (``EventSource`` cannot send
+    headers). URLs end up in access logs and proxy logs: uvicorn's access
+    log redacts the parameter (``QueryTokenFilter``), other layers may not.
+    """
+    if credentials is None and token:
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    return await verify_token(request, credentials)
+
 async def require_admin(role: str = Depends(verify_token)) -> str:
     if role != "admin":
         raise HTTPException(status_code=403, detail="Admin privileges required")
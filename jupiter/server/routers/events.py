@@ -0,0 +1,54 @@
+"""Server-Sent Events router: broadcast messages for clients without WebSockets.
+
+Version: 1.1.0 - Epoch-prefixed event IDs
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from jupiter.server.routers.auth import verify_stream_token, verify_token
+from jupiter.server.sse import RETRY_MS, event_hub
+from jupiter.server.ws import Subscription
+
+router = APIRouter(tags=["events"])
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def last_event_id(request: Request, last_event_id: Optional[str]) -> Optional[str]:
+    """Resume point: ``Last-Event-ID`` header, or the ``last_event_id`` query parameter."""
+    return request.headers.get("last-event-id") or last_event_id
+
+
+@router.get("/events", dependencies=[Depends(verify_stream_token)])
+async def stream_events(
+    request: Request,
+    topics: Optional[str] = Query(None, description="Comma-separated topic patterns (e.g. SCAN_*,livemap.*)."),
+    projects: Optional[str] = Query(None, description="Comma-separated project IDs."),
+    min_log_level: Optional[str] = Query(None, description="Minimum level of LOG_MESSAGE events."),
+    last_event_id_param: Optional[str] = Query(None, alias="last_event_id", description="Resume after this event ID."),
+) -> StreamingResponse:
+    """Stream broadcast messages as Server-Sent Events (same filters as ``/ws`` subscriptions)."""
+    subscription = Subscription()
+    try:
+        subscription.update({"type": "subscribe", "topics": topics, "projects": projects, "min_log_level": min_log_level})
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    resume = last_event_id(request, last_event_id_param)
+
+    async def generate():
+        yield f"retry: {RETRY_MS}\n\n"
+        async for chunk in event_hub.stream(subscription.accepts, resume, is_disconnected=request.is_disconnected):
+            yield chunk
+
+    return StreamingResponse(generate(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@router.get("/events/stats", dependencies=[Depends(verify_token)])
+async def get_event_stats() -> Dict[str, Any]:
+    """Replay buffer and open SSE streams."""
+    return event_hub.stats()
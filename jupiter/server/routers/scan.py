@@ -1,21 +1,30 @@
 """
 Scan router for Jupiter API.
 
-Version: 1.3.1
+Version: 1.12.1 - File indexes built off the event loop
 """
 import asyncio
 import logging
 import time
 import uuid
-from enum import Enum
 from typing import Any, Dict, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Request
-from jupiter.server.models import ScanRequest, ScanReport, FileAnalysis
-from jupiter.server.routers.auth import verify_token
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from jupiter.server.models import FilePageResponse, ScanRequest, ScanReport
+from jupiter.server.responses import EncodedJSONResponse, conditional_response, make_etag
+from jupiter.server.routers.auth import verify_stream_token, verify_token
+from jupiter.server.routers.events import SSE_HEADERS, last_event_id
 from jupiter.core.events import JupiterEvent, SCAN_STARTED, SCAN_FINISHED
 from jupiter.core.cache import CacheManager
+from jupiter.core.analyze_cache import analyze_cache
+from jupiter.core.jsonio import dumps
+from jupiter.core.report_store import DEFAULT_LIMIT, MAX_LIMIT, ReportStore, parse_fields, parse_sort
 from jupiter.server.ws import manager
 from jupiter.server.system_services import SystemState
+from jupiter.server.scan_coordinator import ScanFlight, ScanKey
+from jupiter.server.job_store import FINISHED_STATUSES, BackgroundScanJob, ScanJobStore, ScanStatus
+from jupiter.server.sse import RETRY_MS, event_hub, format_event
+from jupiter.server.scan_progress import DEFAULT_RATE_HZ, ScanProgressAggregator
 from jupiter.server.routers.watch import create_scan_progress_callback, get_watch_state
 
 # Bridge event system for plugin notifications
@@ -29,224 +38,155 @@ router = APIRouter()
 # Background Scan State Management
 # =============================================================================
 
-class ScanStatus(str, Enum):
-    """Status of a background scan job."""
-    PENDING = "pending"
-    RUNNING = "running"
-    COMPLETED = "completed"
-    FAILED = "failed"
+# Jobs are kept by the app's ScanJobStore (jupiter.server.job_store):
+# metadata in memory, reports on disk under .jupiter/jobs/
 
 
-class BackgroundScanJob:
-    """Represents a background scan job."""
-    
-    def __init__(self, job_id: str, options: ScanRequest):
-        self.job_id = job_id
-        self.options = options
-        self.status = ScanStatus.PENDING
-        self.started_at: Optional[float] = None
-        self.finished_at: Optional[float] = None
-        self.progress: int = 0
-        self.files_processed: int = 0
-        self.files_total: int = 0
-        self.current_file: Optional[str] = None
-        self.result: Optional[Dict[str, Any]] = None
-        self.error: Optional[str] = None
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for API response."""
-        return {
-            "job_id": self.job_id,
-            "status": self.status.value,
-            "started_at": self.started_at,
-            "finished_at": self.finished_at,
-            "progress": self.progress,
-            "files_processed": self.files_processed,
-            "files_total": self.files_total,
-            "current_file": self.current_file,
-            "error": self.error,
-            "duration_ms": int((self.finished_at - self.started_at) * 1000) if self.started_at and self.finished_at else None,
-        }
-
+def get_background_job(app, job_id: str) -> Optional[BackgroundScanJob]:
+    """Get a background scan job by ID."""
+    return SystemState(app).scan_job_store().get(job_id)
 
-# Global storage for background scan jobs (in production, use Redis or similar)
-_background_jobs: Dict[str, BackgroundScanJob] = {}
-_current_scan_job: Optional[str] = None  # Track if a scan is already running
 
+def get_current_scan(app) -> Optional[BackgroundScanJob]:
+    """Get the running scan job (the oldest queued one otherwise), if any."""
+    jobs = [flight.job for flight in SystemState(app).scan_coordinator().flights()]
+    running = [job for job in jobs if job.status == ScanStatus.RUNNING]
+    return (running or jobs or [None])[0]
 
-def get_background_job(job_id: str) -> Optional[BackgroundScanJob]:
-    """Get a background scan job by ID."""
-    return _background_jobs.get(job_id)
 
+def _new_job(store: ScanJobStore, options: ScanRequest) -> BackgroundScanJob:
+    """Create and register a job."""
+    return store.add(BackgroundScanJob(str(uuid.uuid4())[:8], options))  # Short ID for convenience
 
-def get_current_scan() -> Optional[BackgroundScanJob]:
-    """Get the currently running scan job, if any."""
-    if _current_scan_job:
-        return _background_jobs.get(_current_scan_job)
-    return None
 
-@router.post("/scan", response_model=ScanReport, dependencies=[Depends(verify_token)])
-async def post_scan(request: Request, options: ScanRequest) -> ScanReport:
-    """Run a filesystem scan and return a JSON report."""
-    app = request.app
-    root = app.state.root_path.resolve()
-    logger.info("Scanning project at %s with options: %s", root, options)
+def _report_payload(report_for_plugins: Dict[str, Any], api: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Plain-dict report in the ``ScanReport`` shape, without building models.
 
-    cache_manager = CacheManager(root)
-    start_time = time.time()
+    Connector file entries are already plain dicts with the right types;
+    only the ``FileAnalysis`` fields are kept, so a 50k-file report costs
+    one dict per file instead of one validated model per file.
+    """
+    return {
+        "report_schema_version": report_for_plugins.get("report_schema_version", "1.0"),
+        "root": report_for_plugins["root"],
+        "files": [
+            {
+                "path": f["path"],
+                "size_bytes": f["size_bytes"],
+                "modified_timestamp": f["modified_timestamp"],
+                "file_type": f["file_type"],
+                "language_analysis": f.get("language_analysis"),
+            }
+            for f in report_for_plugins["files"]
+        ],
+        "dynamic": report_for_plugins.get("dynamic"),
+        "plugins": report_for_plugins.get("plugins"),
+        "api": api,
+        "quality": report_for_plugins.get("quality"),
+        "refactoring": report_for_plugins.get("refactoring"),
+        "pylance": report_for_plugins.get("pylance"),
+        "code_quality": report_for_plugins.get("code_quality"),
+    }
 
-    # Emit via both WebSocket and Bridge event system
-    await manager.broadcast(JupiterEvent(type=SCAN_STARTED, payload={"root": str(root), "options": options.dict()}))
-    emit_scan_started(str(root), options.dict())
 
-    if options.backend_name:
-        connector = app.state.project_manager.get_connector(options.backend_name)
-        if not connector:
-            raise HTTPException(status_code=404, detail=f"Backend '{options.backend_name}' not found")
-    else:
-        connector = app.state.project_manager.get_default_connector()
-    
-    # Set up progress callback if watch is active
-    watch_state = get_watch_state()
-    if watch_state.active and hasattr(connector, 'set_progress_callback'):
-        progress_callback = create_scan_progress_callback()
-        connector.set_progress_callback(progress_callback)
-    
+def _scan_options(app, options: ScanRequest) -> Dict[str, Any]:
+    """Connector options of a request (the active project's ignore globs by default)."""
     scan_options = {
         "show_hidden": options.show_hidden,
         "ignore_globs": options.ignore_globs,
         "incremental": options.incremental,
     }
-    # Apply default ignore globs from active project if none provided
     if not scan_options["ignore_globs"]:
         active_project = app.state.project_manager.get_active_project()
         if active_project:
             scan_options["ignore_globs"] = active_project.ignore_globs
+    return scan_options
 
-    try:
-        report_dict = await connector.scan(scan_options)
-    except Exception as e:
-        logger.error("Scan failed: %s", e)
-        # Emit scan error via Bridge event system
-        emit_scan_error(str(root), str(e))
-        raise HTTPException(status_code=500, detail=f"Scan failed: {str(e)}")
-    
-    file_models = [
-        FileAnalysis(
-            path=f["path"],
-            size_bytes=f["size_bytes"],
-            modified_timestamp=f["modified_timestamp"],
-            file_type=f["file_type"],
-            language_analysis=f["language_analysis"],
-        )
-        for f in report_dict["files"]
-    ]
-
-    # Build report dict for plugin hooks
-    report_for_plugins = {
-        "report_schema_version": report_dict.get("report_schema_version", "1.0"),
-        "root": report_dict["root"],
-        "files": report_dict["files"],
-        "dynamic": report_dict.get("dynamic"),
-        "plugins": app.state.plugin_manager.get_plugins_info(),
-        "quality": report_dict.get("quality"),
-        "refactoring": report_dict.get("refactoring"),
-        "project_path": str(root),  # Add project path for plugins
-    }
-
-    # Run plugin hooks - plugins enrich the report dict in place
-    app.state.plugin_manager.hook_on_scan(report_for_plugins, project_root=root)
-
-    # Now build the response model with enriched data
-    report = ScanReport(
-        report_schema_version=report_for_plugins.get("report_schema_version", "1.0"),
-        root=report_for_plugins["root"],
-        files=file_models,
-        dynamic=report_for_plugins.get("dynamic"),
-        plugins=report_for_plugins.get("plugins"),
-        quality=report_for_plugins.get("quality"),
-        refactoring=report_for_plugins.get("refactoring"),
-        pylance=report_for_plugins.get("pylance"),
-        code_quality=report_for_plugins.get("code_quality"),
-    )
-
-    # Enrich with API info if available (for ScanReport)
-    if hasattr(connector, "get_api_info"):
-        try:
-            api_info = await connector.get_api_info()
-            if api_info:
-                report.api = api_info
-        except Exception as e:
-            logger.warning("Failed to fetch API info during scan: %s", e)
-
-    await manager.broadcast(JupiterEvent(type=SCAN_FINISHED, payload={"file_count": len(report.files)}))
-
-    # Emit scan finished via Bridge event system
-    duration_ms = int((time.time() - start_time) * 1000)
-    emit_scan_finished(str(root), len(report.files), duration_ms)
 
+def _active_project_id(app) -> Optional[str]:
+    """ID of the active project (tags scan events for WebSocket project filters)."""
     try:
-        cache_manager.save_last_scan(report.dict())
-    except Exception as exc:  # pragma: no cover - logging only
-        logger.warning("Failed to persist last scan cache: %s", exc)
+        project = app.state.project_manager.get_active_project()
+    except Exception:
+        return None
+    return project.id if project else None
 
-    if options.capture_snapshot:
-        try:
-            metadata = SystemState(app).history_manager().create_snapshot(
-                report_dict,
-                label=options.snapshot_label,
-                backend_name=options.backend_name,
-            )
-            await manager.broadcast(f"Snapshot stored: {metadata.id}")
-        except Exception as exc:  # pragma: no cover - logging only
-            logger.warning("Failed to store snapshot: %s", exc)
 
-    await manager.broadcast(f"Scan completed. Found {len(file_models)} files.")
+def _progress_rate(app) -> float:
+    """Progress frames per second (``performance.scan_progress_hz``)."""
+    try:
+        return SystemState(app).load_effective_config().performance.scan_progress_hz
+    except Exception:
+        return DEFAULT_RATE_HZ
 
-    return report
 
+def _submit_scan(app, options: ScanRequest, background: bool):
+    """Start a scan, or join the one in flight that serves the same root and options."""
+    scan_options = _scan_options(app, options)
+    root = app.state.root_path.resolve()
+    key = ScanKey.of(root, options.backend_name, scan_options)
+    store = SystemState(app).scan_job_store()
+
+    async def run(flight: ScanFlight) -> bytes:
+        return await _run_scan(app, flight, scan_options, store)
+
+    return SystemState(app).scan_coordinator().submit(
+        key,
+        lambda: _new_job(store, options),
+        run,
+        capture_snapshot=options.capture_snapshot,
+        snapshot_label=options.snapshot_label,
+        background=background,
+    )
 
-# =============================================================================
-# Background Scan Endpoints
-# =============================================================================
 
-# Store reference to running scan task
-_scan_task: Optional[asyncio.Task] = None
+async def _run_scan(app, flight: ScanFlight, scan_options: Dict[str, Any], store: ScanJobStore) -> bytes:
+    """Run one scan flight: connector scan, plugin hooks, cache, snapshot and events.
 
-async def _run_background_scan(app, job: BackgroundScanJob):
-    """Execute scan in background and update job status."""
-    global _current_scan_job
-    
+    The report is encoded once; the same bytes go to the cache, the job
+    result and every caller of the flight.
+    """
+    job = flight.job
     root = app.state.root_path.resolve()
     cache_manager = CacheManager(root)
-    
+    progress: Optional[ScanProgressAggregator] = None
+    project_id = _active_project_id(app)
+
     job.status = ScanStatus.RUNNING
     job.started_at = time.time()
-    _current_scan_job = job.job_id
-    
-    # Notify via WebSocket that scan started
+    store.save(job)
+    logger.info("Scanning project at %s with options: %s (job %s)", root, job.options, job.job_id)
+
+    # Emit via both WebSocket and Bridge event system
     try:
         await manager.broadcast(JupiterEvent(type=SCAN_STARTED, payload={
-            "root": str(root), 
+            "root": str(root),
             "options": job.options.dict(),
             "job_id": job.job_id,
-            "background": True
+            "project_id": project_id,
+            "background": flight.background,
         }))
     except Exception as e:
         logger.warning("Failed to broadcast scan started: %s", e)
     emit_scan_started(str(root), job.options.dict())
-    
+
     try:
-        # Get connector
         if job.options.backend_name:
             connector = app.state.project_manager.get_connector(job.options.backend_name)
             if not connector:
                 raise ValueError(f"Backend '{job.options.backend_name}' not found")
         else:
             connector = app.state.project_manager.get_default_connector()
-        
-        # Create progress callback that updates job status
-        # Note: This callback runs in a thread, so we need to be careful with async
+
+        # Scanner events are aggregated into SCAN_PROGRESS frames (job fields
+        # are plain assignments from the scanner threads)
+        if flight.background or event_hub.listening:
+            progress = ScanProgressAggregator(
+                manager.broadcast, job_id=job.job_id, rate_hz=_progress_rate(app), extra={"project_id": project_id}
+            ).start()
+        elif get_watch_state().active:
+            progress = create_scan_progress_callback(job.job_id, _progress_rate(app), project_id=project_id)
+
         def progress_callback(event_type: str, payload: Dict[str, Any]):
             if event_type == "SCAN_PROGRESS":
                 job.files_total = payload.get("total_files", 0)
@@ -257,51 +197,20 @@ async def _run_background_scan(app, job: BackgroundScanJob):
                 job.files_processed = payload.get("processed", 0)
                 job.files_total = payload.get("total", 0)
                 job.progress = payload.get("percent", 0)
-            
-            # Schedule WebSocket broadcast in the event loop (thread-safe)
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    asyncio.run_coroutine_threadsafe(
-                        manager.broadcast(JupiterEvent(
-                            type="SCAN_PROGRESS",
-                            payload={"job_id": job.job_id, **payload}
-                        )),
-                        loop
-                    )
-            except Exception:
-                pass  # Ignore broadcast errors in callback
-        
+            if progress is not None:
+                progress(event_type, payload)
+
         if hasattr(connector, 'set_progress_callback'):
             connector.set_progress_callback(progress_callback)
-        
-        scan_options = {
-            "show_hidden": job.options.show_hidden,
-            "ignore_globs": job.options.ignore_globs,
-            "incremental": job.options.incremental,
-        }
-        
-        if not scan_options["ignore_globs"]:
-            active_project = app.state.project_manager.get_active_project()
-            if active_project:
-                scan_options["ignore_globs"] = active_project.ignore_globs
-        
-        # Run the scan
-        report_dict = await connector.scan(scan_options)
-        
-        # Process results
-        file_models = [
-            FileAnalysis(
-                path=f["path"],
-                size_bytes=f["size_bytes"],
-                modified_timestamp=f["modified_timestamp"],
-                file_type=f["file_type"],
-                language_analysis=f["language_analysis"],
-            )
-            for f in report_dict["files"]
-        ]
-        
-        # Build report for plugins
+
+        try:
+            report_dict = await connector.scan(scan_options)
+        finally:
+            if progress is not None:
+                # Final frame: the last completions reach clients before SCAN_FINISHED
+                await progress.close()
+
+        # Build report dict for plugin hooks
         report_for_plugins = {
             "report_schema_version": report_dict.get("report_schema_version", "1.0"),
             "root": report_dict["root"],
@@ -310,143 +219,193 @@ async def _run_background_scan(app, job: BackgroundScanJob):
             "plugins": app.state.plugin_manager.get_plugins_info(),
             "quality": report_dict.get("quality"),
             "refactoring": report_dict.get("refactoring"),
-            "project_path": str(root),
+            "project_path": str(root),  # Add project path for plugins
         }
-        
+
+        # Run plugin hooks - plugins enrich the report dict in place
         app.state.plugin_manager.hook_on_scan(report_for_plugins, project_root=root)
-        
-        report = ScanReport(
-            report_schema_version=report_for_plugins.get("report_schema_version", "1.0"),
-            root=report_for_plugins["root"],
-            files=file_models,
-            dynamic=report_for_plugins.get("dynamic"),
-            plugins=report_for_plugins.get("plugins"),
-            quality=report_for_plugins.get("quality"),
-            refactoring=report_for_plugins.get("refactoring"),
-            pylance=report_for_plugins.get("pylance"),
-            code_quality=report_for_plugins.get("code_quality"),
-        )
-        
-        # Get API info if available
+
+        # Enrich with API info if available (for ScanReport)
+        api_info = None
         if hasattr(connector, "get_api_info"):
             try:
-                api_info = await connector.get_api_info()
-                if api_info:
-                    report.api = api_info
+                api_info = await connector.get_api_info() or None
             except Exception as e:
-                logger.warning("Failed to fetch API info during background scan: %s", e)
-        
-        # Save to cache
-        try:
-            cache_manager.save_last_scan(report.dict())
-        except Exception as exc:
-            logger.warning("Failed to persist last scan cache: %s", exc)
-        
-        # Create snapshot if requested
-        if job.options.capture_snapshot:
+                logger.warning("Failed to fetch API info during scan: %s", e)
+
+        file_count = len(report_dict["files"])
+        encoded = dumps(_report_payload(report_for_plugins, api_info))
+
+        cached = cache_manager.save_last_scan_encoded(encoded)
+        analyze_cache.invalidate(root)
+
+        # Read at the end: callers that joined during the scan may have asked for one
+        if flight.capture_snapshot:
             try:
                 metadata = SystemState(app).history_manager().create_snapshot(
                     report_dict,
-                    label=job.options.snapshot_label,
+                    label=flight.snapshot_label,
                     backend_name=job.options.backend_name,
                 )
-                await manager.broadcast(f"Snapshot stored: {metadata.id}")
-            except Exception as exc:
+                await manager.broadcast(f"Snapshot stored: {metadata.id}", project_id=project_id)
+            except Exception as exc:  # pragma: no cover - logging only
                 logger.warning("Failed to store snapshot: %s", exc)
-        
-        # Update job status
-        job.status = ScanStatus.COMPLETED
-        job.finished_at = time.time()
-        job.progress = 100
-        job.result = report.dict()
-        
-        duration_ms = int((job.finished_at - job.started_at) * 1000)
-        
-        # Notify completion
-        try:
-            await manager.broadcast(JupiterEvent(type=SCAN_FINISHED, payload={
-                "job_id": job.job_id,
-                "file_count": len(report.files),
-                "duration_ms": duration_ms,
-                "background": True
-            }))
-            await manager.broadcast(f"Background scan completed. Found {len(file_models)} files in {duration_ms}ms.")
-        except Exception as e:
-            logger.warning("Failed to broadcast scan finished: %s", e)
-        emit_scan_finished(str(root), len(report.files), duration_ms)
-        
     except Exception as e:
-        logger.error("Background scan failed: %s", e)
+        logger.error("Scan failed: %s", e)
         job.status = ScanStatus.FAILED
         job.finished_at = time.time()
         job.error = str(e)
+        store.save(job)
         emit_scan_error(str(root), str(e))
         try:
-            await manager.broadcast(JupiterEvent(type="SCAN_ERROR", payload={
-                "job_id": job.job_id,
-                "error": str(e)
-            }))
+            await manager.broadcast(JupiterEvent(type="SCAN_ERROR", payload={"job_id": job.job_id, "project_id": project_id, "error": str(e)}))
         except Exception:
             pass
-    finally:
-        _current_scan_job = None
+        raise
+
+    job.finished_at = time.time()
+    job.progress = 100
+    job.file_count = file_count
+    # The report goes to disk (linked to last_scan.json): only metadata stays in memory
+    store.complete(job, encoded, source=cache_manager.last_scan_file if cached else None)
+    duration_ms = int((job.finished_at - job.started_at) * 1000)
+
+    try:
+        await manager.broadcast(JupiterEvent(type=SCAN_FINISHED, payload={
+            "job_id": job.job_id,
+            "project_id": project_id,
+            "file_count": file_count,
+            "duration_ms": duration_ms,
+            "background": flight.background,
+            "waiters": flight.waiters,
+        }))
+        if flight.background:
+            await manager.broadcast(f"Background scan completed. Found {file_count} files in {duration_ms}ms.", project_id=project_id)
+        else:
+            await manager.broadcast(f"Scan completed. Found {file_count} files.", project_id=project_id)
+    except Exception as e:
+        logger.warning("Failed to broadcast scan finished: %s", e)
+    # Emitted after the cache is written, so subscribers such as the
+    # livemap graph read the new report
+    emit_scan_finished(str(root), file_count, duration_ms)
+    return encoded
+
+
+@router.post("/scan", response_model=ScanReport, dependencies=[Depends(verify_token)])
+async def post_scan(request: Request, options: ScanRequest) -> EncodedJSONResponse:
+    """Run a filesystem scan and return a JSON report.
+
+    A request matching a scan already in flight (same root and options, or
+    a full scan serving an incremental request) waits for that scan and
+    gets its report instead of scanning again.
+    """
+    app = request.app
+    if options.backend_name and not app.state.project_manager.get_connector(options.backend_name):
+        raise HTTPException(status_code=404, detail=f"Backend '{options.backend_name}' not found")
+
+    flight, joined = _submit_scan(app, options, background=False)
+    if joined:
+        logger.info("Scan request served by in-flight scan %s", flight.job.job_id)
+    try:
+        encoded = await flight.wait()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Scan failed: {str(e)}")
+    return EncodedJSONResponse(encoded, headers={"X-Scan-Job": flight.job.job_id})
+
 
+# =============================================================================
+# Background Scan Endpoints
+# =============================================================================
 
 @router.post("/scan/background", dependencies=[Depends(verify_token)])
 async def post_scan_background(request: Request, options: ScanRequest) -> Dict[str, Any]:
     """
     Start a scan in the background and return immediately with a job ID.
     
+    If a scan serving the same root and options is already queued or
+    running, its job is returned (``joined: true``); a scan with other
+    options is queued behind the running one.
+    
     Use GET /scan/status/{job_id} to check progress.
     Progress updates are also broadcast via WebSocket.
     """
-    global _scan_task
-    
-    # Check if a scan is already running
-    current = get_current_scan()
-    if current and current.status == ScanStatus.RUNNING:
-        raise HTTPException(
-            status_code=409, 
-            detail=f"A scan is already running (job_id: {current.job_id}). Wait for it to complete or check its status."
-        )
-    
-    # Create new job
-    job_id = str(uuid.uuid4())[:8]  # Short ID for convenience
-    job = BackgroundScanJob(job_id, options)
-    _background_jobs[job_id] = job
-    
-    # Clean old completed jobs (keep last 10)
-    completed_jobs = [j for j in _background_jobs.values() if j.status in (ScanStatus.COMPLETED, ScanStatus.FAILED)]
-    if len(completed_jobs) > 10:
-        for old_job in sorted(completed_jobs, key=lambda x: x.finished_at or 0)[:len(completed_jobs) - 10]:
-            del _background_jobs[old_job.job_id]
-    
-    # Start background task using asyncio.create_task (runs in the same event loop)
-    _scan_task = asyncio.create_task(_run_background_scan(request.app, job))
-    
-    logger.info("Started background scan job: %s", job_id)
-    
+    flight, joined = _submit_scan(request.app, options, background=True)
+    job = flight.job
+    if joined:
+        message = "Joined the scan already in progress. Use /scan/status/{job_id} to check progress."
+    else:
+        logger.info("Started background scan job: %s", job.job_id)
+        message = "Scan started in background. Use /scan/status/{job_id} to check progress."
     return {
-        "job_id": job_id,
-        "status": "pending",
-        "message": "Scan started in background. Use /scan/status/{job_id} to check progress."
+        "job_id": job.job_id,
+        "status": job.status.value,
+        "joined": joined,
+        "message": message,
     }
 
 
 @router.get("/scan/status/{job_id}", dependencies=[Depends(verify_token)])
-async def get_scan_status(job_id: str) -> Dict[str, Any]:
+async def get_scan_status(request: Request, job_id: str) -> Dict[str, Any]:
     """Get the status of a background scan job."""
-    job = get_background_job(job_id)
+    job = get_background_job(request.app, job_id)
     if not job:
         raise HTTPException(status_code=404, detail=f"Scan job '{job_id}' not found")
     
     return job.to_dict()
 
 
+@router.get("/scan/jobs", dependencies=[Depends(verify_token)])
+async def list_scan_jobs(request: Request) -> Dict[str, Any]:
+    """List the retained scan jobs, newest first (reports stay on disk)."""
+    store = SystemState(request.app).scan_job_store()
+    return {
+        "jobs": [job.to_dict() for job in store.jobs()],
+        "retention": {"max_jobs": store.max_jobs, "max_age_days": store.max_age_days},
+    }
+
+
+@router.get("/scan/jobs/{job_id}/events", dependencies=[Depends(verify_stream_token)])
+async def stream_scan_job_events(
+    request: Request,
+    job_id: str,
+    last_event_id_param: Optional[str] = Query(None, alias="last_event_id", description="Resume after this event ID."),
+) -> StreamingResponse:
+    """Follow a scan job as Server-Sent Events until it finishes.
+
+    The stream starts and ends with a ``status`` event (the body of
+    ``/scan/status/{job_id}``) and relays the job's ``SCAN_STARTED``,
+    ``SCAN_PROGRESS``, ``SCAN_FINISHED`` and ``SCAN_ERROR`` events in between.
+    """
+    job = get_background_job(request.app, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Scan job '{job_id}' not found")
+    resume = last_event_id(request, last_event_id_param)
+
+    def status() -> str:
+        return format_event(dumps(job.to_dict()).decode("utf-8"), "status")
+
+    async def generate():
+        yield f"retry: {RETRY_MS}\n\n"
+        yield status()
+        if job.status in FINISHED_STATUSES and resume is None:
+            return
+        async for chunk in event_hub.stream(
+            lambda message: message.job_id == job_id,
+            resume,
+            until=lambda message: message.job_id == job_id and message.topic in (SCAN_FINISHED, "SCAN_ERROR"),
+            finished=lambda: job.status in FINISHED_STATUSES,
+            is_disconnected=request.is_disconnected,
+        ):
+            yield chunk
+        yield status()
+
+    return StreamingResponse(generate(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
 @router.get("/scan/status", dependencies=[Depends(verify_token)])
-async def get_current_scan_status() -> Dict[str, Any]:
+async def get_current_scan_status(request: Request) -> Dict[str, Any]:
     """Get the status of the currently running scan, if any."""
-    current = get_current_scan()
+    current = get_current_scan(request.app)
     if current:
         return {
             "running": True,
@@ -459,9 +418,10 @@ async def get_current_scan_status() -> Dict[str, Any]:
 
 
 @router.get("/scan/result/{job_id}", response_model=ScanReport, dependencies=[Depends(verify_token)])
-async def get_scan_result(job_id: str) -> ScanReport:
+async def get_scan_result(request: Request, job_id: str) -> EncodedJSONResponse:
     """Get the result of a completed background scan job."""
-    job = get_background_job(job_id)
+    store = SystemState(request.app).scan_job_store()
+    job = store.get(job_id)
     if not job:
         raise HTTPException(status_code=404, detail=f"Scan job '{job_id}' not found")
     
@@ -474,10 +434,68 @@ async def get_scan_result(job_id: str) -> ScanReport:
     if job.status == ScanStatus.FAILED:
         raise HTTPException(status_code=500, detail=f"Scan job failed: {job.error}")
     
-    if not job.result:
+    result = store.result(job_id)
+    if result is None:
         raise HTTPException(status_code=500, detail="Scan completed but no result available")
     
-    return ScanReport(**job.result)
+    return EncodedJSONResponse(result)
+
+
+@router.get("/scan/result/{job_id}/files", response_model=FilePageResponse, dependencies=[Depends(verify_token)])
+async def get_scan_result_files(
+    request: Request,
+    job_id: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    fields: Optional[str] = None,
+    ext: Optional[List[str]] = Query(None),
+    dir: Optional[str] = None,
+    has_errors: Optional[bool] = None,
+    q: Optional[str] = None,
+    sort: str = "path",
+) -> FilePageResponse:
+    """Page through the files of a completed background scan (see GET /reports/last/files)."""
+    store = SystemState(request.app).scan_job_store()
+    job = store.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Scan job '{job_id}' not found")
+    if job.status != ScanStatus.COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Scan job is {job.status.value}")
+    # A cache miss parses the whole report: keep it off the event loop
+    report_store = await asyncio.to_thread(store.report_store, job_id)
+    if report_store is None:
+        raise HTTPException(status_code=500, detail="Scan completed but no result available")
+    return _file_page(report_store, cursor, limit, fields, ext, dir, has_errors, q, sort)
+
+
+def _file_page(
+    store: ReportStore,
+    cursor: Optional[str],
+    limit: int,
+    fields: Optional[str],
+    ext: Optional[List[str]],
+    directory: Optional[str],
+    has_errors: Optional[bool],
+    search: Optional[str],
+    sort: str,
+) -> FilePageResponse:
+    """Run a page query, turning bad parameters into 400s."""
+    try:
+        key, descending = parse_sort(sort)
+        page = store.query(
+            cursor=cursor,
+            limit=limit,
+            fields=parse_fields(fields),
+            extensions=[e for value in ext or [] for e in value.split(",")],
+            prefix=directory,
+            has_errors=has_errors,
+            search=search,
+            sort=key,
+            descending=descending,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FilePageResponse(**page.to_dict())
 
 
 @router.get("/api/endpoints", dependencies=[Depends(verify_token)])
@@ -547,11 +565,53 @@ def get_registered_handlers(app) -> List[Dict[str, Any]]:
 
 
 @router.get("/reports/last", response_model=ScanReport, dependencies=[Depends(verify_token)])
-async def get_last_report(request: Request) -> ScanReport:
-    """Retrieve the last scan report from cache."""
-    cache_manager = CacheManager(request.app.state.root_path)
-    report_dict = cache_manager.load_last_scan()
-    if not report_dict:
+async def get_last_report(request: Request) -> Response:
+    """Retrieve the last scan report from cache.
+
+    The ETag follows the cache file version: a matching ``If-None-Match``
+    gets a 304 without reading the report, and the compressed body is
+    reused until the next scan. The cache file is written in the
+    ``ScanReport`` shape, so its bytes are served as they are; only legacy
+    reports that still need normalizing go through the model.
+    """
+    stamp = SystemState(request.app).last_scan_stamp()
+    if stamp is None:
         raise HTTPException(status_code=404, detail="No previous scan report found")
-    
-    return ScanReport(**report_dict)
+
+    def body() -> bytes:
+        cache_manager = CacheManager(request.app.state.root_path)
+        encoded = cache_manager.load_last_scan_encoded()
+        if encoded is not None:
+            return encoded
+        report_dict = cache_manager.load_last_scan()
+        if not report_dict:
+            raise HTTPException(status_code=404, detail="No previous scan report found")
+        return dumps(ScanReport(**report_dict).model_dump())
+
+    return await conditional_response(request, make_etag("report", *stamp), body)
+
+
+@router.get("/reports/last/files", response_model=FilePageResponse, dependencies=[Depends(verify_token)])
+async def get_last_report_files(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    fields: Optional[str] = None,
+    ext: Optional[List[str]] = Query(None),
+    dir: Optional[str] = None,
+    has_errors: Optional[bool] = None,
+    q: Optional[str] = None,
+    sort: str = "path",
+) -> FilePageResponse:
+    """Page through the files of the last scan report.
+
+    Served from an index kept in memory until ``last_scan.json`` changes.
+    ``sort`` takes a ``-`` prefix for descending order; ``ext`` can be
+    repeated or comma-separated; ``dir`` is a directory relative to the
+    project root; ``q`` matches a substring of the path; ``fields`` is a
+    comma-separated projection (e.g. ``path,size_bytes``).
+    """
+    store = await asyncio.to_thread(SystemState(request.app).report_store)
+    if store is None:
+        raise HTTPException(status_code=404, detail="No previous scan report found")
+    return _file_page(store, cursor, limit, fields, ext, dir, has_errors, q, sort)
@@ -1,19 +1,23 @@
 """
 System router for Jupiter API.
 
-Version: 1.11.0 - Deprecated legacy livemap endpoints (migrated to plugin router)
+Version: 1.13.0 - WebSocket queue metrics (GET /metrics/websocket)
 """
 from typing import Dict, Any, List, Optional, cast
+import asyncio
 import inspect
 import logging
 import os
 import shutil
 import tempfile
+import uuid
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, Request, HTTPException, UploadFile, File, Body
+from fastapi import APIRouter, Depends, Request, Response, HTTPException, UploadFile, File, Body
 from fastapi.responses import PlainTextResponse
 from jupiter.server.routers.auth import verify_token, require_admin, log_action
+from jupiter.server.responses import conditional_response
+from jupiter.core.jsonio import dumps
 from jupiter.core.metrics import MetricsCollector
 from jupiter.core.plugin_manager import PluginManager
 from jupiter.core.state import save_last_root
@@ -22,7 +26,7 @@ from jupiter.config import load_config, save_config
 from jupiter.config.config import save_global_config
 from jupiter.config.config import ProjectApiConfig, get_project_config_path
 from jupiter.server.ws import manager
-from jupiter.core.events import JupiterEvent, CONFIG_UPDATED, PLUGIN_TOGGLED, RUN_STARTED, RUN_FINISHED
+from jupiter.core.events import JupiterEvent, CONFIG_UPDATED, PLUGIN_TOGGLED, RUN_STARTED, RUN_FINISHED, RUN_OUTPUT
 from jupiter.server.meeting_adapter import MeetingAdapter
 from jupiter.server.system_services import SystemState, preserve_meeting_config
 from jupiter.server.models import (
@@ -39,6 +43,7 @@ from jupiter.server.models import (
     LicenseStatus,
     RunRequest,
     RunResponse,
+    RunJobResponse,
 )
 
 # Bridge event system for plugin notifications
@@ -48,14 +53,20 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 @router.get("/metrics", dependencies=[Depends(verify_token)])
-async def get_metrics(request: Request) -> Dict[str, Any]:
-    """Get system metrics."""
+async def get_metrics(request: Request) -> Response:
+    """Get system metrics (ETag from the content: unchanged metrics answer 304)."""
     state = SystemState(request.app)
     collector = MetricsCollector(
         history_manager=state.history_manager(),
         plugin_manager=request.app.state.plugin_manager,
     )
-    return collector.collect()
+    return await conditional_response(request, None, dumps(collector.collect()))
+
+
+@router.get("/metrics/websocket", dependencies=[Depends(verify_token)])
+async def get_websocket_metrics() -> Dict[str, Any]:
+    """Per-client WebSocket send queues: depth, drops, coalesced events and send lag."""
+    return manager.stats()
 
 
 @router.get("/metrics/bridge", dependencies=[Depends(verify_token)])
@@ -1339,9 +1350,63 @@ performance:
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create config: {e}")
 
-@router.post("/run", response_model=RunResponse)
-async def post_run(request: Request, run_req: RunRequest, role: str = Depends(require_admin)) -> RunResponse:
-    """Execute a command in the project root and return its output."""
+class _RunOutputRelay:
+    """Batches command output lines into ``RUN_OUTPUT`` events.
+
+    Lines are sent at most every ``INTERVAL`` seconds (or as soon as
+    ``MAX_LINES`` are waiting), so a chatty command does not produce one
+    WebSocket message per line. ``close()`` sends the remaining lines after
+    any timer flush still in progress.
+    """
+
+    INTERVAL = 0.1
+    MAX_LINES = 500
+    MAX_LINE_CHARS = 4096
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self._lines: List[List[str]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def __call__(self, stream: str, line: str) -> None:
+        if len(line) > self.MAX_LINE_CHARS:
+            line = line[: self.MAX_LINE_CHARS] + "…"
+        self._lines.append([stream, line])
+        if len(self._lines) >= self.MAX_LINES:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.INTERVAL, self._flush_later)
+
+    def _flush_later(self) -> None:
+        self._timer = None
+        self._task = asyncio.ensure_future(self.flush())
+        self._task.add_done_callback(self._flushed)
+
+    def _flushed(self, task: "asyncio.Task[None]") -> None:
+        if self._task is task:
+            self._task = None
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Failed to relay output of run %s: %s", self.run_id, task.exception())
+
+    async def close(self) -> None:
+        task = self._task
+        if task is not None and not task.done():
+            await asyncio.wait([task])
+        await self.flush()
+
+    async def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._lines:
+            return
+        lines, self._lines = self._lines, []
+        await manager.broadcast(JupiterEvent(type=RUN_OUTPUT, payload={"run_id": self.run_id, "lines": lines}))
+
+
+def _run_connector(request: Request, run_req: RunRequest, role: str) -> Any:
+    """Check run permissions for ``run_req`` and return the connector to use."""
     log_action(role, "run", run_req.command)
     app = request.app
     app.state.meeting_adapter.validate_feature_access("run")
@@ -1366,31 +1431,107 @@ async def post_run(request: Request, run_req: RunRequest, role: str = Depends(re
             raise HTTPException(status_code=404, detail=f"Backend {run_req.backend_name} not found")
     else:
         connector = app.state.project_manager.get_default_connector()
+    return connector
+
+
+async def _execute_run(connector: Any, run_req: RunRequest, run_id: str) -> RunResponse:
+    """Run the command, streaming output and partial call counts as it goes."""
+    await manager.broadcast(JupiterEvent(
+        type=RUN_STARTED, payload={"command": run_req.command, "cwd": run_req.cwd, "run_id": run_id}
+    ))
+
+    from jupiter.server.routers.watch import record_function_calls
 
-    await manager.broadcast(JupiterEvent(type=RUN_STARTED, payload={"command": run_req.command, "cwd": run_req.cwd}))
+    # Partial call counts are fed to the watch panel while the command runs
+    streamed = False
 
+    async def on_dynamic(delta: Dict[str, Any]) -> None:
+        nonlocal streamed
+        streamed = True
+        if delta.get("calls"):
+            await record_function_calls(delta["calls"])
+
+    relay = _RunOutputRelay(run_id)
     try:
-        result_dict = await connector.run_command(run_req.command, with_dynamic=run_req.with_dynamic, cwd=run_req.cwd)
-        await manager.broadcast(JupiterEvent(type=RUN_FINISHED, payload={"returncode": result_dict.get("returncode", 0)}))
-        
-        # If dynamic analysis was enabled and we have call data, record it for the watch feature
-        if run_req.with_dynamic and result_dict.get("dynamic_data"):
-            dynamic_data = result_dict["dynamic_data"]
-            calls = dynamic_data.get("calls", {})
-            if calls:
-                from jupiter.server.routers.watch import record_function_calls
-                await record_function_calls(calls)
-                
-    except Exception as e:
-        logger.error("Run failed: %s", e)
-        raise HTTPException(status_code=500, detail=f"Run failed: {str(e)}")
-    
+        result_dict = await connector.run_command(
+            run_req.command,
+            with_dynamic=run_req.with_dynamic,
+            cwd=run_req.cwd,
+            dynamic_mode=run_req.dynamic_mode,
+            sample_rate=run_req.sample_rate,
+            on_dynamic=on_dynamic if run_req.with_dynamic else None,
+            on_output=relay,
+            timeout=run_req.timeout,
+        )
+    except asyncio.CancelledError:
+        # Job cancelled: the connector has stopped the command
+        await relay.close()
+        await manager.broadcast(JupiterEvent(
+            type=RUN_FINISHED, payload={"returncode": None, "run_id": run_id, "cancelled": True}
+        ))
+        raise
+    finally:
+        await relay.close()
+    await manager.broadcast(JupiterEvent(
+        type=RUN_FINISHED, payload={"returncode": result_dict.get("returncode", 0), "run_id": run_id}
+    ))
+
+    # Connectors that cannot stream only return the final data: record it now
+    if run_req.with_dynamic and not streamed and result_dict.get("dynamic_data"):
+        calls = result_dict["dynamic_data"].get("calls", {})
+        if calls:
+            await record_function_calls(calls)
+
     return RunResponse(
         stdout=result_dict["stdout"],
         stderr=result_dict["stderr"],
         returncode=result_dict["returncode"],
         dynamic_analysis=result_dict.get("dynamic_data"),
+        run_id=run_id,
+        timed_out=result_dict.get("timed_out", False),
+        output_truncated=result_dict.get("output_truncated", False),
+    )
+
+
+@router.post("/run", response_model=RunResponse)
+async def post_run(request: Request, run_req: RunRequest, role: str = Depends(require_admin)) -> RunResponse:
+    """Execute a command in the project root and return its output.
+
+    Output lines are broadcast as ``RUN_OUTPUT`` events while the command runs.
+    """
+    connector = _run_connector(request, run_req, role)
+    try:
+        return await _execute_run(connector, run_req, run_req.run_id or uuid.uuid4().hex[:12])
+    except Exception as e:
+        logger.error("Run failed: %s", e)
+        raise HTTPException(status_code=500, detail=f"Run failed: {str(e)}")
+
+
+@router.post("/run/jobs", response_model=RunJobResponse)
+async def post_run_job(request: Request, run_req: RunRequest, role: str = Depends(require_admin)) -> RunJobResponse:
+    """Start a command as a background job.
+
+    Output is streamed as ``RUN_OUTPUT`` events (``run_id``); the job result
+    (``GET /jobs/{job_id}``) holds the ``RunResponse``. ``POST
+    /jobs/{job_id}/cancel`` stops the command.
+    """
+    from jupiter.core.bridge import get_job_manager, is_initialized
+
+    if not is_initialized():
+        raise HTTPException(status_code=503, detail="Bridge not initialized")
+    connector = _run_connector(request, run_req, role)
+    run_id = run_req.run_id or uuid.uuid4().hex[:12]
+
+    async def job(progress_callback: Any) -> Dict[str, Any]:
+        response = await _execute_run(connector, run_req, run_id)
+        return response.dict()
+
+    job_id = await get_job_manager().submit(
+        f"run: {' '.join(run_req.command)}"[:120],
+        job,
+        metadata={"kind": "run", "run_id": run_id, "command": run_req.command},
     )
+    return RunJobResponse(job_id=job_id, run_id=run_id)
 
 
 
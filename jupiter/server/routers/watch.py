@@ -14,7 +14,10 @@ from pydantic import BaseModel, Field
 
 from jupiter.server.routers.auth import verify_token, require_admin
 from jupiter.server.ws import manager as ws_manager
+from jupiter.core.callstream import CallStreamServer
 from jupiter.core.events import JupiterEvent
+from jupiter.core.analyze_cache import analyze_cache
+from jupiter.server.scan_progress import DEFAULT_RATE_HZ, ScanProgressAggregator
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +38,7 @@ class WatchStatusResponse(BaseModel):
     track_files: bool = False
     call_counts: Dict[str, int] = Field(default_factory=dict)
     total_events: int = 0
+    live_calls: bool = Field(default=False, description="Traced processes can stream calls to this server.")
 
 
 class FunctionCallEvent(BaseModel):
@@ -55,6 +59,7 @@ class WatchState:
     call_counts: Dict[str, int] = field(default_factory=dict)
     total_events: int = 0
     _file_watcher_task: Optional[asyncio.Task] = None
+    _call_stream: Optional[CallStreamServer] = None
 
 
 # Global watch state
@@ -85,10 +90,34 @@ def _build_status_response(active: Optional[bool] = None,
         track_calls=_watch_state.track_calls,
         track_files=_watch_state.track_files,
         call_counts=call_counts if call_counts is not None else dict(_watch_state.call_counts),
-        total_events=total_events if total_events is not None else _watch_state.total_events
+        total_events=total_events if total_events is not None else _watch_state.total_events,
+        live_calls=_watch_state._call_stream is not None,
     )
 
 
+async def _start_call_stream(root: Path) -> None:
+    """Open the live call channel so traced processes of ``root`` can push deltas."""
+    await _stop_call_stream()
+    stream = CallStreamServer(root, on_calls=record_function_calls)
+    try:
+        await stream.start()
+    except OSError as e:
+        logger.warning("Live call stream unavailable: %s", e)
+        return
+    _watch_state._call_stream = stream
+
+
+async def _stop_call_stream() -> None:
+    stream, _watch_state._call_stream = _watch_state._call_stream, None
+    if stream is not None:
+        await stream.stop()
+
+
+async def shutdown_call_stream() -> None:
+    """Close the live call channel (server shutdown)."""
+    await _stop_call_stream()
+
+
 @router.post("/watch/start")
 async def start_watch(
     request: Request,
@@ -100,6 +129,8 @@ async def start_watch(
     When watch is active:
     - File modifications in the project are tracked
     - Function calls from `run` commands with dynamic=true are counted
+    - Traced processes of the project stream their calls live (local socket
+      announced in `.jupiter/ipc/calls.json`)
     - Events are broadcast via WebSocket
     """
     global _watch_state
@@ -113,6 +144,9 @@ async def start_watch(
     _watch_state.track_files = body.track_files
     _watch_state.call_counts = {}
     _watch_state.total_events = 0
+
+    if body.track_calls:
+        await _start_call_stream(Path(request.app.state.root_path))
     
     # Broadcast watch started event
     await ws_manager.broadcast(JupiterEvent(
@@ -144,6 +178,8 @@ async def stop_watch(
     final_counts = dict(_watch_state.call_counts)
     final_events = _watch_state.total_events
     
+    await _stop_call_stream()
+
     # Reset state
     _watch_state.active = False
     _watch_state.started_at = None
@@ -197,7 +233,9 @@ async def record_function_calls(calls: Dict[str, int]) -> None:
     """Record function calls from a dynamic analysis run.
     
     This is called by the run endpoint when dynamic analysis is enabled.
-    Updates the global watch state and broadcasts events via WebSocket.
+    Also fed by the live call channel while traced processes run. Only the
+    delta is broadcast (clients add it to the counts from ``/watch/status``),
+    so event size does not grow with the number of functions seen so far.
     
     Args:
         calls: Dictionary mapping function keys (file::function) to call counts.
@@ -215,7 +253,7 @@ async def record_function_calls(calls: Dict[str, int]) -> None:
         type="FUNCTION_CALLS",
         payload={
             "calls": calls,
-            "cumulative": dict(_watch_state.call_counts),
+            "total_events": _watch_state.total_events,
             "timestamp": datetime.utcnow().isoformat()
         }
     ))
@@ -240,6 +278,8 @@ async def broadcast_file_change(file_path: str, change_type: str) -> None:
         file_path: Path to the changed file.
         change_type: Type of change (created, modified, deleted).
     """
+    # Cached analyze summaries would also be caught by their fingerprint; drop them early
+    analyze_cache.invalidate()
     if not _watch_state.active or not _watch_state.track_files:
         return
     
@@ -301,43 +341,35 @@ async def broadcast_log_message(level: str, message: str, source: str = "jupiter
     ))
 
 
-# Global reference to the main event loop for cross-thread communication
-_main_loop: Optional[asyncio.AbstractEventLoop] = None
-
+def create_scan_progress_callback(
+    job_id: Optional[str] = None,
+    rate_hz: float = DEFAULT_RATE_HZ,
+    project_id: Optional[str] = None,
+) -> Optional[ScanProgressAggregator]:
+    """Create a progress callback for use with ProjectScanner.
 
-def set_main_loop(loop: Optional[asyncio.AbstractEventLoop]) -> None:
-    """Set the main event loop reference for cross-thread callbacks."""
-    global _main_loop
-    _main_loop = loop
+    Must be called on the event loop. The callback aggregates scanner events
+    (from any thread) into ``SCAN_PROGRESS`` frames sent at most ``rate_hz``
+    times per second; ``await callback.close()`` sends the final frame.
 
-
-def create_scan_progress_callback():
-    """Create a callback function for use with ProjectScanner.
-    
     Returns:
-        A synchronous callback that queues async broadcasts using thread-safe mechanism.
+        A started ``ScanProgressAggregator``, or None when watch mode is off.
     """
     if not _watch_state.active:
         return None
-    
-    def callback(event_type: str, payload: Dict[str, Any]) -> None:
-        """Synchronous callback that schedules async broadcast from any thread."""
-        global _main_loop
-        
-        # Update watch state counters (thread-safe simple operations)
-        _watch_state.total_events += 1
-        
-        if not _main_loop:
+
+    async def broadcast_frame(event: JupiterEvent) -> None:
+        if not _watch_state.active:
             return
-            
-        try:
-            # Schedule the coroutine to run on the main event loop from this thread
-            future = asyncio.run_coroutine_threadsafe(
-                broadcast_scan_progress(event_type, payload),
-                _main_loop
-            )
-            # Don't wait for result - fire and forget
-        except Exception as e:
-            logger.debug("Failed to schedule broadcast: %s", e)
-    
-    return callback
+        # total_events keeps counting scanner events, not the frames they are folded into
+        _watch_state.total_events += event.payload.get("events", 0)
+        await ws_manager.broadcast(JupiterEvent(
+            type=event.type,
+            payload={
+                **event.payload,
+                "timestamp": datetime.utcnow().isoformat()
+            }
+        ))
+
+    extra = {"project_id": project_id} if project_id else None
+    return ScanProgressAggregator(broadcast_frame, job_id=job_id, rate_hz=rate_hz, extra=extra).start()
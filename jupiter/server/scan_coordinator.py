@@ -0,0 +1,166 @@
+"""Coalescing of concurrent scan requests.
+
+Version: 1.0.0 - Scan flights keyed by (root, options), per-root queue
+
+The Web UI, CI webhooks and the watch loop often ask for a scan of the
+same tree at the same moment. Each scan is a *flight* keyed by the project
+root and the effective scan options:
+
+- a request matching a flight in progress (queued or running) joins it and
+  receives the same encoded report;
+- an incremental request is also served by a full scan of the same key
+  (a full scan is at least as fresh as an incremental one);
+- flights of the same root run one after the other (they write the same
+  cache and history); they queue instead of being rejected.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, replace
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ScanKey:
+    """Identity of a scan: two requests with the same key produce the same report."""
+
+    root: str
+    backend: Optional[str]
+    show_hidden: bool
+    ignore_globs: Tuple[str, ...]
+    incremental: bool
+
+    @classmethod
+    def of(cls, root: Any, backend: Optional[str], scan_options: Dict[str, Any]) -> "ScanKey":
+        """Key for the effective connector options (``show_hidden``, ``ignore_globs``, ``incremental``)."""
+        return cls(
+            root=str(root),
+            backend=backend,
+            show_hidden=bool(scan_options.get("show_hidden")),
+            ignore_globs=tuple(sorted(scan_options.get("ignore_globs") or ())),
+            incremental=bool(scan_options.get("incremental")),
+        )
+
+    def full(self) -> "ScanKey":
+        return replace(self, incremental=False)
+
+
+class ScanFlight:
+    """One scan in progress and the callers waiting for it."""
+
+    def __init__(self, key: ScanKey, job: Any, capture_snapshot: bool, snapshot_label: Optional[str], background: bool):
+        self.key = key
+        self.job = job
+        self.waiters = 1
+        # Snapshot requests of every caller are merged (decided when the scan ends)
+        self.capture_snapshot = capture_snapshot
+        self.snapshot_label = snapshot_label
+        self.background = background
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        # A failed scan nobody awaits must not log "exception never retrieved"
+        self.future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self.task: Optional[asyncio.Task] = None
+
+    def join(self, capture_snapshot: bool, snapshot_label: Optional[str]) -> None:
+        self.waiters += 1
+        self.capture_snapshot = self.capture_snapshot or capture_snapshot
+        if self.snapshot_label is None:
+            self.snapshot_label = snapshot_label
+
+    @property
+    def active(self) -> bool:
+        """Not finished, and owned by the running event loop."""
+        if self.future.done():
+            return False
+        try:
+            return self.future.get_loop() is asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+
+    async def wait(self) -> bytes:
+        """Encoded report of the flight (a cancelled caller does not cancel the scan)."""
+        return await asyncio.shield(self.future)
+
+
+ScanRunner = Callable[[ScanFlight], Awaitable[bytes]]
+
+
+class ScanCoordinator:
+    """Registry of scan flights (one per ``app``, see ``SystemState.scan_coordinator()``)."""
+
+    def __init__(self) -> None:
+        self._flights: Dict[ScanKey, ScanFlight] = {}
+        self._tails: Dict[str, asyncio.Task] = {}  # last flight queued per root
+        self.started = 0
+        self.joined = 0
+
+    def find(self, key: ScanKey) -> Optional[ScanFlight]:
+        """Flight able to serve ``key``: same key, or the full scan for an incremental key."""
+        candidates: Iterable[ScanKey] = (key.full(), key) if key.incremental else (key,)
+        for candidate in candidates:
+            flight = self._flights.get(candidate)
+            if flight is not None and flight.active:
+                return flight
+        return None
+
+    def submit(
+        self,
+        key: ScanKey,
+        make_job: Callable[[], Any],
+        run: ScanRunner,
+        capture_snapshot: bool = False,
+        snapshot_label: Optional[str] = None,
+        background: bool = False,
+    ) -> Tuple[ScanFlight, bool]:
+        """Join the flight serving ``key`` or start a new one.
+
+        Args:
+            make_job: Builds the job record of a new flight.
+            run: Runs the scan of a new flight and returns the encoded report.
+
+        Returns:
+            (flight, joined): ``joined`` is True when an existing flight was reused.
+        """
+        flight = self.find(key)
+        if flight is not None:
+            flight.join(capture_snapshot, snapshot_label)
+            self.joined += 1
+            logger.info("Scan request joined flight %s (%d waiters)", getattr(flight.job, "job_id", "?"), flight.waiters)
+            return flight, True
+
+        flight = ScanFlight(key, make_job(), capture_snapshot, snapshot_label, background)
+        previous = self._tails.get(key.root)
+        self._flights[key] = flight
+        flight.task = asyncio.create_task(self._run(flight, run, previous))
+        self._tails[key.root] = flight.task
+        self.started += 1
+        return flight, False
+
+    async def _run(self, flight: ScanFlight, run: ScanRunner, previous: Optional[asyncio.Task]) -> None:
+        try:
+            if previous is not None and not previous.done() and previous.get_loop() is asyncio.get_running_loop():
+                await asyncio.wait({previous})
+            result = await run(flight)
+        except asyncio.CancelledError:
+            flight.future.cancel()
+            raise
+        except Exception as exc:
+            flight.future.set_exception(exc)
+        else:
+            flight.future.set_result(result)
+        finally:
+            if self._flights.get(flight.key) is flight:
+                del self._flights[flight.key]
+            if self._tails.get(flight.key.root) is flight.task:
+                del self._tails[flight.key.root]
+
+    def flights(self) -> List[ScanFlight]:
+        """Flights queued or running, oldest first."""
+        return [flight for flight in self._flights.values() if flight.active]
+
+    def stats(self) -> Dict[str, int]:
+        return {"in_flight": len(self.flights()), "started": self.started, "joined": self.joined}
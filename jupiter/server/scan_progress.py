@@ -0,0 +1,170 @@
+"""Rate-limited scan progress frames.
+
+Version: 1.0.0 - Scanner events aggregated into frames at a fixed rate
+
+The scanner reports every file (``SCAN_FILE_COMPLETED``) and every
+analyzed module (``FUNCTION_ANALYZED``) from its worker threads. Sending
+one WebSocket frame per event costs a cross-thread hop and a frame per
+file, which floods the event loop and the browser on large trees.
+
+``ScanProgressAggregator`` is the scanner's progress callback: it only
+updates counters under a lock (no hop to the event loop), and a task on
+the loop broadcasts one ``SCAN_PROGRESS`` frame per interval
+(``performance.scan_progress_hz``, 10 Hz by default) when something
+changed. A frame carries cumulative counts and a sample of the files and
+functions seen since the previous frame:
+
+- ``processed``, ``total``, ``percent``, ``current_file``, ``phase``;
+- ``files_completed`` (files in this frame), ``errors``,
+  ``functions_found`` and ``classes_found`` (cumulative);
+- ``recent_files`` and ``recent_functions`` (last ``sample_size`` of this frame);
+- ``events`` (scanner events folded into this frame).
+
+Counts are cumulative, so a frame replaced by a newer one in a slow
+client's queue loses only samples. ``close()`` sends the final frame.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+from jupiter.core.events import FUNCTION_ANALYZED, SCAN_FILE_COMPLETED, SCAN_PROGRESS, JupiterEvent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE_HZ = 10.0
+DEFAULT_SAMPLE_SIZE = 5
+
+Broadcaster = Callable[[JupiterEvent], Awaitable[Any]]
+
+
+class ScanProgressAggregator:
+    """Scanner progress callback sending at most ``rate_hz`` frames per second."""
+
+    def __init__(
+        self,
+        broadcast: Broadcaster,
+        job_id: Optional[str] = None,
+        rate_hz: float = DEFAULT_RATE_HZ,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+        extra: Optional[Dict[str, Any]] = None,
+    ):
+        self.broadcast = broadcast
+        self.job_id = job_id
+        self.interval = 1.0 / rate_hz if rate_hz and rate_hz > 0 else 1.0 / DEFAULT_RATE_HZ
+        self.extra = dict(extra or {})
+        self._lock = threading.Lock()
+        self._phase = "scanning"
+        self._processed = 0
+        self._total = 0
+        self._percent = 0
+        self._current_file: Optional[str] = None
+        self._errors = 0
+        self._functions = 0
+        self._classes = 0
+        self._files_in_frame = 0
+        self._events_in_frame = 0
+        self._recent_files: Deque[str] = deque(maxlen=sample_size)
+        self._recent_functions: Deque[Dict[str, Any]] = deque(maxlen=sample_size)
+        self._dirty = False
+        self._task: Optional[asyncio.Task] = None
+        self.events = 0
+        self.frames = 0
+
+    def __call__(self, event_type: str, payload: Dict[str, Any]) -> None:
+        """Record a scanner event (called from the scanner threads)."""
+        with self._lock:
+            self.events += 1
+            self._events_in_frame += 1
+            self._dirty = True
+            if event_type == SCAN_FILE_COMPLETED:
+                self._processed = max(self._processed, payload.get("processed", 0))
+                self._total = payload.get("total", self._total)
+                self._percent = max(self._percent, payload.get("percent", 0))
+                self._current_file = payload.get("file")
+                self._files_in_frame += 1
+                if payload.get("file"):
+                    self._recent_files.append(payload["file"])
+                if payload.get("error"):
+                    self._errors += 1
+            elif event_type == FUNCTION_ANALYZED:
+                self._functions += payload.get("functions_count", 0)
+                self._classes += payload.get("classes_count", 0)
+                self._recent_functions.append({
+                    "file": payload.get("file"),
+                    "functions": list(payload.get("functions") or ())[:3],
+                    "functions_count": payload.get("functions_count", 0),
+                })
+            elif event_type == SCAN_PROGRESS:
+                self._phase = payload.get("phase", self._phase)
+                self._total = payload.get("total_files", self._total)
+                self._processed = payload.get("processed", self._processed)
+                self._percent = payload.get("percent", self._percent)
+
+    def start(self) -> "ScanProgressAggregator":
+        """Start the flush task on the running loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return self
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    def _take_frame(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if not self._dirty:
+                return None
+            frame = {
+                **self.extra,
+                "phase": self._phase,
+                "processed": self._processed,
+                "total": self._total,
+                "total_files": self._total,
+                "percent": self._percent,
+                "current_file": self._current_file,
+                "files_completed": self._files_in_frame,
+                "errors": self._errors,
+                "functions_found": self._functions,
+                "classes_found": self._classes,
+                "recent_files": list(self._recent_files),
+                "recent_functions": list(self._recent_functions),
+                "events": self._events_in_frame,
+            }
+            if self.job_id is not None:
+                frame["job_id"] = self.job_id
+            self._dirty = False
+            self._files_in_frame = 0
+            self._events_in_frame = 0
+            self._recent_files.clear()
+            self._recent_functions.clear()
+            return frame
+
+    async def flush(self) -> bool:
+        """Broadcast the pending frame, if any; True when one was sent."""
+        frame = self._take_frame()
+        if frame is None:
+            return False
+        self.frames += 1
+        try:
+            await self.broadcast(JupiterEvent(type=SCAN_PROGRESS, payload=frame))
+        except Exception as exc:
+            logger.debug("Failed to broadcast scan progress: %s", exc)
+        return True
+
+    async def close(self) -> None:
+        """Stop the flush task and send the final frame."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+        logger.debug("Scan progress: %d events sent as %d frames", self.events, self.frames)
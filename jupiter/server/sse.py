@@ -0,0 +1,187 @@
+"""Server-Sent Events streams of the broadcast messages.
+
+Version: 1.1.0 - Event IDs prefixed with a per-process epoch
+
+Clients that cannot use the ``/ws`` WebSocket (CI dashboards, ``curl``)
+follow the same messages over SSE. ``EventHub`` listens to every
+``ConnectionManager.broadcast()`` (so it sees the rate-limited scan
+progress frames, not raw scanner events) and keeps the last
+``max_events`` messages with increasing IDs:
+
+- each SSE event carries ``id: <epoch>-<n>``; the epoch is drawn when the
+  hub is created, so IDs from a previous server run are recognized;
+- a reconnecting client sends ``Last-Event-ID`` and receives the buffered
+  messages it missed;
+- when those messages already left the buffer, or the ID has another
+  epoch, a ``gap`` event tells the client to reload state (followed by
+  the whole buffer for a foreign epoch);
+- progress events of the same job queued for a slow stream are coalesced
+  (only the newest is sent);
+- a comment line is sent every ``keepalive`` seconds so proxies keep the
+  connection open.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import secrets
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from jupiter.core.jsonio import dumps
+from jupiter.server.ws import _Outgoing, manager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_EVENTS = 1000
+KEEPALIVE_SECONDS = 15.0
+RETRY_MS = 3000
+
+
+def format_event(data: str, event: Optional[str] = None, event_id: Optional[str] = None) -> str:
+    """One SSE event (multi-line data is split into ``data:`` lines)."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event and event != "message":
+        lines.append(f"event: {event}")
+    lines.extend(f"data: {line}" for line in data.splitlines() or [""])
+    return "\n".join(lines) + "\n\n"
+
+
+def parse_last_event_id(value: Optional[str]) -> Optional[Tuple[str, int]]:
+    """``Last-Event-ID`` value -> (epoch, sequence); None when absent or malformed.
+
+    Bare numbers (IDs without an epoch) parse with an empty epoch.
+    """
+    if not value:
+        return None
+    epoch, _, sequence = value.strip().rpartition("-")
+    try:
+        return epoch, int(sequence)
+    except ValueError:
+        return None
+
+
+class EventHub:
+    """Bounded replay buffer of broadcast messages and its SSE streams."""
+
+    def __init__(self, max_events: int = DEFAULT_MAX_EVENTS):
+        self._events: Deque[Tuple[int, _Outgoing]] = deque(maxlen=max(1, max_events))
+        self.epoch = secrets.token_hex(4)
+        self._next_id = 1
+        self._waiters: Set[asyncio.Event] = set()
+        self.streams_opened = 0
+
+    @property
+    def last_id(self) -> int:
+        return self._next_id - 1
+
+    @property
+    def listening(self) -> bool:
+        """True while at least one SSE stream is open."""
+        return bool(self._waiters)
+
+    def publish(self, message: _Outgoing) -> None:
+        """Append a broadcast message (``ConnectionManager`` listener)."""
+        self._events.append((self._next_id, message))
+        self._next_id += 1
+        for waiter in self._waiters:
+            waiter.set()
+
+    def event_id(self, sequence: int) -> str:
+        """SSE ``id`` of a buffered message."""
+        return f"{self.epoch}-{sequence}"
+
+    def resume_point(self, last_event_id: Optional[str]) -> Tuple[int, bool]:
+        """Sequence to resume after, and whether the client must be told of a gap.
+
+        No ID resumes from now; an ID of another epoch (previous server run)
+        replays the whole buffer after a gap.
+        """
+        parsed = parse_last_event_id(last_event_id)
+        if parsed is None:
+            return self.last_id, False
+        epoch, sequence = parsed
+        if epoch != self.epoch or sequence > self.last_id:
+            return 0, True
+        return sequence, False
+
+    def since(self, last_id: int) -> Tuple[List[Tuple[int, _Outgoing]], bool]:
+        """Buffered messages after ``last_id``, and whether some were lost."""
+        if not self._events or last_id >= self.last_id:
+            return [], False
+        first_id = self._events[0][0]
+        start = max(0, last_id - first_id + 1)
+        return [self._events[i] for i in range(start, len(self._events))], last_id < first_id - 1
+
+    async def stream(
+        self,
+        accepts: Callable[[_Outgoing], bool],
+        last_event_id: Optional[str] = None,
+        until: Optional[Callable[[_Outgoing], bool]] = None,
+        finished: Optional[Callable[[], bool]] = None,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+        keepalive: float = KEEPALIVE_SECONDS,
+    ) -> AsyncIterator[str]:
+        """Yield SSE events for the messages ``accepts`` selects.
+
+        Args:
+            last_event_id: ``Last-Event-ID`` to resume after (None: only new messages).
+            until: Stop after sending a message it returns True for.
+            finished: Stop when nothing is pending and it returns True.
+        """
+        waiter = asyncio.Event()
+        self._waiters.add(waiter)
+        self.streams_opened += 1
+        cursor, foreign = self.resume_point(last_event_id)
+        try:
+            while True:
+                waiter.clear()
+                batch, gap = self.since(cursor)
+                if gap or foreign:
+                    foreign = False
+                    oldest = batch[0][0] if batch else self._next_id
+                    yield format_event(dumps({"oldest_id": self.event_id(oldest)}).decode("utf-8"), "gap")
+                    cursor = batch[-1][0] if batch else self.last_id
+                if batch:
+                    cursor = batch[-1][0]
+                    for event_id, message in _coalesce([item for item in batch if accepts(item[1])]):
+                        yield format_event(message.text, message.topic, self.event_id(event_id))
+                        if until is not None and until(message):
+                            return
+                    continue
+                if finished is not None and finished():
+                    return
+                try:
+                    await asyncio.wait_for(waiter.wait(), keepalive)
+                except asyncio.TimeoutError:
+                    if is_disconnected is not None and await is_disconnected():
+                        return
+                    yield ": keepalive\n\n"
+        finally:
+            self._waiters.discard(waiter)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "epoch": self.epoch,
+            "buffered": len(self._events),
+            "max_events": self._events.maxlen,
+            "last_id": self.event_id(self.last_id),
+            "streams": len(self._waiters),
+            "streams_opened": self.streams_opened,
+        }
+
+
+def _coalesce(batch: List[Tuple[int, _Outgoing]]) -> List[Tuple[int, _Outgoing]]:
+    """Drop progress events superseded by a newer one of the same job in ``batch``."""
+    newest = {message.coalesce_key: index for index, (_, message) in enumerate(batch) if message.coalesce_key}
+    return [
+        item for index, item in enumerate(batch)
+        if item[1].coalesce_key is None or newest[item[1].coalesce_key] == index
+    ]
+
+
+event_hub = EventHub()
+manager.add_listener(event_hub.publish)
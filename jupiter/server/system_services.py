@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import logging
 from pathlib import Path
 
 from fastapi import FastAPI
@@ -12,10 +13,19 @@ from jupiter.config.config import (
     save_global_settings,
     save_project_settings,
 )
+from jupiter.core.cache import CacheManager
+from jupiter.core.callgraph import CallGraphService
 from jupiter.core.logging_utils import configure_logging
 from jupiter.core.history import HistoryManager
+from jupiter.core.report_store import ReportStore
+from jupiter.core.runtime_profile import RuntimeProfile
+from jupiter.core.simulator import ProjectSimulator
 from jupiter.core.plugin_manager import PluginManager
 from jupiter.server.manager import ProjectManager
+from jupiter.server.job_store import ScanJobStore
+from jupiter.server.scan_coordinator import ScanCoordinator
+
+logger = logging.getLogger(__name__)
 
 
 class SystemState:
@@ -39,6 +49,100 @@ class SystemState:
             self.app.state.history_manager = manager
         return manager
 
+    def last_scan_stamp(self) -> tuple | None:
+        """Identity of the cached last scan (path, mtime, size); None when there is none."""
+        return CacheManager(self.root_path).last_scan_stamp()
+
+    def simulator(self) -> ProjectSimulator | None:
+        """Return a simulator indexed on the cached last scan, reusing it until the cache changes."""
+        stamp = self.last_scan_stamp()
+        if stamp is None:
+            return None
+        cached = getattr(self.app.state, "simulator_cache", None)
+        if cached and cached[0] == stamp:
+            return cached[1]
+
+        last_scan = CacheManager(self.root_path).load_last_scan()
+        if not last_scan or "files" not in last_scan:
+            return None
+        try:
+            source_roots = self.load_effective_config().performance.source_roots
+        except Exception as exc:
+            logger.debug("Could not read source roots: %s", exc)
+            source_roots = []
+        simulator = ProjectSimulator(
+            last_scan["files"], root=last_scan.get("root") or str(self.root_path), source_roots=source_roots
+        )
+        self.app.state.simulator_cache = (stamp, simulator)
+        return simulator
+
+    def runtime_profile(self) -> RuntimeProfile | None:
+        """Return the runtime profile of the cached last scan, reusing it until the cache changes."""
+        stamp = self.last_scan_stamp()
+        if stamp is None:
+            return None
+        cache = CacheManager(self.root_path)
+        cached = getattr(self.app.state, "runtime_profile_cache", None)
+        if cached and cached[0] == stamp:
+            return cached[1]
+
+        last_scan = cache.load_last_scan()
+        if not last_scan:
+            return None
+        call_graph = None
+        dynamic = last_scan.get("dynamic")
+        if isinstance(dynamic, dict) and dynamic.get("calls"):
+            try:
+                source_roots = self.load_effective_config().performance.source_roots
+            except Exception as exc:
+                logger.debug("Could not read source roots: %s", exc)
+                source_roots = []
+            try:
+                call_graph = CallGraphService(self.root_path, source_roots, use_dynamic=False).analyze()
+            except Exception as exc:
+                logger.warning("Call graph unavailable for the runtime profile: %s", exc)
+        profile = RuntimeProfile.build(dynamic, call_graph)
+        self.app.state.runtime_profile_cache = (stamp, profile)
+        return profile
+
+    def report_store(self) -> ReportStore | None:
+        """Return the file index of the cached last scan, reusing it until the cache changes."""
+        stamp = self.last_scan_stamp()
+        if stamp is None:
+            return None
+        cached = getattr(self.app.state, "report_store_cache", None)
+        if cached and cached[0] == stamp:
+            return cached[1]
+
+        last_scan = CacheManager(self.root_path).load_last_scan()
+        if not last_scan or "files" not in last_scan:
+            return None
+        store = ReportStore(last_scan)
+        self.app.state.report_store_cache = (stamp, store)
+        return store
+
+    def scan_coordinator(self) -> ScanCoordinator:
+        """Return the app's scan coordinator (concurrent identical scans share one run)."""
+        coordinator = getattr(self.app.state, "scan_coordinator", None)
+        if coordinator is None:
+            coordinator = ScanCoordinator()
+            self.app.state.scan_coordinator = coordinator
+        return coordinator
+
+    def scan_job_store(self) -> ScanJobStore:
+        """Return the background scan jobs of the current root (reloaded from disk when the root changes)."""
+        store = getattr(self.app.state, "scan_job_store", None)
+        if store is None or store.root != self.root_path:
+            try:
+                performance = self.load_effective_config().performance
+                retention = (performance.scan_job_retention, performance.scan_job_max_age_days)
+            except Exception as exc:
+                logger.warning("Using default scan job retention: %s", exc)
+                retention = ()
+            store = ScanJobStore(self.root_path, *retention)
+            self.app.state.scan_job_store = store
+        return store
+
     def load_effective_config(self) -> JupiterConfig:
         """Return merged install/project config for the current root."""
         config = load_merged_config(self.install_path, self.root_path)
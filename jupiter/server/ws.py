@@ -1,62 +1,449 @@
-"""WebSocket handling for Jupiter."""
+"""WebSocket handling for Jupiter.
+
+Version: 1.3.0 - Broadcast listeners (SSE replay buffer)
+
+``broadcast()`` encodes a message once and appends it to every client's
+bounded send queue; each client has its own writer task, so a slow browser
+tab never delays the other clients or the broadcasting coroutine (a scan,
+a command run). The slow-consumer policy decides what a lagging client
+gets:
+
+- ``coalesce`` (default): a progress event (``SCAN_PROGRESS``,
+  ``ANALYSIS_PROGRESS``...) replaces the one of the same job still queued
+  (only the latest state matters); on a full queue the oldest message is
+  dropped;
+- ``drop_oldest``: on a full queue the oldest message is dropped;
+- ``disconnect``: on a full queue the client is closed (it reloads its
+  state on reconnect).
+
+A send blocked for more than ``send_timeout`` seconds also disconnects the
+client. ``stats()`` reports queue depth, drops and send lag per client.
+
+Subscriptions
+-------------
+A client receives every message until it subscribes. Each message has a
+topic (the ``JupiterEvent`` type, the ``topic`` of a forwarded bridge
+event, ``message`` for plain text), an optional project ID (``project_id``
+argument of ``broadcast()`` or of the payload) and, for ``LOG_MESSAGE``,
+a level. Clients narrow what they get with JSON messages on ``/ws``::
+
+    {"type": "subscribe", "topics": ["SCAN_*", "livemap.*"],
+     "projects": ["web"], "min_log_level": "warning"}
+    {"type": "unsubscribe", "topics": ["SCAN_PROGRESS", "LOG_MESSAGE"]}
+
+or with the same fields as query parameters
+(``/ws?topics=SCAN_*,livemap.*&projects=web&min_log_level=warning``).
+Topics are shell-style patterns; unsubscribing from a topic that was not
+subscribed excludes it (``*`` minus ``SCAN_PROGRESS``). Messages without a
+project ID reach every client; each change is acknowledged with a
+``subscription`` message.
+Messages a client did not subscribe to are never queued for it.
+
+Every broadcast message is also handed to ``ConnectionManager.listeners``
+(the Server-Sent Events buffer of ``jupiter.server.sse``).
+"""
 
 from __future__ import annotations
 
-import logging
+import asyncio
+import fnmatch
 import json
-from typing import List, Union, Dict, Any
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Union
 from fastapi import WebSocket, WebSocketDisconnect
-from jupiter.core.events import JupiterEvent
+from jupiter.core.events import (
+    ANALYSIS_PROGRESS,
+    LOG_MESSAGE,
+    SCAN_FILE_PROCESSING,
+    SCAN_PROGRESS,
+    SIMULATE_PROGRESS,
+    JupiterEvent,
+)
+from jupiter.core.jsonio import dumps
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_QUEUE_SIZE = 256
+DEFAULT_SEND_TIMEOUT = 10.0
+SLOW_CLIENT_POLICIES = ("coalesce", "drop_oldest", "disconnect")
+
+# State snapshots: a newer event of the same type and job supersedes a queued one
+COALESCIBLE_EVENTS = frozenset({SCAN_PROGRESS, SCAN_FILE_PROCESSING, ANALYSIS_PROGRESS, SIMULATE_PROGRESS})
+
+LOG_LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40, "critical": 50}
+# Legacy ``{"type": "subscribe", "channel": ...}`` names
+CHANNEL_TOPICS = {"logs": (LOG_MESSAGE,)}
+
+
+@dataclass
+class _Outgoing:
+    text: str
+    enqueued_at: float
+    coalesce_key: Optional[tuple] = None
+    topic: str = "message"
+    project_id: Optional[str] = None
+    log_level: Optional[int] = None
+    job_id: Optional[str] = None
+
+
+def _encode(message: Union[str, Dict[str, Any], JupiterEvent], project_id: Optional[str] = None) -> _Outgoing:
+    """Encode a message once for every client."""
+    coalesce_key = None
+    topic = "message"
+    payload: Any = None
+    if isinstance(message, JupiterEvent):
+        text = dumps(message.to_dict()).decode("utf-8")
+        topic = message.type
+        payload = message.payload
+        if message.type in COALESCIBLE_EVENTS:
+            coalesce_key = (message.type, payload.get("job_id") if isinstance(payload, dict) else None)
+    elif isinstance(message, dict):
+        text = dumps(message).decode("utf-8")
+        # Bridge events are forwarded as {"type": "bridge_event", "topic": ...}
+        topic = str(message.get("topic") or message.get("type") or "message")
+        payload = message.get("payload")
+    else:
+        text = str(message)
+    if not isinstance(payload, dict):
+        payload = {}
+    if project_id is None and payload.get("project_id") is not None:
+        project_id = str(payload["project_id"])
+    log_level = None
+    if topic == LOG_MESSAGE:
+        log_level = LOG_LEVELS.get(str(payload.get("level", "info")).lower(), LOG_LEVELS["info"])
+    job_id = str(payload["job_id"]) if payload.get("job_id") is not None else None
+    return _Outgoing(text, time.monotonic(), coalesce_key, topic, project_id, log_level, job_id)
+
+
+def _names(value: Any) -> List[str]:
+    """``"a,b"`` or ``["a", "b"]`` -> ``["a", "b"]``."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    return [str(item).strip() for item in value if str(item).strip()]
+
+
+class Subscription:
+    """Topics, projects and minimum log level a client asked for (None: everything)."""
+
+    def __init__(self) -> None:
+        self.topics: Optional[Set[str]] = None
+        self.excluded: Set[str] = set()
+        self.projects: Optional[Set[str]] = None
+        self.min_log_level: Optional[int] = None
+        self._matches: Dict[str, bool] = {}
+
+    def update(self, request: Dict[str, Any]) -> None:
+        """Apply a ``subscribe`` / ``unsubscribe`` request.
+
+        Raises:
+            ValueError: Unknown request type or log level.
+        """
+        kind = request.get("type", "subscribe")
+        if kind not in ("subscribe", "unsubscribe"):
+            raise ValueError(f"Unknown subscription request '{kind}'")
+        topics = _names(request.get("topics"))
+        for channel in _names(request.get("channel")):
+            topics.extend(CHANNEL_TOPICS.get(channel, (channel,)))
+        projects = _names(request.get("projects"))
+        level = request.get("min_log_level")
+        if level is not None and str(level).lower() not in LOG_LEVELS:
+            raise ValueError(f"Unknown log level '{level}' (expected {', '.join(LOG_LEVELS)})")
+
+        if kind == "subscribe":
+            if topics:
+                self.topics = (self.topics or set()) | set(topics)
+                self.excluded -= set(topics)
+            if projects:
+                self.projects = (self.projects or set()) | set(projects)
+            if level is not None:
+                self.min_log_level = LOG_LEVELS[str(level).lower()]
+        else:
+            for topic in topics:
+                if self.topics is not None and topic in self.topics:
+                    self.topics.discard(topic)
+                else:
+                    # Narrow a wider pattern ("*", "SCAN_*") without resubscribing
+                    self.excluded.add(topic)
+            if projects and self.projects is not None:
+                self.projects -= set(projects)
+                self.projects = self.projects or None
+            if level is not None:
+                self.min_log_level = None
+        self._matches.clear()
+
+    def accepts(self, message: _Outgoing) -> bool:
+        if self.projects is not None and message.project_id is not None and message.project_id not in self.projects:
+            return False
+        if self.min_log_level is not None and message.log_level is not None and message.log_level < self.min_log_level:
+            return False
+        matched = self._matches.get(message.topic)
+        if matched is None:
+            topic = message.topic
+            matched = (
+                self.topics is None or any(fnmatch.fnmatchcase(topic, pattern) for pattern in self.topics)
+            ) and not any(fnmatch.fnmatchcase(topic, pattern) for pattern in self.excluded)
+            self._matches[topic] = matched
+        return matched
+
+    def to_dict(self) -> Dict[str, Any]:
+        level_names = {value: name for name, value in LOG_LEVELS.items()}
+        return {
+            "topics": sorted(self.topics) if self.topics is not None else None,
+            "excluded_topics": sorted(self.excluded),
+            "projects": sorted(self.projects) if self.projects is not None else None,
+            "min_log_level": level_names.get(self.min_log_level) if self.min_log_level is not None else None,
+        }
+
+
+class ClientConnection:
+    """One connected client: its send queue, writer task and counters."""
+
+    def __init__(self, websocket: WebSocket, manager: "ConnectionManager"):
+        self.websocket = websocket
+        self.manager = manager
+        self.queue: Deque[_Outgoing] = deque()
+        self._ready = asyncio.Event()
+        self.connected_at = time.time()
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.filtered = 0
+        self.subscription = Subscription()
+        self.max_depth = 0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self._lag_total_ms = 0.0
+        self.closed = False
+        self.writer: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self.writer = asyncio.create_task(self._write_loop())
+
+    def subscribe(self, request: Dict[str, Any]) -> None:
+        """Apply a subscription request and acknowledge it (errors are reported, not raised)."""
+        try:
+            self.subscription.update(request)
+            reply: Dict[str, Any] = {"type": "subscription", **self.subscription.to_dict()}
+        except ValueError as exc:
+            reply = {"type": "subscription_error", "error": str(exc), **self.subscription.to_dict()}
+        self.enqueue(_Outgoing(dumps(reply).decode("utf-8"), time.monotonic(), topic="subscription"))
+
+    def offer(self, message: _Outgoing) -> bool:
+        """Queue a broadcast message if the client subscribed to it."""
+        if not self.subscription.accepts(message):
+            self.filtered += 1
+            return False
+        return self.enqueue(message)
+
+    def enqueue(self, message: _Outgoing) -> bool:
+        """Queue a message without waiting; False when the policy disconnects the client."""
+        if self.closed:
+            return False
+        manager = self.manager
+        if message.coalesce_key is not None and manager.policy == "coalesce":
+            for index, queued in enumerate(self.queue):
+                if queued.coalesce_key == message.coalesce_key:
+                    # Keep the position (and age) of the queued event, send the newer state
+                    self.queue[index] = replace(message, enqueued_at=queued.enqueued_at)
+                    self.coalesced += 1
+                    return True
+        if len(self.queue) >= manager.queue_size:
+            if manager.policy == "disconnect":
+                logger.warning("WebSocket client too slow (%d queued messages): disconnecting.", len(self.queue))
+                self.close(slow=True)
+                return False
+            self.queue.popleft()
+            self.dropped += 1
+        self.queue.append(message)
+        self.max_depth = max(self.max_depth, len(self.queue))
+        self._ready.set()
+        return True
+
+    async def _write_loop(self) -> None:
+        try:
+            while not self.closed:
+                if not self.queue:
+                    self._ready.clear()
+                    await self._ready.wait()
+                    continue
+                message = self.queue.popleft()
+                await asyncio.wait_for(self.websocket.send_text(message.text), self.manager.send_timeout)
+                lag_ms = (time.monotonic() - message.enqueued_at) * 1000
+                self.sent += 1
+                self.last_lag_ms = lag_ms
+                self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+                self._lag_total_ms += lag_ms
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            logger.warning("WebSocket send blocked for %.0fs. Removing connection.", self.manager.send_timeout)
+            self.close(slow=True)
+        except Exception:
+            logger.warning("Failed to send message to a client. Removing connection.")
+            self.close()
+
+    def close(self, slow: bool = False) -> None:
+        """Stop the writer, drop the queue and close the socket (idempotent)."""
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.clear()
+        self._ready.set()
+        self.manager._forget(self, slow)
+        if self.writer is not None and self.writer is not asyncio.current_task():
+            self.writer.cancel()  # may be blocked in a send
+        try:
+            asyncio.get_running_loop().create_task(self._close_socket())
+        except RuntimeError:
+            pass
+
+    async def _close_socket(self) -> None:
+        try:
+            # 1013 "try again later": the client reconnects and reloads its state
+            await self.websocket.close(code=1013, reason="Client too slow")
+        except Exception:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        client = getattr(self.websocket, "client", None)
+        return {
+            "client": f"{client.host}:{client.port}" if client else None,
+            "connected_at": self.connected_at,
+            "queued": len(self.queue),
+            "max_queued": self.max_depth,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "filtered": self.filtered,
+            "subscription": self.subscription.to_dict(),
+            # Time between broadcast and the end of the send
+            "lag_ms": round(self.last_lag_ms, 2),
+            "max_lag_ms": round(self.max_lag_ms, 2),
+            "avg_lag_ms": round(self._lag_total_ms / self.sent, 2) if self.sent else 0.0,
+            "oldest_queued_ms": round((time.monotonic() - self.queue[0].enqueued_at) * 1000, 2) if self.queue else 0.0,
+        }
+
+
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+    def __init__(
+        self,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        policy: str = "coalesce",
+        send_timeout: float = DEFAULT_SEND_TIMEOUT,
+    ):
+        if policy not in SLOW_CLIENT_POLICIES:
+            raise ValueError(f"Unknown slow-client policy '{policy}' (expected {', '.join(SLOW_CLIENT_POLICIES)})")
+        self.queue_size = max(1, queue_size)
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self.clients: Dict[WebSocket, ClientConnection] = {}
+        self.broadcasts = 0
+        self.disconnected_slow = 0
+        # Other consumers of every broadcast message (the SSE replay buffer)
+        self.listeners: List[Callable[[_Outgoing], None]] = []
 
-    async def connect(self, websocket: WebSocket):
+    def add_listener(self, listener: Callable[[_Outgoing], None]) -> None:
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        return list(self.clients)
+
+    async def connect(self, websocket: WebSocket, subscription: Optional[Dict[str, Any]] = None) -> ClientConnection:
         await websocket.accept()
-        self.active_connections.append(websocket)
+        client = ClientConnection(websocket, self)
+        self.clients[websocket] = client
+        client.start()
+        if subscription:
+            client.subscribe({"type": "subscribe", **subscription})
         logger.info("WebSocket connection established.")
+        return client
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        client = self.clients.pop(websocket, None)
+        if client is not None:
+            client.closed = True
+            client._ready.set()
+            if client.writer is not None:
+                client.writer.cancel()
         logger.info("WebSocket connection closed.")
 
-    async def broadcast(self, message: Union[str, Dict[str, Any], JupiterEvent]):
-        """Broadcast a message to all connected clients.
-        
+    async def shutdown(self) -> None:
+        """Close every client and wait for the writer tasks to stop."""
+        clients = list(self.clients.values())
+        for client in clients:
+            client.close()
+        writers = [client.writer for client in clients if client.writer is not None]
+        if writers:
+            await asyncio.gather(*writers, return_exceptions=True)
+
+    def _forget(self, client: ClientConnection, slow: bool) -> None:
+        if self.clients.get(client.websocket) is client:
+            del self.clients[client.websocket]
+        if slow:
+            self.disconnected_slow += 1
+
+    async def broadcast(self, message: Union[str, Dict[str, Any], JupiterEvent], project_id: Optional[str] = None):
+        """Broadcast a message to the clients subscribed to it.
+
+        The message is encoded once and queued for each client; this never
+        waits on a socket.
+
         Args:
             message: Can be a string, a dict, or a JupiterEvent object.
+            project_id: Project the message belongs to (default: the
+                payload's ``project_id``; None reaches every project filter).
         """
-        if isinstance(message, JupiterEvent):
-            payload = json.dumps(message.to_dict())
-        elif isinstance(message, dict):
-            payload = json.dumps(message)
-        else:
-            payload = str(message)
-
-        to_remove = []
-        for connection in self.active_connections:
+        outgoing = _encode(message, project_id)
+        self.broadcasts += 1
+        for client in list(self.clients.values()):
+            client.offer(outgoing)
+        for listener in self.listeners:
             try:
-                await connection.send_text(payload)
-            except Exception:
-                logger.warning("Failed to send message to a client. Removing connection.")
-                to_remove.append(connection)
-        
-        for connection in to_remove:
-            if connection in self.active_connections:
-                self.active_connections.remove(connection)
+                listener(outgoing)
+            except Exception as exc:
+                logger.warning("Broadcast listener failed: %s", exc)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue and lag metrics of every connected client."""
+        return {
+            "policy": self.policy,
+            "queue_size": self.queue_size,
+            "send_timeout": self.send_timeout,
+            "connections": len(self.clients),
+            "broadcasts": self.broadcasts,
+            "disconnected_slow": self.disconnected_slow,
+            "clients": [client.stats() for client in self.clients.values()],
+        }
+
 
 manager = ConnectionManager()
 
+def _query_subscription(websocket: WebSocket) -> Dict[str, Any]:
+    """Subscription fields given as query parameters (``?topics=SCAN_*,LOG_MESSAGE``)."""
+    params = getattr(websocket, "query_params", None) or {}
+    return {name: params[name] for name in ("topics", "projects", "min_log_level") if params.get(name)}
+
+
 async def websocket_endpoint(websocket: WebSocket):
     """Handle WebSocket connections."""
-    await manager.connect(websocket)
+    client = await manager.connect(websocket, _query_subscription(websocket))
     try:
         while True:
-            # Keep the connection alive
-            await websocket.receive_text()
+            # Subscription requests; anything else keeps the connection alive
+            text = await websocket.receive_text()
+            try:
+                request = json.loads(text)
+            except ValueError:
+                continue
+            if isinstance(request, dict) and request.get("type") in ("subscribe", "unsubscribe"):
+                client.subscribe(request)
     except WebSocketDisconnect:
         manager.disconnect(websocket)
     except Exception:
@@ -27,6 +27,7 @@ const state = {
   watch: {
     active: false,
     callCounts: {},  // Cumulative function call counts
+    hotCalls: {},    // Function key -> timestamp of its last live call delta
     totalEvents: 0,
     filesScanned: 0,
     functionsFound: 0,
@@ -47,6 +48,7 @@ const state = {
   },
   activeProjectId: null,
   projects: [],
+  run: { id: null, jobId: null },  // Command running from the Run modal
   developerMode: false  // Developer mode flag for hot reload features
 };
 
@@ -565,7 +567,12 @@ async function startScan(options = {}) {
 
       const result = await response.json();
       state.currentScanJobId = result.job_id;
-      addLog(`${t("scan_background_started") || "Background scan started"} (Job: ${result.job_id})`);
+      if (result.joined) {
+        // Same project and options already scanning: follow that job
+        addLog(`${t("scan_background_joined") || "Joined the scan in progress"} (Job: ${result.job_id})`);
+      } else {
+        addLog(`${t("scan_background_started") || "Background scan started"} (Job: ${result.job_id})`);
+      }
       
       // Poll for completion or rely on WebSocket
       pollScanStatus(result.job_id);
@@ -586,7 +593,7 @@ async function startScan(options = {}) {
       const report = await response.json();
       console.log("Scan report received:", report);
       report.last_scan_timestamp = Date.now() / 1000;
-      renderReport(report);
+      renderReport(report, { fromServer: true });
       addLog(t("scan_complete_log"));
       pushLiveEvent(t("scan_button"), t("scan_live_event_complete"));
       await loadSnapshots(true);
@@ -654,7 +661,7 @@ async function pollScanStatus(jobId) {
         if (resultResponse.ok) {
           const report = await resultResponse.json();
           report.last_scan_timestamp = Date.now() / 1000;
-          renderReport(report);
+          renderReport(report, { fromServer: true });
           addLog(`${t("scan_complete_log")} (${status.duration_ms}ms)`);
           pushLiveEvent(t("scan_button"), t("scan_live_event_complete"));
           await loadSnapshots(true);
@@ -742,6 +749,9 @@ function handleAction(action, data) {
     case "confirm-run":
       runCommand();
       break;
+    case "stop-run":
+      stopRunCommand();
+      break;
     case "clear-run-command": {
       const cmdInput = document.getElementById("run-command");
       if (cmdInput) cmdInput.value = "";
@@ -1080,10 +1090,14 @@ async function runCommand() {
   localStorage.setItem("jupiter_run_dynamic", withDynamic ? "true" : "false");
   if (cwd) localStorage.setItem("jupiter_run_cwd", cwd);
     
-  // Show running state
+  // Show running state; RUN_OUTPUT events append lines to the output while it runs
+  const runId = `ui-${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 8)}`;
+  state.run = { id: runId, jobId: null };
+  const stopButton = document.getElementById("run-stop");
   if (runModal) runModal.classList.add("running");
   if (outputContainer) outputContainer.classList.remove("hidden");
-  outputDiv.textContent = t("run_running") || "Exécution en cours...";
+  outputDiv.classList.remove("hidden");
+  outputDiv.textContent = (t("run_running") || "Exécution en cours...") + "\n";
   outputDiv.style.borderLeft = "";
     
     try {
@@ -1094,7 +1108,8 @@ async function runCommand() {
         const requestBody = { 
             command, 
             with_dynamic: withDynamic,
-            backend_name: state.currentBackend
+            backend_name: state.currentBackend,
+            run_id: runId
         };
         
         // Add cwd if specified
@@ -1102,15 +1117,40 @@ async function runCommand() {
             requestBody.cwd = cwd;
         }
         
-        const response = await apiFetch(`${apiBaseUrl}/run`, {
+        // Background job (can be stopped); plain /run when the job system is unavailable
+        let result;
+        const jobResponse = await apiFetch(`${apiBaseUrl}/run/jobs`, {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify(requestBody)
         });
+        if (jobResponse.status === 503) {
+            const response = await apiFetch(`${apiBaseUrl}/run`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify(requestBody)
+            });
+            result = await response.json();
+        } else {
+            const job = await jobResponse.json();
+            if (!jobResponse.ok) {
+                throw new Error(job.detail || `HTTP ${jobResponse.status}`);
+            }
+            state.run.jobId = job.job_id;
+            if (stopButton) stopButton.classList.remove("hidden");
+            result = await waitForRunJob(apiBaseUrl, job.job_id);
+        }
         
-        const result = await response.json();
+        if (result === null) {
+            outputDiv.textContent += `\n⛔ ${t("run_cancelled") || "Commande arrêtée"}\n`;
+            outputDiv.style.borderLeft = "3px solid var(--warning)";
+            return;
+        }
         
         let outputText = `⏱️ Exit Code: ${result.returncode}\n\n`;
+        if (result.timed_out) {
+            outputText += `⌛ ${t("run_timed_out") || "Délai dépassé, commande arrêtée"}\n\n`;
+        }
         outputText += `📤 STDOUT:\n${result.stdout || "(vide)"}\n\n`;
         if (result.stderr) {
             outputText += `⚠️ STDERR:\n${result.stderr}\n`;
@@ -1154,7 +1194,52 @@ async function runCommand() {
         outputDiv.style.borderLeft = "3px solid var(--danger)";
     } finally {
         if (runModal) runModal.classList.remove("running");
+        if (stopButton) stopButton.classList.add("hidden");
+        state.run = { id: null, jobId: null };
+    }
+}
+
+// Poll a /run/jobs job until it ends; returns its RunResponse, or null if cancelled
+async function waitForRunJob(apiBaseUrl, jobId) {
+    while (true) {
+        await new Promise(resolve => setTimeout(resolve, 1000));
+        const response = await apiFetch(`${apiBaseUrl}/jobs/${encodeURIComponent(jobId)}`);
+        const job = await response.json();
+        if (!response.ok) {
+            throw new Error(job.detail || `HTTP ${response.status}`);
+        }
+        if (job.status === "completed") return job.result;
+        if (job.status === "cancelled") return null;
+        if (job.status === "failed") throw new Error(job.error || "Run failed");
+    }
+}
+
+async function stopRunCommand() {
+    const jobId = state.run?.jobId;
+    if (!jobId) return;
+    try {
+        const apiBaseUrl = state.apiBaseUrl || inferApiBaseUrl();
+        await apiFetch(`${apiBaseUrl}/jobs/${encodeURIComponent(jobId)}/cancel`, { method: 'POST' });
+        addLog(`Run ${jobId} cancelled`);
+    } catch (e) {
+        addLog(`Failed to cancel run: ${e.message}`, "ERROR");
+    }
+}
+
+// Keep the live output of the Run modal bounded (the server keeps its own capped copy)
+const RUN_OUTPUT_MAX_CHARS = 200000;
+
+function appendRunOutput(lines) {
+    const outputDiv = document.getElementById("run-output");
+    if (!outputDiv) return;
+    const atBottom = outputDiv.scrollTop + outputDiv.clientHeight >= outputDiv.scrollHeight - 4;
+    const text = lines.map(([stream, line]) => (stream === "stderr" ? `⚠️ ${line}` : line)).join("\n") + "\n";
+    let content = outputDiv.textContent + text;
+    if (content.length > RUN_OUTPUT_MAX_CHARS) {
+        content = content.slice(content.length - RUN_OUTPUT_MAX_CHARS);
     }
+    outputDiv.textContent = content;
+    if (atBottom) outputDiv.scrollTop = outputDiv.scrollHeight;
 }
 
 // ===============================
@@ -1812,8 +1897,10 @@ async function changeRoot(path) {
 
 // --- UI Rendering ---
 
-function renderReport(report) {
+function renderReport(report, { fromServer } = {}) {
   console.log("Rendering report with", report?.files?.length, "files");
+  // Reports fetched from the API can be paged server-side (GET /reports/last/files)
+  state.reportFromServer = fromServer ?? (report === state.report && Boolean(state.reportFromServer));
   state.report = report;
   if (report?.root) {
     const rootLabel = document.getElementById("root-path");
@@ -1898,6 +1985,9 @@ function handleSort(view, key) {
   if (view === 'functions') renderFunctions(state.report);
 }
 
+// Rows per page of the files table
+const FILES_PAGE_SIZE = 100;
+
 function renderFiles(report) {
     const files = Array.isArray(report?.files) ? [...report.files] : [];
     const body = document.getElementById("files-body");
@@ -1908,6 +1998,7 @@ function renderFiles(report) {
     const typeFilter = document.getElementById("files-type-filter");
     
     if(!body || !empty) return;
+    bindFilesFilters(searchInput, typeFilter);
     body.innerHTML = "";
 
     if (!files.length) {
@@ -1919,6 +2010,11 @@ function renderFiles(report) {
     }
     empty.style.display = "none";
 
+    if (state.reportFromServer && state.apiBaseUrl) {
+        renderFilesPage(null);
+        return;
+    }
+
     // Apply filters
     let filteredFiles = files;
     
@@ -1967,29 +2063,10 @@ function renderFiles(report) {
     // Render rows
     filteredFiles
         .slice(0, 200)
-        .forEach((file) => {
-            const funcCount = file.language_analysis?.defined_functions?.length || 0;
-            const fileExt = getFileExtension(file.path);
-            const fileIcon = getFileIcon(fileExt);
-            const row = document.createElement("tr");
-            row.innerHTML = `
-                <td class="file-path">
-                    <span class="file-icon">${fileIcon}</span>
-                    <span class="file-name" title="${file.path}">${file.path}</span>
-                </td>
-                <td class="numeric file-type"><span class="type-badge">.${fileExt}</span></td>
-                <td class="numeric">${bytesToHuman(file.size_bytes || 0)}</td>
-                <td class="numeric">${formatDate(file.modified_timestamp)}</td>
-                <td class="numeric">${funcCount > 0 ? `<span class="func-count">${funcCount}</span>` : '<span class="muted">—</span>'}</td>
-                <td class="actions">
-                    <button class="btn-icon simulate-btn" onclick="triggerSimulation('file', '${file.path.replace(/\\/g, '\\\\')}')" title="${t('files_simulate_tooltip') || 'Simuler la suppression'}">
-                        🔬
-                    </button>
-                </td>
-            `;
-            body.appendChild(row);
-        });
-    
+        .forEach((file) => body.appendChild(fileRow(file)));
+}
+
+function bindFilesFilters(searchInput, typeFilter) {
     // Setup filter listeners (only once)
     if (!searchInput?.dataset.bound) {
         searchInput?.addEventListener("input", () => renderFiles(state.report));
@@ -2001,6 +2078,84 @@ function renderFiles(report) {
     }
 }
 
+/**
+ * Files table served by GET /reports/last/files: filtering, sorting and
+ * paging happen on the server, FILES_PAGE_SIZE rows at a time.
+ * Falls back to the local rendering when the request fails.
+ */
+async function renderFilesPage(cursor) {
+    const body = document.getElementById("files-body");
+    const countBadge = document.getElementById("files-count-badge");
+    const sizeBadge = document.getElementById("files-size-badge");
+    const search = document.getElementById("files-search")?.value || "";
+    const type = document.getElementById("files-type-filter")?.value || "";
+    const { key, dir } = state.sortState.files;
+    const sortKey = { type: "extension", func_count: "function_count" }[key] || key;
+    const params = new URLSearchParams({
+        limit: String(FILES_PAGE_SIZE),
+        sort: `${dir === "desc" ? "-" : ""}${sortKey}`,
+        fields: "path,size_bytes,modified_timestamp,function_count",
+    });
+    if (search) params.set("q", search);
+    if (type) params.set("ext", type);
+    if (cursor) params.set("cursor", cursor);
+
+    // Only the latest request renders (typing in the search box fires many)
+    const query = (state.filesQuery = (state.filesQuery || 0) + 1);
+    let page;
+    try {
+        const response = await apiFetch(`${state.apiBaseUrl}/reports/last/files?${params}`);
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+        page = await response.json();
+    } catch (error) {
+        console.warn("Paged files unavailable, rendering locally:", error);
+        if (query === state.filesQuery) {
+            state.reportFromServer = false;
+            renderFiles(state.report);
+        }
+        return;
+    }
+    if (query !== state.filesQuery || !body) return;
+
+    if (!cursor) body.innerHTML = "";
+    body.querySelector(".files-more-row")?.remove();
+    if (countBadge) countBadge.textContent = `${page.total} fichiers`;
+    if (sizeBadge) sizeBadge.textContent = bytesToHuman(page.total_size_bytes);
+    page.files.forEach((file) => body.appendChild(fileRow(file)));
+
+    if (page.next_cursor) {
+        const row = document.createElement("tr");
+        row.className = "files-more-row";
+        const shown = body.querySelectorAll("tr").length;
+        row.innerHTML = `<td colspan="6"><button class="btn btn-secondary">${shown} / ${page.total} — ${t("files_load_more")}</button></td>`;
+        row.querySelector("button").addEventListener("click", () => renderFilesPage(page.next_cursor));
+        body.appendChild(row);
+    }
+}
+
+function fileRow(file) {
+    const funcCount = file.function_count ?? (file.language_analysis?.defined_functions?.length || 0);
+    const fileExt = getFileExtension(file.path);
+    const fileIcon = getFileIcon(fileExt);
+    const row = document.createElement("tr");
+    row.innerHTML = `
+        <td class="file-path">
+            <span class="file-icon">${fileIcon}</span>
+            <span class="file-name" title="${file.path}">${file.path}</span>
+        </td>
+        <td class="numeric file-type"><span class="type-badge">.${fileExt}</span></td>
+        <td class="numeric">${bytesToHuman(file.size_bytes || 0)}</td>
+        <td class="numeric">${formatDate(file.modified_timestamp)}</td>
+        <td class="numeric">${funcCount > 0 ? `<span class="func-count">${funcCount}</span>` : '<span class="muted">—</span>'}</td>
+        <td class="actions">
+            <button class="btn-icon simulate-btn" onclick="triggerSimulation('file', '${file.path.replace(/\\/g, '\\\\')}')" title="${t('files_simulate_tooltip') || 'Simuler la suppression'}">
+                🔬
+            </button>
+        </td>
+    `;
+    return row;
+}
+
 /**
  * Get file extension from path
  */
@@ -2042,6 +2197,38 @@ function getFileIcon(ext) {
     return icons[ext] || '📄';
 }
 
+// Functions called within this window are highlighted in the functions view
+const WATCH_HOT_MS = 3000;
+
+// Tracer key "pkg/app.py::Worker.run" -> "pkg/app.py::run". defined_functions holds bare names,
+// so same-named methods of one file share an entry (as in the server's _dynamic_by_name);
+// functions of different files never do
+function dynamicCallName(key) {
+    const [path, qualname = ""] = key.split("::");
+    return `${path.replace(/\\/g, "/")}::${qualname.split(".").pop()}`;
+}
+
+// Report file path -> "relative/path.py::funcName", the key dynamicCallName() produces
+function functionCallKey(filePath, root, funcName) {
+    const path = String(filePath || "").replace(/\\/g, "/");
+    const base = String(root || "").replace(/\\/g, "/").replace(/\/+$/, "");
+    const relative = base && path.startsWith(`${base}/`) ? path.slice(base.length + 1) : path;
+    return `${relative}::${funcName}`;
+}
+
+// One pass over the call counts: "path::name" -> {count, last} (last = latest hot timestamp)
+function indexDynamicCalls(calls, hotCalls) {
+    const index = new Map();
+    for (const [key, count] of Object.entries(calls || {})) {
+        const name = dynamicCallName(key);
+        const entry = index.get(name) || { count: 0, last: 0 };
+        entry.count += count;
+        entry.last = Math.max(entry.last, hotCalls?.[key] || 0);
+        index.set(name, entry);
+    }
+    return index;
+}
+
 function renderFunctions(report) {
     const body = document.getElementById("functions-body");
     const empty = document.getElementById("functions-empty");
@@ -2049,33 +2236,18 @@ function renderFunctions(report) {
     body.innerHTML = "";
 
     const files = Array.isArray(report?.files) ? report.files : [];
-    const dynamicCalls = report?.dynamic?.calls || {};
-    const watchCalls = state.watch.callCounts || {};  // Live watch call counts
+    const dynamicCalls = indexDynamicCalls(report?.dynamic?.calls);
+    const watchCalls = indexDynamicCalls(state.watch.callCounts, state.watch.hotCalls);  // Live watch call counts
     
     let allFunctions = [];
     files.forEach(file => {
         if (file.language_analysis && file.language_analysis.defined_functions) {
             file.language_analysis.defined_functions.forEach(funcName => {
-                let callCount = 0;
-                // Simple heuristic matching
-                const fileName = file.path.split(/[/\\]/).pop();
-                const keySuffix = `${fileName}::${funcName}`;
-                
-                // Check dynamic calls from report
-                for (const [key, count] of Object.entries(dynamicCalls)) {
-                    if (key.endsWith(keySuffix)) {
-                        callCount = count;
-                        break;
-                    }
-                }
-                
-                // Also check live watch call counts (cumulative)
-                for (const [key, count] of Object.entries(watchCalls)) {
-                    if (key.endsWith(keySuffix)) {
-                        callCount = Math.max(callCount, count);  // Use higher count
-                        break;
-                    }
-                }
+                const name = functionCallKey(file.path, report.root, funcName);
+                const watched = watchCalls.get(name);
+                // Use the higher of the cached and live (cumulative) counts
+                const callCount = Math.max(dynamicCalls.get(name)?.count || 0, watched?.count || 0);
+                const hot = Boolean(watched) && Date.now() - watched.last < WATCH_HOT_MS;
                 
                 let status = "unknown";
                 const unusedFuncs = file.language_analysis.potentially_unused_functions || [];
@@ -2096,6 +2268,7 @@ function renderFunctions(report) {
                     name: funcName,
                     file: file.path,
                     calls: callCount,
+                    hot: hot,
                     status: status,
                     lines: lines
                 });
@@ -2180,7 +2353,7 @@ function renderFunctions(report) {
     filteredFunctions.forEach(func => {
         const row = document.createElement("tr");
         const statusInfo = getStatusBadge(func.status);
-        const callsClass = func.calls > 0 ? "active" : "zero";
+        const callsClass = (func.calls > 0 ? "active" : "zero") + (func.hot ? " hot" : "");
         const escapedFile = func.file.replace(/\\/g, '\\\\').replace(/'/g, "\\'");
         const escapedName = func.name.replace(/'/g, "\\'");
         
@@ -2215,8 +2388,8 @@ function getUnusedFunctions() {
     if (!report || !report.files) return [];
     
     const files = Array.isArray(report.files) ? report.files : [];
-    const dynamicCalls = report?.dynamic?.calls || {};
-    const watchCalls = state.watch?.callCounts || {};
+    const dynamicCalls = indexDynamicCalls(report?.dynamic?.calls);
+    const watchCalls = indexDynamicCalls(state.watch?.callCounts);
     
     let unusedFunctions = [];
     
@@ -2229,24 +2402,8 @@ function getUnusedFunctions() {
                 if (!unusedFuncs.includes(funcName)) return;
                 
                 // Verify it wasn't called dynamically
-                const fileName = file.path.split(/[/\\]/).pop();
-                const keySuffix = `${fileName}::${funcName}`;
-                let wasCalled = false;
-                
-                for (const [key, count] of Object.entries(dynamicCalls)) {
-                    if (key.endsWith(keySuffix) && count > 0) {
-                        wasCalled = true;
-                        break;
-                    }
-                }
-                if (!wasCalled) {
-                    for (const [key, count] of Object.entries(watchCalls)) {
-                        if (key.endsWith(keySuffix) && count > 0) {
-                            wasCalled = true;
-                            break;
-                        }
-                    }
-                }
+                const name = functionCallKey(file.path, report.root, funcName);
+                const wasCalled = (dynamicCalls.get(name)?.count || 0) > 0 || (watchCalls.get(name)?.count || 0) > 0;
                 
                 if (!wasCalled) {
                     unusedFunctions.push({
@@ -5571,7 +5728,7 @@ async function loadContext(force = false) {
 async function loadCachedReport() {
   if (!state.apiBaseUrl) return null;
   try {
-    const response = await apiFetch(`${state.apiBaseUrl}/reports/last`);
+    const response = await apiFetch(`${state.apiBaseUrl}/reports/last`, { revalidate: true });
     if (!response.ok) {
       if (response.status !== 404) {
         addLog(`Cached report request failed (${response.status})`, "WARN");
@@ -5585,7 +5742,7 @@ async function loadCachedReport() {
     if (currentRoot && reportRoot && reportRoot !== currentRoot) {
       return null;
     }
-    renderReport(report);
+    renderReport(report, { fromServer: true });
     addLog("Restored last cached report.", "INFO");
     return report;
   } catch (error) {
@@ -6119,11 +6276,25 @@ function connectWebSocket() {
             break;
           }
           
+          case "RUN_OUTPUT": {
+            const payload = parsed.payload || {};
+            if (payload.run_id && payload.run_id === state.run?.id) {
+              appendRunOutput(payload.lines || []);
+            }
+            break;
+          }
+          
           case "FUNCTION_CALLS": {
             // Update watch state with new call counts
             const payload = parsed.payload || {};
-            if (payload.cumulative) {
-              state.watch.callCounts = payload.cumulative;
+            // Payloads carry deltas only (live stream from traced processes)
+            const now = Date.now();
+            for (const [key, count] of Object.entries(payload.calls || {})) {
+              state.watch.callCounts[key] = (state.watch.callCounts[key] || 0) + count;
+              state.watch.hotCalls[key] = now;
+            }
+            if (payload.total_events !== undefined) {
+              state.watch.totalEvents = payload.total_events;
             }
             const callCount = Object.values(payload.calls || {}).reduce((a, b) => a + b, 0);
             addWatchEvent("FUNCTION_CALLS", `${callCount} appels dynamiques`, "success");
@@ -6139,6 +6310,7 @@ function connectWebSocket() {
           case "WATCH_STARTED": {
             state.watch.active = true;
             state.watch.callCounts = {};
+            state.watch.hotCalls = {};
             state.watch.totalEvents = 0;
             state.watch.filesScanned = 0;
             state.watch.functionsFound = 0;
@@ -6162,6 +6334,7 @@ function connectWebSocket() {
           
           case "WATCH_CALLS_RESET": {
             state.watch.callCounts = {};
+            state.watch.hotCalls = {};
             state.watch.totalEvents = 0;
             addWatchEvent("WATCH", "Compteurs réinitialisés", "");
             if (state.view === "functions") {
@@ -6186,6 +6359,7 @@ function connectWebSocket() {
             state.watch.phase = "scanning";
             state.watch.progress = 0;
             state.watch.filesScanned = 0;
+            state.watch.scanFunctionsSeen = 0;
             
             // Handle background scan indicator
             if (payload.background && payload.job_id) {
@@ -6216,6 +6390,26 @@ function connectWebSocket() {
               });
             }
             
+            if (payload.files_completed !== undefined) {
+              // Aggregated frame: cumulative counts plus a sample of recent files
+              state.watch.filesScanned = payload.processed || 0;
+              state.watch.currentFile = payload.current_file;
+              const functionsFound = payload.functions_found || 0;
+              state.watch.functionsFound += Math.max(0, functionsFound - (state.watch.scanFunctionsSeen || 0));
+              state.watch.scanFunctionsSeen = functionsFound;
+              (payload.recent_functions || []).forEach((entry) => {
+                if (entry.functions && entry.functions.length > 0) {
+                  addWatchEvent("FUNC", `${entry.file}: ${entry.functions.join(", ")}${entry.functions_count > entry.functions.length ? "..." : ""}`, "");
+                }
+              });
+              if (payload.files_completed > 0) {
+                addWatchEvent("SCAN", `${payload.processed}/${payload.total} fichiers`, "");
+              }
+              updateWatchProgress(payload.percent, `Scan: ${payload.processed}/${payload.total} fichiers`, payload.current_file);
+              updateWatchStats();
+              break;
+            }
+
             updateWatchProgress(payload.percent, `Phase: ${payload.phase || "scanning"}`);
             break;
           }
@@ -6274,7 +6468,7 @@ function connectWebSocket() {
                   if (resultResponse.ok) {
                     const report = await resultResponse.json();
                     report.last_scan_timestamp = Date.now() / 1000;
-                    renderReport(report);
+                    renderReport(report, { fromServer: true });
                     addLog(`${t("scan_complete_log")} (${payload.duration_ms}ms)`);
                     pushLiveEvent(t("scan_button"), t("scan_live_event_complete"));
                     await loadSnapshots(true);
@@ -6958,17 +7152,22 @@ window.closeUnusedFunctionsExportModal = closeUnusedFunctionsExportModal;
 // --- Authentication ---
 
 async function apiFetch(url, options = {}) {
-    const headers = new Headers(options.headers || {});
+    // revalidate: the endpoint sends an ETag, let the browser cache the body
+    // and revalidate it (If-None-Match -> 304) instead of bypassing its cache
+    const { revalidate = false, ...fetchOptions } = options;
+    const headers = new Headers(fetchOptions.headers || {});
     if (state.token) {
         headers.set("Authorization", `Bearer ${state.token}`);
     }
-    headers.set("Cache-Control", "no-store");
-    headers.set("Pragma", "no-cache");
+    if (!revalidate) {
+        headers.set("Cache-Control", "no-store");
+        headers.set("Pragma", "no-cache");
+    }
     
-    options.headers = headers;
-    options.cache = "no-store";
+    fetchOptions.headers = headers;
+    fetchOptions.cache = revalidate ? "no-cache" : "no-store";
     
-    const response = await fetch(url, options);
+    const response = await fetch(url, fetchOptions);
     
     if (response.status === 401) {
         addLog("Authentication required", "WARNING");
@@ -7889,7 +8088,7 @@ async function viewSnapshotDetail(snapshotId) {
       params.set("backend_name", state.currentBackend);
     }
     
-    const response = await apiFetch(`${apiBase}/snapshots/${snapshotId}?${params.toString()}`);
+    const response = await apiFetch(`${apiBase}/snapshots/${snapshotId}?${params.toString()}`, { revalidate: true });
     if (!response.ok) {
       throw new Error(`HTTP ${response.status}`);
     }
@@ -7955,7 +8154,7 @@ async function exportSnapshot(snapshotId) {
       params.set("backend_name", state.currentBackend);
     }
     
-    const response = await apiFetch(`${apiBase}/snapshots/${snapshotId}?${params.toString()}`);
+    const response = await apiFetch(`${apiBase}/snapshots/${snapshotId}?${params.toString()}`, { revalidate: true });
     if (!response.ok) {
       throw new Error(`HTTP ${response.status}`);
     }
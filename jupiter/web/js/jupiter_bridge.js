@@ -1,7 +1,7 @@
 /**
  * Jupiter Bridge - Frontend API for Plugin Development
  * 
- * Version: 0.1.2
+ * Version: 0.1.3
  * 
  * Provides a unified API for plugins to interact with Jupiter's
  * frontend and backend services. Exposed as window.jupiterBridge.
@@ -20,7 +20,7 @@
 (function(global) {
     'use strict';
 
-    const VERSION = '0.1.2';
+    const VERSION = '0.1.3';
 
     // =============================================================================
     // INTERNAL STATE
@@ -34,6 +34,7 @@
         wsReconnectAttempts: 0,
         wsMaxReconnectAttempts: 5,
         wsReconnectDelay: 1000,
+        wsSubscription: null,           // last {topics, projects, min_log_level} sent, replayed on reconnect
         eventSubscriptions: new Map(),  // topic -> Set<callback>
         pendingRequests: new Map(),     // requestId -> {resolve, reject, timeout}
         requestIdCounter: 0
@@ -261,6 +262,13 @@
                     bridgeState.ws.onopen = () => {
                         console.log('[JupiterBridge] WebSocket connected');
                         bridgeState.wsReconnectAttempts = 0;
+                        const { excluded = [], ...subscription } = bridgeState.wsSubscription || {};
+                        if (bridgeState.wsSubscription) {
+                            this.send({ type: 'subscribe', ...subscription });
+                        }
+                        if (excluded.length) {
+                            this.send({ type: 'unsubscribe', topics: excluded });
+                        }
                         resolve(bridgeState.ws);
                     };
 
@@ -310,6 +318,42 @@
             return false;
         },
 
+        /**
+         * Only receive the given topics (shell patterns such as 'SCAN_*' or
+         * 'livemap.*'), projects and log levels; kept across reconnects.
+         * @param {{topics?: string[], projects?: string[], min_log_level?: string}} filters
+         */
+        subscribe(filters = {}) {
+            const current = bridgeState.wsSubscription || {};
+            const topics = filters.topics || [];
+            bridgeState.wsSubscription = {
+                ...current,
+                ...filters,
+                topics: [...new Set([...(current.topics || []), ...topics])],
+                excluded: (current.excluded || []).filter((topic) => !topics.includes(topic)),
+            };
+            return this.send({ type: 'subscribe', ...filters });
+        },
+
+        /**
+         * Stop receiving topics (an unsubscribed topic is excluded even when a
+         * wider pattern, or no subscription at all, would match it).
+         * @param {{topics?: string[], projects?: string[]}} filters
+         */
+        unsubscribe(filters = {}) {
+            const topics = filters.topics || [];
+            const current = bridgeState.wsSubscription || { topics: [], excluded: [] };
+            bridgeState.wsSubscription = {
+                ...current,
+                topics: current.topics.filter((topic) => !topics.includes(topic)),
+                excluded: [...new Set([
+                    ...(current.excluded || []),
+                    ...topics.filter((topic) => !current.topics.includes(topic)),
+                ])],
+            };
+            return this.send({ type: 'unsubscribe', ...filters });
+        },
+
         /**
          * Check if WebSocket is connected
          */
@@ -1,7 +1,7 @@
 /**
  * Jupiter Central Logs Panel Component
  * 
- * Version: 0.1.0
+ * Version: 0.1.1
  * 
  * Provides a centralized log viewer with multi-plugin filtering,
  * time range selection, and automatic injection into plugin pages.
@@ -20,7 +20,7 @@
 (function(global) {
     'use strict';
 
-    const VERSION = '0.1.0';
+    const VERSION = '0.1.1';
 
     // =============================================================================
     // LOG LEVELS (shared with logs_panel.js)
@@ -287,6 +287,8 @@
                         const data = JSON.parse(event.data);
                         if (data.type === 'log') {
                             this.addLog(data);
+                        } else if (data.type === 'LOG_MESSAGE' && data.payload) {
+                            this.addLog(data.payload);
                         }
                     } catch (e) {
                         // Ignore non-JSON messages
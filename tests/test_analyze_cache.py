@@ -0,0 +1,62 @@
+"""Tests for the analyze summary cache (jupiter.core.analyze_cache)."""
+
+import os
+from unittest import mock
+
+from jupiter.core.analyze_cache import AnalyzeCache, analyze_cache, project_fingerprint
+from jupiter.core.connectors.local import LocalConnector
+from jupiter.core.scanner import ProjectScanner
+
+
+def test_unchanged_project_reuses_summary(tmp_path):
+    source = tmp_path / "main.py"
+    source.write_text("def foo():\n    pass\n")
+    connector = LocalConnector(str(tmp_path))
+    options = {"top": 5}
+    analyze_cache.invalidate()
+
+    first = connector._run_analyze_sync(options)
+    with mock.patch("jupiter.core.connectors.local.ProjectAnalyzer") as analyzer:
+        second = connector._run_analyze_sync(options)
+    analyzer.assert_not_called()
+    assert second == first and second is not first
+
+    # Same size, newer mtime: the file is analyzed again
+    stat = source.stat()
+    source.write_text("def bar():\n    pass\n")
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    third = connector._run_analyze_sync(options)
+    assert [entry["name"] for entry in third["python_summary"]["function_usage_details"]] == ["bar"]
+
+    assert analyze_cache.invalidate(connector.root_path) == 2
+    assert analyze_cache.get(connector.root_path, project_fingerprint(connector.root_path, [source], options)) is None
+
+
+def test_fingerprint_tracks_options_files_and_last_scan(tmp_path):
+    (tmp_path / "a.py").write_text("x = 1\n")
+    paths = ProjectScanner(root=tmp_path).iter_paths()
+    base = project_fingerprint(tmp_path, paths, {"top": 5})
+
+    assert project_fingerprint(tmp_path, paths, {"top": 5, "ignore_globs": []}) == base
+    assert project_fingerprint(tmp_path, paths, {"top": 10}) != base
+    assert project_fingerprint(tmp_path, paths + [tmp_path / "gone.py"], {"top": 5}) == base
+
+    (tmp_path / "b.py").write_text("y = 2\n")
+    assert project_fingerprint(tmp_path, ProjectScanner(root=tmp_path).iter_paths(), {"top": 5}) != base
+
+    (tmp_path / ".jupiter").mkdir()
+    (tmp_path / ".jupiter" / "cache").mkdir()
+    (tmp_path / ".jupiter" / "cache" / "last_scan.json").write_text("{}")
+    assert project_fingerprint(tmp_path, paths, {"top": 5}) != base
+
+
+def test_cache_is_bounded_lru():
+    cache = AnalyzeCache(max_entries=2)
+    cache.put("/p", "a", {"n": 1})
+    cache.put("/p", "b", {"n": 2})
+    assert cache.get("/p", "a") == {"n": 1}
+    cache.put("/q", "c", {"n": 3})
+
+    assert cache.get("/p", "b") is None
+    assert cache.invalidate("/q") == 1
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1, "invalidations": 1}
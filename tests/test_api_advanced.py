@@ -5,6 +5,7 @@ from jupiter.config import load_config
 from jupiter.core.plugin_manager import PluginManager as JupiterPluginManager
 from pathlib import Path
 import pytest
+import asyncio
 import time
 
 @pytest.fixture
@@ -50,6 +51,22 @@ def test_simulate_remove_endpoint(client):
     assert "main.py" in data["target"]
     assert "risk_score" in data
 
+def test_simulate_batch_endpoint(client):
+    client.post("/scan", json={"incremental": False})
+
+    response = client.post("/simulate/batch", json={"targets": [
+        {"action": "remove", "path": "main.py", "function_name": "foo"},
+        {"action": "move", "path": "main.py", "new_path": "app.py"},
+    ]})
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["results"]) == 2
+    assert "impacts" in data
+    assert data["risk_score"] in ("low", "medium", "high")
+
+    response = client.post("/simulate/batch", json={"targets": [{"action": "move", "path": "main.py"}]})
+    assert response.status_code == 400
+
 def test_snapshots_endpoints(client):
     # Create snapshot via scan
     client.post("/scan", json={"incremental": False})
@@ -78,3 +95,228 @@ def test_snapshots_endpoints(client):
     assert response.status_code == 200
     diff = response.json()
     assert "metrics_delta" in diff["diff"]
+
+def test_profile_endpoint(client):
+    from jupiter.core.cache import CacheManager
+
+    (client.app.state.root_path / "main.py").write_text("def foo():\n    bar()\n\ndef bar():\n    pass\n")
+    response = client.get("/profile")
+    assert response.status_code == 400
+
+    client.post("/scan", json={"incremental": False})
+    CacheManager(client.app.state.root_path).merge_dynamic_data({
+        "calls": {"main.py::foo": 1, "main.py::bar": 3},
+        "times": {"main.py::foo": 0.5, "main.py::bar": 0.3},
+        "call_graph": {"main.py::foo": {"main.py::bar": 3}},
+    })
+
+    response = client.get("/profile", params={"top": 5, "function": "main.py::bar"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["top_self_time"][0]["key"] == "main.py::bar"
+    assert data["top_self_time"][0]["line_number"] == 4
+    assert data["hot_edges"][0] == {"caller": "main.py::foo", "callee": "main.py::bar", "calls": 3, "time": 0.3}
+    assert data["function"]["callers"][0]["caller"] == "main.py::foo"
+
+    assert client.get("/profile", params={"function": "main.py::nope"}).status_code == 404
+    assert client.get("/analyze").json()["runtime"]["statistics"]["profiled_functions"] == 2
+
+def test_scan_report_is_encoded_once(client):
+    from jupiter.server.models import ScanReport
+
+    response = client.post("/scan", json={"incremental": False})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    report = ScanReport.model_validate(response.json())
+    assert [f.path for f in report.files] == [str(client.app.state.root_path / "main.py")]
+    # The cache holds the very bytes that were sent
+    cache_file = client.app.state.root_path / ".jupiter" / "cache" / "last_scan.json"
+    assert cache_file.read_bytes() == response.content
+    assert client.get("/reports/last").json()["files"] == response.json()["files"]
+
+    with TestClient(client.app) as live:
+        job_id = live.post("/scan/background", json={"incremental": False, "capture_snapshot": False}).json()["job_id"]
+        for _ in range(100):
+            if live.get(f"/scan/status/{job_id}").json()["status"] in ("completed", "failed"):
+                break
+            time.sleep(0.05)
+        result = live.get(f"/scan/result/{job_id}")
+        files = live.get(f"/scan/result/{job_id}/files", params={"fields": "path"}).json()["files"]
+    assert result.status_code == 200
+    assert result.content == cache_file.read_bytes()
+    assert result.json()["files"] == response.json()["files"]
+    assert files == [{"path": f["path"]} for f in response.json()["files"]]
+
+def test_report_files_pagination(client, monkeypatch):
+    import asyncio
+    from jupiter.server.system_services import SystemState
+
+    # The index is built (report parsed) off the event loop
+    on_loop = []
+    report_store = SystemState.report_store
+
+    def tracked(self):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return report_store(self)
+
+    monkeypatch.setattr(SystemState, "report_store", tracked)
+    root = client.app.state.root_path
+    (root / "pkg").mkdir()
+    for name in ("a.py", "b.py", "c.js"):
+        (root / "pkg" / name).write_text("def f():\n    pass\n" * (2 if name == "b.py" else 1))
+    (root / "broken.py").write_text("def (:\n")
+    assert client.get("/reports/last/files").status_code == 404
+    client.post("/scan", json={"incremental": False})
+
+    response = client.get("/reports/last/files", params={"limit": 2, "fields": "path,size_bytes"})
+    assert response.status_code == 200
+    page = response.json()
+    assert page["total"] == 5 and page["count"] == 2
+    assert set(page["files"][0]) == {"path", "size_bytes"}
+    assert page["extensions"] == {"js": 1, "py": 4}
+
+    paths = [f["path"] for f in page["files"]]
+    while page["next_cursor"]:
+        page = client.get("/reports/last/files", params={"limit": 2, "cursor": page["next_cursor"]}).json()
+        paths += [f["path"] for f in page["files"]]
+    assert paths == sorted(paths) and len(paths) == 5
+
+    page = client.get("/reports/last/files", params={"dir": "pkg", "ext": "py", "sort": "-size_bytes",
+                                                      "fields": "path,function_count"}).json()
+    assert [f["path"] for f in page["files"]] == [str(root / "pkg" / "b.py"), str(root / "pkg" / "a.py")]
+    assert page["files"][0]["function_count"] == 1
+
+    page = client.get("/reports/last/files", params={"has_errors": "true", "fields": "path"}).json()
+    assert page["files"] == [{"path": str(root / "broken.py")}]
+
+    assert client.get("/reports/last/files", params={"sort": "colour"}).status_code == 400
+    assert client.get("/reports/last/files", params={"fields": "path,nope"}).status_code == 400
+    assert on_loop and not any(on_loop)
+
+def test_last_report_serves_cached_bytes(client, monkeypatch):
+    import json
+
+    from jupiter.server.routers import scan as scan_router
+
+    client.post("/scan", json={"incremental": False})
+    cache_file = client.app.state.root_path / ".jupiter" / "cache" / "last_scan.json"
+    real_model = scan_router.ScanReport
+    built = []
+    monkeypatch.setattr(scan_router, "ScanReport", lambda **data: built.append(1) or real_model(**data))
+
+    assert client.get("/reports/last").content == cache_file.read_bytes()
+    assert built == []
+
+    # Legacy cache (files/plugins keyed by name) still goes through the model
+    report = json.loads(cache_file.read_bytes())
+    report["files"] = {f["path"]: f for f in report["files"]}
+    report["plugins"] = {}
+    cache_file.write_text(json.dumps(report, indent=2))
+    legacy = client.get("/reports/last").json()
+    assert isinstance(legacy["files"], list) and legacy["plugins"] == []
+    assert built == [1]
+
+
+def test_heavy_reads_revalidate_and_compress(client):
+    root = client.app.state.root_path
+    for index in range(30):
+        (root / f"mod_{index}.py").write_text(f"def handler_{index}():\n    return {index}\n")
+    client.post("/scan", json={"incremental": False})
+
+    response = client.get("/reports/last", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    etag = response.headers["etag"]
+    assert len(response.json()["files"]) == 31
+
+    revalidated = client.get("/reports/last", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304 and revalidated.content == b""
+    assert client.get("/reports/last", headers={"Accept-Encoding": "identity"}).headers["etag"] == etag
+
+    (root / "extra.py").write_text("x = 1\n")
+    client.post("/scan", json={"incremental": False})
+    assert client.get("/reports/last", headers={"If-None-Match": etag}).status_code == 200
+
+    snap_id = client.get("/snapshots").json()["snapshots"][0]["id"]
+    snapshot = client.get(f"/snapshots/{snap_id}")
+    assert "immutable" in snapshot.headers["cache-control"]
+    assert client.get(f"/snapshots/{snap_id}", headers={"If-None-Match": snapshot.headers["etag"]}).status_code == 304
+    assert client.get("/snapshots/missing", headers={"If-None-Match": "*"}).status_code == 404
+
+def test_concurrent_scans_share_one_run(client, monkeypatch):
+    from jupiter.core.connectors.local import LocalConnector
+
+    scans = []
+    original = LocalConnector.scan
+
+    async def slow_scan(self, options):
+        scans.append(options["incremental"])
+        await asyncio.sleep(0.3)
+        return await original(self, options)
+
+    monkeypatch.setattr(LocalConnector, "scan", slow_scan)
+    with TestClient(client.app) as live:
+        first = live.post("/scan/background", json={"incremental": False, "capture_snapshot": False}).json()
+        joined = live.post("/scan/background", json={"incremental": True, "capture_snapshot": False}).json()
+        # Waits for the background flight instead of scanning again
+        report = live.post("/scan", json={"incremental": False, "capture_snapshot": False})
+        status = live.get(f"/scan/status/{first['job_id']}").json()
+
+    assert not first["joined"] and joined["joined"] and joined["job_id"] == first["job_id"]
+    assert report.status_code == 200 and report.headers["x-scan-job"] == first["job_id"]
+    assert status["status"] == "completed"
+    assert scans == [False]
+
+def test_background_results_survive_a_restart(client):
+    with TestClient(client.app) as live:
+        job_id = live.post("/scan/background", json={"capture_snapshot": False}).json()["job_id"]
+        for _ in range(100):
+            if live.get(f"/scan/status/{job_id}").json()["status"] in ("completed", "failed"):
+                break
+            time.sleep(0.05)
+    expected = client.get(f"/scan/result/{job_id}").content
+
+    client.app.state.scan_job_store = None  # as after a restart: reloaded from .jupiter/jobs/
+    jobs = client.get("/scan/jobs").json()["jobs"]
+    assert [job["job_id"] for job in jobs] == [job_id] and jobs[0]["file_count"] == 1
+    assert client.get(f"/scan/result/{job_id}").content == expected
+    assert client.get(f"/scan/result/{job_id}/files", params={"fields": "path"}).json()["total"] == 1
+
+
+def test_websocket_subscriptions_filter_scan_events(client, tmp_path):
+    from jupiter.server.meeting_adapter import MeetingAdapter
+
+    client.app.state.meeting_adapter = MeetingAdapter(device_key=None, project_root=tmp_path)
+    with TestClient(client.app) as live:
+        with live.websocket_connect("/ws?topics=SCAN_*") as ws:
+            assert ws.receive_json()["topics"] == ["SCAN_*"]
+            ws.send_json({"type": "unsubscribe", "topics": ["SCAN_PROGRESS"]})
+            assert ws.receive_json()["excluded_topics"] == ["SCAN_PROGRESS"]
+
+            assert live.post("/scan", json={"incremental": False}).status_code == 200
+            # Plain-text "Scan completed." messages are filtered out
+            assert [ws.receive_json()["type"] for _ in range(2)] == ["SCAN_STARTED", "SCAN_FINISHED"]
+
+
+def test_scan_job_events_stream_over_sse(client):
+    with TestClient(client.app) as live:
+        job_id = live.post("/scan/background", json={"capture_snapshot": False}).json()["job_id"]
+        with live.stream("GET", f"/scan/jobs/{job_id}/events") as response:
+            assert response.headers["content-type"].startswith("text/event-stream")
+            body = "".join(response.iter_text())
+        # Resume from the start: the job's events are replayed from the buffer
+        replay = live.get(f"/scan/jobs/{job_id}/events", headers={"Last-Event-ID": "0"}).text
+
+    events = [line[len("event: "):] for line in body.splitlines() if line.startswith("event: ")]
+    assert events[0] == "status" and events[-1] == "status"
+    assert '"status":"completed"' in body.split("event: status")[-1]
+    replayed = [line[len("event: "):] for line in replay.splitlines() if line.startswith("event: ")]
+    assert [event for event in replayed if event not in ("status", "gap")][0] == "SCAN_STARTED"
+    assert replayed[-2:] == ["SCAN_FINISHED", "status"]
+    assert client.get("/scan/jobs/unknown/events").status_code == 404
+    assert client.get("/events", params={"min_log_level": "loud"}).status_code == 400
@@ -35,3 +35,39 @@ def test_clear_cache(tmp_path):
     cache_manager.clear_cache()
     
     assert not (tmp_path / ".jupiter" / "cache" / "last_scan.json").exists()
+
+def test_jsonio_round_trip(tmp_path):
+    """Reports are encoded compactly, including the odd plugin types."""
+    from jupiter.core.jsonio import dumps, loads
+
+    encoded = dumps({"path": tmp_path / "a.py", "tags": {"b", "a"}, "counts": {1: 2}, "text": "é"})
+    assert loads(encoded) == {"path": str(tmp_path / "a.py"), "tags": ["a", "b"], "counts": {"1": 2}, "text": "é"}
+    assert b" " not in encoded
+
+    cache_manager = CacheManager(tmp_path)
+    cache_manager.save_last_scan_encoded(encoded)
+    assert cache_manager.load_last_scan()["tags"] == ["a", "b"]
+    assert not list((tmp_path / ".jupiter" / "cache").glob("*.tmp"))
+
+
+def test_merge_dynamic_data_keeps_measured_times_only_when_complete(tmp_path):
+    manager = CacheManager(tmp_path)
+    manager.save_last_scan({"files": []})
+    run = {
+        "calls": {"a.py::f": 2},
+        "times": {"a.py::f": 0.5},
+        "self_times": {"a.py::f": 0.4},
+        "call_graph": {},
+        "call_graph_times": {},
+    }
+    manager.merge_dynamic_data(run)
+    manager.merge_dynamic_data(run)
+    dynamic = manager.load_last_scan()["dynamic"]
+    assert dynamic["calls"] == {"a.py::f": 4}
+    assert dynamic["self_times"] == {"a.py::f": 0.8}
+
+    # An older trace without them: the partial timings are dropped
+    manager.merge_dynamic_data({"calls": {"a.py::f": 1}, "times": {"a.py::f": 0.1}, "call_graph": {}})
+    dynamic = manager.load_last_scan()["dynamic"]
+    assert dynamic["calls"] == {"a.py::f": 5}
+    assert "self_times" not in dynamic and "call_graph_times" not in dynamic
@@ -0,0 +1,90 @@
+"""Tests for merging runtime traces into the static call graph (jupiter.core.callgraph)."""
+
+from jupiter.core.callgraph import (
+    DynamicKeyResolver,
+    build_call_graph,
+    reconcile_dynamic,
+    static_key_for_qualname,
+)
+from jupiter.core.tracer import Tracer
+
+DISPATCH_SOURCE = (
+    "class Dispatcher:\n"
+    "    def dispatch(self, event):\n"
+    "        return getattr(self, 'do' + event)()\n"
+    "\n"
+    "    def dosave(self):\n"
+    "        return 2\n"
+    "\n"
+    "    def doflush(self):\n"
+    "        return 1\n"
+    "\n"
+    "\n"
+    "def run(events):\n"
+    "    dispatcher = Dispatcher()\n"
+    "    return [dispatcher.dispatch(event) for event in events]\n"
+)
+
+
+def test_static_key_for_qualname():
+    assert static_key_for_qualname("a.py::run") == "a.py::run"
+    assert static_key_for_qualname("a.py::Worker.run") == "a.py::Worker.run"
+    assert static_key_for_qualname("a.py::Outer.Inner.run") == "a.py::Inner.run"
+    assert static_key_for_qualname("a.py::Worker.run.<locals>.step") == "a.py::Worker.step"
+    assert static_key_for_qualname("a.py::outer.<locals>.inner") == "a.py::inner"
+    assert static_key_for_qualname("a.py::<module>") is None
+    assert static_key_for_qualname("a.py::f.<locals>.<lambda>") is None
+    assert static_key_for_qualname("no-separator") is None
+
+
+def test_resolver_falls_back_to_bare_names(tmp_path):
+    (tmp_path / "app.py").write_text(DISPATCH_SOURCE)
+    result = build_call_graph(tmp_path, [tmp_path / "app.py"])
+    resolver = DynamicKeyResolver(result.all_functions)
+
+    assert resolver.resolve("app.py::Dispatcher.dosave") == ["app.py::Dispatcher.dosave"]
+    # Keys written before qualnames were recorded carry the bare function name
+    assert resolver.resolve("app.py::dosave") == ["app.py::Dispatcher.dosave"]
+    assert resolver.resolve("app.py::Other.dosave") == []
+    assert resolver.resolve("other.py::run") == []
+
+
+def test_traced_dispatch_is_not_reported_unused(tmp_path):
+    script = tmp_path / "app.py"
+    script.write_text(DISPATCH_SOURCE)
+    namespace = {"__name__": "app"}
+    exec(compile(script.read_text(), str(script), "exec"), namespace)
+    tracer = Tracer(str(tmp_path), backend="profile")
+    tracer.install()
+    try:
+        namespace["run"](["save", "save", "save"])
+    finally:
+        tracer.uninstall()
+    dynamic = tracer.results()
+
+    static = build_call_graph(tmp_path, [script])
+    assert "app.py::Dispatcher.dosave" in static.unused_functions
+
+    result = build_call_graph(tmp_path, [script], dynamic=dynamic)
+
+    assert "app.py::Dispatcher.dosave" not in result.unused_functions
+    assert "app.py::Dispatcher.doflush" in result.unused_functions
+    assert "app.py::Dispatcher.dosave" in result.runtime_only
+    assert result.runtime_calls["app.py::Dispatcher.dosave"] == 3
+    assert result.runtime_edges["app.py::Dispatcher.dispatch"]["app.py::Dispatcher.dosave"] == 3
+    assert "called_at_runtime:3" in result.usage_reasons["app.py::Dispatcher.dosave"]
+
+
+def test_reconcile_reports_unresolved_keys(tmp_path):
+    (tmp_path / "app.py").write_text(DISPATCH_SOURCE)
+    result = build_call_graph(tmp_path, [tmp_path / "app.py"])
+
+    stats = reconcile_dynamic(result, {
+        "calls": {"app.py::run": 1, "app.py::<module>": 1, "gone.py::f": 2},
+        "call_graph": {"app.py::run": {"app.py::Dispatcher.dispatch": 2, "gone.py::f": 2}},
+    })
+
+    assert stats == {"resolved_keys": 1, "unresolved_keys": 2, "runtime_edges": 1, "runtime_only": 1}
+    assert result.unresolved_runtime_keys == {"app.py::<module>", "gone.py::f"}
+    assert result.runtime_edges == {"app.py::run": {"app.py::Dispatcher.dispatch": 2}}
+    assert reconcile_dynamic(result, None)["resolved_keys"] == 0
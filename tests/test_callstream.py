@@ -0,0 +1,70 @@
+"""Tests for the live call channel between traced processes and the server."""
+
+import asyncio
+import json
+
+from jupiter.core.callstream import CallPublisher, CallStreamServer, endpoint_file
+
+
+async def _wait_for(predicate, timeout=3.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            return False
+        await asyncio.sleep(0.02)
+    return True
+
+
+async def test_publisher_streams_deltas(tmp_path):
+    received = []
+
+    async def on_calls(calls):
+        received.append(calls)
+
+    server = CallStreamServer(tmp_path, on_calls=on_calls)
+    descriptor = await server.start()
+    assert endpoint_file(tmp_path).exists()
+    assert descriptor["transport"] in ("unix", "tcp")
+
+    publisher = CallPublisher(str(tmp_path), interval=0.05).start()
+    publisher.push({"calls": {"a.py::f": 2}})
+    publisher.push({"calls": {"a.py::f": 1, "b.py::g": 1}})
+    assert await _wait_for(lambda: received)
+    publisher.push({"calls": {"b.py::g": 4}})
+    await asyncio.to_thread(publisher.close)
+    assert await _wait_for(lambda: server.clients == 0)
+
+    totals = {}
+    for calls in received:
+        for key, count in calls.items():
+            totals[key] = totals.get(key, 0) + count
+    assert totals == {"a.py::f": 3, "b.py::g": 5}
+
+    await server.stop()
+    assert not endpoint_file(tmp_path).exists()
+
+
+async def test_publisher_without_server_drops_calls(tmp_path):
+    publisher = CallPublisher(str(tmp_path), interval=0.05)
+    publisher.push({"calls": {"a.py::f": 1}})
+    publisher.close()
+    assert publisher.sent == 0
+
+
+async def test_bad_token_is_rejected(tmp_path):
+    received = []
+
+    async def on_calls(calls):
+        received.append(calls)
+
+    server = CallStreamServer(tmp_path, on_calls=on_calls)
+    await server.start()
+    server.descriptor["token"] = "forged"
+    endpoint_file(tmp_path).write_text(json.dumps(server.descriptor), encoding="utf-8")
+
+    publisher = CallPublisher(str(tmp_path), interval=0.05).start()
+    publisher.push({"calls": {"a.py::f": 1}})
+    await asyncio.sleep(0.3)
+    await asyncio.to_thread(publisher.close)
+    await server.stop()
+    assert received == []
@@ -4,7 +4,10 @@ import sys
 import os
 import time
 from unittest.mock import MagicMock
-from jupiter.core.tracer import Tracer
+
+import pytest
+
+from jupiter.core.tracer import SamplingProfiler, Tracer, folded_lines, monitoring_available
 
 def test_tracer_logic():
     """Test the tracer logic in isolation."""
@@ -14,7 +17,7 @@ def test_tracer_logic():
     # Mock a frame
     mock_code = MagicMock()
     mock_code.co_filename = os.path.join(root_path, "script.py")
-    mock_code.co_name = "my_func"
+    mock_code.co_name = mock_code.co_qualname = "my_func"
     
     mock_frame = MagicMock()
     mock_frame.f_code = mock_code
@@ -41,7 +44,7 @@ def test_tracer_call_graph():
     # Caller frame
     caller_code = MagicMock()
     caller_code.co_filename = os.path.join(root_path, "main.py")
-    caller_code.co_name = "main"
+    caller_code.co_name = caller_code.co_qualname = "main"
     caller_frame = MagicMock()
     caller_frame.f_code = caller_code
     caller_frame.f_back = None
@@ -49,7 +52,7 @@ def test_tracer_call_graph():
     # Callee frame
     callee_code = MagicMock()
     callee_code.co_filename = os.path.join(root_path, "utils.py")
-    callee_code.co_name = "helper"
+    callee_code.co_name = callee_code.co_qualname = "helper"
     callee_frame = MagicMock()
     callee_frame.f_code = callee_code
     callee_frame.f_back = caller_frame
@@ -58,3 +61,363 @@ def test_tracer_call_graph():
     tracer.trace_func(callee_frame, "call", None)
     
     assert tracer.call_graph["main.py::main"]["utils.py::helper"] == 1
+
+
+def test_tracer_key_memoization_and_root_filter(tmp_path):
+    """Keys are computed once per code object; sibling directories are excluded."""
+    tracer = Tracer(str(tmp_path / "proj"))
+
+    inside = MagicMock()
+    inside.co_filename = os.path.join(str(tmp_path), "proj", "pkg", "mod.py")
+    inside.co_name = inside.co_qualname = "run"
+    sibling = MagicMock()
+    sibling.co_filename = os.path.join(str(tmp_path), "proj2", "mod.py")
+    sibling.co_name = sibling.co_qualname = "run"
+
+    assert tracer._key_for_code(inside) == "pkg/mod.py::run"
+    assert tracer._key_for_code(sibling) is None
+
+    inside.co_filename = "/elsewhere.py"  # memoized: not re-evaluated
+    assert tracer._key_for_code(inside) == "pkg/mod.py::run"
+
+
+def _traced_program(tmp_path):
+    script = tmp_path / "prog.py"
+    script.write_text(
+        "import json\n"
+        "def leaf(x):\n"
+        "    return x + 1\n"
+        "def gen():\n"
+        "    for i in range(3):\n"
+        "        yield leaf(i)\n"
+        "def fails():\n"
+        "    raise ValueError\n"
+        "def main():\n"
+        "    total = sum(gen())\n"
+        "    try:\n"
+        "        fails()\n"
+        "    except ValueError:\n"
+        "        pass\n"
+        "    json.dumps([leaf(1)])\n"
+        "    return total\n"
+    )
+    code = compile(script.read_text(), str(script), "exec")
+    namespace = {"__name__": "prog"}
+    exec(code, namespace)
+    return namespace["main"]
+
+
+def _run_traced(tmp_path, backend):
+    main = _traced_program(tmp_path)
+    tracer = Tracer(str(tmp_path), backend=backend)
+    used = tracer.install()
+    try:
+        main()
+    finally:
+        tracer.uninstall()
+    return used, tracer.results()
+
+
+def test_tracer_profile_backend(tmp_path):
+    used, results = _run_traced(tmp_path, "profile")
+    assert used == "profile"
+    assert sys.getprofile() is None
+    assert results["calls"]["prog.py::main"] == 1
+    assert results["calls"]["prog.py::gen"] == 1  # resumes are not new calls
+    assert results["calls"]["prog.py::leaf"] == 4
+    assert results["calls"]["prog.py::fails"] == 1
+    assert results["call_graph"]["prog.py::main"]["prog.py::fails"] == 1
+    # Library code (json) never shows up
+    assert all(key.startswith("prog.py::") for key in results["calls"])
+
+
+@pytest.mark.skipif(not monitoring_available(), reason="sys.monitoring requires Python 3.12+")
+def test_tracer_monitoring_backend(tmp_path):
+    used, results = _run_traced(tmp_path, "monitoring")
+    assert used == "monitoring"
+    assert results["calls"]["prog.py::main"] == 1
+    assert results["calls"]["prog.py::gen"] == 1  # resumes are not new calls
+    assert results["calls"]["prog.py::leaf"] == 4
+    assert results["call_graph"]["prog.py::gen"]["prog.py::leaf"] == 3
+    assert results["call_graph"]["prog.py::main"]["prog.py::fails"] == 1
+    assert results["times"]["prog.py::main"] >= results["times"]["prog.py::fails"]
+    assert sys.monitoring.get_tool(sys.monitoring.PROFILER_ID) is None
+
+
+def _concurrent_program(tmp_path):
+    script = tmp_path / "conc.py"
+    script.write_text(
+        "import asyncio, threading\n"
+        "def work(n):\n"
+        "    return sum(range(n))\n"
+        "def worker():\n"
+        "    for _ in range(50):\n"
+        "        work(100)\n"
+        "async def fetch():\n"
+        "    await asyncio.sleep(0.05)\n"
+        "    return work(10)\n"
+        "async def gather():\n"
+        "    return await asyncio.gather(fetch(), fetch())\n"
+        "def main():\n"
+        "    threads = [threading.Thread(target=worker) for _ in range(4)]\n"
+        "    for t in threads:\n"
+        "        t.start()\n"
+        "    for t in threads:\n"
+        "        t.join()\n"
+        "    asyncio.run(gather())\n"
+    )
+    namespace = {"__name__": "conc"}
+    exec(compile(script.read_text(), str(script), "exec"), namespace)
+    return namespace["main"]
+
+
+@pytest.mark.parametrize("backend", ["profile", "monitoring"])
+def test_tracer_threads_and_coroutines(tmp_path, backend):
+    """Calls from spawned threads are recorded; suspended coroutines are not timed."""
+    if backend == "monitoring" and not monitoring_available():
+        pytest.skip("sys.monitoring requires Python 3.12+")
+    main = _concurrent_program(tmp_path)
+    tracer = Tracer(str(tmp_path), backend=backend, threads=True)
+    tracer.install()
+    try:
+        main()
+    finally:
+        tracer.uninstall()
+    results = tracer.results()
+
+    assert results["threads"] >= 5
+    assert results["calls"]["conc.py::worker"] == 4
+    assert results["calls"]["conc.py::work"] == 4 * 50 + 2
+    assert results["call_graph"]["conc.py::worker"]["conc.py::work"] == 200
+    assert results["calls"]["conc.py::fetch"] == 2
+    assert results["call_graph"]["conc.py::fetch"]["conc.py::work"] == 2
+    # Each fetch() sleeps 50 ms while suspended; only running slices count
+    assert results["times"]["conc.py::fetch"] < 0.04
+
+
+@pytest.mark.skipif(
+    hasattr(__import__("threading"), "setprofile_all_threads"), reason="3.12+ profiles every thread by default"
+)
+def test_tracer_profile_backend_skips_worker_threads_by_default(tmp_path):
+    """Below 3.12 the setprofile fallback only profiles the installing thread unless asked."""
+    main = _concurrent_program(tmp_path)
+    tracer = Tracer(str(tmp_path), backend="profile")
+    tracer.install()
+    try:
+        main()
+    finally:
+        tracer.uninstall()
+    results = tracer.results()
+
+    assert results["threads"] == 1
+    assert "conc.py::worker" not in results["calls"]
+    assert results["calls"]["conc.py::fetch"] == 2
+
+
+def _timed_program(tmp_path):
+    script = tmp_path / "timed.py"
+    script.write_text(
+        "def fib(n):\n"
+        "    return n if n < 2 else fib(n - 1) + fib(n - 2)\n"
+        "def work(n):\n"
+        "    return sum(range(n))\n"
+        "def cheap():\n"
+        "    for _ in range(9):\n"
+        "        work(10)\n"
+        "def costly():\n"
+        "    work(300000)\n"
+        "def main():\n"
+        "    fib(15)\n"
+        "    cheap()\n"
+        "    costly()\n"
+    )
+    namespace = {"__name__": "timed"}
+    exec(compile(script.read_text(), str(script), "exec"), namespace)
+    return namespace["main"]
+
+
+@pytest.mark.parametrize("backend", ["profile", "monitoring"])
+def test_tracer_times_recursion_and_uneven_callees(tmp_path, backend):
+    """Recursive frames are timed once; self and edge times are measured, not split by call count."""
+    if backend == "monitoring" and not monitoring_available():
+        pytest.skip("sys.monitoring requires Python 3.12+")
+    from jupiter.core.runtime_profile import RuntimeProfile
+
+    main = _timed_program(tmp_path)
+    tracer = Tracer(str(tmp_path), backend=backend)
+    tracer.install()
+    try:
+        main()
+    finally:
+        tracer.uninstall()
+    results = tracer.results()
+    times, self_times = results["times"], results["self_times"]
+
+    assert results["calls"]["timed.py::fib"] > 1000
+    # Only the outermost fib frame counts towards its cumulative time
+    assert times["timed.py::fib"] <= times["timed.py::main"]
+    assert self_times["timed.py::fib"] == pytest.approx(times["timed.py::fib"])
+    assert self_times["timed.py::main"] < times["timed.py::main"] / 2
+
+    profile = RuntimeProfile.build(results)
+    assert profile.get("timed.py::main").self_time < profile.get("timed.py::fib").cumulative_time
+    # costly() made 1 of work()'s 10 calls but owns nearly all of its time
+    costly = profile.edges[("timed.py::costly", "timed.py::work")]
+    cheap = profile.edges[("timed.py::cheap", "timed.py::work")]
+    assert costly.time > 10 * cheap.time
+    assert profile.get("timed.py::costly").self_time < costly.time
+    assert profile.top_self(1)[0].key in ("timed.py::work", "timed.py::fib")
+
+
+def test_tracer_caches_merged_counters_once_stopped(tmp_path):
+    deltas = []
+    tracer = Tracer(str(tmp_path), sink=deltas.append)
+    frame = MagicMock()
+    frame.f_code.co_filename = str(tmp_path / "a.py")
+    frame.f_code.co_name = frame.f_code.co_qualname = "foo"
+    frame.f_back = None
+    tracer.trace_func(frame, "call", None)
+    tracer.trace_func(frame, "return", None)
+    # Still recording: every access sees fresh counters
+    assert tracer.calls is not tracer.calls
+
+    tracer.uninstall()
+    assert tracer.calls is tracer.calls
+    assert tracer.calls["a.py::foo"] == 1
+
+    tracer.flush()
+    assert deltas[-1]["calls"] == {"a.py::foo": 1}
+    assert "a.py::foo" not in tracer.calls
+
+
+def test_tracer_ignores_events_after_uninstall(tmp_path):
+    """Threads still calling the profile function after uninstall() do not change the counters."""
+    tracer = Tracer(str(tmp_path), backend="profile", threads=True)
+    frame = MagicMock()
+    frame.f_code.co_filename = str(tmp_path / "a.py")
+    frame.f_code.co_name = frame.f_code.co_qualname = "foo"
+    frame.f_back = None
+    tracer.trace_func(frame, "call", None)
+    tracer.trace_func(frame, "return", None)
+    tracer.uninstall()
+    calls = dict(tracer.calls)
+
+    assert tracer.trace_func(frame, "call", None) is None
+    tracer._view = None  # Force a re-merge of the per-thread counters
+    assert dict(tracer.calls) == calls == {"a.py::foo": 1}
+
+
+def test_tracer_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        Tracer("/root", backend="settrace")
+
+
+def test_sampling_profiler_aggregates_thread_stacks(tmp_path):
+    """Samples of a blocked thread land in calls/times/call_graph and folded stacks."""
+    import threading
+
+    script = tmp_path / "worker.py"
+    script.write_text(
+        "def inner(event):\n"
+        "    event.wait(5)\n"
+        "def outer(event):\n"
+        "    inner(event)\n"
+    )
+    namespace = {}
+    exec(compile(script.read_text(), str(script), "exec"), namespace)
+
+    event = threading.Event()
+    worker = threading.Thread(target=namespace["outer"], args=(event,))
+    worker.start()
+    try:
+        profiler = SamplingProfiler(str(tmp_path), rate=1000)
+        time.sleep(0.05)
+        for _ in range(3):
+            profiler.sample()
+    finally:
+        event.set()
+        worker.join()
+
+    results = profiler.results()
+    assert results["mode"] == "sample"
+    assert results["samples"] == 3
+    assert results["calls"]["worker.py::inner"] == 3
+    assert results["call_graph"]["worker.py::outer"]["worker.py::inner"] == 3
+    assert results["times"]["worker.py::outer"] == pytest.approx(0.003)
+    assert results["folded"] == {"worker.py::outer;worker.py::inner": 3}
+    assert folded_lines(results["folded"]) == ["worker.py::outer;worker.py::inner 3"]
+
+
+def test_run_command_sample_mode(tmp_path, monkeypatch):
+    from jupiter.core.runner import run_command
+
+    # The traced subprocess imports jupiter.core.tracer from this checkout
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    monkeypatch.setenv("PYTHONPATH", os.pathsep.join(filter(None, [repo_root, os.environ.get("PYTHONPATH")])))
+
+    (tmp_path / "busy.py").write_text(
+        "import time\n"
+        "def spin():\n"
+        "    end = time.perf_counter() + 0.3\n"
+        "    while time.perf_counter() < end:\n"
+        "        pass\n"
+        "spin()\n"
+    )
+    result = run_command([sys.executable, "busy.py"], cwd=tmp_path, with_dynamic=True,
+                         dynamic_mode="sample", sample_rate=200)
+
+    assert result.returncode == 0, result.stderr
+    data = result.dynamic_data
+    assert data["mode"] == "sample"
+    assert data["samples"] > 0
+    assert data["calls"]["busy.py::spin"] > 0
+    assert any(stack.endswith("busy.py::spin") for stack in data["folded"])
+
+    with pytest.raises(ValueError):
+        run_command([sys.executable, "busy.py"], cwd=tmp_path, with_dynamic=True, dynamic_mode="fast")
+
+
+def test_run_command_streams_partial_dynamic_data(tmp_path, monkeypatch):
+    from jupiter.core.runner import run_command
+
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    monkeypatch.setenv("PYTHONPATH", os.pathsep.join(filter(None, [repo_root, os.environ.get("PYTHONPATH")])))
+
+    (tmp_path / "slow.py").write_text(
+        "import time\n"
+        "def step():\n"
+        "    time.sleep(0.02)\n"
+        "for _ in range(20):\n"
+        "    step()\n"
+        "print('done')\n"
+    )
+    deltas = []
+    result = run_command([sys.executable, "slow.py"], cwd=tmp_path, with_dynamic=True,
+                         on_dynamic=deltas.append, flush_interval=0.1)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "done"
+    assert len(deltas) >= 2  # Partial updates arrived while the script ran
+    assert sum(d["calls"].get("slow.py::step", 0) for d in deltas) == 20
+    assert result.dynamic_data["calls"]["slow.py::step"] == 20
+    assert result.dynamic_data["complete"] is True
+
+
+def test_tracer_runs_modules(tmp_path, monkeypatch):
+    """``-m module`` is traced like ``python -m`` (used for ``python -m pytest``)."""
+    from jupiter.core.runner import run_command
+
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    monkeypatch.setenv("PYTHONPATH", os.pathsep.join(filter(None, [repo_root, os.environ.get("PYTHONPATH")])))
+    (tmp_path / "tool.py").write_text(
+        "import sys\n"
+        "def main(args):\n"
+        "    return len(args)\n"
+        "if __name__ == '__main__':\n"
+        "    sys.exit(main(sys.argv[1:]))\n"
+    )
+
+    result = run_command([sys.executable, "-m", "tool", "a", "b"], cwd=tmp_path, with_dynamic=True)
+
+    assert result.returncode == 2, result.stderr
+    assert result.dynamic_data["calls"]["tool.py::main"] == 1
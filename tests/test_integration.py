@@ -82,6 +82,123 @@ def test_run_command(temp_project):
     assert data["returncode"] == 0
     assert "Hello" in data["stdout"]
 
+def test_run_command_timeout(temp_project):
+    cmd = ["python", "-c", "import time; time.sleep(30)"]
+    response = client.post("/run", json={"command": cmd, "timeout": 0.5, "run_id": "it-run"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["timed_out"] is True
+    assert data["run_id"] == "it-run"
+    assert data["returncode"] != 0
+
+@pytest.fixture
+def run_events():
+    """RUN_* events broadcast while the test runs, as decoded frames."""
+    import json
+    from jupiter.server.ws import manager as ws_manager
+
+    events = []
+
+    def listener(message):
+        if message.topic.startswith("RUN_"):
+            events.append(json.loads(message.text))
+
+    ws_manager.add_listener(listener)
+    yield events
+    ws_manager.listeners.remove(listener)
+
+
+def _wait_for_job(live, job_id, statuses=("completed", "failed", "cancelled"), timeout=15):
+    import time
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = live.get(f"/jobs/{job_id}").json()
+        if job["status"] in statuses:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} still {job['status']}")
+
+
+def test_run_job_batches_output_events(temp_project, run_events):
+    script = "import sys\nfor i in range(50): print('line', i)\nprint('oops', file=sys.stderr)"
+    with TestClient(app) as live:
+        started = live.post("/run/jobs", json={"command": ["python", "-c", script], "run_id": "job-run"}).json()
+        job = _wait_for_job(live, started["job_id"])
+
+    assert started["run_id"] == "job-run"
+    assert job["status"] == "completed" and job["result"]["returncode"] == 0
+    assert job["result"]["stdout"].count("line") == 50
+    types = [event["type"] for event in run_events]
+    assert types[0] == "RUN_STARTED" and types[-1] == "RUN_FINISHED"
+    outputs = [event["payload"] for event in run_events if event["type"] == "RUN_OUTPUT"]
+    lines = [line for payload in outputs for line in payload["lines"]]
+    # Lines arrive in batches, none lost by the final flush
+    assert len(outputs) < len(lines) == 51
+    assert ["stderr", "oops"] in lines and all(payload["run_id"] == "job-run" for payload in outputs)
+
+
+@pytest.mark.skipif(os.name != "posix", reason="process groups are POSIX only")
+def test_run_job_cancel_stops_the_process_group(temp_project, run_events):
+    import time
+    # The child outlives its parent unless the whole group is killed
+    script = (
+        "import subprocess, sys, time\n"
+        "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+        "print(child.pid, flush=True)\n"
+        "time.sleep(60)"
+    )
+    with TestClient(app) as live:
+        job_id = live.post("/run/jobs", json={"command": ["python", "-c", script]}).json()["job_id"]
+        deadline = time.monotonic() + 10
+        while not any(event["type"] == "RUN_OUTPUT" for event in run_events) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        child_pid = int(next(e for e in run_events if e["type"] == "RUN_OUTPUT")["payload"]["lines"][0][1])
+
+        assert live.post(f"/jobs/{job_id}/cancel").json() == {"status": "cancelled", "job_id": job_id}
+        assert _wait_for_job(live, job_id)["status"] == "cancelled"
+        assert live.post(f"/jobs/{job_id}/cancel").status_code == 400
+
+    assert run_events[-1]["type"] == "RUN_FINISHED" and run_events[-1]["payload"]["cancelled"] is True
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        try:
+            with open(f"/proc/{child_pid}/stat") as stat:
+                # Reparented zombies count as stopped
+                if stat.read().rsplit(")", 1)[1].split()[0] == "Z":
+                    break
+        except FileNotFoundError:
+            break
+        time.sleep(0.05)
+    else:
+        raise AssertionError("child process survived the cancel")
+
+
+def test_run_job_timeout(temp_project):
+    cmd = ["python", "-c", "import time; time.sleep(30)"]
+    with TestClient(app) as live:
+        job_id = live.post("/run/jobs", json={"command": cmd, "timeout": 0.5}).json()["job_id"]
+        job = _wait_for_job(live, job_id)
+
+    assert job["status"] == "completed"
+    assert job["result"]["timed_out"] is True and job["result"]["returncode"] != 0
+
+
+async def test_run_output_timer_flush_failures_are_logged(monkeypatch, caplog):
+    import asyncio
+    from jupiter.server.routers import system
+
+    async def broken(message):
+        raise RuntimeError("socket gone")
+
+    monkeypatch.setattr(system.manager, "broadcast", broken)
+    relay = system._RunOutputRelay("r1")
+    await relay("stdout", "hello")
+    await asyncio.sleep(relay.INTERVAL * 3)
+
+    assert relay._task is None
+    assert "Failed to relay output of run r1: socket gone" in caplog.text
+
+
 def test_meeting_status(temp_project):
     response = client.get("/meeting/status")
     assert response.status_code == 200
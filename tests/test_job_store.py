@@ -0,0 +1,53 @@
+"""Tests for the durable scan job store (jupiter.server.job_store)."""
+
+import time
+
+from jupiter.core.jsonio import dumps
+from jupiter.server.job_store import BackgroundScanJob, ScanJobStore, ScanStatus
+from jupiter.server.models import ScanRequest
+
+REPORT = {"root": "/p", "files": [{"path": "/p/a.py", "size_bytes": 3, "modified_timestamp": 0, "file_type": "py"}]}
+
+
+def finished_job(store, job_id, finished_at=None):
+    job = store.add(BackgroundScanJob(job_id, ScanRequest(incremental=True)))
+    job.started_at = time.time()
+    job.finished_at = finished_at or time.time()
+    store.complete(job, dumps(REPORT))
+    return job
+
+
+def test_jobs_survive_a_restart(tmp_path):
+    store = ScanJobStore(tmp_path)
+    source = tmp_path / "last_scan.json"
+    source.write_bytes(dumps(REPORT))
+    job = store.add(BackgroundScanJob("done", ScanRequest(incremental=True, snapshot_label="ci")))
+    job.started_at = job.finished_at = time.time()
+    store.complete(job, dumps(REPORT), source=source)
+    running = store.add(BackgroundScanJob("busy", ScanRequest()))
+    running.status = ScanStatus.RUNNING
+    store.save(running)
+
+    reopened = ScanJobStore(tmp_path)
+    done = reopened.get("done")
+    assert done.status == ScanStatus.COMPLETED
+    assert done.options.incremental and done.options.snapshot_label == "ci"
+    assert done.result_bytes == len(dumps(REPORT))
+    assert reopened.result("done") == dumps(REPORT)
+    assert [f["path"] for f in reopened.report_store("done").files] == ["/p/a.py"]
+    interrupted = reopened.get("busy")
+    assert interrupted.status == ScanStatus.FAILED and "restart" in interrupted.error
+
+
+def test_retention_by_count_and_age(tmp_path):
+    store = ScanJobStore(tmp_path, max_jobs=2, max_age_days=1)
+    old = finished_job(store, "old", finished_at=time.time() - 3 * 86400)
+    assert store.get("old") is None and store.result("old") is None
+    for name in ("a", "b", "c"):
+        finished_job(store, name)
+    pending = store.add(BackgroundScanJob("pending", ScanRequest()))
+
+    assert {job.job_id for job in store.jobs()} == {"b", "c", "pending"}
+    assert not (tmp_path / ".jupiter" / "jobs" / "a.report.json").exists()
+    assert old.job_id not in {p.name.split(".")[0] for p in (tmp_path / ".jupiter" / "jobs").iterdir()}
+    assert pending.status == ScanStatus.PENDING
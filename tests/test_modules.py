@@ -0,0 +1,83 @@
+from jupiter.core.language.python import analyze_python_source
+from jupiter.core.modules import ModuleTable
+
+
+FILES = [
+    "pkg/__init__.py",
+    "pkg/core.py",
+    "pkg/sub/__init__.py",
+    "pkg/sub/utils.py",
+    "other/utils.py",
+    "main.py",
+    "web/app.js",
+    "web/lib/helpers.ts",
+    "web/lib/index.js",
+]
+
+
+def test_module_names_and_package_init():
+    table = ModuleTable(FILES)
+    assert table.module_name("pkg/__init__.py") == "pkg"
+    assert table.module_name("pkg/sub/utils.py") == "pkg.sub.utils"
+    assert table.module_name("main.py") == "main"
+    assert table.resolve("pkg") == "pkg/__init__.py"
+    assert table.resolve("pkg.sub") == "pkg/sub/__init__.py"
+
+
+def test_absolute_imports_use_longest_module_prefix():
+    table = ModuleTable(FILES)
+    assert table.resolve("pkg.core") == "pkg/core.py"
+    assert table.resolve("pkg.core.Engine") == "pkg/core.py"
+    assert table.resolve("other.utils") == "other/utils.py"
+    # Same-named files are never confused and external modules stay unresolved
+    assert table.resolve("utils") is None
+    assert table.resolve("os.path") is None
+
+
+def test_relative_imports_resolve_against_importer():
+    table = ModuleTable(FILES)
+    assert table.resolve(".utils", "pkg/sub/__init__.py") == "pkg/sub/utils.py"
+    assert table.resolve("..core", "pkg/sub/utils.py") == "pkg/core.py"
+    assert table.resolve(".", "pkg/sub/utils.py") == "pkg/sub/__init__.py"
+    assert table.resolve(".core", "main.py") is None
+
+
+def test_from_imports_record_each_name_absolute_or_relative():
+    source = "from pkg import core, VERSION\nfrom . import utils\nfrom .. import *\nimport pkg.sub\n"
+    imports = analyze_python_source(source)["imports"]
+    assert imports == ["..", ".utils", "pkg.VERSION", "pkg.core", "pkg.sub"]
+
+    table = ModuleTable(FILES)
+    resolved = {imp: table.resolve(imp, "pkg/sub/__init__.py") for imp in imports}
+    assert resolved["pkg.core"] == "pkg/core.py"
+    assert resolved["pkg.VERSION"] == "pkg/__init__.py"
+    assert resolved[".utils"] == "pkg/sub/utils.py"
+    assert resolved[".."] == "pkg/__init__.py"
+
+
+def test_js_relative_specifiers():
+    table = ModuleTable(FILES)
+    assert table.resolve("./lib/helpers", "web/app.js") == "web/lib/helpers.ts"
+    assert table.resolve("./lib", "web/app.js") == "web/lib/index.js"
+    assert table.resolve("../app", "web/lib/helpers.ts") == "web/app.js"
+
+
+def test_python_imports_do_not_fall_back_to_js_files():
+    table = ModuleTable(["main.py", "os.js", "web/app.js"])
+    assert table.resolve("os", "main.py") is None
+    # Bare specifiers from JS files still resolve against the root
+    assert table.resolve("os", "web/app.js") == "os.js"
+    assert table.resolve("os", "main.py") is None
+
+
+def test_source_roots_and_absolute_paths():
+    table = ModuleTable(
+        ["C:\\proj\\src\\app\\models.py", "C:\\proj\\src\\app\\views.py", "C:\\proj\\tests\\test_app.py"],
+        root="C:\\proj",
+        source_roots=["src"],
+    )
+    assert table.module_name("C:/proj/src/app/models.py") == "app.models"
+    assert table.resolve("app.models") == "C:/proj/src/app/models.py"
+    # The root-relative name stays available as an alias
+    assert table.resolve("src.app.views") == "C:/proj/src/app/views.py"
+    assert table.resolve(".models", "C:/proj/src/app/views.py") == "C:/proj/src/app/models.py"
@@ -0,0 +1,65 @@
+"""Tests for the indexed report file store (jupiter.core.report_store)."""
+
+import pytest
+
+from jupiter.core.report_store import ReportStore, parse_fields, parse_sort
+
+
+def _store():
+    files = [
+        {"path": f"/proj/{name}", "size_bytes": size, "modified_timestamp": 0.0, "file_type": name.rsplit(".", 1)[-1],
+         "language_analysis": analysis}
+        for name, size, analysis in [
+            ("src/app.py", 300, {"defined_functions": ["a", "b"]}),
+            ("src/util.py", 100, {"defined_functions": ["c"]}),
+            ("src/web/main.JS", 200, None),
+            ("srcx/other.py", 50, {"error": "SyntaxError"}),
+            ("README", 10, None),
+        ]
+    ]
+    return ReportStore({"root": "/proj", "files": list(reversed(files)), "dynamic": None})
+
+
+def test_pages_follow_the_cursor_in_each_order():
+    store = _store()
+
+    first = store.query(limit=2, sort="size_bytes", descending=True)
+    second = store.query(cursor=first.next_cursor, limit=2, sort="size_bytes", descending=True)
+    last = store.query(cursor=second.next_cursor, limit=2, sort="size_bytes", descending=True)
+    assert [f["size_bytes"] for f in first.files + second.files + last.files] == [300, 200, 100, 50, 10]
+    assert last.next_cursor is None
+    assert first.total == 5 and first.total_size_bytes == 660
+
+    with pytest.raises(ValueError):
+        store.query(cursor="/proj/gone.py", sort="size_bytes")
+    # In path order, a cursor naming a removed file resumes at the next path
+    assert store.query(cursor="/proj/src/b.py", limit=1).files[0]["path"] == "/proj/src/util.py"
+    assert store.query(cursor="/proj/src/b.py", limit=1, descending=True).files[0]["path"] == "/proj/src/app.py"
+
+
+def test_filters_and_projection():
+    store = _store()
+
+    page = store.query(prefix="src", fields=["path", "extension", "function_count"])
+    assert page.files == [
+        {"path": "/proj/src/app.py", "extension": "py", "function_count": 2},
+        {"path": "/proj/src/util.py", "extension": "py", "function_count": 1},
+        {"path": "/proj/src/web/main.JS", "extension": "js", "function_count": 0},
+    ]
+    assert store.query(prefix="./src/web/", extensions=["JS"]).total == 1
+    assert store.query(prefix="/proj/srcx", fields=["path"]).files == [{"path": "/proj/srcx/other.py"}]
+    assert store.query(has_errors=True, fields=["path"]).files == [{"path": "/proj/srcx/other.py"}]
+    assert store.query(search="UTIL").total == 1
+    assert store.query(extensions=[""]).files[0]["path"] == "/proj/README"
+    assert store.extension_counts == {"": 1, "js": 1, "py": 3}
+    assert store.header == {"root": "/proj", "dynamic": None}
+
+
+def test_parse_helpers():
+    assert parse_fields("path, size_bytes,path") == ["path", "size_bytes"]
+    assert parse_fields("") is None
+    assert parse_sort("-function_count") == ("function_count", True)
+    with pytest.raises(ValueError):
+        parse_fields("path,bogus")
+    with pytest.raises(ValueError):
+        parse_sort("bogus")
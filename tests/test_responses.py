@@ -0,0 +1,81 @@
+"""Tests for conditional, compressed responses (jupiter.server.responses)."""
+
+import gzip
+import threading
+
+from starlette.requests import Request
+
+from jupiter.server.responses import (
+    VariantCache,
+    compress,
+    conditional_response,
+    etag_matches,
+    make_etag,
+    negotiate_encoding,
+)
+
+
+def test_etag_matching():
+    etag = make_etag("report", "/tmp/last_scan.json", 1, 2)
+    assert etag.startswith('"') and etag == make_etag("report", "/tmp/last_scan.json", 1, 2)
+    assert etag != make_etag("report", "/tmp/last_scan.json", 1, 3)
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_negotiate_encoding(monkeypatch):
+    import jupiter.server.responses as responses
+
+    monkeypatch.setattr(responses, "brotli", None)
+    assert negotiate_encoding("gzip, deflate, br") == "gzip"
+    assert negotiate_encoding("gzip;q=0, deflate") == "identity"
+    assert negotiate_encoding("*") == "gzip"
+    assert negotiate_encoding(None) == "identity"
+    assert gzip.decompress(compress(b"x" * 2000, "gzip")) == b"x" * 2000
+    assert compress(b"abc", "gzip") == compress(b"abc", "gzip")
+
+    monkeypatch.setattr(responses, "brotli", object())
+    assert negotiate_encoding("gzip, br") == "br"
+    assert negotiate_encoding("gzip, br;q=0.5") == "gzip"
+
+
+def test_variant_cache_is_byte_bounded():
+    cache = VariantCache(max_bytes=100)
+    cache.put(("a", "gzip"), b"x" * 20)
+    cache.put(("b", "gzip"), b"x" * 20)
+    cache.put(("huge", "gzip"), b"x" * 30)  # over a quarter of the budget: skipped
+    assert cache.get(("huge", "gzip")) is None
+    assert cache.get(("a", "gzip")) == b"x" * 20
+    for key in "cdef":
+        cache.put((key, "gzip"), b"x" * 20)
+    # "b" was the least recently used entry
+    assert cache.get(("b", "gzip")) is None
+    assert cache.get(("a", "gzip")) is not None
+    assert cache.stats()["bytes"] <= 100
+
+
+def _request(**headers):
+    raw = [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+async def test_conditional_response_builds_off_the_loop_once_per_etag():
+    threads = []
+
+    def body():
+        threads.append(threading.current_thread())
+        return b"x" * 4000
+
+    etag = make_etag("test", "identity-cache")
+    plain = await conditional_response(_request(), etag, body)
+    again = await conditional_response(_request(), etag, body)
+    zipped = await conditional_response(_request(accept_encoding="gzip"), etag, body)
+
+    assert plain.body == again.body == b"x" * 4000
+    assert "content-encoding" not in plain.headers
+    assert gzip.decompress(zipped.body) == b"x" * 4000
+    # Identity bytes are cached per ETag and reused for the compressed variant
+    assert len(threads) == 1 and threads[0] is not threading.main_thread()
@@ -0,0 +1,121 @@
+"""Tests for the asyncio command runner (jupiter.core.runner.run_command_async)."""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+from jupiter.core.runner import run_command_async
+
+
+async def test_output_is_streamed_while_running(tmp_path):
+    (tmp_path / "talk.py").write_text(
+        "import sys, time\n"
+        "for i in range(3):\n"
+        "    print('line', i, flush=True)\n"
+        "    time.sleep(0.2)\n"
+        "print('oops', file=sys.stderr)\n"
+    )
+    seen = []
+
+    async def on_output(stream, line):
+        seen.append((time.monotonic(), stream, line))
+
+    result = await run_command_async([sys.executable, "talk.py"], cwd=tmp_path, on_output=on_output)
+
+    assert result.returncode == 0
+    assert result.stdout == "line 0\nline 1\nline 2\n"
+    assert result.stderr == "oops\n"
+    assert [(s, l) for _, s, l in seen] == [
+        ("stdout", "line 0"), ("stdout", "line 1"), ("stdout", "line 2"), ("stderr", "oops"),
+    ]
+    # The first line arrived well before the command finished
+    assert seen[-1][0] - seen[0][0] >= 0.3
+
+
+async def test_output_cap_keeps_the_tail(tmp_path):
+    result = await run_command_async(
+        [sys.executable, "-c", "print('x' * 50000); print('end')"],
+        cwd=tmp_path,
+        max_output_chars=1000,
+    )
+
+    assert result.output_truncated is True
+    assert result.stdout.endswith("x\nend\n")
+    assert len(result.stdout) < 1100
+
+
+async def test_timeout_stops_the_command(tmp_path):
+    started = time.monotonic()
+    result = await run_command_async(
+        [sys.executable, "-c", "import time; print('ready', flush=True); time.sleep(30)"],
+        cwd=tmp_path,
+        timeout=0.5,
+    )
+
+    assert time.monotonic() - started < 5
+    assert result.timed_out is True
+    assert result.returncode != 0
+    assert result.stdout == "ready\n"
+    assert "timed out" in result.stderr
+
+
+@pytest.mark.skipif(os.name != "posix", reason="uses sh")
+async def test_timeout_covers_a_command_that_closed_its_output(tmp_path):
+    started = time.monotonic()
+    result = await run_command_async(["sh", "-c", "exec >&- 2>&-; sleep 6"], cwd=tmp_path, timeout=1)
+
+    assert time.monotonic() - started < 4
+    assert result.timed_out is True
+    assert result.returncode != 0
+
+
+async def test_cancellation_terminates_the_command(tmp_path):
+    pid_file = tmp_path / "pid"
+    task = asyncio.ensure_future(run_command_async(
+        [sys.executable, "-c", f"import os, time; open({str(pid_file)!r}, 'w').write(str(os.getpid())); time.sleep(30)"],
+        cwd=tmp_path,
+    ))
+    for _ in range(100):
+        if pid_file.exists() and pid_file.read_text():
+            break
+        await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    pid = int(pid_file.read_text())
+    with pytest.raises(OSError):
+        os.kill(pid, 0)
+
+
+async def test_missing_executable_is_reported(tmp_path):
+    result = await run_command_async([str(tmp_path / "missing")], cwd=tmp_path)
+    assert result.returncode == -1
+    assert result.stderr
+
+
+async def test_dynamic_deltas_are_forwarded(tmp_path, monkeypatch):
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    monkeypatch.setenv("PYTHONPATH", os.pathsep.join(filter(None, [repo_root, os.environ.get("PYTHONPATH")])))
+    (tmp_path / "slow.py").write_text(
+        "import time\n"
+        "def step():\n"
+        "    time.sleep(0.02)\n"
+        "for _ in range(20):\n"
+        "    step()\n"
+    )
+    deltas = []
+
+    async def on_dynamic(delta):
+        deltas.append(delta)
+
+    result = await run_command_async([sys.executable, "slow.py"], cwd=tmp_path, with_dynamic=True,
+                                     on_dynamic=on_dynamic, flush_interval=0.1)
+
+    assert result.returncode == 0, result.stderr
+    assert len(deltas) >= 2
+    assert sum(d["calls"].get("slow.py::step", 0) for d in deltas) == 20
+    assert result.dynamic_data["calls"]["slow.py::step"] == 20
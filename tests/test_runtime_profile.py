@@ -0,0 +1,98 @@
+"""Tests for the runtime profile (jupiter.core.runtime_profile)."""
+
+import pytest
+
+from jupiter.core.callgraph import CallGraphResult, FunctionInfo
+from jupiter.core.runtime_profile import RuntimeProfile
+
+
+DYNAMIC = {
+    "calls": {"app.py::main": 1, "app.py::parse": 10, "app.py::load": 2, "lib.py::read": 12},
+    "times": {"app.py::main": 3.0, "app.py::parse": 2.0, "app.py::load": 0.6, "lib.py::read": 1.2},
+    "call_graph": {
+        "app.py::main": {"app.py::parse": 10, "app.py::load": 2},
+        "app.py::parse": {"lib.py::read": 10},
+        "app.py::load": {"lib.py::read": 2},
+    },
+}
+
+
+def test_self_time_and_edges_are_derived():
+    profile = RuntimeProfile.build(DYNAMIC)
+
+    read = profile.get("lib.py::read")
+    assert read.callers == {"app.py::parse": 10, "app.py::load": 2}
+    # parse made 10 of the 12 read calls: 1.0s of read's 1.2s is under parse
+    assert profile.edges[("app.py::parse", "lib.py::read")].time == pytest.approx(1.0)
+    assert profile.get("app.py::parse").self_time == pytest.approx(1.0)
+    assert profile.get("app.py::load").self_time == pytest.approx(0.4)
+    assert profile.get("app.py::main").self_time == pytest.approx(0.4)
+
+    assert [f.key for f in profile.top_cumulative(2)] == ["app.py::main", "app.py::parse"]
+    assert [f.key for f in profile.top_self(2)] == ["lib.py::read", "app.py::parse"]
+    assert [(e.caller, e.callee) for e in profile.hot_edges(1)] == [("app.py::main", "app.py::parse")]
+    assert profile.total_time == pytest.approx(3.0)
+
+
+def test_recorded_self_and_edge_times_are_used():
+    dynamic = dict(DYNAMIC)
+    # load's 2 read calls took 1.1s of read's 1.2s
+    dynamic["self_times"] = {"app.py::main": 0.1, "app.py::parse": 1.8, "app.py::load": 0.1, "lib.py::read": 1.0}
+    dynamic["call_graph_times"] = {
+        "app.py::main": {"app.py::parse": 1.9, "app.py::load": 1.0},
+        "app.py::parse": {"lib.py::read": 0.1},
+        "app.py::load": {"lib.py::read": 1.1},
+    }
+    profile = RuntimeProfile.build(dynamic)
+
+    assert profile.edges[("app.py::load", "lib.py::read")].time == pytest.approx(1.1)
+    assert profile.edges[("app.py::parse", "lib.py::read")].time == pytest.approx(0.1)
+    assert profile.get("app.py::parse").self_time == pytest.approx(1.8)
+    assert profile.get("app.py::main").self_time == pytest.approx(0.1)
+    assert [f.key for f in profile.top_self(2)] == ["app.py::parse", "lib.py::read"]
+    assert [(e.caller, e.callee) for e in profile.hot_edges(2)] == [
+        ("app.py::main", "app.py::parse"),
+        ("app.py::load", "lib.py::read"),
+    ]
+
+
+def test_static_functions_are_joined():
+    graph = CallGraphResult()
+    for info in (
+        FunctionInfo(name="main", file_path="app.py", line_number=1, module="app"),
+        FunctionInfo(name="parse", file_path="app.py", line_number=5, module="app"),
+        FunctionInfo(name="read", file_path="lib.py", line_number=3, is_method=True, class_name="Reader", module="lib"),
+        FunctionInfo(name="unused", file_path="app.py", line_number=9, module="app"),
+    ):
+        graph.all_functions[info.full_name] = info
+
+    profile = RuntimeProfile.build(DYNAMIC, graph)
+
+    assert profile.get("lib.py::Reader.read") is profile.get("lib.py::read")
+    assert profile.for_function(graph.all_functions["app.py::unused"]) is None
+    stats = profile.statistics()
+    assert stats["static_functions"] == 4
+    assert stats["joined_functions"] == 3
+    assert stats["unmatched_keys"] == 1  # app.py::load has no static definition
+
+    rankings = profile.rankings(top=1)
+    assert rankings["top_self_time"][0]["qualname"] == "lib.Reader.read"
+    assert rankings["top_self_time"][0]["line_number"] == 3
+
+    detail = profile.function_detail("lib.py::Reader.read")
+    assert [e["caller"] for e in detail["callers"]] == ["app.py::parse", "app.py::load"]
+    assert profile.function_detail("app.py::missing") is None
+
+
+def test_recursion_and_missing_data():
+    profile = RuntimeProfile.build({
+        "calls": {"a.py::fact": 5},
+        "times": {"a.py::fact": 0.5},
+        "call_graph": {"a.py::fact": {"a.py::fact": 4}},
+    })
+    # A self edge does not subtract from the function's own self time
+    assert profile.get("a.py::fact").self_time == pytest.approx(0.5)
+
+    empty = RuntimeProfile.build(None)
+    assert empty.rankings()["statistics"]["profiled_functions"] == 0
+    assert empty.hot_edges() == []
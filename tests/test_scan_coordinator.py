@@ -0,0 +1,87 @@
+"""Tests for scan request coalescing (jupiter.server.scan_coordinator)."""
+
+import asyncio
+
+import pytest
+
+from jupiter.server.scan_coordinator import ScanCoordinator, ScanKey
+
+
+def key(incremental=False, hidden=False):
+    return ScanKey.of("/project", None, {"incremental": incremental, "show_hidden": hidden, "ignore_globs": ["b", "a"]})
+
+
+class Job:
+    def __init__(self, name):
+        self.job_id = name
+
+
+async def test_identical_and_incremental_requests_join_the_flight():
+    coordinator = ScanCoordinator()
+    runs = []
+    release = asyncio.Event()
+
+    async def run(flight):
+        runs.append(flight.key)
+        await release.wait()
+        return b"report"
+
+    full, joined = coordinator.submit(key(), lambda: Job("full"), run)
+    assert not joined
+    same, joined_same = coordinator.submit(key(), lambda: Job("other"), run, capture_snapshot=True, snapshot_label="ci")
+    incremental, joined_incremental = coordinator.submit(key(incremental=True), lambda: Job("inc"), run)
+    assert joined_same and joined_incremental
+    assert same is full and incremental is full
+    assert full.waiters == 3 and full.capture_snapshot and full.snapshot_label == "ci"
+
+    release.set()
+    assert await asyncio.gather(full.wait(), same.wait(), incremental.wait()) == [b"report"] * 3
+    assert runs == [key()]
+    assert coordinator.stats() == {"in_flight": 0, "started": 1, "joined": 2}
+
+
+async def test_full_request_does_not_join_incremental_scan_and_runs_after_it():
+    coordinator = ScanCoordinator()
+    order = []
+    release = asyncio.Event()
+
+    async def run(flight):
+        order.append(("start", flight.job.job_id))
+        if flight.job.job_id == "inc":
+            await release.wait()
+        order.append(("end", flight.job.job_id))
+        return flight.job.job_id.encode()
+
+    incremental, _ = coordinator.submit(key(incremental=True), lambda: Job("inc"), run)
+    full, joined = coordinator.submit(key(), lambda: Job("full"), run)
+    other, _ = coordinator.submit(key(hidden=True), lambda: Job("hidden"), run)
+    assert not joined and full is not incremental
+    await asyncio.sleep(0)
+    # Same root: the full scan is queued behind the incremental one
+    assert order == [("start", "inc")]
+
+    release.set()
+    assert await full.wait() == b"full" and await other.wait() == b"hidden"
+    assert order == [("start", "inc"), ("end", "inc"), ("start", "full"), ("end", "full"),
+                     ("start", "hidden"), ("end", "hidden")]
+
+
+async def test_failure_reaches_every_waiter_and_frees_the_key():
+    coordinator = ScanCoordinator()
+
+    async def fail(flight):
+        await asyncio.sleep(0)
+        raise RuntimeError("disk gone")
+
+    first, _ = coordinator.submit(key(), lambda: Job("a"), fail)
+    second, joined = coordinator.submit(key(), lambda: Job("b"), fail)
+    assert joined
+    for flight in (first, second):
+        with pytest.raises(RuntimeError, match="disk gone"):
+            await flight.wait()
+
+    async def ok(flight):
+        return b"ok"
+
+    retry, joined = coordinator.submit(key(), lambda: Job("c"), ok)
+    assert not joined and await retry.wait() == b"ok"
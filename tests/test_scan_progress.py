@@ -0,0 +1,74 @@
+"""Tests for rate-limited scan progress frames (jupiter.server.scan_progress)."""
+
+import asyncio
+import threading
+
+from jupiter.core.events import FUNCTION_ANALYZED, SCAN_FILE_COMPLETED, SCAN_PROGRESS
+from jupiter.server.scan_progress import ScanProgressAggregator
+
+
+async def test_events_are_batched_into_frames():
+    frames = []
+
+    async def broadcast(event):
+        frames.append(event)
+
+    progress = ScanProgressAggregator(broadcast, job_id="job", rate_hz=50).start()
+    total = 2000
+
+    def scanner():
+        progress(SCAN_PROGRESS, {"phase": "scanning", "total_files": total, "processed": 0, "percent": 0})
+        for index in range(1, total + 1):
+            progress(SCAN_FILE_COMPLETED, {"file": f"f{index}.py", "processed": index, "total": total, "percent": index * 100 // total})
+            if index % 10 == 0:
+                progress(FUNCTION_ANALYZED, {"file": f"f{index}.py", "functions_count": 2, "functions": ["a", "b"]})
+
+    thread = threading.Thread(target=scanner)
+    thread.start()
+    while thread.is_alive():
+        await asyncio.sleep(0.005)
+    await progress.close()
+
+    assert 1 <= len(frames) < 100
+    assert {frame.type for frame in frames} == {SCAN_PROGRESS}
+    last = frames[-1].payload
+    assert last["job_id"] == "job" and last["processed"] == total and last["percent"] == 100
+    assert last["functions_found"] == 400
+    assert sum(frame.payload["files_completed"] for frame in frames) == total
+    assert sum(frame.payload["events"] for frame in frames) == progress.events == total + total // 10 + 1
+    assert last["recent_files"][-1] == f"f{total}.py" and len(last["recent_files"]) <= 5
+
+
+async def test_close_flushes_pending_events_only_once():
+    frames = []
+
+    async def broadcast(event):
+        frames.append(event.payload)
+
+    progress = ScanProgressAggregator(broadcast, rate_hz=1).start()
+    progress(SCAN_FILE_COMPLETED, {"file": "a.py", "processed": 1, "total": 1, "percent": 100, "error": "boom"})
+    await progress.close()
+    assert await progress.flush() is False
+
+    assert len(frames) == 1
+    assert frames[0]["processed"] == 1 and frames[0]["errors"] == 1 and "job_id" not in frames[0]
+
+
+async def test_watch_total_events_counts_scanner_events(monkeypatch):
+    from jupiter.server.routers import watch
+
+    sent = []
+
+    async def broadcast(event):
+        sent.append(event.payload)
+
+    monkeypatch.setattr(watch.ws_manager, "broadcast", broadcast)
+    monkeypatch.setattr(watch, "_watch_state", watch.WatchState(active=True))
+
+    progress = watch.create_scan_progress_callback("job", rate_hz=1)
+    for index in range(1, 4):
+        progress(SCAN_FILE_COMPLETED, {"file": f"f{index}.py", "processed": index, "total": 3, "percent": index * 33})
+    await progress.close()
+
+    assert len(sent) == 1 and sent[0]["events"] == 3 and "timestamp" in sent[0]
+    assert watch.get_watch_state().total_events == 3
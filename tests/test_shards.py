@@ -0,0 +1,94 @@
+"""Tests for sharded dynamic-analysis runs (jupiter.core.shards)."""
+
+import os
+import sys
+
+import pytest
+
+from jupiter.core.runner import CommandResult
+from jupiter.core.shards import merge_shard_results, run_sharded, split_pytest_command
+
+
+def _make_tests(root, sizes):
+    tests = root / "tests"
+    tests.mkdir()
+    for name, size in sizes.items():
+        (tests / name).write_text("def test_ok():\n    pass\n" + "#" * size)
+    (tests / "helpers.py").write_text("")
+    return tests
+
+
+def test_split_balances_files_and_keeps_options(tmp_path):
+    _make_tests(tmp_path, {"test_big.py": 3000, "test_mid.py": 2000, "test_small.py": 1000, "test_tiny.py": 900})
+
+    commands = split_pytest_command(["pytest", "-q", "-k", "ok", "tests"], tmp_path, 2)
+
+    assert len(commands) == 2
+    for command in commands:
+        assert command[:3] == [sys.executable, "-m", "pytest"]
+        assert command[3:8] == ["-q", "-k", "ok", "-p", "no:cacheprovider"]
+    shards = [sorted(c[8:]) for c in commands]
+    assert shards == [["tests/test_big.py", "tests/test_tiny.py"], ["tests/test_mid.py", "tests/test_small.py"]]
+
+
+def test_split_uses_testpaths_and_node_ids(tmp_path):
+    _make_tests(tmp_path, {"test_a.py": 10, "test_b.py": 10})
+    (tmp_path / "pytest.ini").write_text("[pytest]\ntestpaths = tests\n")
+
+    commands = split_pytest_command([sys.executable, "-m", "pytest"], tmp_path, 8)
+    assert sorted(c[-1] for c in commands) == ["tests/test_a.py", "tests/test_b.py"]
+
+    commands = split_pytest_command(["pytest", "tests/test_a.py::test_ok"], tmp_path, 3)
+    assert commands == [[sys.executable, "-m", "pytest", "-p", "no:cacheprovider", "tests/test_a.py::test_ok"]]
+
+    with pytest.raises(ValueError):
+        split_pytest_command(["make", "test"], tmp_path, 2)
+
+
+def test_merge_shard_results_sums_counters():
+    results = [
+        CommandResult(stdout="", stderr="", returncode=0, dynamic_data={
+            "calls": {"a.py::f": 2}, "times": {"a.py::f": 0.5},
+            "call_graph": {"a.py::f": {"a.py::g": 1}}, "backend": "profile", "complete": True,
+        }),
+        CommandResult(stdout="", stderr="", returncode=1, dynamic_data=None),
+        CommandResult(stdout="", stderr="", returncode=0, dynamic_data={
+            "calls": {"a.py::f": 1, "b.py::h": 4}, "times": {"a.py::f": 0.25},
+            "call_graph": {"a.py::f": {"a.py::g": 2}}, "complete": False,
+        }),
+    ]
+
+    merged = merge_shard_results(results)
+
+    assert merged["calls"] == {"a.py::f": 3, "b.py::h": 4}
+    assert merged["times"] == {"a.py::f": 0.75}
+    assert merged["call_graph"] == {"a.py::f": {"a.py::g": 3}}
+    assert merged["backend"] == "profile"
+    assert merged["complete"] is False
+    assert merged["shards"] == 3
+    assert merge_shard_results(results[1:2]) is None
+
+
+async def test_run_sharded_merges_traced_shards(tmp_path, monkeypatch):
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    monkeypatch.setenv("PYTHONPATH", os.pathsep.join(filter(None, [repo_root, os.environ.get("PYTHONPATH")])))
+    (tmp_path / "work.py").write_text(
+        "import os, sys\n"
+        "def step():\n"
+        "    pass\n"
+        "for _ in range(int(sys.argv[1])):\n"
+        "    step()\n"
+        "print('shard', os.environ['JUPITER_SHARD'], 'of', os.environ['JUPITER_SHARDS'])\n"
+    )
+    commands = [[sys.executable, "work.py", str(n)] for n in (3, 4, 5)]
+
+    done = []
+    result = await run_sharded(commands, tmp_path, 2, with_dynamic=True,
+                               on_shard_done=lambda index, command, res: done.append(index))
+
+    assert result.returncode == 0, result.stderr
+    assert sorted(done) == [0, 1, 2]
+    assert result.dynamic_data["calls"]["work.py::step"] == 12
+    assert result.dynamic_data["shards"] == 3
+    for index in range(3):
+        assert f"shard {index} of 3" in result.stdout
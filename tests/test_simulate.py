@@ -1,4 +1,6 @@
-from jupiter.core.simulator import ProjectSimulator
+import pytest
+
+from jupiter.core.simulator import ProjectSimulator, SimulationTarget
 
 def test_simulate_remove_file():
     files = [
@@ -62,3 +64,111 @@ def test_simulate_remove_function():
     result_unused = sim.simulate_remove_function("lib/utils.py", "unused")
     assert result_unused.risk_score == "low"
     assert len(result_unused.impacts) == 0
+
+
+def _batch_files():
+    return [
+        {
+            "path": "lib/utils.py",
+            "language_analysis": {
+                "defined_functions": ["helper", "unused"],
+                "imports": [],
+                "function_calls": []
+            }
+        },
+        {
+            "path": "lib/extra.py",
+            "language_analysis": {
+                "defined_functions": ["extra"],
+                "imports": ["lib.utils"],
+                "function_calls": ["helper"]
+            }
+        },
+        {
+            "path": "main.py",
+            "language_analysis": {
+                "defined_functions": ["main"],
+                "imports": ["lib.utils", "lib.extra"],
+                "function_calls": ["helper", "extra"]
+            }
+        }
+    ]
+
+
+def test_simulate_batch_attributes_combined_impacts():
+    sim = ProjectSimulator(_batch_files())
+    batch = sim.simulate_batch([
+        SimulationTarget(action="remove", path="lib/utils.py", function_name="helper"),
+        SimulationTarget(action="remove", path="lib/utils.py", function_name="unused"),
+        SimulationTarget(action="remove", path="lib/extra.py"),
+    ])
+
+    assert len(batch.results) == 3
+    assert batch.risk_score == "high"
+    # Impacts on lib/extra.py are dropped because the batch removes that file
+    assert all(not i.target.startswith("lib/extra.py") for i in batch.impacts)
+    main_impacts = [i for i in batch.impacts if i.target.startswith("main.py")]
+    assert main_impacts
+    helper_call = next(i for i in main_impacts if "helper" in i.details)
+    assert helper_call.sources == ["Remove function lib/utils.py::helper"]
+    assert batch.results[1].risk_score == "low"
+
+
+def test_simulate_batch_move_targets():
+    sim = ProjectSimulator(_batch_files())
+    batch = sim.simulate_batch([
+        SimulationTarget(action="move", path="lib/utils.py", new_path="lib/helpers.py"),
+        SimulationTarget(action="move", path="lib/extra.py", function_name="extra", new_path="lib/helpers.py"),
+    ])
+
+    assert batch.risk_score == "medium"
+    file_move = batch.results[0]
+    assert {i.target for i in file_move.impacts} == {"lib/extra.py", "main.py"}
+    assert all("lib.helpers" in i.details for i in file_move.impacts)
+    func_move = batch.results[1]
+    assert [i.target for i in func_move.impacts] == ["main.py"]
+
+
+def test_simulate_batch_rejects_move_without_destination():
+    sim = ProjectSimulator(_batch_files())
+    with pytest.raises(ValueError):
+        sim.simulate_batch([SimulationTarget(action="move", path="lib/utils.py")])
+
+
+def test_simulate_resolves_relative_imports_and_absolute_paths():
+    root = "/work/project"
+    files = [
+        {"path": f"{root}/pkg/__init__.py", "language_analysis": {"imports": [], "defined_functions": []}},
+        {
+            "path": f"{root}/pkg/core.py",
+            "language_analysis": {"imports": [], "defined_functions": ["run"]},
+        },
+        {
+            "path": f"{root}/pkg/cli.py",
+            "language_analysis": {"imports": [".core"], "function_calls": ["run"]},
+        },
+    ]
+    sim = ProjectSimulator(files, root=root)
+
+    # The user-facing path is relative to the project root
+    result = sim.simulate_remove_file("pkg/core.py")
+    kinds = {(i.target, i.impact_type) for i in result.impacts}
+    assert (f"{root}/pkg/cli.py", "broken_import") in kinds
+    assert (f"{root}/pkg/cli.py::run", "broken_call") in kinds
+
+    moved = sim.simulate_move_file("pkg/core.py", "pkg/engine.py")
+    assert "pkg.engine" in moved.impacts[0].details
+
+
+def test_move_file_normalizes_the_new_path():
+    files = [
+        {"path": "pkg/__init__.py", "language_analysis": {"imports": []}},
+        {"path": "pkg/core.py", "language_analysis": {"imports": []}},
+        {"path": "main.py", "language_analysis": {"imports": ["pkg.core"]}},
+    ]
+    sim = ProjectSimulator(files)
+
+    for new_path in ("./pkg/engine.py", "pkg\\engine.py"):
+        result = sim.simulate_move_file("pkg/core.py", new_path)
+        assert "(now 'pkg.engine')" in result.impacts[0].details
+        assert result.target == "Move file pkg/core.py -> pkg/engine.py"
@@ -0,0 +1,94 @@
+"""Tests for the Server-Sent Events replay buffer (jupiter.server.sse)."""
+
+import asyncio
+import json
+
+from jupiter.core.events import SCAN_PROGRESS, JupiterEvent
+from jupiter.server.sse import EventHub, format_event
+from jupiter.server.ws import _encode
+
+
+def parse(chunks):
+    """SSE chunks -> [(id, event, data)] (comments and retry lines skipped)."""
+    events = []
+    for chunk in chunks:
+        fields = dict(line.split(": ", 1) for line in chunk.strip().split("\n") if ": " in line and not line.startswith(":"))
+        if "data" in fields:
+            events.append((fields.get("id"), fields.get("event", "message"), fields["data"]))
+    return events
+
+
+async def collect(stream, count):
+    chunks = []
+    async for chunk in stream:
+        chunks.append(chunk)
+        if len(parse(chunks)) == count:
+            break
+    return parse(chunks)
+
+
+def progress(job_id, percent):
+    return _encode(JupiterEvent(type=SCAN_PROGRESS, payload={"job_id": job_id, "percent": percent}))
+
+
+async def test_resume_replays_missed_events_and_reports_gaps():
+    hub = EventHub(max_events=4)
+    for index in range(6):
+        hub.publish(_encode({"type": "bridge_event", "topic": "livemap.updated", "payload": {"n": index}}))
+
+    replay = await collect(hub.stream(lambda message: True, last_event_id=hub.event_id(4)), 2)
+    assert [(event_id, event) for event_id, event, _ in replay] == [
+        (f"{hub.epoch}-5", "livemap.updated"), (f"{hub.epoch}-6", "livemap.updated"),
+    ]
+
+    # ID 2 is gone from the 4-event buffer: the client is told to reload
+    events = await collect(hub.stream(lambda message: True, last_event_id=hub.event_id(1)), 5)
+    assert events[0][1] == "gap" and json.loads(events[0][2]) == {"oldest_id": hub.event_id(3)}
+    assert [event_id for event_id, _, _ in events[1:]] == [hub.event_id(n) for n in (3, 4, 5, 6)]
+
+    # IDs of a previous run (other epoch, or none), even below last_id, are not resume points
+    for stale in ("0123abcd-5", "5"):
+        events = await collect(hub.stream(lambda message: True, last_event_id=stale), 5)
+        assert events[0][1] == "gap" and [event_id for event_id, _, _ in events[1:]] == [hub.event_id(n) for n in (3, 4, 5, 6)]
+
+
+async def test_stream_coalesces_progress_and_stops_when_done():
+    hub = EventHub()
+    hub.publish(progress("a", 10))
+    hub.publish(progress("b", 50))
+    hub.publish(progress("a", 20))
+    hub.publish(_encode(JupiterEvent(type="SCAN_FINISHED", payload={"job_id": "a"})))
+    hub.publish(_encode("unrelated"))
+
+    chunks = []
+    stream = hub.stream(
+        lambda message: message.job_id == "a",
+        last_event_id=hub.event_id(0),
+        until=lambda message: message.topic == "SCAN_FINISHED",
+    )
+    async for chunk in stream:
+        chunks.append(chunk)
+    events = parse(chunks)
+    assert [(event_id, event) for event_id, event, _ in events] == [(hub.event_id(3), SCAN_PROGRESS), (hub.event_id(4), "SCAN_FINISHED")]
+    assert json.loads(events[0][2])["payload"]["percent"] == 20
+    assert not hub.listening
+
+    # New streams wait for new messages; keepalive comments in between
+    stream = hub.stream(lambda message: True, keepalive=0.01)
+    assert await stream.__anext__() == ": keepalive\n\n"
+    hub.publish(_encode("line one\nline two"))
+    assert await asyncio.wait_for(stream.__anext__(), 1) == f"id: {hub.epoch}-6\ndata: line one\ndata: line two\n\n"
+    await stream.aclose()
+    assert format_event("{}", "status") == "event: status\ndata: {}\n\n"
+
+
+def test_query_tokens_are_redacted_from_access_logs():
+    import logging
+
+    from jupiter.core.logging_utils import QueryTokenFilter
+
+    record = logging.LogRecord("uvicorn.access", logging.INFO, "", 0, '%s - "%s %s HTTP/%s" %d', (
+        "127.0.0.1:5000", "GET", "/events?topics=SCAN_*&token=s3cret&last_event_id=1", "1.1", 200,
+    ), None)
+    assert QueryTokenFilter().filter(record)
+    assert "s3cret" not in record.getMessage() and "&token=***&last_event_id=1" in record.getMessage()
@@ -0,0 +1,90 @@
+import json
+
+from jupiter.core.tracefile import TraceTail, TraceWriter, merge_dynamic, read_trace
+from jupiter.core.tracer import Tracer
+
+
+def test_writer_and_reader_merge_chunks(tmp_path):
+    path = tmp_path / "trace.ndjson"
+    writer = TraceWriter(str(path), root="/proj", mode="trace")
+    writer.write_chunk({"calls": {"a.py::f": 2}, "times": {"a.py::f": 0.5}, "call_graph": {"a.py::main": {"a.py::f": 2}}})
+    writer.write_chunk({"calls": {"a.py::f": 1, "a.py::g": 4}, "times": {}, "call_graph": {"a.py::main": {"a.py::f": 1}}})
+    writer.close(backend="profile", threads=2)
+
+    data = read_trace(str(path))
+    assert data["calls"] == {"a.py::f": 3, "a.py::g": 4}
+    assert data["times"] == {"a.py::f": 0.5}
+    assert data["call_graph"] == {"a.py::main": {"a.py::f": 3}}
+    assert data["backend"] == "profile"
+    assert data["mode"] == "trace"
+    assert data["complete"] is True
+
+
+def test_reader_survives_killed_process(tmp_path):
+    path = tmp_path / "trace.ndjson"
+    writer = TraceWriter(str(path), mode="trace")
+    writer.write_chunk({"calls": {"a.py::f": 2}})
+    writer._file.write('{"type":"chunk","calls":{"a.py::f"')  # Torn final write
+    writer._file.flush()
+
+    data = read_trace(str(path))
+    assert data["calls"] == {"a.py::f": 2}
+    assert data["complete"] is False
+
+
+def test_reader_accepts_legacy_json(tmp_path):
+    path = tmp_path / "trace.json"
+    legacy = {"calls": {"a.py::f": 1}, "times": {}, "call_graph": {}}
+    path.write_text(json.dumps(legacy, indent=2))
+    assert read_trace(str(path)) == legacy
+
+
+def test_tail_returns_only_new_complete_chunks(tmp_path):
+    path = tmp_path / "trace.ndjson"
+    writer = TraceWriter(str(path))
+    tail = TraceTail(str(path))
+    assert tail.read_new() is None
+
+    writer.write_chunk({"calls": {"a.py::f": 1}})
+    writer.write_chunk({"calls": {"a.py::f": 2}})
+    assert tail.read_new()["calls"] == {"a.py::f": 3}
+    assert tail.read_new() is None
+
+    writer._file.write('{"type":"chunk","calls":{"a.py::g":5}}')  # No newline yet
+    writer._file.flush()
+    assert tail.read_new() is None
+    writer._file.write("\n")
+    writer._file.flush()
+    assert tail.read_new()["calls"] == {"a.py::g": 5}
+    writer.close()
+    tail.read_new()
+    assert tail.finished
+
+
+def test_merge_dynamic_repairs_malformed_sections():
+    base = {"calls": [], "call_graph": {"a": "bad"}}
+    merge_dynamic(base, {"calls": {"f": 1}, "call_graph": {"a": {"f": 2}}, "samples": 3})
+    assert base == {"calls": {"f": 1}, "call_graph": {"a": {"f": 2}}, "samples": 3}
+
+
+def test_tracer_flushes_windows_to_sink(tmp_path):
+    script = tmp_path / "loop.py"
+    script.write_text("def tick():\n    return 1\n")
+    namespace = {}
+    exec(compile(script.read_text(), str(script), "exec"), namespace)
+    tick = namespace["tick"]
+
+    chunks = []
+    tracer = Tracer(str(tmp_path), backend="profile", sink=chunks.append, flush_interval=0)
+    tracer.install()
+    try:
+        for _ in range(5):
+            tick()
+    finally:
+        tracer.uninstall()
+    tracer.flush()
+
+    # Every call event starts a new window: nothing stays in memory
+    assert len(chunks) >= 2
+    assert sum(chunk["calls"].get("loop.py::tick", 0) for chunk in chunks) == 5
+    assert tracer.results()["calls"] == {}
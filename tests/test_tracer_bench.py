@@ -0,0 +1,55 @@
+"""Tests for the tracer overhead calibration (jupiter.core.tracer_bench)."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from jupiter.core.tracer_bench import available_backends, bench_dir, load_bench_reports, run_tracer_bench
+
+
+def test_bench_measures_every_workload_and_saves(tmp_path):
+    report = run_tracer_bench(tmp_path, backends=["profile", "sample"], repeat=1, scale=0.02)
+
+    assert set(report.baseline) == {"calls", "recursion", "async"}
+    assert [(m.workload, m.backend) for m in report.measurements] == [
+        (w, b) for w in ("calls", "recursion", "async") for b in ("profile", "sample")
+    ]
+    traced = {m.workload: m for m in report.measurements if m.backend == "profile"}
+    # 2000 Counter.bump + 2000 add calls, at least
+    assert traced["calls"].calls >= 4000
+    assert traced["recursion"].calls > 0 and traced["async"].calls > 0
+    assert all(m.ratio > 0 for m in report.measurements)
+
+    saved = list(bench_dir(tmp_path).glob("tracer-*.json"))
+    assert [str(p) for p in saved] == [report.path]
+    data = json.loads(saved[0].read_text(encoding="utf-8"))
+    assert data["python"] == report.python
+    assert len(data["measurements"]) == 6
+
+
+def test_bench_compares_with_previous_report_and_budget(tmp_path):
+    first = run_tracer_bench(tmp_path, workloads=["calls"], backends=["profile"], repeat=1, scale=0.02)
+    # Pretend the previous run was much cheaper: the new ratio is a regression
+    path = Path(first.path)
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data["measurements"][0]["ratio"] = 0.01
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+    second = run_tracer_bench(tmp_path, workloads=["calls"], backends=["profile"], repeat=1, scale=0.02,
+                              max_overhead=1.0, save=False)
+
+    assert second.previous == path.name
+    assert second.measurements[0].previous_ratio == 0.01
+    assert second.regressions == second.measurements
+    assert second.over_budget == second.measurements
+    assert "REGRESSION" in second.describe()
+    assert len(load_bench_reports(tmp_path)) == 1
+
+
+def test_bench_rejects_unknown_names(tmp_path):
+    with pytest.raises(ValueError):
+        run_tracer_bench(tmp_path, workloads=["nope"], save=False)
+    if "monitoring" not in available_backends():
+        with pytest.raises(ValueError):
+            run_tracer_bench(tmp_path, backends=["monitoring"], save=False)
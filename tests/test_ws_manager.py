@@ -0,0 +1,144 @@
+"""Tests for per-client WebSocket send queues (jupiter.server.ws)."""
+
+import asyncio
+import json
+
+import pytest
+
+from jupiter.core.events import SCAN_PROGRESS, JupiterEvent
+from jupiter.server.ws import ConnectionManager
+
+
+class FakeSocket:
+    def __init__(self, blocked=False):
+        self.sent = []
+        self.closed_with = None
+        self.gate = asyncio.Event()
+        if not blocked:
+            self.gate.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        await self.gate.wait()
+        self.sent.append(text)
+
+    async def close(self, code=1000, reason=None):
+        self.closed_with = code
+
+
+async def settle():
+    # Each send goes through wait_for(): give the writers a few loop turns
+    for _ in range(50):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+async def managers():
+    created = []
+
+    def make(**kwargs):
+        created.append(ConnectionManager(**kwargs))
+        return created[-1]
+
+    yield make
+    for manager in created:
+        await manager.shutdown()
+
+
+async def test_slow_client_does_not_delay_others(managers):
+    manager = managers(queue_size=3, policy="drop_oldest")
+    fast, slow = FakeSocket(), FakeSocket(blocked=True)
+    await manager.connect(fast)
+    await manager.connect(slow)
+
+    for index in range(6):
+        await manager.broadcast({"n": index})
+        await settle()
+
+    assert [json.loads(text)["n"] for text in fast.sent] == list(range(6))
+    stats = {id(c.websocket): c.stats() for c in manager.clients.values()}
+    # The slow client holds one message in its blocked send and keeps the newest 3
+    assert stats[id(slow)]["queued"] == 3 and stats[id(slow)]["dropped"] == 2
+    assert stats[id(fast)]["sent"] == 6 and stats[id(fast)]["dropped"] == 0
+
+    slow.gate.set()
+    await settle()
+    assert [json.loads(text)["n"] for text in slow.sent] == [0, 3, 4, 5]
+    assert manager.stats()["clients"][1]["max_lag_ms"] >= 0
+    await manager.shutdown()
+    assert manager.clients == {} and manager.stats()["disconnected_slow"] == 0
+
+
+async def test_progress_events_are_coalesced(managers):
+    manager = managers(queue_size=10)
+    slow = FakeSocket(blocked=True)
+    client = await manager.connect(slow)
+
+    await manager.broadcast("first")
+    await settle()
+    for percent in (10, 20, 30):
+        await manager.broadcast(JupiterEvent(type=SCAN_PROGRESS, payload={"job_id": "a", "percent": percent}))
+    await manager.broadcast(JupiterEvent(type=SCAN_PROGRESS, payload={"job_id": "b", "percent": 5}))
+    await manager.broadcast("done")
+    # The replacement keeps the metadata used by subscription filters and SSE
+    assert [(m.topic, m.job_id) for m in client.queue][:2] == [(SCAN_PROGRESS, "a"), (SCAN_PROGRESS, "b")]
+    slow.gate.set()
+    await settle()
+
+    progress = [json.loads(text)["payload"] for text in slow.sent[1:-1]]
+    assert slow.sent[0] == "first" and slow.sent[-1] == "done"
+    assert progress == [{"job_id": "a", "percent": 30}, {"job_id": "b", "percent": 5}]
+    assert manager.stats()["clients"][0]["coalesced"] == 2
+
+
+async def test_disconnect_policy_closes_slow_clients(managers):
+    manager = managers(queue_size=2, policy="disconnect")
+    slow = FakeSocket(blocked=True)
+    await manager.connect(slow)
+    for index in range(4):
+        await manager.broadcast(str(index))
+    await settle()
+
+    assert manager.clients == {}
+    assert slow.closed_with == 1013
+    assert manager.stats()["disconnected_slow"] == 1
+
+    with pytest.raises(ValueError):
+        ConnectionManager(policy="ignore")
+
+
+async def test_subscriptions_filter_topics_projects_and_log_levels(managers):
+    manager = managers()
+    everything, livemap = FakeSocket(), FakeSocket()
+    await manager.connect(everything)
+    client = await manager.connect(livemap, {"topics": "livemap.*,SCAN_FINISHED", "projects": "web"})
+    client.subscribe({"type": "subscribe", "topics": ["LOG_MESSAGE"], "min_log_level": "warning"})
+    client.subscribe({"type": "unsubscribe", "topics": ["livemap.debug"]})
+    client.subscribe({"type": "subscribe", "min_log_level": "loud"})
+    await settle()
+    acks = [json.loads(text) for text in livemap.sent]
+    livemap.sent.clear()
+    assert acks[0]["type"] == "subscription" and acks[0]["topics"] == ["SCAN_FINISHED", "livemap.*"]
+    assert acks[2]["excluded_topics"] == ["livemap.debug"] and acks[2]["min_log_level"] == "warning"
+    assert acks[3]["type"] == "subscription_error"
+
+    await manager.broadcast(JupiterEvent(type=SCAN_PROGRESS, payload={"job_id": "a", "percent": 1}))
+    await manager.broadcast({"type": "bridge_event", "topic": "livemap.graph_updated", "payload": {}})
+    await manager.broadcast({"type": "bridge_event", "topic": "livemap.debug", "payload": {}})
+    await manager.broadcast(JupiterEvent(type="SCAN_FINISHED", payload={"project_id": "api"}))
+    await manager.broadcast(JupiterEvent(type="SCAN_FINISHED", payload={}), project_id="web")
+    await manager.broadcast(JupiterEvent(type="LOG_MESSAGE", payload={"level": "info", "message": "quiet"}))
+    await manager.broadcast(JupiterEvent(type="LOG_MESSAGE", payload={"level": "error", "message": "loud"}))
+    await manager.broadcast("Scan completed.")
+    await settle()
+
+    received = [json.loads(text) for text in livemap.sent]
+    assert [message.get("topic") or message["type"] for message in received] == [
+        "livemap.graph_updated", "SCAN_FINISHED", "LOG_MESSAGE",
+    ]
+    assert received[2]["payload"]["message"] == "loud"
+    assert len(everything.sent) == 8
+    stats = {id(c.websocket): c.stats() for c in manager.clients.values()}
+    assert stats[id(livemap)]["filtered"] == 5 and stats[id(everything)]["filtered"] == 0